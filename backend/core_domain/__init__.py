@@ -4,3 +4,5 @@
 from .enums import *
 from .events import *
 from .typing import *
+from .business_day import *
+from .pagination import *
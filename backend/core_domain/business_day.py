@@ -0,0 +1,96 @@
+"""
+Business day helpers - venue timezone aware day boundaries
+RESTI POS - Core domain
+
+A riportok korábban `DATE(created_at)` / `func.date(...)` szűréssel
+dolgoztak: ez nem használja a created_at indexeket (minden sorra
+kiértékelődik), és a DB session időzónája szerint vágja a napot, nem
+az étterem időzónája szerint.
+
+Ezek a függvények egy üzleti napot / nap tartományt félig nyitott,
+timezone-aware [start, end) időbélyeg intervallummá alakítanak, így a
+szűrés `created_at >= :start AND created_at < :end` formájú (sargable),
+a nyári / téli időszámítás váltás napjain is helyes hosszúságú.
+
+Használat:
+    start, end = business_day_bounds(date(2024, 3, 31), "Europe/Budapest")
+    query.filter(Order.created_at >= start, Order.created_at < end)
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+__all__ = [
+    "venue_zone",
+    "business_day_bounds",
+    "business_range_bounds",
+    "business_date_of",
+]
+
+
+@lru_cache(maxsize=8)
+def venue_zone(tz_name: str) -> ZoneInfo:
+    """
+    IANA időzóna objektum (gyorsítótárazva).
+
+    Args:
+        tz_name: IANA időzóna név (pl. 'Europe/Budapest')
+
+    Returns:
+        ZoneInfo: Időzóna
+    """
+    return ZoneInfo(tz_name)
+
+
+def business_day_bounds(day: date, tz_name: str) -> Tuple[datetime, datetime]:
+    """
+    Egy üzleti nap félig nyitott határai.
+
+    Args:
+        day: Az üzleti nap
+        tz_name: Az étterem időzónája
+
+    Returns:
+        tuple: (nap kezdete, következő nap kezdete) - UTC, timezone-aware
+    """
+    return business_range_bounds(day, day, tz_name)
+
+
+def business_range_bounds(start_date: date, end_date: date, tz_name: str) -> Tuple[datetime, datetime]:
+    """
+    Üzleti nap tartomány (mindkét végén inkluzív) félig nyitott határai.
+
+    Args:
+        start_date: Első nap
+        end_date: Utolsó nap
+        tz_name: Az étterem időzónája
+
+    Returns:
+        tuple: (start_date kezdete, end_date utáni nap kezdete) - UTC, timezone-aware
+    """
+    zone = venue_zone(tz_name)
+    start = datetime.combine(start_date, time.min, tzinfo=zone)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=zone)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def business_date_of(timestamp: Optional[datetime], tz_name: str) -> date:
+    """
+    Időbélyeg -> üzleti nap az étterem időzónájában.
+
+    Naiv időbélyeget UTC-nek tekint (a timestamptz oszlopok UTC-ben tárolnak).
+
+    Args:
+        timestamp: Időbélyeg (None = most)
+        tz_name: Az étterem időzónája
+
+    Returns:
+        date: Az üzleti nap
+    """
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
+    elif timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(venue_zone(tz_name)).date()
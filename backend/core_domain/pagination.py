@@ -0,0 +1,90 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Az offset(skip).limit(limit) lapozás mély oldalakon az összes korábbi
+sort beolvassa és eldobja. A keyset lapozás a (created_at, id) kulcs
+szerint folytatja a listát (legújabb elől):
+
+    WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+
+A kurzor átlátszatlan (opaque) string: az oldal utolsó sorának
+(created_at, id) kulcsa base64url kódolva. A kliens változtatás nélkül
+küldi vissza a következő oldal kéréséhez.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+__all__ = [
+    "InvalidCursorError",
+    "encode_cursor",
+    "decode_cursor",
+    "next_page_cursor",
+]
+
+
+class InvalidCursorError(ValueError):
+    """A kliens által küldött kurzor nem dekódolható."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Keyset kurzor kódolása.
+
+    Args:
+        created_at: Az oldal utolsó sorának created_at értéke
+        row_id: Az oldal utolsó sorának id-ja
+
+    Returns:
+        str: Átlátszatlan, URL-biztos kurzor
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Keyset kurzor dekódolása.
+
+    Args:
+        cursor: encode_cursor által előállított kurzor
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        InvalidCursorError: Ha a kurzor hibás
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError, UnicodeEncodeError, binascii.Error) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def next_page_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """
+    A következő oldal kurzora egy (created_at DESC, id DESC) rendezett oldalból.
+
+    Teli oldal esetén az utolsó sor kulcsa (a következő oldal lehet üres),
+    egyébként None (nincs több sor).
+
+    Args:
+        items: Az oldal sorai (created_at és id attribútummal)
+        limit: A kért oldalméret
+
+    Returns:
+        Optional[str]: Kurzor vagy None
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if last.created_at is None:
+        return None
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,25 @@
+# Core HTTP Package
+# Shared, pooled HTTP clients for inter-service calls in RESTI POS
+
+from .config import TargetConfig, HTTPClientSettings
+from .client import (
+    HTTPClientRegistry,
+    http_clients,
+    get_sync_client,
+    get_async_client,
+    close_all_clients,
+    http_client_stats,
+)
+from .product_catalog import ProductCatalog
+
+__all__ = [
+    "TargetConfig",
+    "HTTPClientSettings",
+    "HTTPClientRegistry",
+    "http_clients",
+    "get_sync_client",
+    "get_async_client",
+    "close_all_clients",
+    "http_client_stats",
+    "ProductCatalog",
+]
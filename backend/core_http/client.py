@@ -0,0 +1,290 @@
+"""
+Shared pooled HTTP clients for inter-service calls
+RESTI POS - Core infrastructure
+
+Korábban minden szolgáltatás-közi hívás új httpx.Client / AsyncClient
+példányt nyitott (új TCP kapcsolat, nincs keep-alive), ami terhelés alatt
+ephemeral port churn-t okozott, és a kapcsolódási idő dominált.
+
+Ez a modul célszolgáltatásonként (target) EGY hosszú életű, poolozott
+klienst ad:
+- Connection pooling + HTTP keep-alive
+- Célonkénti limitek (max_connections, max_keepalive_connections)
+- Célonkénti alapértelmezett timeout-ok (hívásonként felülírhatók: timeout=...)
+  a config.py beépített értékeiből és a HTTP_CLIENT_TARGETS változóból
+- Késleltetés metrikák célonként (count, errors, avg/max/p95 ms)
+
+Szinkron kódútvonalakhoz (threadpool-ban futó service metódusok)
+get_sync_client(), aszinkronhoz get_async_client(). A httpx kliensek
+szálbiztosak, így a szinkron kliens megosztható a threadpool szálai között.
+
+Életciklus: a szolgáltatás shutdown eseményében `await close_all_clients()`.
+
+Használat:
+    from backend.core_http import get_sync_client, get_async_client
+
+    response = get_sync_client("menu").get(url, timeout=5.0)
+    response = await get_async_client("orders").get(url)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+
+from .config import HTTPClientSettings, TargetConfig, build_target_configs
+
+logger = logging.getLogger(__name__)
+
+
+class _LatencyStats:
+    """Célonkénti késleltetés statisztika (utolsó N minta a p95-höz)."""
+
+    def __init__(self, sample_size: int = 512):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+    def record(self, elapsed_ms: float, is_error: bool) -> None:
+        """Egy kérés eredményének rögzítése."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+        if is_error:
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Összesített metrikák."""
+        ordered = sorted(self.samples)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] if ordered else 0.0
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "p95_ms": round(p95, 2),
+        }
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    """Szinkron transport wrapper: válaszidő (fejlécekig) és hibák mérése."""
+
+    def __init__(self, inner: httpx.BaseTransport, record: Callable[[float, bool], None]):
+        self._inner = inner
+        self._record = record
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = self._inner.handle_request(request)
+        except Exception:
+            self._record((time.perf_counter() - started) * 1000, True)
+            raise
+        self._record((time.perf_counter() - started) * 1000, response.status_code >= 500)
+        return response
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _MeteredAsyncTransport(httpx.AsyncBaseTransport):
+    """Aszinkron transport wrapper: válaszidő (fejlécekig) és hibák mérése."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, record: Callable[[float, bool], None]):
+        self._inner = inner
+        self._record = record
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except Exception:
+            self._record((time.perf_counter() - started) * 1000, True)
+            raise
+        self._record((time.perf_counter() - started) * 1000, response.status_code >= 500)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class HTTPClientRegistry:
+    """
+    Célonkénti, lustán létrehozott, megosztott httpx kliensek nyilvántartása.
+
+    Az AsyncClient event loop-hoz kötött: ha más loop-ból kérik
+    (pl. tesztekben asyncio.run), új kliens jön létre.
+    """
+
+    def __init__(
+        self,
+        default_config: Optional[TargetConfig] = None,
+        target_configs: Optional[Dict[str, TargetConfig]] = None
+    ):
+        self.default_config = default_config or TargetConfig()
+        self._configs: Dict[str, TargetConfig] = dict(target_configs or {})
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._stats: Dict[str, _LatencyStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: HTTPClientSettings) -> "HTTPClientRegistry":
+        """
+        Registry a célonkénti beállításokkal (beépített alapértékek + HTTP_CLIENT_TARGETS).
+
+        Args:
+            settings: HTTP kliens beállítások
+
+        Returns:
+            HTTPClientRegistry: Új registry
+        """
+        default_config, target_configs = build_target_configs(settings.http_client_targets)
+        return cls(default_config=default_config, target_configs=target_configs)
+
+    def configure_target(self, target: str, config: TargetConfig) -> None:
+        """
+        Célszolgáltatás beállításainak megadása (a kliens első létrehozása előtt).
+
+        Args:
+            target: Célszolgáltatás neve (pl. 'orders', 'inventory', 'menu')
+            config: Kliens beállítások
+        """
+        with self._lock:
+            self._configs[target] = config
+
+    def config(self, target: str) -> TargetConfig:
+        """
+        Egy cél érvényes beállításai (vagy az alapértelmezett).
+
+        Args:
+            target: Célszolgáltatás neve
+
+        Returns:
+            TargetConfig: A cél kliens beállításai
+        """
+        return self._configs.get(target, self.default_config)
+
+    # ========================================================================
+    # Metrikák
+    # ========================================================================
+
+    def _recorder(self, target: str) -> Callable[[float, bool], None]:
+        """Célhoz kötött metrika-rögzítő a transport wrapper-ekhez."""
+        def record(elapsed_ms: float, is_error: bool) -> None:
+            with self._lock:
+                stats = self._stats.setdefault(target, _LatencyStats())
+                stats.record(elapsed_ms, is_error)
+        return record
+
+    # ========================================================================
+    # Kliensek
+    # ========================================================================
+
+    def get_sync_client(self, target: str) -> httpx.Client:
+        """
+        Megosztott szinkron kliens egy célszolgáltatáshoz.
+
+        Args:
+            target: Célszolgáltatás neve
+
+        Returns:
+            httpx.Client: Poolozott, keep-alive kliens (NE zárd le, ne használd `with`-tel)
+        """
+        with self._lock:
+            client = self._sync_clients.get(target)
+            if client is None or client.is_closed:
+                config = self.config(target)
+                client = httpx.Client(
+                    transport=_MeteredTransport(
+                        httpx.HTTPTransport(limits=config.limits()),
+                        self._recorder(target)
+                    ),
+                    timeout=config.timeouts()
+                )
+                self._sync_clients[target] = client
+            return client
+
+    def get_async_client(self, target: str) -> httpx.AsyncClient:
+        """
+        Megosztott aszinkron kliens egy célszolgáltatáshoz (event loop-ból hívandó).
+
+        Args:
+            target: Célszolgáltatás neve
+
+        Returns:
+            httpx.AsyncClient: Poolozott, keep-alive kliens (NE zárd le, ne használd `async with`-tel)
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(target)
+            if entry is not None and entry[1] is loop and not entry[0].is_closed:
+                return entry[0]
+
+            config = self.config(target)
+            client = httpx.AsyncClient(
+                transport=_MeteredAsyncTransport(
+                    httpx.AsyncHTTPTransport(limits=config.limits()),
+                    self._recorder(target)
+                ),
+                timeout=config.timeouts()
+            )
+            self._async_clients[target] = (client, loop)
+            return client
+
+    async def close_all(self) -> None:
+        """Összes kliens lezárása (szolgáltatás shutdown)."""
+        with self._lock:
+            sync_clients = list(self._sync_clients.values())
+            async_clients = list(self._async_clients.values())
+            self._sync_clients.clear()
+            self._async_clients.clear()
+
+        for client in sync_clients:
+            client.close()
+
+        loop = asyncio.get_running_loop()
+        for client, client_loop in async_clients:
+            if client_loop is loop:
+                await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Célonkénti késleltetés metrikák (monitoringhoz).
+
+        Returns:
+            dict: target -> {requests, errors, avg_ms, max_ms, p95_ms}
+        """
+        with self._lock:
+            return {target: stats.as_dict() for target, stats in self._stats.items()}
+
+
+# Singleton instance (folyamatonként egy), célonkénti beállításokkal
+http_clients = HTTPClientRegistry.from_settings(HTTPClientSettings())
+
+
+def get_sync_client(target: str) -> httpx.Client:
+    """Megosztott szinkron kliens (lásd HTTPClientRegistry.get_sync_client)."""
+    return http_clients.get_sync_client(target)
+
+
+def get_async_client(target: str) -> httpx.AsyncClient:
+    """Megosztott aszinkron kliens (lásd HTTPClientRegistry.get_async_client)."""
+    return http_clients.get_async_client(target)
+
+
+async def close_all_clients() -> None:
+    """Összes megosztott kliens lezárása (shutdown eseményből)."""
+    await http_clients.close_all()
+
+
+def http_client_stats() -> Dict[str, Any]:
+    """Célonkénti késleltetés metrikák."""
+    return http_clients.stats()
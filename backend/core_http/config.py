@@ -0,0 +1,126 @@
+"""
+HTTP client settings - per-target pool limits and timeouts
+RESTI POS - Core infrastructure
+
+A megosztott kliensek célonkénti beállításai: beépített alapértékek
+(DEFAULT_TARGET_CONFIGS), amelyeket a HTTP_CLIENT_TARGETS környezeti
+változó (JSON) mezőnként felülírhat. A "default" kulcs a nem felsorolt
+célokra vonatkozik.
+
+Példa (.env):
+    HTTP_CLIENT_TARGETS={"ntak": {"timeout": 45}, "orders": {"max_connections": 200}}
+"""
+
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Tuple
+
+import httpx
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+@dataclass(frozen=True)
+class TargetConfig:
+    """
+    Egy célszolgáltatás kliens beállításai.
+
+    Attributes:
+        timeout: Alapértelmezett teljes timeout másodpercben
+        connect_timeout: Kapcsolódási timeout másodpercben
+        max_connections: Maximális egyidejű kapcsolatok száma
+        max_keepalive_connections: Maximálisan nyitva tartott tétlen kapcsolatok
+        keepalive_expiry: Tétlen kapcsolat élettartama másodpercben
+    """
+
+    timeout: float = 10.0
+    connect_timeout: float = 2.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+
+    def limits(self) -> httpx.Limits:
+        """httpx pool limitek."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        """httpx alapértelmezett timeout-ok."""
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+DEFAULT_TARGET = "default"
+
+# Beépített célonkénti beállítások (a hívásonkénti timeout=... továbbra is felülírja)
+DEFAULT_TARGET_CONFIGS: Dict[str, TargetConfig] = {
+    # Outbox kézbesítés, riport aggregátumok, készletlevonás visszahívás: a legforgalmasabb cél
+    "orders": TargetConfig(timeout=10.0, max_connections=100, max_keepalive_connections=20),
+    "inventory": TargetConfig(timeout=10.0, max_connections=50, max_keepalive_connections=10),
+    # Termék lookup: rövid, gyakori kérések
+    "menu": TargetConfig(timeout=5.0, max_connections=50, max_keepalive_connections=10),
+    "logistics": TargetConfig(timeout=5.0, max_connections=20, max_keepalive_connections=5),
+    "admin": TargetConfig(timeout=10.0, max_connections=20, max_keepalive_connections=5),
+    # Külső NTAK API: lassú, kevés párhuzamos kapcsolat
+    "ntak": TargetConfig(
+        timeout=30.0,
+        connect_timeout=5.0,
+        max_connections=10,
+        max_keepalive_connections=2,
+        keepalive_expiry=60.0
+    ),
+}
+
+
+class HTTPClientSettings(BaseSettings):
+    """
+    Megosztott HTTP kliens beállítások környezeti változókból.
+    """
+
+    http_client_targets: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description=(
+            "Per-target overrides as JSON, e.g. {\"ntak\": {\"timeout\": 45}}; "
+            "keys are TargetConfig fields, \"default\" applies to unlisted targets"
+        )
+    )
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
+
+
+def build_target_configs(
+    overrides: Dict[str, Dict[str, float]]
+) -> Tuple[TargetConfig, Dict[str, TargetConfig]]:
+    """
+    Célonkénti beállítások: beépített alapértékek + felülírások.
+
+    Args:
+        overrides: target -> {TargetConfig mező: érték}
+
+    Returns:
+        tuple: (alapértelmezett beállítás, target -> beállítás)
+
+    Raises:
+        ValueError: Ismeretlen TargetConfig mező esetén
+    """
+    field_types = {field.name: field.type for field in fields(TargetConfig)}
+
+    def apply(base: TargetConfig, target: str) -> TargetConfig:
+        values = overrides.get(target, {})
+        unknown = sorted(set(values) - set(field_types))
+        if unknown:
+            raise ValueError(f"Unknown HTTP client setting(s) for target '{target}': {', '.join(unknown)}")
+        return replace(base, **{name: field_types[name](value) for name, value in values.items()})
+
+    default_config = apply(TargetConfig(), DEFAULT_TARGET)
+    targets = set(DEFAULT_TARGET_CONFIGS) | (set(overrides) - {DEFAULT_TARGET})
+    return default_config, {
+        target: apply(DEFAULT_TARGET_CONFIGS.get(target, default_config), target)
+        for target in sorted(targets)
+    }
@@ -0,0 +1,212 @@
+"""
+Shared product catalog client (service_menu metadata cache)
+RESTI POS - Core infrastructure
+
+Riportok, blokk nyomtatás és KDS korábban termékenként hívták a
+service_menu `GET /api/v1/products/{id}` végpontját (N hívás), vagy a
+teljes termék listát töltötték le a nevekért.
+
+Ez a modul egy szolgáltatásonként egy példányos, szálbiztos termék
+metaadat gyorsítótárat ad (id -> name, category_id, category_name,
+is_active), amely:
+- a hiányzó termékeket EGY tömeges hívással tölti
+  (POST /api/v1/internal/products/lookup, 500 ID-nként)
+- a válasz ETag-jében (catalog_version) kapott katalógus verziót tárolja;
+  ha az megváltozik, a teljes gyorsítótár érvénytelenné válik
+- `revalidate_seconds` időközönként a következő kérés az összes kért ID-t
+  újratölti (ugyanabban az egy hívásban ellenőrizve a verziót)
+
+Így egy feloldás legfeljebb egy hívás (500 ID-ig), általában nulla.
+
+Használat:
+    catalog = ProductCatalog(base_url=settings.menu_service_url, revalidate_seconds=60)
+    products = catalog.get_many([1, 2, 3])            # szinkron kódútvonal
+    products = await catalog.aget_many([1, 2, 3])     # aszinkron kódútvonal
+    name = products.get(1, {}).get("name")
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from .client import get_async_client, get_sync_client
+
+# A service_menu lookup végpont egy kérésben legfeljebb ennyi ID-t fogad
+LOOKUP_BATCH_SIZE = 500
+
+ProductInfo = Dict[str, Any]
+
+
+class ProductCatalog:
+    """
+    service_menu termék metaadat gyorsítótár katalógus verzió (ETag) alapú
+    érvénytelenítéssel.
+
+    A service_menu-ben nem létező termékek is tárolásra kerülnek (None),
+    így nem okoznak ismételt hívást a következő érvénytelenítésig.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        revalidate_seconds: int = 60,
+        max_entries: int = 20000,
+        target: str = "menu",
+        timeout: float = 5.0
+    ):
+        """
+        Args:
+            base_url: service_menu alap URL
+            revalidate_seconds: Verzió ellenőrzés időköze másodpercben (0 = minden kérésnél)
+            max_entries: Maximális bejegyzésszám (túllépéskor teljes ürítés)
+            target: core_http cél neve (poolozott kliens)
+            timeout: Kérésenkénti timeout másodpercben
+        """
+        self.lookup_url = f"{base_url}/api/v1/internal/products/lookup"
+        self.revalidate_seconds = revalidate_seconds
+        self.max_entries = max_entries
+        self.target = target
+        self.timeout = timeout
+        self._entries: Dict[int, Optional[ProductInfo]] = {}
+        self._version: Optional[str] = None
+        self._validated_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._fetches = 0
+        self._invalidations = 0
+
+    # ========================================================================
+    # Gyorsítótár
+    # ========================================================================
+
+    def _plan(self, product_ids: Iterable[int]) -> Tuple[Dict[int, ProductInfo], List[int]]:
+        """
+        Kért ID-k szétválasztása: gyorsítótárból kiszolgálható / lekérendő.
+
+        Ha a verzió ellenőrzés esedékes, minden kért ID lekérendő.
+
+        Returns:
+            tuple: (talált product_id -> adat, lekérendő ID-k)
+        """
+        unique_ids = [product_id for product_id in dict.fromkeys(product_ids) if product_id is not None]
+        with self._lock:
+            due = (
+                self._validated_at is None
+                or time.monotonic() - self._validated_at >= self.revalidate_seconds
+            )
+            if due:
+                return {}, unique_ids
+
+            found: Dict[int, ProductInfo] = {}
+            to_fetch: List[int] = []
+            for product_id in unique_ids:
+                if product_id not in self._entries:
+                    to_fetch.append(product_id)
+                    continue
+                info = self._entries[product_id]
+                if info is not None:
+                    found[product_id] = info
+            self._hits += len(unique_ids) - len(to_fetch)
+            return found, to_fetch
+
+    def _store(self, version: Optional[str], requested: List[int], items: List[ProductInfo]) -> Dict[int, ProductInfo]:
+        """
+        Lekért termékek eltárolása; eltérő katalógus verziónál teljes ürítés.
+
+        Returns:
+            Dict[int, ProductInfo]: A lekért (létező) termékek
+        """
+        fetched = {item["id"]: item for item in items}
+        with self._lock:
+            if version != self._version or len(self._entries) + len(requested) > self.max_entries:
+                if self._entries:
+                    self._invalidations += 1
+                self._entries = {}
+                self._version = version
+            for product_id in requested:
+                self._entries[product_id] = fetched.get(product_id)
+            self._validated_at = time.monotonic()
+            self._fetches += 1
+        return fetched
+
+    @staticmethod
+    def _parse(response: httpx.Response) -> Tuple[Optional[str], List[ProductInfo]]:
+        """Lookup válasz -> (katalógus verzió, termékek)."""
+        response.raise_for_status()
+        data = response.json()
+        version = response.headers.get("ETag", "").strip('"') or data.get("catalog_version")
+        return version, data.get("items", [])
+
+    def invalidate(self) -> None:
+        """Teljes gyorsítótár ürítése (a következő kérés mindent újratölt)."""
+        with self._lock:
+            self._entries = {}
+            self._validated_at = None
+            self._invalidations += 1
+
+    # ========================================================================
+    # Feloldás
+    # ========================================================================
+
+    def get_many(self, product_ids: Iterable[int]) -> Dict[int, ProductInfo]:
+        """
+        Termékek metaadatai (szinkron; threadpool-ban futó kódból).
+
+        Args:
+            product_ids: Termék ID-k (duplikátumok megengedettek)
+
+        Returns:
+            Dict[int, ProductInfo]: product_id -> {id, name, category_id, category_name, is_active};
+            a service_menu-ben nem létező termékek kimaradnak
+
+        Raises:
+            httpx.HTTPError: Ha a service_menu nem elérhető vagy hibával válaszol
+        """
+        found, to_fetch = self._plan(product_ids)
+        client = get_sync_client(self.target)
+        for start in range(0, len(to_fetch), LOOKUP_BATCH_SIZE):
+            batch = to_fetch[start:start + LOOKUP_BATCH_SIZE]
+            response = client.post(self.lookup_url, json={"product_ids": batch}, timeout=self.timeout)
+            version, items = self._parse(response)
+            found.update(self._store(version, batch, items))
+        return found
+
+    async def aget_many(self, product_ids: Iterable[int]) -> Dict[int, ProductInfo]:
+        """
+        Termékek metaadatai (aszinkron; event loop-ból).
+
+        Args:
+            product_ids: Termék ID-k (duplikátumok megengedettek)
+
+        Returns:
+            Dict[int, ProductInfo]: Lásd get_many
+
+        Raises:
+            httpx.HTTPError: Ha a service_menu nem elérhető vagy hibával válaszol
+        """
+        found, to_fetch = self._plan(product_ids)
+        client = get_async_client(self.target)
+        for start in range(0, len(to_fetch), LOOKUP_BATCH_SIZE):
+            batch = to_fetch[start:start + LOOKUP_BATCH_SIZE]
+            response = await client.post(self.lookup_url, json={"product_ids": batch}, timeout=self.timeout)
+            version, items = self._parse(response)
+            found.update(self._store(version, batch, items))
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gyorsítótár statisztikák (monitoringhoz).
+
+        Returns:
+            dict: version, entries, hits, fetches, invalidations
+        """
+        with self._lock:
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "fetches": self._fetches,
+                "invalidations": self._invalidations,
+            }
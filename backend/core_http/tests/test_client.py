@@ -0,0 +1,136 @@
+"""
+HTTP Client Registry Tests - Megosztott, poolozott szolgáltatás-közi kliensek
+Core infrastructure
+
+Teszteli a következő funkciókat:
+- Célonkénti beállítások: beépített alapértékek + HTTP_CLIENT_TARGETS felülírás
+- Ismeretlen beállítás mező hibát ad
+- Célonként egy megosztott kliens (szinkron és aszinkron), a célok külön kliensek
+- close_all_clients lezárja a klienseket, utána új kliens jön létre
+- Késleltetés metrikák célonként (kérések, 5xx és transport hibák)
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.core_http.client import HTTPClientRegistry
+from backend.core_http.config import DEFAULT_TARGET_CONFIGS, HTTPClientSettings, TargetConfig, build_target_configs
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/fail":
+        return httpx.Response(503)
+    if request.url.path == "/down":
+        raise httpx.ConnectError("connection refused", request=request)
+    return httpx.Response(200, json={"ok": True})
+
+
+@pytest.fixture
+def mock_transport(monkeypatch):
+    """A registry által létrehozott pool transport helyett httpx.MockTransport (a mérő wrapper marad)."""
+    monkeypatch.setattr(httpx, "HTTPTransport", lambda **kwargs: httpx.MockTransport(_handler))
+    monkeypatch.setattr(httpx, "AsyncHTTPTransport", lambda **kwargs: httpx.MockTransport(_handler))
+
+
+def test_registry_from_settings_applies_target_overrides(monkeypatch):
+    """Test: A HTTP_CLIENT_TARGETS felülírja a beépített értékeket; a "default" a nem felsorolt célokra vonatkozik."""
+    monkeypatch.setenv(
+        "HTTP_CLIENT_TARGETS",
+        '{"ntak": {"timeout": 45}, "orders": {"max_connections": 200}, "default": {"timeout": 3}}'
+    )
+
+    registry = HTTPClientRegistry.from_settings(HTTPClientSettings())
+
+    ntak = registry.config("ntak")
+    assert ntak.timeout == 45.0
+    assert ntak.max_connections == DEFAULT_TARGET_CONFIGS["ntak"].max_connections
+    assert registry.config("orders").max_connections == 200
+    assert isinstance(registry.config("orders").max_connections, int)
+    assert registry.config("menu") == DEFAULT_TARGET_CONFIGS["menu"]
+    assert registry.config("reports") == TargetConfig(timeout=3.0)
+
+
+def test_target_config_applied_to_created_client(mock_transport):
+    """Test: A létrehozott kliens a cél timeout beállításait kapja."""
+    default_config, target_configs = build_target_configs({"menu": {"timeout": 7, "connect_timeout": 1}})
+    registry = HTTPClientRegistry(default_config, target_configs)
+
+    client = registry.get_sync_client("menu")
+
+    assert client.timeout == httpx.Timeout(7.0, connect=1.0)
+    assert registry.get_sync_client("unknown").timeout == TargetConfig().timeouts()
+
+
+def test_unknown_setting_rejected():
+    """Test: Ismeretlen TargetConfig mező ValueError."""
+    with pytest.raises(ValueError, match="Unknown HTTP client setting.*'menu'.*max_conns"):
+        build_target_configs({"menu": {"max_conns": 5}})
+
+
+def test_sync_client_reused_per_target(mock_transport):
+    """Test: Célonként egy megosztott szinkron kliens, a célok külön klienst kapnak."""
+    registry = HTTPClientRegistry()
+
+    orders = registry.get_sync_client("orders")
+
+    assert registry.get_sync_client("orders") is orders
+    assert registry.get_sync_client("menu") is not orders
+
+
+def test_async_client_reused_per_target_and_loop(mock_transport):
+    """Test: Ugyanabban az event loop-ban ugyanaz az aszinkron kliens, új loop-ban új kliens."""
+    registry = HTTPClientRegistry()
+
+    async def scenario():
+        first = registry.get_async_client("orders")
+        assert registry.get_async_client("orders") is first
+        assert registry.get_async_client("inventory") is not first
+        return first
+
+    first_loop_client = asyncio.run(scenario())
+    second_loop_client = asyncio.run(scenario())
+
+    assert second_loop_client is not first_loop_client
+
+
+def test_close_all_clients_closes_and_recreates(mock_transport):
+    """Test: close_all lezárja a szinkron és aszinkron klienseket; a következő kérés új klienst kap."""
+    registry = HTTPClientRegistry()
+    sync_client = registry.get_sync_client("orders")
+
+    async def scenario():
+        async_client = registry.get_async_client("orders")
+        await registry.close_all()
+        assert async_client.is_closed
+        assert registry.get_async_client("orders") is not async_client
+
+    asyncio.run(scenario())
+
+    assert sync_client.is_closed
+    reopened = registry.get_sync_client("orders")
+    assert reopened is not sync_client
+    assert reopened.get("http://orders/health").status_code == 200
+
+
+def test_stats_recorded_per_target(mock_transport):
+    """Test: Kérések és hibák (5xx, transport hiba) célonként számolva."""
+    registry = HTTPClientRegistry()
+    orders = registry.get_sync_client("orders")
+
+    orders.get("http://orders/health")
+    orders.get("http://orders/fail")
+    with pytest.raises(httpx.ConnectError):
+        orders.get("http://orders/down")
+
+    async def scenario():
+        await registry.get_async_client("menu").get("http://menu/health")
+
+    asyncio.run(scenario())
+
+    stats = registry.stats()
+    assert set(stats) == {"orders", "menu"}
+    assert (stats["orders"]["requests"], stats["orders"]["errors"]) == (3, 2)
+    assert (stats["menu"]["requests"], stats["menu"]["errors"]) == (1, 0)
+    assert stats["orders"]["max_ms"] >= stats["orders"]["avg_ms"] >= 0.0
@@ -63,6 +63,70 @@ class Settings(BaseSettings):
         le=86400
     )
 
+    # Batched NTAK submission (ntak_submissions queue + NtakBatchWorker)
+    ntak_batch_window_seconds: float = Field(
+        default=5.0,
+        description="Submission window in seconds; orders queued within one window are sent in one NTAK request",
+        ge=0.5,
+        le=300.0
+    )
+    ntak_batch_size: int = Field(
+        default=50,
+        description="Maximum number of order summaries per NTAK submission",
+        ge=1,
+        le=500
+    )
+    ntak_max_attempts: int = Field(
+        default=10,
+        description="Submission attempts before a queued order is marked FAILED",
+        ge=1,
+        le=100
+    )
+    ntak_backoff_base_seconds: float = Field(
+        default=5.0,
+        description="Base delay of the exponential NTAK retry backoff in seconds",
+        ge=0.1,
+        le=3600.0
+    )
+    ntak_backoff_max_seconds: float = Field(
+        default=600.0,
+        description="Maximum NTAK retry backoff delay in seconds",
+        ge=1.0,
+        le=86400.0
+    )
+    ntak_lease_seconds: int = Field(
+        default=120,
+        description="Claim lease; an unfinished NTAK submission is retried after this many seconds",
+        ge=5,
+        le=3600
+    )
+    ntak_request_timeout_seconds: float = Field(
+        default=30.0,
+        description="HTTP timeout of an NTAK batch submission in seconds",
+        ge=1.0,
+        le=300.0
+    )
+
+    # Audit log writer (Module 8 - Performance)
+    audit_flush_batch_size: int = Field(
+        default=100,
+        description="Buffered audit events are flushed once this many are pending",
+        ge=1,
+        le=5000
+    )
+    audit_flush_interval_ms: int = Field(
+        default=250,
+        description="Maximum time a buffered audit event waits before it is flushed (milliseconds)",
+        ge=10,
+        le=60000
+    )
+    audit_buffer_max_events: int = Field(
+        default=10000,
+        description="Upper bound of the in-memory audit buffer while the database is unavailable",
+        ge=100,
+        le=1000000
+    )
+
     # Inter-Service Communication URLs
     orders_service_url: str = Field(
         default="http://localhost:8002",
@@ -74,6 +138,13 @@ class Settings(BaseSettings):
         description="URL of the Menu Service for product information"
     )
 
+    product_catalog_revalidate_seconds: int = Field(
+        default=60,
+        description="Catalog version (ETag) revalidation interval of the local product metadata cache in seconds (0 = every request)",
+        ge=0,
+        le=86400
+    )
+
     inventory_service_url: str = Field(
         default="http://localhost:8003",
         description="URL of the Inventory Service for stock data"
@@ -119,6 +190,26 @@ class Settings(BaseSettings):
         le=1440
     )
 
+    # Permission cache (Module 6 - RBAC performance)
+    permission_cache_ttl_seconds: int = Field(
+        default=60,
+        description="TTL of the in-process resolved permission cache in seconds (0 = disabled)",
+        ge=0,
+        le=3600
+    )
+
+    auth_stateless_tokens: bool = Field(
+        default=False,
+        description="Authorize require_permission from signed token claims when the token's permission epoch is current"
+    )
+
+    permission_epoch_ttl_seconds: float = Field(
+        default=5.0,
+        description="How long a service may reuse the last read permission epoch (seconds)",
+        ge=0,
+        le=300
+    )
+
     # PIN Code Configuration (Module 6 - RBAC)
     pin_code_min_length: int = Field(
         default=4,
@@ -134,6 +225,20 @@ class Settings(BaseSettings):
         le=8
     )
 
+    # Venue Configuration
+    venue_timezone: str = Field(
+        default="Europe/Budapest",
+        description="IANA timezone of the venue; business days in reports are cut at local midnight"
+    )
+
+    # Export Configuration
+    export_batch_size: int = Field(
+        default=1000,
+        description="Rows fetched per server-side cursor batch and encoded per chunk in streaming exports",
+        ge=100,
+        le=50000
+    )
+
     # Logging Configuration
     log_level: str = Field(
         default="INFO",
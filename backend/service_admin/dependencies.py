@@ -5,7 +5,7 @@ Modul 6 - FastAPI Függőségek (Middleware Alap)
 Ez a modul tartalmazza az összes kritikus FastAPI dependency-t:
 - JWT token kezelés (create, decode)
 - Felhasználó autentikáció (get_current_user)
-- RBAC jogosultság-ellenőrzés (require_permission)
+- RBAC jogosultság-ellenőrzés (require_permission, permission_cache-elt principal)
 - Service dependency factories
 
 Használat:
@@ -16,7 +16,7 @@ Használat:
 
 import os
 from datetime import datetime, timedelta
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -28,6 +28,11 @@ from backend.service_admin.models.database import get_db
 from backend.service_admin.models.employee import Employee
 from backend.service_admin.models.role import Role
 from backend.service_admin.models.permission import Permission
+from backend.service_admin.permission_cache import (
+    permission_cache,
+    permission_epoch_tracker,
+    CachedPrincipal
+)
 
 
 # ============================================================================
@@ -145,33 +150,18 @@ def decode_access_token(token: str) -> dict:
 # Authentication Dependencies
 # ============================================================================
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> Employee:
+def _decode_credentials(credentials: HTTPAuthorizationCredentials) -> Tuple[int, dict]:
     """
-    JWT token alapján lekéri a jelenlegi felhasználót.
-
-    Ez a függőség minden védett endpoint-nál használható a felhasználó
-    azonosításához és autentikációjához.
+    Bearer token dekódolása és az Employee ID kinyerése.
 
     Args:
         credentials: HTTP Bearer token (Authorization header)
-        db: Database session (dependency injection)
 
     Returns:
-        Employee: Autentikált Employee objektum (roles és permissions betöltve)
+        Tuple[int, dict]: Employee ID (sub claim) és a teljes token payload
 
     Raises:
-        HTTPException 401: Ha a token érvénytelen, lejárt, vagy a felhasználó nem található
-        HTTPException 403: Ha a felhasználó inaktív
-
-    Example:
-        @app.get("/protected")
-        async def protected_route(
-            current_user: Employee = Depends(get_current_user)
-        ):
-            return {"user": current_user.username}
+        HTTPException 401: Ha a token érvénytelen vagy hiányzik a sub claim
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -191,24 +181,77 @@ async def get_current_user(
 
         # Convert to int (sub field is a string in JWT standard)
         try:
-            employee_id = int(employee_id_str)
+            return int(employee_id_str), payload
         except (ValueError, TypeError):
             raise credentials_exception
 
     except JWTError:
         raise credentials_exception
 
-    # Employee lekérése az adatbázisból (roles és permissions eager loading)
+
+def _load_employee(db: Session, employee_id: int) -> Optional[Employee]:
+    """
+    Employee betöltése roles és permissions eager loading-gal.
+
+    Args:
+        db: Database session
+        employee_id: Employee ID
+
+    Returns:
+        Optional[Employee]: Employee vagy None ha nem található
+    """
     # Használjunk explicit joinedload-ot a roles és permissions betöltésére
-    employee = db.query(Employee)\
+    return db.query(Employee)\
         .options(
             joinedload(Employee.roles).joinedload(Role.permissions)
         )\
         .filter(Employee.id == employee_id)\
         .first()
 
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Employee:
+    """
+    JWT token alapján lekéri a jelenlegi felhasználót.
+
+    Ez a függőség minden védett endpoint-nál használható a felhasználó
+    azonosításához és autentikációjához. A betöltött jogosultságokkal
+    frissíti a permission_cache-t is.
+
+    Args:
+        credentials: HTTP Bearer token (Authorization header)
+        db: Database session (dependency injection)
+
+    Returns:
+        Employee: Autentikált Employee objektum (roles és permissions betöltve)
+
+    Raises:
+        HTTPException 401: Ha a token érvénytelen, lejárt, vagy a felhasználó nem található
+        HTTPException 403: Ha a felhasználó inaktív
+
+    Example:
+        @app.get("/protected")
+        async def protected_route(
+            current_user: Employee = Depends(get_current_user)
+        ):
+            return {"user": current_user.username}
+    """
+    employee_id, _ = _decode_credentials(credentials)
+
+    # Employee lekérése az adatbázisból (roles és permissions eager loading)
+    version = permission_cache.version
+    employee = _load_employee(db, employee_id)
+
     if employee is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    permission_cache.put(employee, version)
 
     # Inaktív felhasználó ellenőrzése
     if not employee.is_active:
@@ -220,6 +263,102 @@ async def get_current_user(
     return employee
 
 
+def _principal_from_token(
+    employee_id: int,
+    payload: dict,
+    current_epoch: int
+) -> Optional[CachedPrincipal]:
+    """
+    Principal a token claim-jeiből, ha azok még érvényesek.
+
+    Args:
+        employee_id: Employee ID (sub claim)
+        payload: Aláírás-ellenőrzött token payload
+        current_epoch: Aktuális jogosultság epoch
+
+    Returns:
+        Optional[CachedPrincipal]: Principal, vagy None ha a token nem tartalmaz
+        jogosultság claim-eket vagy az epoch elavult (DB fallback szükséges)
+    """
+    token_epoch = payload.get("perm_epoch")
+    if token_epoch is None or "permissions" not in payload:
+        return None
+
+    try:
+        is_current = int(token_epoch) == current_epoch
+    except (ValueError, TypeError):
+        return None
+
+    permission_epoch_tracker.record_token_check(is_current)
+    if not is_current:
+        return None
+
+    return CachedPrincipal.from_token_claims(employee_id, payload)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> CachedPrincipal:
+    """
+    JWT token alapján feloldja a jelenlegi felhasználó jogosultságait.
+
+    A require_permission család ezt használja:
+    1. Stateless mód (settings.auth_stateless_tokens): ha a token perm_epoch
+       claim-je megegyezik az aktuális epoch-kal, a token permissions claim-je
+       alapján autorizál, adatbázis lekérdezés nélkül
+    2. Cache hit esetén nincs adatbázis lekérdezés
+    3. Miss esetén egyszer betölti az Employee-t (roles + permissions)
+       és eltárolja a feloldott frozenset-et
+
+    Stateless módban az epoch ellenőrzés (permission_epoch_tracker) egyben
+    a más szolgáltatásokban végzett RBAC módosításokat is érvényre juttatja
+    a helyi cache-ben; kikapcsolt módban nem fut epoch lekérdezés, a cache
+    a TTL és a helyi érvénytelenítés alapján frissül.
+
+    Args:
+        credentials: HTTP Bearer token (Authorization header)
+        db: Database session (dependency injection)
+
+    Returns:
+        CachedPrincipal: Feloldott, immutábilis principal
+
+    Raises:
+        HTTPException 401: Ha a token érvénytelen, lejárt, vagy a felhasználó nem található
+        HTTPException 403: Ha a felhasználó inaktív
+    """
+    employee_id, payload = _decode_credentials(credentials)
+
+    if settings.auth_stateless_tokens:
+        epoch = permission_epoch_tracker.current(db)
+        principal = _principal_from_token(employee_id, payload, epoch)
+        if principal is not None:
+            return principal
+
+    principal = permission_cache.get(employee_id)
+    if principal is None:
+        version = permission_cache.version
+        employee = _load_employee(db, employee_id)
+
+        if employee is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        principal = permission_cache.put(employee, version)
+
+    # Inaktív felhasználó ellenőrzése
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user account"
+        )
+
+    return principal
+
+
 async def get_current_active_user(
     current_user: Employee = Depends(get_current_user)
 ) -> Employee:
@@ -280,21 +419,21 @@ def require_permission(permission_name: str) -> Callable:
             - "admin:all" - Teljes admin hozzáférés
     """
     async def permission_checker(
-        current_user: Employee = Depends(get_current_user)
-    ) -> Employee:
+        current_user: CachedPrincipal = Depends(get_current_principal)
+    ) -> CachedPrincipal:
         """
         Ellenőrzi, hogy a felhasználónak van-e adott jogosultsága.
 
         Args:
-            current_user: Autentikált Employee (get_current_user dependency)
+            current_user: Feloldott principal (get_current_principal dependency)
 
         Returns:
-            Employee: Autentikált és jogosult Employee objektum
+            CachedPrincipal: Autentikált és jogosult principal
 
         Raises:
             HTTPException 403: Ha nincs jogosultsága
         """
-        # Jogosultság ellenőrzése az Employee.has_permission() metódussal
+        # Jogosultság ellenőrzése (frozenset tagság, cache-elt principal)
         if not current_user.has_permission(permission_name):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -331,8 +470,8 @@ def require_any_permission(*permission_names: str) -> Callable:
             ...
     """
     async def permission_checker(
-        current_user: Employee = Depends(get_current_user)
-    ) -> Employee:
+        current_user: CachedPrincipal = Depends(get_current_principal)
+    ) -> CachedPrincipal:
         """Ellenőrzi, hogy a felhasználónak van-e bármelyik jogosultsága."""
         has_any = any(
             current_user.has_permission(perm)
@@ -375,8 +514,8 @@ def require_all_permissions(*permission_names: str) -> Callable:
             ...
     """
     async def permission_checker(
-        current_user: Employee = Depends(get_current_user)
-    ) -> Employee:
+        current_user: CachedPrincipal = Depends(get_current_principal)
+    ) -> CachedPrincipal:
         """Ellenőrzi, hogy a felhasználónak van-e minden jogosultsága."""
         missing_permissions = [
             perm for perm in permission_names
@@ -11,12 +11,15 @@ This module initializes the FastAPI application and configures:
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-import httpx
 import logging
 
+from backend.core_http import close_all_clients, http_client_stats
 from backend.service_admin.config import settings
 from backend.service_admin import __version__, __service_name__
 from backend.service_admin.models.database import init_db
+from backend.service_admin.permission_cache import permission_cache, permission_epoch_tracker
+from backend.service_admin.services.audit_writer import audit_log_writer
+from backend.service_admin.services.ntak_queue import ntak_batch_worker
 
 # Configure logging
 logging.basicConfig(
@@ -33,11 +36,15 @@ async def lifespan(app: FastAPI):
     Manages the application lifespan events.
 
     Startup:
-    - Initialize HTTP client for inter-service communication
     - Log service configuration
+    - Initialize database tables
+    - Start the buffered audit log writer
+    - Start the batched NTAK submission worker
 
     Shutdown:
-    - Close HTTP client connections
+    - Stop the NTAK submission worker
+    - Stop the audit log writer (flushes buffered events)
+    - Close shared (pooled) HTTP client connections
     """
     # Startup
     logger.info(f"Starting {__service_name__} v{__version__}")
@@ -48,14 +55,21 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing database tables...")
     init_db()
 
-    # Create HTTP client for inter-service communication
-    app.state.http_client = httpx.AsyncClient(timeout=30.0)
+    # Inter-service HTTP: backend.core_http megosztott, poolozott kliensei (lustán jönnek létre)
+
+    # Pufferelt audit naplózás (kötegelt INSERT)
+    await audit_log_writer.start()
+
+    # Kötegelt NTAK beküldés (ntak_submissions sor)
+    await ntak_batch_worker.start()
 
     yield
 
     # Shutdown
     logger.info(f"Shutting down {__service_name__}")
-    await app.state.http_client.aclose()
+    await ntak_batch_worker.stop()
+    await audit_log_writer.stop()
+    await close_all_clients()
 
 
 # Initialize FastAPI application
@@ -94,7 +108,10 @@ async def health_check():
         "status": "healthy",
         "service": __service_name__,
         "version": __version__,
-        "ntak_enabled": settings.ntak_enabled
+        "ntak_enabled": settings.ntak_enabled,
+        "ntak_worker": ntak_batch_worker.stats(),
+        "audit_writer": audit_log_writer.stats(),
+        "http_clients": http_client_stats()
     }
 
 
@@ -138,13 +155,17 @@ async def service_status():
             "enabled": settings.ntak_enabled,
             "api_url": settings.ntak_api_url,
             "restaurant_id": settings.ntak_restaurant_id,
-            "report_interval": settings.ntak_report_interval
+            "report_interval": settings.ntak_report_interval,
+            "batch_window_seconds": settings.ntak_batch_window_seconds,
+            "batch_size": settings.ntak_batch_size
         },
         "connected_services": {
             "orders_service": settings.orders_service_url,
             "menu_service": settings.menu_service_url,
             "inventory_service": settings.inventory_service_url
-        }
+        },
+        "permission_cache": permission_cache.stats(),
+        "permission_epoch": permission_epoch_tracker.stats()
     }
 
     return status
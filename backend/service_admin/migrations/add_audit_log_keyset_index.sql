@@ -0,0 +1,10 @@
+-- Migration: Keyset pagination index for audit log listing
+-- GET /internal/audit-logs follows next_cursor: (created_at, id) < (:c, :i) ORDER BY created_at DESC, id DESC
+-- Date: 2026-10-16
+--
+-- CONCURRENTLY: no write lock on busy tables; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ntak_audit_logs_created_at_id
+    ON ntak_audit_logs (created_at, id);
+
+ANALYZE ntak_audit_logs;
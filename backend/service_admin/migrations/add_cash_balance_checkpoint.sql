@@ -0,0 +1,21 @@
+-- Migration: Running cash balance checkpoint
+-- FinanceService.get_current_cash_balance no longer sums every open cash movement;
+-- it reads the checkpoint plus the movements recorded after it.
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS cash_balance_checkpoints (
+    id INTEGER PRIMARY KEY,
+    balance DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    last_movement_id INTEGER NOT NULL DEFAULT 0,
+    daily_closure_id INTEGER REFERENCES daily_closures(id) ON DELETE SET NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Initial checkpoint from the current open (not yet closed) movements
+INSERT INTO cash_balance_checkpoints (id, balance, last_movement_id)
+SELECT
+    1,
+    COALESCE(SUM(amount) FILTER (WHERE daily_closure_id IS NULL), 0),
+    COALESCE(MAX(id), 0)
+FROM cash_movements
+ON CONFLICT (id) DO NOTHING;
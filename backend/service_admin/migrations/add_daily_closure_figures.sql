@@ -0,0 +1,21 @@
+-- Migration: Daily closure figures
+-- Voucher / transfer totals, order count and VAT split on daily_closures
+-- (total_cash, total_card, total_szep_card, total_revenue come from
+-- add_daily_closure_revenue_fields.py and are repeated here idempotently).
+-- The figures are read from service_orders' daily_closure_figures table.
+-- Date: 2026-10-16
+
+ALTER TABLE daily_closures
+ADD COLUMN IF NOT EXISTS total_cash DECIMAL(10, 2) DEFAULT 0.00,
+ADD COLUMN IF NOT EXISTS total_card DECIMAL(10, 2) DEFAULT 0.00,
+ADD COLUMN IF NOT EXISTS total_szep_card DECIMAL(10, 2) DEFAULT 0.00,
+ADD COLUMN IF NOT EXISTS total_voucher DECIMAL(10, 2) DEFAULT 0.00,
+ADD COLUMN IF NOT EXISTS total_transfer DECIMAL(10, 2) DEFAULT 0.00,
+ADD COLUMN IF NOT EXISTS total_revenue DECIMAL(10, 2) DEFAULT 0.00,
+ADD COLUMN IF NOT EXISTS order_count INTEGER DEFAULT 0,
+ADD COLUMN IF NOT EXISTS vat_breakdown JSONB;
+
+COMMENT ON COLUMN daily_closures.total_voucher IS 'Utalványos fizetések összege';
+COMMENT ON COLUMN daily_closures.total_transfer IS 'Átutalásos fizetések összege';
+COMMENT ON COLUMN daily_closures.order_count IS 'Lezárt rendelések száma';
+COMMENT ON COLUMN daily_closures.vat_breakdown IS 'ÁFA kulcs szerinti bontás';
@@ -0,0 +1,22 @@
+-- Migration: NTAK submission queue
+-- Closed orders reported by service_orders are queued here and submitted to
+-- NTAK in batches by the admin service's background worker (retry with backoff).
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS ntak_submissions (
+    id SERIAL PRIMARY KEY,
+    order_id INTEGER NOT NULL UNIQUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'PENDING',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    transaction_id VARCHAR(100),
+    batch_id VARCHAR(64),
+    last_error TEXT,
+    enqueued_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    sent_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_ntak_submissions_status_next_attempt
+    ON ntak_submissions (status, next_attempt_at);
+
+COMMENT ON TABLE ntak_submissions IS 'NTAK beküldési sor (rendelésenként egy, kötegelt beküldés)';
@@ -0,0 +1,17 @@
+-- Migration: Permission epoch (stateless token authorization)
+-- Single-row RBAC version counter bumped by every role / permission / employee
+-- role change; tokens carry the epoch they were issued at (perm_epoch claim).
+-- The row id=1 is seeded here so bumps are plain upserts on an existing row.
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS permission_epochs (
+    id INTEGER PRIMARY KEY,
+    epoch BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO permission_epochs (id, epoch)
+VALUES (1, 0)
+ON CONFLICT (id) DO NOTHING;
+
+COMMENT ON TABLE permission_epochs IS 'RBAC jogosultság epoch (egysoros verziószámláló)';
@@ -11,6 +11,8 @@ Importálás:
         Employee,
         Role,
         Permission,
+        PermissionEpoch,
+        NtakSubmission,
         CashMovement,
         DailyClosure,
         AssetGroup,
@@ -30,11 +32,14 @@ from backend.service_admin.models.audit_log import AuditLog
 from backend.service_admin.models.employee import Employee, employee_roles
 from backend.service_admin.models.role import Role, role_permissions
 from backend.service_admin.models.permission import Permission
+from backend.service_admin.models.permission_epoch import PermissionEpoch
+from backend.service_admin.models.ntak_submission import NtakSubmission, NtakSubmissionStatus
 
 # V3.0: Finance models
 from backend.service_admin.models.finance import (
     CashMovement,
     CashMovementType,
+    CashBalanceCheckpoint,
     DailyClosure,
     ClosureStatus
 )
@@ -67,11 +72,15 @@ __all__ = [
     'Employee',
     'Role',
     'Permission',
+    'PermissionEpoch',
+    'NtakSubmission',
+    'NtakSubmissionStatus',
     'employee_roles',
     'role_permissions',
     # Finance (V3.0)
     'CashMovement',
     'CashMovementType',
+    'CashBalanceCheckpoint',
     'DailyClosure',
     'ClosureStatus',
     # Assets (V3.0)
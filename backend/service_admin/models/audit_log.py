@@ -75,3 +75,5 @@ class AuditLog(Base):
 Index('idx_audit_event_entity', AuditLog.event_type, AuditLog.entity_type)
 Index('idx_audit_user_created', AuditLog.user_id, AuditLog.created_at.desc())
 Index('idx_audit_status_created', AuditLog.status, AuditLog.created_at.desc())
+# Keyset lapozás: ORDER BY created_at DESC, id DESC
+Index('ix_ntak_audit_logs_created_at_id', AuditLog.created_at, AuditLog.id)
@@ -131,6 +131,20 @@ class DailyClosure(Base):
     # Formátum: {"KESZPENZ": 10000.00, "KARTYA": 5000.00, "SZEP_KARTYA": 2000.00}
     payment_summary = Column(JSONB, nullable=True)
 
+    # Bevételek a nap lezárt rendeléseiből (add_daily_closure_revenue_fields,
+    # add_daily_closure_figures migrációk)
+    total_cash = Column(DECIMAL(10, 2), nullable=True, default=0.00)
+    total_card = Column(DECIMAL(10, 2), nullable=True, default=0.00)
+    total_szep_card = Column(DECIMAL(10, 2), nullable=True, default=0.00)
+    total_voucher = Column(DECIMAL(10, 2), nullable=True, default=0.00)
+    total_transfer = Column(DECIMAL(10, 2), nullable=True, default=0.00)
+    total_revenue = Column(DECIMAL(10, 2), nullable=True, default=0.00)
+    order_count = Column(Integer, nullable=True, default=0)
+
+    # ÁFA kulcs szerinti bontás
+    # Formátum: {"27.00": {"order_count": 3, "gross": 12700.0, "net": 10000.0, "vat": 2700.0}}
+    vat_breakdown = Column(JSONB, nullable=True)
+
     # Megjegyzések/indoklás
     notes = Column(Text, nullable=True)
 
@@ -168,6 +182,49 @@ class DailyClosure(Base):
         )
 
 
+CASH_BALANCE_CHECKPOINT_ID = 1
+
+
+class CashBalanceCheckpoint(Base):
+    """
+    Készpénz egyenleg checkpoint (egyetlen sor, id = 1).
+
+    A balance a még zárásra nem rendelt pénzmozgások összege
+    last_movement_id-ig (inkluzív). Az aktuális egyenleg:
+
+        balance + SUM(amount) WHERE id > last_movement_id AND daily_closure_id IS NULL
+
+    A FinanceService minden pénzmozgás rögzítésekor ugyanabban a
+    tranzakcióban lépteti (a sor zárolásával), napi záráskor nullázza,
+    így a lekérdezés a checkpoint óta rögzített mozgások számával arányos.
+    """
+    __tablename__ = 'cash_balance_checkpoints'
+
+    id = Column(Integer, primary_key=True, default=CASH_BALANCE_CHECKPOINT_ID)
+
+    # Nyitott (zárásra nem rendelt) pénzmozgások összege last_movement_id-ig
+    balance = Column(DECIMAL(12, 2), nullable=False, default=0)
+
+    # Az utolsó beszámított pénzmozgás ID-ja
+    last_movement_id = Column(Integer, nullable=False, default=0)
+
+    # Az utolsó napi zárás, amely a checkpointot nullázta
+    daily_closure_id = Column(Integer, ForeignKey('daily_closures.id', ondelete='SET NULL'), nullable=True)
+
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return (
+            f"<CashBalanceCheckpoint(balance={self.balance}, "
+            f"last_movement_id={self.last_movement_id})>"
+        )
+
+
 # Indexek a gyakori lekérdezésekhez
 Index('idx_cash_movement_type_date', CashMovement.movement_type, CashMovement.created_at.desc())
 Index('idx_cash_movement_employee_date', CashMovement.employee_id, CashMovement.created_at.desc())
@@ -0,0 +1,63 @@
+"""
+NtakSubmission Model - SQLAlchemy ORM
+Module 8: Adminisztráció és NTAK - Kötegelt NTAK adatszolgáltatás
+
+NTAK beküldési sor: az Orders Service (outbox) által jelentett lezárt
+rendelések itt várnak a kötegelt (batch) beküldésre. Rendelésenként egy
+sor; a háttérben futó NtakBatchWorker a due sorokat beküldési ablakonként
+egy kérésben küldi el, hiba esetén exponenciális backoff-fal újrapróbál.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Index
+from sqlalchemy.sql import func
+
+from backend.service_admin.models.database import Base
+
+
+class NtakSubmissionStatus:
+    """NTAK beküldési státuszok."""
+    PENDING = "PENDING"   # Beküldésre vár (vagy újrapróbálásra)
+    SENT = "SENT"         # NTAK elfogadta
+    FAILED = "FAILED"     # Végleg sikertelen (max próbálkozás / elutasított adat)
+
+
+class NtakSubmission(Base):
+    """
+    NTAK beküldési sor elem (rendelésenként egy).
+    """
+    __tablename__ = 'ntak_submissions'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Reference to service_orders.orders.id (egyedi: ismételt jelentés nem duplikál)
+    order_id = Column(Integer, nullable=False, unique=True)
+
+    # Státusz: PENDING, SENT, FAILED
+    status = Column(String(20), nullable=False, default=NtakSubmissionStatus.PENDING)
+
+    # Próbálkozások száma
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # Legkorábbi következő próbálkozás (backoff / lease)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+    # Utolsó sikeres beküldés adatai
+    transaction_id = Column(String(100), nullable=True)
+    batch_id = Column(String(64), nullable=True)
+
+    # Utolsó hibaüzenet
+    last_error = Column(Text, nullable=True)
+
+    enqueued_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    sent_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # A worker lekérdezése: status = PENDING AND next_attempt_at <= now
+        Index('ix_ntak_submissions_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<NtakSubmission(id={self.id}, order_id={self.order_id}, "
+            f"status='{self.status}', attempts={self.attempts})>"
+        )
@@ -0,0 +1,42 @@
+"""
+PermissionEpoch Model - SQLAlchemy ORM
+Module 6: RBAC (Role-Based Access Control) - Stateless Token Authorization
+
+Globális "jogosultság epoch" számláló (egysoros tábla).
+Minden RBAC módosítás (szerepkör, jogosultság, munkatárs-szerepkör hozzárendelés)
+ugyanabban a tranzakcióban lépteti. A JWT token a kiállításkori epoch-ot
+tartalmazza (perm_epoch claim); ha eltér az aktuálistól, a token jogosultság
+claim-jei elavultak és az adatbázis alapú ellenőrzés fut.
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, TIMESTAMP
+from sqlalchemy.sql import func
+
+from backend.service_admin.models.database import Base
+
+
+# Az egyetlen epoch sor azonosítója
+PERMISSION_EPOCH_ROW_ID = 1
+
+
+class PermissionEpoch(Base):
+    """
+    PermissionEpoch modell - egysoros RBAC verziószámláló.
+    """
+    __tablename__ = 'permission_epochs'
+
+    id = Column(Integer, primary_key=True)
+
+    # Monoton növekvő epoch érték
+    epoch = Column(BigInteger, nullable=False, default=0)
+
+    # Utolsó léptetés időpontja
+    updated_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<PermissionEpoch(id={self.id}, epoch={self.epoch})>"
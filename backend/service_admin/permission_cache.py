@@ -0,0 +1,405 @@
+"""
+Permission Cache - Module 6: RBAC (Performance)
+Modul 6 - Folyamaton belüli jogosultság-gyorsítótár
+
+A require_permission dependency minden védett végponton lefut (KDS, POS,
+készlet, menü). Ez a modul employee_id -> feloldott jogosultság-halmaz
+(frozenset) gyorsítótárat biztosít, így a forró úton nincs JOIN az
+employees/roles/permissions táblákra.
+
+Érvénytelenítés:
+- TTL: minden bejegyzés legfeljebb `permission_cache_ttl_seconds` ideig él
+  (ez korlátozza a más folyamatokban végzett módosítások késését is)
+- Verzió: a RoleService / PermissionService / EmployeeService módosító
+  műveletei a commit után verziót léptetnek (teljes ürítés vagy egy
+  munkatárs); a betöltés előtt kiolvasott verziónál régebbi
+  érvénytelenítés után befejeződő betöltés nem kerül a cache-be
+
+Stateless mód (auth_stateless_tokens):
+- A token `permissions` + `perm_epoch` claim-jei alapján autorizálunk
+- A `permission_epochs` egysoros tábla értékét a permission_epoch_tracker
+  rövid ideig (permission_epoch_ttl_seconds) cache-eli; ha a token epoch-ja
+  elavult, a DB alapú út fut le
+- Epoch változáskor a helyi permission_cache is ürül, így a többi
+  szolgáltatás (orders, inventory, menu) is gyorsan értesül a módosításról
+
+Használat:
+    from backend.service_admin.permission_cache import permission_cache
+
+    principal = permission_cache.get(employee_id)
+    if principal is None:
+        version = permission_cache.version
+        employee = ...  # DB lekérés roles + permissions betöltéssel
+        principal = permission_cache.put(employee, version)
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from backend.service_admin.config import settings
+from backend.service_admin.models.permission_epoch import (
+    PermissionEpoch,
+    PERMISSION_EPOCH_ROW_ID
+)
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    """
+    Feloldott felhasználó (principal) a jogosultság-ellenőrzéshez.
+
+    Csak az autorizációhoz szükséges, DB-session-től független adatokat
+    tartalmazza, így biztonságosan megosztható kérések között.
+    """
+
+    id: int
+    username: str
+    name: str
+    is_active: bool
+    roles: Tuple[str, ...]
+    permissions: FrozenSet[str]
+
+    def has_permission(self, permission_name: str) -> bool:
+        """
+        O(1) jogosultság-ellenőrzés (frozenset tagság).
+
+        Args:
+            permission_name: A jogosultság neve (pl. 'orders:manage')
+
+        Returns:
+            bool: True ha van jogosultsága, False ha nincs
+        """
+        return permission_name in self.permissions
+
+    @classmethod
+    def from_employee(cls, employee) -> "CachedPrincipal":
+        """
+        CachedPrincipal létrehozása betöltött Employee objektumból.
+
+        Args:
+            employee: Employee (roles és permissions betöltve)
+
+        Returns:
+            CachedPrincipal: Immutábilis principal
+        """
+        return cls(
+            id=employee.id,
+            username=employee.username,
+            name=employee.name,
+            is_active=bool(employee.is_active),
+            roles=tuple(role.name for role in employee.roles),
+            permissions=frozenset(perm.name for perm in employee.permissions),
+        )
+
+    @classmethod
+    def from_token_claims(cls, employee_id: int, payload: Dict[str, Any]) -> "CachedPrincipal":
+        """
+        CachedPrincipal létrehozása ellenőrzött JWT claim-ekből (stateless mód).
+
+        Csak aktív munkatárs kaphat tokent, a deaktiválás pedig epoch-ot léptet,
+        ezért friss epoch mellett az is_active=True feltételezés biztonságos.
+
+        Args:
+            employee_id: Employee ID (sub claim)
+            payload: Dekódolt, aláírás-ellenőrzött token payload
+
+        Returns:
+            CachedPrincipal: Token alapú principal
+        """
+        return cls(
+            id=employee_id,
+            username=payload.get("username", ""),
+            name=payload.get("name", ""),
+            is_active=True,
+            roles=tuple(payload.get("roles") or ()),
+            permissions=frozenset(payload.get("permissions") or ()),
+        )
+
+
+class PermissionCache:
+    """
+    Szálbiztos, TTL + verzió alapú gyorsítótár feloldott jogosultságokhoz.
+
+    A gyorsítótár folyamatonként (worker-enként) létezik; minden szolgáltatás,
+    amely a service_admin.dependencies modult használja, saját példányt kap.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        """
+        Args:
+            ttl_seconds: Bejegyzések élettartama másodpercben (0 = kikapcsolva)
+            max_entries: Maximális bejegyzésszám (túllépéskor teljes ürítés)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[CachedPrincipal, float, int]] = {}
+        self._lock = threading.Lock()
+        # Minden érvénytelenítés lépteti; put() ehhez méri a betöltés kezdetét
+        self._version = 0
+        # Az utolsó teljes / munkatársankénti érvénytelenítés verziója
+        self._all_version = 0
+        self._employee_versions: Dict[int, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """True, ha a gyorsítótár aktív (ttl_seconds > 0)."""
+        return self.ttl_seconds > 0
+
+    @property
+    def version(self) -> int:
+        """Aktuális gyorsítótár-verzió (put() előtt érdemes lekérni)."""
+        return self._version
+
+    def get(self, employee_id: int) -> Optional[CachedPrincipal]:
+        """
+        Principal lekérése a gyorsítótárból.
+
+        Args:
+            employee_id: Munkatárs azonosítója
+
+        Returns:
+            Optional[CachedPrincipal]: Principal vagy None (miss / lejárt)
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry is not None:
+                principal, expires_at, version = entry
+                if expires_at > now and version >= self._all_version:
+                    self._hits += 1
+                    return principal
+                del self._entries[employee_id]
+            self._misses += 1
+            return None
+
+    def put(self, employee, version: Optional[int] = None) -> CachedPrincipal:
+        """
+        Employee feloldása és eltárolása.
+
+        Ha a `version` meg van adva és a betöltés közben a teljes cache
+        vagy ennek a munkatársnak a bejegyzése érvénytelenítésre került,
+        a principal visszaadásra kerül, de nem kerül tárolásra (így nem
+        kerülhet elavult adat a gyorsítótárba).
+
+        Args:
+            employee: Employee (roles és permissions betöltve)
+            version: A DB lekérés előtt kiolvasott verzió (opcionális)
+
+        Returns:
+            CachedPrincipal: A feloldott principal
+        """
+        principal = CachedPrincipal.from_employee(employee)
+        if not self.enabled:
+            return principal
+
+        with self._lock:
+            invalidated_at = max(self._all_version, self._employee_versions.get(principal.id, 0))
+            if version is not None and version < invalidated_at:
+                return principal
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[principal.id] = (
+                principal,
+                time.monotonic() + self.ttl_seconds,
+                self._version,
+            )
+        return principal
+
+    def invalidate_employee(self, employee_id: int) -> None:
+        """
+        Egy munkatárs bejegyzésének törlése (pl. szerepkör-hozzárendelés után).
+
+        A verzió lépik, így a munkatárs már folyamatban lévő (régi szerepköröket
+        olvasó) betöltése nem kerül vissza a cache-be; a többi bejegyzés marad.
+
+        Args:
+            employee_id: Munkatárs azonosítója
+        """
+        with self._lock:
+            self._version += 1
+            self._employee_versions[employee_id] = self._version
+            self._entries.pop(employee_id, None)
+            self._invalidations += 1
+
+    def invalidate_all(self) -> None:
+        """
+        Teljes érvénytelenítés verzióléptetéssel (szerepkör/jogosultság módosítás).
+        """
+        with self._lock:
+            self._version += 1
+            self._all_version = self._version
+            self._employee_versions.clear()
+            self._entries.clear()
+            self._invalidations += 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Gyorsítótár statisztikák (monitoringhoz).
+
+        Returns:
+            dict: hits, misses, hit_ratio, size, version, invalidations, ttl_seconds
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "size": len(self._entries),
+                "version": self._version,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+
+class PermissionEpochTracker:
+    """
+    A permission_epochs tábla értékének rövid TTL-es, folyamaton belüli cache-e.
+
+    A forró úton (stateless token ellenőrzés) legfeljebb
+    `ttl_seconds`-onként egy egysoros PK lekérdezés fut.
+    """
+
+    def __init__(self, ttl_seconds: float, cache: PermissionCache):
+        """
+        Args:
+            ttl_seconds: Az epoch érték újraolvasási ideje másodpercben
+            cache: A helyi permission cache (epoch változáskor ürül)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._epoch: Optional[int] = None
+        self._checked_at = 0.0
+        self._token_hits = 0
+        self._token_stale = 0
+
+    @staticmethod
+    def read_epoch(db: Session) -> int:
+        """
+        Aktuális epoch olvasása közvetlenül az adatbázisból.
+
+        Args:
+            db: Database session
+
+        Returns:
+            int: Aktuális epoch (0 ha még nincs sor)
+        """
+        row = db.query(PermissionEpoch.epoch).filter(
+            PermissionEpoch.id == PERMISSION_EPOCH_ROW_ID
+        ).first()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def bump(db: Session) -> None:
+        """
+        Epoch léptetése a hívó tranzakciójában (a commit a hívó feladata).
+
+        Atomikus upsert (INSERT ... ON CONFLICT DO UPDATE), így két párhuzamos
+        első léptetés sem ütközik a hiányzó soron. A migráció az id=1 sort
+        előre létrehozza; upsert nélküli dialektuson sima UPDATE fut.
+
+        Args:
+            db: Database session
+        """
+        table = PermissionEpoch.__table__
+        dialect = db.get_bind().dialect.name
+
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            updated = db.query(PermissionEpoch).filter(
+                PermissionEpoch.id == PERMISSION_EPOCH_ROW_ID
+            ).update(
+                {PermissionEpoch.epoch: PermissionEpoch.epoch + 1},
+                synchronize_session=False
+            )
+            if not updated:
+                db.add(PermissionEpoch(id=PERMISSION_EPOCH_ROW_ID, epoch=1))
+            return
+
+        stmt = insert(table).values(id=PERMISSION_EPOCH_ROW_ID, epoch=1)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={'epoch': table.c.epoch + 1, 'updated_at': func.now()}
+            )
+        )
+
+    def current(self, db: Session) -> int:
+        """
+        Aktuális epoch TTL-es cache-ből (szükség esetén újraolvasva).
+
+        Ha az epoch megváltozott az utolsó olvasás óta, a helyi
+        permission_cache-t is érvényteleníti.
+
+        Args:
+            db: Database session
+
+        Returns:
+            int: Aktuális epoch
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._epoch is not None and now - self._checked_at < self.ttl_seconds:
+                return self._epoch
+
+        epoch = self.read_epoch(db)
+
+        with self._lock:
+            if self._epoch is not None and epoch != self._epoch:
+                self._cache.invalidate_all()
+            self._epoch = epoch
+            self._checked_at = now
+        return epoch
+
+    def record_token_check(self, is_current: bool) -> None:
+        """
+        Stateless token ellenőrzés eredményének számlálása.
+
+        Args:
+            is_current: True ha a token epoch-ja aktuális volt
+        """
+        with self._lock:
+            if is_current:
+                self._token_hits += 1
+            else:
+                self._token_stale += 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Epoch tracker statisztikák (monitoringhoz).
+
+        Returns:
+            dict: epoch, ttl_seconds, token_hits, token_stale
+        """
+        with self._lock:
+            return {
+                "stateless_tokens": settings.auth_stateless_tokens,
+                "epoch": self._epoch,
+                "ttl_seconds": self.ttl_seconds,
+                "token_hits": self._token_hits,
+                "token_stale": self._token_stale,
+            }
+
+
+# Singleton instance (folyamatonként egy)
+permission_cache = PermissionCache(ttl_seconds=settings.permission_cache_ttl_seconds)
+permission_epoch_tracker = PermissionEpochTracker(
+    ttl_seconds=settings.permission_epoch_ttl_seconds,
+    cache=permission_cache
+)
@@ -10,6 +10,7 @@ Ez a router felelős a pénzügyi műveletek kezeléséért:
 
 from typing import Optional, List
 from datetime import datetime, date
+from decimal import Decimal
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
@@ -280,6 +281,55 @@ async def get_cash_balance(
         )
 
 
+@finance_router.post(
+    "/cash-drawer/balance/verify",
+    summary="Készpénz egyenleg konzisztencia ellenőrzés",
+    description="Összeveti az egyenleg checkpointot a nyitott pénzmozgások teljes összegével; opcionálisan javítja.",
+    dependencies=[Depends(require_permission("finance:manage"))]
+)
+async def verify_cash_balance(
+    repair: bool = Query(False, description="Eltérés esetén a checkpoint újraszámolása"),
+    current_user: Employee = Depends(get_current_user),
+    service: FinanceService = Depends(get_finance_service)
+) -> dict:
+    """
+    Egyenleg checkpoint ellenőrzése (igény szerinti / ütemezett konzisztencia job).
+
+    **Jogosultság:** `finance:manage`
+
+    A teljes nyitott pénzmozgás összeget számolja (teljes scan), ezért
+    ütemezve, forgalmon kívül érdemes futtatni.
+
+    Args:
+        repair: Eltérés esetén javítás
+        current_user: Bejelentkezett felhasználó (dependency)
+        service: FinanceService instance (dependency)
+
+    Returns:
+        dict: Checkpoint és teljes összeg, eltérés, javítás történt-e
+
+    Raises:
+        HTTPException 403: Ha nincs jogosultság
+    """
+    try:
+        result = service.verify_cash_balance(repair=repair)
+
+        return {
+            **{
+                key: float(value) if isinstance(value, Decimal) else value
+                for key, value in result.items()
+            },
+            "currency": "HUF",
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Hiba történt az egyenleg ellenőrzése során: {str(e)}"
+        )
+
+
 # ============================================================================
 # Daily Closure Endpoints (Napi Pénztárzárás)
 # ============================================================================
@@ -6,18 +6,23 @@ Ez a router felelős a belső mikroszolgáltatás-kommunikációért,
 különösen az NTAK rendelésjelentések és audit naplózás kezeléséért.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import httpx
 import logging
 
+from backend.core_domain.pagination import InvalidCursorError, next_page_cursor
 from backend.service_admin.models.database import get_db
+from backend.service_admin.models.ntak_submission import NtakSubmission
 from backend.service_admin.services import AuditLogService
+from backend.service_admin.services.ntak_queue import NtakQueueService, ntak_batch_worker
+from backend.service_admin.services.export_service import ExportService, AUDIT_LOG_EXPORT_FIELDS
 from backend.service_admin.config import settings
 from backend.service_admin.schemas.ntak import (
-    NTAKOrderSummaryData,
+    NTAKQueueEntryResponse,
+    NTAKQueueStatsResponse,
     NTAKResponse,
     NTAKSendRequest
 )
@@ -52,11 +57,13 @@ def get_audit_service(db: Session = Depends(get_db)) -> AuditLogService:
 
 @internal_router.post(
     "/report-order/{order_id}",
-    response_model=NTAKResponse,
-    status_code=status.HTTP_200_OK,
+    response_model=NTAKQueueEntryResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="NTAK Rendelésjelentés",
     description="Belső végpont rendelés NTAK-hoz való jelentéséhez. "
-                "Ezt a végpontot az Orders Service hívja meg, amikor egy rendelés lezárul."
+                "Ezt a végpontot az Orders Service hívja meg, amikor egy rendelés lezárul. "
+                "A rendelés a beküldési sorba kerül; az NTAK beküldést a háttér-worker "
+                "kötegelve végzi."
 )
 async def report_order_to_ntak(
     order_id: int,
@@ -64,29 +71,24 @@ async def report_order_to_ntak(
     send_request: Optional[NTAKSendRequest] = None,
     audit_service: AuditLogService = Depends(get_audit_service),
     db: Session = Depends(get_db)
-) -> NTAKResponse:
+) -> NTAKQueueEntryResponse:
     """
-    Kritikus végpont: Rendelés jelentése NTAK-hoz.
+    Kritikus végpont: Rendelés jelentése NTAK-hoz (sorba állítás).
 
     Ez a végpont:
-    1. Lekéri a rendelés adatait az Orders Service-ből
-    2. Átalakítja NTAK formátumba
-    3. Elküldi az NTAK API-nak
-    4. Naplózza az eredményt az audit logba
+    1. A rendelést az ntak_submissions sorba állítja (idempotens)
+    2. A háttérben futó NtakBatchWorker beküldési ablakonként kötegelve
+       elküldi az NTAK-nak, és naplózza az eredményt az audit logba
 
     Args:
         order_id: Rendelés egyedi azonosítója
         request: FastAPI Request objektum (IP cím, user agent)
-        send_request: Opcionális küldési paraméterek
+        send_request: Opcionális küldési paraméterek (force_resend)
         audit_service: AuditLogService dependency
         db: Database session
 
     Returns:
-        NTAKResponse: NTAK API válasz
-
-    Raises:
-        HTTPException: 404 ha a rendelés nem található
-        HTTPException: 500 ha NTAK küldés sikertelen
+        NTAKQueueEntryResponse: A rendelés beküldési sorának állapota
     """
     logger.info(f"NTAK rendelésjelentés kezdeményezve - order_id: {order_id}")
 
@@ -104,108 +106,77 @@ async def report_order_to_ntak(
             user_agent=request.headers.get('user-agent')
         )
 
-        return NTAKResponse(
-            success=False,
-            message="NTAK szolgáltatás le van tiltva",
-            transaction_id=None,
-            timestamp=datetime.now(),
-            error_code="NTAK_DISABLED"
+        return NTAKQueueEntryResponse(
+            order_id=order_id,
+            status="DISABLED",
+            last_error="NTAK szolgáltatás le van tiltva"
         )
 
-    try:
-        # 1. Lekérjük a rendelés adatait az Orders Service-ből
-        logger.info(f"Rendelés adatok lekérése - order_id: {order_id}")
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            orders_url = f"{settings.orders_service_url}/api/orders/{order_id}"
-            response = await client.get(orders_url)
-
-            if response.status_code == 404:
-                logger.error(f"Rendelés nem található - order_id: {order_id}")
-
-                audit_service.log_event(
-                    event_type='NTAK_SEND',
-                    entity_type='ORDER',
-                    entity_id=order_id,
-                    status='FAILURE',
-                    message=f'Rendelés nem található az Orders Service-ben',
-                    ip_address=request.client.host if request.client else None,
-                    user_agent=request.headers.get('user-agent')
-                )
-
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Rendelés nem található: {order_id}"
-                )
-
-            response.raise_for_status()
-            order_data = response.json()
-
-        # 2. TODO: Átalakítás NTAK formátumba
-        #    Ez a későbbi fázisokban kerül implementálásra
-        #    Most placeholder adatot használunk
-        logger.info(f"Rendelés átalakítása NTAK formátumra - order_id: {order_id}")
-
-        # 3. TODO: NTAK API hívás
-        #    Jelenleg mock válasz, később kerül implementálásra
-        logger.info(f"NTAK API hívás - order_id: {order_id}")
-
-        # Mock NTAK válasz (később valódi API hívás lesz)
-        ntak_transaction_id = f"NTAK-{datetime.now().strftime('%Y%m%d%H%M%S')}-{order_id}"
-
-        ntak_response = NTAKResponse(
-            success=True,
-            message="Rendelésösszesítő sikeresen elküldve (mock)",
-            transaction_id=ntak_transaction_id,
-            timestamp=datetime.now(),
-            error_code=None
-        )
+    # Idempotencia: az Orders Service outbox-a at-least-once kézbesít; a sor
+    # rendelésenként egy bejegyzést tart, az ismételt jelentés nem duplikál
+    submission = NtakQueueService.enqueue(
+        db,
+        order_id,
+        force_resend=bool(send_request and send_request.force_resend)
+    )
+    logger.info(
+        f"NTAK rendelés sorban - order_id: {order_id}, status: {submission.status}, "
+        f"Idempotency-Key: {request.headers.get('idempotency-key')}"
+    )
 
-        # 4. Audit log naplózás
-        logger.info(f"NTAK küldés sikeres - order_id: {order_id}, tx_id: {ntak_transaction_id}")
+    return NTAKQueueEntryResponse.model_validate(submission)
 
-        audit_service.log_ntak_send(
-            order_id=order_id,
-            success=True,
-            message=f"NTAK rendelésösszesítő elküldve - TX: {ntak_transaction_id}",
-            details={
-                "transaction_id": ntak_transaction_id,
-                "order_data": order_data,
-                "ntak_response": ntak_response.model_dump()
-            }
-        )
 
-        return ntak_response
+@internal_router.get(
+    "/ntak/queue",
+    response_model=NTAKQueueStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="NTAK Beküldési Sor Metrikák",
+    description="Sor mélység, a legrégebben várakozó rendelés kora (lag) és a worker számlálói."
+)
+def get_ntak_queue_stats(db: Session = Depends(get_db)) -> NTAKQueueStatsResponse:
+    """
+    NTAK beküldési sor metrikák (monitoringhoz).
 
-    except httpx.HTTPError as e:
-        logger.error(f"HTTP hiba a rendelés lekérésekor - order_id: {order_id}, error: {str(e)}")
+    Args:
+        db: Database session
 
-        audit_service.log_ntak_send(
-            order_id=order_id,
-            success=False,
-            message=f"HTTP hiba az Orders Service kommunikáció során: {str(e)}",
-            details={"error": str(e)}
-        )
+    Returns:
+        NTAKQueueStatsResponse: pending, due, sent, failed, lag_seconds, worker
+    """
+    return NTAKQueueStatsResponse(
+        **NtakQueueService.queue_stats(db),
+        worker=ntak_batch_worker.stats()
+    )
 
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Orders Service nem elérhető: {str(e)}"
-        )
 
-    except Exception as e:
-        logger.error(f"Váratlan hiba NTAK küldéskor - order_id: {order_id}, error: {str(e)}")
+@internal_router.get(
+    "/ntak/queue/{order_id}",
+    response_model=NTAKQueueEntryResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Rendelés NTAK Beküldési Állapota"
+)
+def get_ntak_queue_entry(order_id: int, db: Session = Depends(get_db)) -> NTAKQueueEntryResponse:
+    """
+    Egy rendelés NTAK beküldési sorának állapota.
 
-        audit_service.log_ntak_send(
-            order_id=order_id,
-            success=False,
-            message=f"Váratlan hiba: {str(e)}",
-            details={"error": str(e), "error_type": type(e).__name__}
-        )
+    Args:
+        order_id: Rendelés egyedi azonosítója
+        db: Database session
+
+    Returns:
+        NTAKQueueEntryResponse: A sor állapota
 
+    Raises:
+        HTTPException: 404 ha a rendelés nincs a sorban
+    """
+    submission = db.query(NtakSubmission).filter(NtakSubmission.order_id == order_id).first()
+    if submission is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Hiba a NTAK jelentés során: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"A rendelés nincs az NTAK beküldési sorban: {order_id}"
         )
+    return NTAKQueueEntryResponse.model_validate(submission)
 
 
 # ============================================
@@ -270,7 +241,8 @@ async def cancel_order_in_ntak(
             order_id=order_id,
             success=True,
             message=f"NTAK rendelés sztornózva - TX: {cancel_transaction_id}",
-            details={"transaction_id": cancel_transaction_id}
+            details={"transaction_id": cancel_transaction_id},
+            must_persist=True
         )
 
         return NTAKResponse(
@@ -314,11 +286,16 @@ async def get_audit_logs(
     status_filter: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     audit_service: AuditLogService = Depends(get_audit_service)
 ):
     """
     Audit logok lekérdezése szűrési feltételekkel.
 
+    Mély lapozáshoz a válasz next_cursor értékét kell visszaküldeni
+    (keyset a created_at, id kulcson) az offset növelése helyett.
+
     Args:
         event_type: Szűrés esemény típusra (pl. 'NTAK_SEND')
         entity_type: Szűrés entitás típusra (pl. 'ORDER')
@@ -326,6 +303,8 @@ async def get_audit_logs(
         status_filter: Szűrés státuszra ('SUCCESS', 'FAILURE', 'PENDING')
         limit: Max visszaadott rekordok száma
         offset: Lapozás offset
+        cursor: Az előző oldal next_cursor értéke (az offset ekkor figyelmen kívül marad)
+        include_total: Összes darabszám számolása (default: kurzor nélkül igen, kurzorral nem)
         audit_service: AuditLogService dependency
 
     Returns:
@@ -340,18 +319,27 @@ async def get_audit_logs(
             entity_id=entity_id,
             status=status_filter,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
 
-        total_count = audit_service.count_logs(
-            event_type=event_type,
-            status=status_filter
-        )
+        # Összes darabszám csak kérésre (a teljes szűrt halmazt beolvassa)
+        if include_total is None:
+            include_total = cursor is None
+        total_count = None
+        if include_total:
+            total_count = audit_service.count_logs(
+                event_type=event_type,
+                status=status_filter,
+                entity_type=entity_type,
+                entity_id=entity_id
+            )
 
         return {
             "total": total_count,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_page_cursor(logs, limit),
             "logs": [
                 {
                     "id": log.id,
@@ -369,6 +357,11 @@ async def get_audit_logs(
             ]
         }
 
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Hiba az audit logok lekérésekor: {str(e)}")
         raise HTTPException(
@@ -377,6 +370,71 @@ async def get_audit_logs(
         )
 
 
+# ============================================
+# V.3b - Audit Log Export (streamelt)
+# ============================================
+
+@internal_router.get(
+    "/audit-logs/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Audit Log Export",
+    description="Audit logok streamelt CSV / NDJSON exportja (nagy időszakokra is)."
+)
+async def export_audit_logs(
+    event_type: Optional[str] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+) -> StreamingResponse:
+    """
+    Audit logok exportja szűrési feltételekkel, időrendben, streamelve.
+
+    A get_audit_logs-szal ellentétben nincs limit / offset: a sorok szerver
+    oldali kurzorral, darabokban kerülnek kiküldésre.
+
+    Args:
+        event_type: Szűrés esemény típusra (pl. 'NTAK_SEND')
+        entity_type: Szűrés entitás típusra (pl. 'ORDER')
+        entity_id: Szűrés entitás ID-ra
+        status_filter: Szűrés státuszra ('SUCCESS', 'FAILURE', 'PENDING')
+        start_date: Első nap (inkluzív, az étterem időzónájában)
+        end_date: Utolsó nap (inkluzív, az étterem időzónájában)
+        export_format: 'csv' vagy 'ndjson'
+
+    Returns:
+        StreamingResponse: Letölthető CSV / NDJSON fájl
+
+    Raises:
+        HTTPException 400: Ha a dátumok hibásak
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A kezdő dátum nem lehet későbbi mint a záró dátum"
+        )
+
+    logger.info(f"Audit log export - filters: event={event_type}, entity={entity_type}, id={entity_id}")
+
+    return ExportService.streaming_response(
+        lambda db: ExportService.iter_audit_log_rows(
+            db,
+            event_type=event_type,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            status=status_filter,
+            start_date=start_date,
+            end_date=end_date
+        ),
+        AUDIT_LOG_EXPORT_FIELDS,
+        export_format,
+        filename=f"audit_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+
+
 # ============================================
 # V.4 - Rendeléshez Tartozó Audit Logok
 # ============================================
@@ -10,11 +10,13 @@ Ez a router felelős a dashboard analitikai végpontok kezeléséért:
 from typing import Optional
 from datetime import date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.service_admin.models.database import get_db
 from backend.service_admin.models.employee import Employee
 from backend.service_admin.services.reports_service import ReportsService
+from backend.service_admin.services.export_service import ExportService, SALES_EXPORT_FIELDS
 from backend.service_admin.schemas.reports import (
     SalesReportResponse,
     TopProductsResponse,
@@ -287,6 +289,80 @@ async def get_consumption_report(
         )
 
 
+# ============================================================================
+# Export Endpoints
+# ============================================================================
+
+@reports_router.get(
+    "/export/sales",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Értékesítési export (CSV / NDJSON)",
+    description="Sikeres fizetések tételes exportja streamelve, akár egy teljes évre.",
+    dependencies=[Depends(require_permission("reports:view"))]
+)
+async def export_sales(
+    start_date: Optional[date] = Query(
+        None,
+        description="Kezdő dátum (YYYY-MM-DD). Default: 30 nappal ezelőtt"
+    ),
+    end_date: Optional[date] = Query(
+        None,
+        description="Záró dátum (YYYY-MM-DD). Default: ma"
+    ),
+    export_format: str = Query(
+        "csv",
+        alias="format",
+        pattern="^(csv|ndjson)$",
+        description="Export formátum: csv vagy ndjson"
+    )
+) -> StreamingResponse:
+    """
+    Értékesítési tételes export (fizetésenként egy sor) streamelve.
+
+    **Jogosultság:** `reports:view`
+
+    A sorok szerver oldali kurzorral, darabokban kerülnek kiküldésre,
+    így a memóriahasználat az időszak hosszától független.
+
+    Args:
+        start_date: Kezdő dátum (opcionális)
+        end_date: Záró dátum (opcionális)
+        export_format: 'csv' vagy 'ndjson'
+
+    Returns:
+        StreamingResponse: Letölthető CSV / NDJSON fájl
+
+    Raises:
+        HTTPException 400: Ha a dátumok hibásak
+        HTTPException 403: Ha nincs jogosultság
+    """
+    if end_date is None:
+        end_date = date.today()
+    if start_date is None:
+        start_date = end_date - timedelta(days=30)
+
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A kezdő dátum nem lehet későbbi mint a záró dátum"
+        )
+
+    # Maximum 365 napos intervallum (mint a sales riportnál)
+    if (end_date - start_date).days > 365:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum 365 napos időszakot lehet lekérdezni"
+        )
+
+    return ExportService.streaming_response(
+        lambda db: ExportService.iter_sales_rows(db, start_date, end_date),
+        SALES_EXPORT_FIELDS,
+        export_format,
+        filename=f"sales_{start_date.isoformat()}_{end_date.isoformat()}"
+    )
+
+
 # ============================================================================
 # Health Check Endpoint (for testing)
 # ============================================================================
@@ -50,6 +50,8 @@ from .ntak import (
     NTAKResponse,
     NTAKSendRequest,
     NTAKStatusResponse,
+    NTAKQueueEntryResponse,
+    NTAKQueueStatsResponse,
 )
 
 # Employee schemas
@@ -125,6 +127,8 @@ __all__ = [
     "NTAKResponse",
     "NTAKSendRequest",
     "NTAKStatusResponse",
+    "NTAKQueueEntryResponse",
+    "NTAKQueueStatsResponse",
     # Employee
     "EmployeeBase",
     "EmployeeCreate",
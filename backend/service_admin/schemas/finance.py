@@ -189,6 +189,39 @@ class DailyClosureResponse(BaseModel):
         description="Fizetési módok szerinti összegzés",
         examples=[{"KESZPENZ": 10000.00, "KARTYA": 5000.00, "SZEP_KARTYA": 2000.00}]
     )
+    total_cash: Optional[Decimal] = Field(
+        None,
+        description="Készpénzes fizetések összege"
+    )
+    total_card: Optional[Decimal] = Field(
+        None,
+        description="Bankkártyás fizetések összege"
+    )
+    total_szep_card: Optional[Decimal] = Field(
+        None,
+        description="SZÉP kártyás fizetések összege"
+    )
+    total_voucher: Optional[Decimal] = Field(
+        None,
+        description="Utalványos fizetések összege"
+    )
+    total_transfer: Optional[Decimal] = Field(
+        None,
+        description="Átutalásos fizetések összege"
+    )
+    total_revenue: Optional[Decimal] = Field(
+        None,
+        description="Összes bevétel"
+    )
+    order_count: Optional[int] = Field(
+        None,
+        description="Lezárt rendelések száma"
+    )
+    vat_breakdown: Optional[Dict[str, Dict[str, float]]] = Field(
+        None,
+        description="ÁFA kulcs szerinti bontás (rendelésszám, bruttó, nettó, ÁFA)",
+        examples=[{"27.00": {"order_count": 3, "gross": 12700.00, "net": 10000.00, "vat": 2700.00}}]
+    )
     notes: Optional[str] = Field(
         None,
         description="Megjegyzések"
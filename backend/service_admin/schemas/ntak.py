@@ -271,3 +271,71 @@ class NTAKStatusResponse(BaseModel):
         description="Number of submission retry attempts",
         examples=[0, 1, 3]
     )
+
+
+class NTAKQueueEntryResponse(BaseModel):
+    """
+    Schema for an order queued for batched NTAK submission.
+
+    Returned by the /internal/report-order endpoint: the order is submitted
+    asynchronously by the NTAK batch worker.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    order_id: int = Field(
+        ...,
+        description="Order identifier",
+        examples=[42]
+    )
+    status: str = Field(
+        ...,
+        description="Queue status (PENDING, SENT, FAILED) or DISABLED if NTAK is turned off",
+        examples=["PENDING", "SENT", "FAILED", "DISABLED"]
+    )
+    attempts: int = Field(
+        0,
+        ge=0,
+        description="Submission attempts so far",
+        examples=[0, 1, 3]
+    )
+    enqueued_at: Optional[datetime] = Field(
+        None,
+        description="Timestamp when the order was (re)queued"
+    )
+    sent_at: Optional[datetime] = Field(
+        None,
+        description="Timestamp when NTAK accepted the order summary"
+    )
+    transaction_id: Optional[str] = Field(
+        None,
+        description="NTAK transaction identifier (after a successful submission)"
+    )
+    last_error: Optional[str] = Field(
+        None,
+        description="Last submission error"
+    )
+
+
+class NTAKQueueStatsResponse(BaseModel):
+    """
+    Schema for NTAK submission queue metrics (queue depth, lag, worker counters).
+    """
+
+    pending: int = Field(..., ge=0, description="Orders waiting for submission (incl. retries)")
+    due: int = Field(..., ge=0, description="Pending orders whose next attempt is due now")
+    sent: int = Field(..., ge=0, description="Orders accepted by NTAK")
+    failed: int = Field(..., ge=0, description="Orders that failed permanently")
+    oldest_pending_at: Optional[datetime] = Field(
+        None,
+        description="Enqueue time of the oldest pending order"
+    )
+    lag_seconds: float = Field(
+        ...,
+        ge=0,
+        description="Age of the oldest pending order in seconds (0 if the queue is empty)"
+    )
+    worker: dict = Field(
+        ...,
+        description="Batch worker counters of this process (batches, accepted, rejected, last_batch)"
+    )
@@ -4,14 +4,21 @@ Module 8: Adminisztráció és NTAK - IV. Fázis
 
 Ez a service felelős az audit log bejegyzések létrehozásáért és lekérdezéséért.
 Támogatja az NTAK adatküldések, rendszeresemények és user action-ök naplózását.
+
+Az egyedi események alapértelmezésben a pufferelt AuditLogWriter-en
+keresztül, kötegelt INSERT-tel íródnak ki; a must_persist események
+(és futó író hiányában minden esemény) szinkron, a kérésen belül.
 """
 
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
+
+from backend.core_domain.pagination import decode_cursor
 
 from backend.service_admin.models.audit_log import AuditLog
+from backend.service_admin.services.audit_writer import audit_log_writer
 
 
 class AuditLogService:
@@ -44,11 +51,17 @@ class AuditLogService:
         message: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None
-    ) -> AuditLog:
+        user_agent: Optional[str] = None,
+        must_persist: bool = False
+    ) -> Optional[AuditLog]:
         """
         Létrehoz egy új audit log bejegyzést.
 
+        Alapértelmezésben az esemény a pufferelt íróba kerül (az esemény
+        időpontjával), és a következő kötegelt kiíráskor perzisztálódik.
+        must_persist=True esetén (megfelelőségi szempontból kritikus
+        események) a bejegyzés a visszatérés előtt commitolva van.
+
         Args:
             event_type: Esemény típusa (pl. 'NTAK_SEND', 'NTAK_CANCEL', 'USER_LOGIN')
             entity_type: Érintett entitás típusa (pl. 'ORDER', 'PAYMENT', 'USER')
@@ -59,9 +72,11 @@ class AuditLogService:
             details: Részletes adatok JSONB formátumban (dict)
             ip_address: Kliens IP címe
             user_agent: Kliens user agent string
+            must_persist: Szinkron kiírás (commit a visszatérés előtt)
 
         Returns:
-            AuditLog: A létrehozott audit log objektum
+            Optional[AuditLog]: A létrehozott audit log objektum szinkron
+                kiírásnál, pufferelt esemény esetén None
 
         Example:
             >>> service.log_event(
@@ -73,6 +88,20 @@ class AuditLogService:
             ...     details={'transaction_id': 'NTAK-2024-001234'}
             ... )
         """
+        if not must_persist and audit_log_writer.running:
+            audit_log_writer.submit({
+                "event_type": event_type,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "user_id": user_id,
+                "status": status,
+                "message": message,
+                "details": details,
+                "ip_address": ip_address,
+                "user_agent": user_agent
+            })
+            return None
+
         audit_log = AuditLog(
             event_type=event_type,
             entity_type=entity_type,
@@ -97,8 +126,9 @@ class AuditLogService:
         success: bool,
         message: str,
         details: Optional[Dict[str, Any]] = None,
-        user_id: Optional[int] = None
-    ) -> AuditLog:
+        user_id: Optional[int] = None,
+        must_persist: bool = False
+    ) -> Optional[AuditLog]:
         """
         Speciális metódus NTAK adatküldés naplózásához.
 
@@ -108,9 +138,10 @@ class AuditLogService:
             message: Státusz üzenet
             details: Részletes információk (NTAK válasz, payload, stb.)
             user_id: Felhasználó ID (opcionális)
+            must_persist: Szinkron kiírás (lásd log_event)
 
         Returns:
-            AuditLog: A létrehozott audit log objektum
+            Optional[AuditLog]: A létrehozott audit log objektum (pufferelt esemény esetén None)
         """
         return self.log_event(
             event_type='NTAK_SEND',
@@ -119,17 +150,50 @@ class AuditLogService:
             user_id=user_id,
             status='SUCCESS' if success else 'FAILURE',
             message=message,
-            details=details
+            details=details,
+            must_persist=must_persist
         )
 
+    def log_ntak_batch(
+        self,
+        entries: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> int:
+        """
+        Több NTAK adatküldés eredményének naplózása egyszerre (kötegelt
+        beküldés), soronkénti commit nélkül.
+
+        Args:
+            entries: [{"order_id", "success", "message", "details"}, ...]
+            commit: False esetén a commit a hívó feladata (azonos tranzakció)
+
+        Returns:
+            int: A létrehozott audit log bejegyzések száma
+        """
+        self.db.add_all([
+            AuditLog(
+                event_type='NTAK_SEND',
+                entity_type='ORDER',
+                entity_id=entry["order_id"],
+                status='SUCCESS' if entry["success"] else 'FAILURE',
+                message=entry.get("message"),
+                details=entry.get("details")
+            )
+            for entry in entries
+        ])
+        if commit:
+            self.db.commit()
+        return len(entries)
+
     def log_ntak_cancel(
         self,
         order_id: int,
         success: bool,
         message: str,
         details: Optional[Dict[str, Any]] = None,
-        user_id: Optional[int] = None
-    ) -> AuditLog:
+        user_id: Optional[int] = None,
+        must_persist: bool = False
+    ) -> Optional[AuditLog]:
         """
         Speciális metódus NTAK sztornó naplózásához.
 
@@ -139,9 +203,10 @@ class AuditLogService:
             message: Státusz üzenet
             details: Részletes információk
             user_id: Felhasználó ID (opcionális)
+            must_persist: Szinkron kiírás (lásd log_event)
 
         Returns:
-            AuditLog: A létrehozott audit log objektum
+            Optional[AuditLog]: A létrehozott audit log objektum (pufferelt esemény esetén None)
         """
         return self.log_event(
             event_type='NTAK_CANCEL',
@@ -150,7 +215,8 @@ class AuditLogService:
             user_id=user_id,
             status='SUCCESS' if success else 'FAILURE',
             message=message,
-            details=details
+            details=details,
+            must_persist=must_persist
         )
 
     def get_logs(
@@ -161,11 +227,15 @@ class AuditLogService:
         user_id: Optional[int] = None,
         status: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[AuditLog]:
         """
         Lekéri az audit logokat szűrési feltételekkel.
 
+        Kurzor megadásakor keyset (created_at, id) lapozás: az offset
+        figyelmen kívül marad, a mély oldalak sem olvassák végig a korábbiakat.
+
         Args:
             event_type: Szűrés esemény típusra
             entity_type: Szűrés entitás típusra
@@ -174,9 +244,13 @@ class AuditLogService:
             status: Szűrés státuszra
             limit: Max visszaadott rekordok száma (default: 100)
             offset: Lapozás offset (default: 0)
+            cursor: Az előző oldal next_cursor értéke (opcionális)
 
         Returns:
             List[AuditLog]: Audit log bejegyzések listája
+
+        Raises:
+            InvalidCursorError: Ha a kurzor hibás
         """
         query = self.db.query(AuditLog)
 
@@ -192,13 +266,17 @@ class AuditLogService:
         if status:
             query = query.filter(AuditLog.status == status)
 
-        # Rendezés időbélyeg szerint csökkenő sorrendben (legújabb elől)
-        query = query.order_by(desc(AuditLog.created_at))
+        # Rendezés időbélyeg szerint csökkenő sorrendben (legújabb elől, id a holtversenyre)
+        query = query.order_by(desc(AuditLog.created_at), desc(AuditLog.id))
 
-        # Lapozás
-        query = query.limit(limit).offset(offset)
+        # Lapozás: keyset, ha van kurzor, egyébként offset
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.filter(tuple_(AuditLog.created_at, AuditLog.id) < tuple_(cursor_created_at, cursor_id))
+        else:
+            query = query.offset(offset)
 
-        return query.all()
+        return query.limit(limit).all()
 
     def get_order_audit_logs(self, order_id: int) -> List[AuditLog]:
         """
@@ -245,7 +323,9 @@ class AuditLogService:
     def count_logs(
         self,
         event_type: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None
     ) -> int:
         """
         Megszámolja az audit logokat szűrési feltételekkel.
@@ -253,6 +333,8 @@ class AuditLogService:
         Args:
             event_type: Opcionális esemény típus szűrő
             status: Opcionális státusz szűrő
+            entity_type: Opcionális entitás típus szűrő
+            entity_id: Opcionális entitás ID szűrő
 
         Returns:
             int: Audit logok száma
@@ -263,5 +345,9 @@ class AuditLogService:
             query = query.filter(AuditLog.event_type == event_type)
         if status:
             query = query.filter(AuditLog.status == status)
+        if entity_type:
+            query = query.filter(AuditLog.entity_type == entity_type)
+        if entity_id:
+            query = query.filter(AuditLog.entity_id == entity_id)
 
         return query.count()
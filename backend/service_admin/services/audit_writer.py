@@ -0,0 +1,241 @@
+"""
+Audit Log Writer - Pufferelt, kötegelt audit naplózás
+Module 8: Adminisztráció és NTAK (Performance)
+
+Az AuditLogService.log_event eseményenként add + commit + refresh
+kört futtatott, így minden NTAK küldés / sztornó naplózása egy teljes
+tranzakció volt az admin adatbázison, a kérés válaszidejében.
+
+Ez a modul egy folyamatonként egy példányos írót ad, amely:
+- az eseményeket memóriában gyűjti (az esemény időpontja a created_at)
+- `batch_size` eseményenként vagy `flush_interval_ms` időközönként
+  egyetlen többsoros INSERT-tel írja ki (saját session, háttér-task)
+- leálláskor (shutdown) a maradékot kiírja
+- sikertelen kiírásnál az eseményeket visszateszi a pufferbe
+  (legfeljebb `max_buffer` eseményig; a többit eldobja és számolja)
+
+A megfelelőségi szempontból kritikus eseményeket (must_persist) az
+AuditLogService továbbra is szinkron, a kérésen belül írja ki. Ha az író
+nem fut (tesztek, szkriptek), minden esemény szinkron íródik.
+
+Használat:
+    from backend.service_admin.services.audit_writer import audit_log_writer
+
+    audit_log_writer.submit({"event_type": "NTAK_SEND", "status": "FAILURE", ...})
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.service_admin.config import settings
+from backend.service_admin.models.audit_log import AuditLog
+from backend.service_admin.models.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Egy puffer sor oszlopai (executemany: minden sornak azonos kulcsai vannak)
+AUDIT_LOG_COLUMNS = (
+    "event_type",
+    "entity_type",
+    "entity_id",
+    "user_id",
+    "status",
+    "message",
+    "details",
+    "ip_address",
+    "user_agent",
+    "created_at",
+)
+
+
+class AuditLogWriter:
+    """
+    Pufferelt audit log író többsoros INSERT-tel.
+
+    A submit() bármely szálból hívható; a kiírás a háttér-taskban
+    (threadpool-ban) vagy flush() hívásakor történik.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval_ms: int,
+        max_buffer: int,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_buffer = max_buffer
+        self._session_factory = session_factory
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._written = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._dropped = 0
+        self._last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Fut-e a háttér-task (ha nem, a hívók szinkron írnak)."""
+        return self._task is not None and not self._task.done()
+
+    # ========================================================================
+    # Életciklus
+    # ========================================================================
+
+    async def start(self) -> None:
+        """Író indítása (startup eseményből)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Audit log writer started (batch_size={self.batch_size}, "
+            f"flush_interval_ms={self.flush_interval_ms})"
+        )
+
+    async def stop(self) -> None:
+        """Író leállítása és a maradék kiírása (shutdown eseményből)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.to_thread(self.flush)
+        logger.info("Audit log writer stopped")
+
+    async def _run(self) -> None:
+        """Fő ciklus: kiírás intervallumonként vagy teli köteg jelzésére."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await asyncio.to_thread(self.flush)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit log flush cycle failed: {e}")
+
+    # ========================================================================
+    # Írás
+    # ========================================================================
+
+    def submit(self, entry: Dict[str, Any]) -> None:
+        """
+        Esemény pufferelése (bármely szálból hívható).
+
+        Args:
+            entry: AuditLog mezők (event_type kötelező); created_at
+                hiányában az aktuális időpont
+        """
+        row = {column: entry.get(column) for column in AUDIT_LOG_COLUMNS}
+        row["status"] = row["status"] or "SUCCESS"
+        row["created_at"] = row["created_at"] or datetime.now(timezone.utc)
+
+        with self._lock:
+            self._buffer.append(row)
+            pending = len(self._buffer)
+
+        if pending >= self.batch_size:
+            self._notify()
+
+    def _notify(self) -> None:
+        """Azonnali kiírás kérése a háttér-tasktól."""
+        if self._loop is None or self._wakeup is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Az event loop már leállt
+            pass
+
+    def flush(self) -> int:
+        """
+        A puffer kiírása többsoros INSERT-tel, saját session-nel.
+
+        Hiba esetén az események visszakerülnek a puffer elejére.
+
+        Returns:
+            int: A kiírt események száma
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            started = time.perf_counter()
+            db = self._session_factory()
+            try:
+                db.execute(insert(AuditLog), rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._requeue(rows)
+                self._failed_flushes += 1
+                logger.error(f"Audit log flush failed ({len(rows)} events kept in buffer): {e}")
+                return 0
+            finally:
+                db.close()
+
+            self._written += len(rows)
+            self._flushes += 1
+            self._last_flush_ms = round((time.perf_counter() - started) * 1000, 1)
+            return len(rows)
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        """Sikertelen kiírás sorainak visszatétele (max_buffer felett a legrégebbiek elvesznek)."""
+        with self._lock:
+            self._buffer[:0] = rows
+            overflow = len(self._buffer) - self.max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self._dropped += overflow
+                logger.error(f"Audit log buffer full: {overflow} oldest events dropped")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Író statisztikák (monitoringhoz).
+
+        Returns:
+            dict: running, buffered, written, flushes, failed_flushes, dropped, last_flush_ms
+        """
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "running": self.running,
+            "buffered": buffered,
+            "written": self._written,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "dropped": self._dropped,
+            "last_flush_ms": self._last_flush_ms,
+        }
+
+
+# Singleton instance (folyamatonként egy)
+audit_log_writer = AuditLogWriter(
+    batch_size=settings.audit_flush_batch_size,
+    flush_interval_ms=settings.audit_flush_interval_ms,
+    max_buffer=settings.audit_buffer_max_events
+)
@@ -19,6 +19,7 @@ from sqlalchemy.orm import Session
 
 from backend.service_admin.models.employee import Employee
 from backend.service_admin.models.permission import Permission
+from backend.service_admin.permission_cache import PermissionEpochTracker
 from backend.service_admin.config import settings
 
 
@@ -363,6 +364,8 @@ class AuthService:
         - Username (username)
         - Roles (roles)
         - Permissions (permissions)
+        - Permission epoch (perm_epoch) - stateless autorizációhoz; ha az
+          aktuális epoch eltér, a require_permission az adatbázishoz fordul
 
         Args:
             employee: Employee objektum
@@ -374,6 +377,9 @@ class AuthService:
             token = auth_service.create_token_with_permissions(employee)
             # Token tartalmaz: employee_id, username, roles, permissions
         """
+        # Aktuális jogosultság epoch (a token kiállításakor)
+        perm_epoch = PermissionEpochTracker.read_epoch(self.db)
+
         # Jogosultságok összegyűjtése
         permissions = self.get_employee_permissions(employee)
 
@@ -383,8 +389,10 @@ class AuthService:
         # Additional claims összeállítás
         additional_claims = {
             "username": employee.username,
+            "name": employee.name,
             "roles": roles,
             "permissions": permissions,
+            "perm_epoch": perm_epoch,
         }
 
         # Token generálás
@@ -14,6 +14,7 @@ from passlib.context import CryptContext
 from backend.service_admin.models.employee import Employee
 from backend.service_admin.models.role import Role
 from backend.service_admin.models.permission import Permission
+from backend.service_admin.permission_cache import permission_cache, permission_epoch_tracker
 
 
 # Password/PIN hashing context
@@ -233,7 +234,12 @@ class EmployeeService:
         if pin_code is not None:
             employee.pin_code_hash = self._hash_pin(pin_code)
 
+        # Deaktiválás esetén a kiadott tokenek jogosultság claim-jei elavulnak
+        if is_active is not None:
+            permission_epoch_tracker.bump(self.db)
+
         self.db.commit()
+        permission_cache.invalidate_employee(employee_id)
         self.db.refresh(employee)
 
         return employee
@@ -258,7 +264,9 @@ class EmployeeService:
             return False
 
         self.db.delete(employee)
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_employee(employee_id)
 
         return True
 
@@ -437,7 +445,9 @@ class EmployeeService:
         # Szerepkörök hozzárendelése (felülírja a meglévőket)
         employee.roles = roles
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_employee(employee_id)
         self.db.refresh(employee)
 
         return employee
@@ -482,7 +492,9 @@ class EmployeeService:
             if role.id not in existing_role_ids:
                 employee.roles.append(role)
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_employee(employee_id)
         self.db.refresh(employee)
 
         return employee
@@ -513,7 +525,9 @@ class EmployeeService:
             if role.id not in role_ids
         ]
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_employee(employee_id)
         self.db.refresh(employee)
 
         return employee
@@ -0,0 +1,290 @@
+"""
+ExportService - Streamelt CSV / NDJSON exportok
+Module 8: Adminisztráció és NTAK
+
+Nagy időszakokra (akár egy teljes év) a riport és audit log listázó
+végpontok a teljes eredményt Python listában építették fel, és egyetlen
+JSON válaszban küldték vissza, így a memória a sorok számával nőtt.
+
+Ez a service:
+- Szerver oldali kurzorral olvas (yield_per / stream_results), egyszerre
+  legfeljebb `export_batch_size` sor van a memóriában
+- A sorokat CSV vagy NDJSON darabokra (chunk) kódolja, amelyeket a
+  StreamingResponse azonnal továbbküld
+- A streamhez saját Session-t nyit (a kérés dependency session-je a
+  válasz küldése közben már nem használható), és a végén bezárja
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from backend.core_domain.business_day import business_date_of, business_range_bounds
+from backend.service_admin.config import settings
+from backend.service_admin.models.audit_log import AuditLog
+from backend.service_admin.models.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Támogatott export formátumok -> media type
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+SALES_EXPORT_FIELDS = [
+    "payment_id",
+    "order_id",
+    "business_date",
+    "paid_at",
+    "order_created_at",
+    "order_type",
+    "order_status",
+    "payment_method",
+    "amount",
+]
+
+AUDIT_LOG_EXPORT_FIELDS = [
+    "id",
+    "created_at",
+    "event_type",
+    "entity_type",
+    "entity_id",
+    "user_id",
+    "status",
+    "message",
+    "details",
+    "ip_address",
+]
+
+RowFactory = Callable[[Session], Iterable[Dict[str, Any]]]
+
+
+class ExportService:
+    """
+    Service osztály a streamelt exportokhoz.
+
+    Felelősségek:
+    - Sorok olvasása szerver oldali kurzorral (értékesítés, audit log)
+    - CSV / NDJSON kódolás darabokban
+    - StreamingResponse összeállítása saját session kezeléssel
+    """
+
+    # ========================================================================
+    # Kódolás
+    # ========================================================================
+
+    @staticmethod
+    def _json_value(value: Any) -> Any:
+        """Érték JSON-ba írható formára (dátum: ISO, Decimal: string)."""
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    @staticmethod
+    def _csv_value(value: Any) -> Any:
+        """Érték CSV cellára (dict/list: JSON string, None: üres cella)."""
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return ExportService._json_value(value)
+
+    @staticmethod
+    def encode_rows(
+        rows: Iterable[Dict[str, Any]],
+        fields: List[str],
+        export_format: str,
+        chunk_rows: int
+    ) -> Iterator[str]:
+        """
+        Sorok kódolása CSV vagy NDJSON darabokra.
+
+        Args:
+            rows: Sorok (dict) iterátora
+            fields: Oszlopok sorrendje (CSV fejléc)
+            export_format: 'csv' vagy 'ndjson'
+            chunk_rows: Ennyi soronként ad vissza egy darabot
+
+        Yields:
+            str: Kódolt darab (CSV-nél az első a fejléc)
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer is not None:
+            writer.writerow(fields)
+
+        pending = 0
+        for row in rows:
+            if writer is not None:
+                writer.writerow([ExportService._csv_value(row.get(field)) for field in fields])
+            else:
+                record = {field: ExportService._json_value(row.get(field)) for field in fields}
+                buffer.write(json.dumps(record, ensure_ascii=False, default=str))
+                buffer.write("\n")
+            pending += 1
+
+            if pending >= chunk_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    # ========================================================================
+    # Sor források (szerver oldali kurzor)
+    # ========================================================================
+
+    @staticmethod
+    def iter_sales_rows(db: Session, start_date: date, end_date: date) -> Iterator[Dict[str, Any]]:
+        """
+        Sikeres fizetések rendelés adatokkal, fizetési idő szerint rendezve.
+
+        Az étterem időzónája szerinti [start_date, end_date] üzleti napokra
+        félig nyitott időbélyeg tartománnyal szűr (ix_payments_status_created_at).
+
+        Args:
+            db: Database session
+            start_date: Első üzleti nap (inkluzív)
+            end_date: Utolsó üzleti nap (inkluzív)
+
+        Yields:
+            dict: SALES_EXPORT_FIELDS mezők
+        """
+        range_start, range_end = business_range_bounds(start_date, end_date, settings.venue_timezone)
+        query = text("""
+            SELECT
+                p.id AS payment_id,
+                p.order_id,
+                p.created_at AS paid_at,
+                o.created_at AS order_created_at,
+                o.order_type,
+                o.status AS order_status,
+                p.payment_method,
+                p.amount
+            FROM payments p
+            JOIN orders o ON o.id = p.order_id
+            WHERE p.status = 'SIKERES'
+                AND p.created_at >= :range_start AND p.created_at < :range_end
+            ORDER BY p.created_at, p.id
+        """)
+
+        result = db.execute(
+            query,
+            {"range_start": range_start, "range_end": range_end},
+            execution_options={"yield_per": settings.export_batch_size}
+        )
+        for row in result.mappings():
+            record = dict(row)
+            record["business_date"] = business_date_of(row["paid_at"], settings.venue_timezone)
+            yield record
+
+    @staticmethod
+    def iter_audit_log_rows(
+        db: Session,
+        event_type: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Audit log bejegyzések szűrési feltételekkel, időrendben.
+
+        Args:
+            db: Database session
+            event_type: Szűrés esemény típusra
+            entity_type: Szűrés entitás típusra
+            entity_id: Szűrés entitás ID-ra
+            status: Szűrés státuszra
+            start_date: Első üzleti nap (inkluzív, opcionális)
+            end_date: Utolsó üzleti nap (inkluzív, opcionális)
+
+        Yields:
+            dict: AUDIT_LOG_EXPORT_FIELDS mezők
+        """
+        query = select(*(getattr(AuditLog, field) for field in AUDIT_LOG_EXPORT_FIELDS))
+
+        if event_type:
+            query = query.where(AuditLog.event_type == event_type)
+        if entity_type:
+            query = query.where(AuditLog.entity_type == entity_type)
+        if entity_id:
+            query = query.where(AuditLog.entity_id == entity_id)
+        if status:
+            query = query.where(AuditLog.status == status)
+        if start_date:
+            range_start, _ = business_range_bounds(start_date, start_date, settings.venue_timezone)
+            query = query.where(AuditLog.created_at >= range_start)
+        if end_date:
+            _, range_end = business_range_bounds(end_date, end_date, settings.venue_timezone)
+            query = query.where(AuditLog.created_at < range_end)
+
+        query = query.order_by(AuditLog.created_at, AuditLog.id)
+
+        result = db.execute(query, execution_options={"yield_per": settings.export_batch_size})
+        for row in result.mappings():
+            yield dict(row)
+
+    # ========================================================================
+    # Streaming válasz
+    # ========================================================================
+
+    @staticmethod
+    def _stream(row_factory: RowFactory, fields: List[str], export_format: str) -> Iterator[str]:
+        """Saját session-nel olvasott, kódolt darabok (a végén a session bezárul)."""
+        db = SessionLocal()
+        try:
+            yield from ExportService.encode_rows(
+                row_factory(db),
+                fields,
+                export_format,
+                settings.export_batch_size
+            )
+        except Exception as e:
+            # A státusz kód már elment; a kliens csonka fájlt kap
+            logger.error(f"Export stream aborted: {str(e)}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def streaming_response(
+        row_factory: RowFactory,
+        fields: List[str],
+        export_format: str,
+        filename: str
+    ) -> StreamingResponse:
+        """
+        Streamelt export válasz.
+
+        Args:
+            row_factory: Session -> sorok iterátora (a stream közben hívódik)
+            fields: Oszlopok sorrendje
+            export_format: 'csv' vagy 'ndjson'
+            filename: Letöltési fájlnév kiterjesztés nélkül
+
+        Returns:
+            StreamingResponse: Darabolt (chunked) válasz Content-Disposition fejléccel
+        """
+        return StreamingResponse(
+            ExportService._stream(row_factory, fields, export_format),
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.{export_format}"',
+                "X-Accel-Buffering": "no",
+            }
+        )
@@ -9,14 +9,16 @@ Ez a service felelős a pénzügyi műveletek kezeléséért:
 """
 
 from typing import Optional, List, Dict
-from datetime import datetime, date
-from decimal import Decimal
+from datetime import datetime, date, timezone
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func
-import httpx
+from sqlalchemy import desc, and_, func, text
 import logging
 
+from backend.core_domain.business_day import business_date_of, business_day_bounds
 from backend.service_admin.models.finance import (
+    CASH_BALANCE_CHECKPOINT_ID,
+    CashBalanceCheckpoint,
     CashMovement,
     CashMovementType,
     DailyClosure,
@@ -27,6 +29,24 @@ from backend.service_admin.config import settings
 # Logger inicializálás
 logger = logging.getLogger(__name__)
 
+# Fizetési mód -> napi zárás összeg oszlop
+PAYMENT_METHOD_TOTAL_COLUMNS = {
+    'KESZPENZ': 'total_cash',
+    'KARTYA': 'total_card',
+    'SZEP_KARTYA': 'total_szep_card',
+    'VOUCHER': 'total_voucher',
+    'ATUTALAS': 'total_transfer',
+}
+
+CLOSURE_TOTAL_COLUMNS = (
+    'total_cash',
+    'total_card',
+    'total_szep_card',
+    'total_voucher',
+    'total_transfer',
+    'total_revenue',
+)
+
 
 class FinanceService:
     """
@@ -48,6 +68,24 @@ class FinanceService:
         """
         self.db = db
 
+    @staticmethod
+    def _closure_day_filter(day: date):
+        """
+        Zárás dátum szűrő egy üzleti napra (félig nyitott tartomány az
+        étterem időzónájában; a closure_date index használható).
+
+        Args:
+            day: Az üzleti nap
+
+        Returns:
+            SQLAlchemy feltétel
+        """
+        day_start, day_end = business_day_bounds(day, settings.venue_timezone)
+        return and_(
+            DailyClosure.closure_date >= day_start,
+            DailyClosure.closure_date < day_end
+        )
+
     # ========================================================================
     # Cash Movement Operations (Pénzmozgások)
     # ========================================================================
@@ -77,6 +115,7 @@ class FinanceService:
         if amount <= 0:
             raise ValueError("A befizetés összegének pozitívnak kell lennie")
 
+        checkpoint = self._lock_checkpoint()
         movement = CashMovement(
             movement_type=CashMovementType.CASH_IN,
             amount=amount,
@@ -85,11 +124,7 @@ class FinanceService:
             order_id=order_id
         )
 
-        self.db.add(movement)
-        self.db.commit()
-        self.db.refresh(movement)
-
-        return movement
+        return self._record_movement(checkpoint, movement)
 
     def record_cash_withdrawal(
         self,
@@ -116,9 +151,12 @@ class FinanceService:
         if amount <= 0:
             raise ValueError("A kivétel összegének pozitívnak kell lennie")
 
-        # Ellenőrizzük hogy van-e elegendő készpénz
-        current_balance = self.get_current_cash_balance()
+        # Ellenőrizzük hogy van-e elegendő készpénz (zárolt checkpoint mellett,
+        # így két párhuzamos kivétel nem viheti negatívba az egyenleget)
+        checkpoint = self._lock_checkpoint()
+        current_balance = self._balance_from(checkpoint)
         if current_balance < amount:
+            self.db.rollback()
             raise ValueError(
                 f"Nincs elegendő készpénz a kivételhez. "
                 f"Aktuális egyenleg: {current_balance}, Kért összeg: {amount}"
@@ -132,11 +170,7 @@ class FinanceService:
             order_id=order_id
         )
 
-        self.db.add(movement)
-        self.db.commit()
-        self.db.refresh(movement)
-
-        return movement
+        return self._record_movement(checkpoint, movement)
 
     def record_sale(
         self,
@@ -155,6 +189,7 @@ class FinanceService:
         Returns:
             CashMovement: Létrehozott pénzmozgás rekord
         """
+        checkpoint = self._lock_checkpoint()
         movement = CashMovement(
             movement_type=CashMovementType.SALE,
             amount=amount,
@@ -163,11 +198,7 @@ class FinanceService:
             order_id=order_id
         )
 
-        self.db.add(movement)
-        self.db.commit()
-        self.db.refresh(movement)
-
-        return movement
+        return self._record_movement(checkpoint, movement)
 
     def get_cash_movements(
         self,
@@ -215,18 +246,142 @@ class FinanceService:
         """
         Aktuális készpénz egyenleg lekérdezése.
 
-        Összegzi az összes pénzmozgást ami még nincs lezárt napi záráshoz rendelve.
+        A zárásra még nem rendelt pénzmozgások összege: a checkpoint
+        egyenlege + a checkpoint óta rögzített mozgások (általában nulla,
+        mert a rögzítés a checkpointot is lépteti).
 
         Returns:
             Decimal: Aktuális készpénz egyenleg
         """
-        result = self.db.query(
-            func.sum(CashMovement.amount)
-        ).filter(
+        checkpoint = self.db.query(CashBalanceCheckpoint).filter(
+            CashBalanceCheckpoint.id == CASH_BALANCE_CHECKPOINT_ID
+        ).first()
+
+        return self._balance_from(checkpoint)
+
+    def verify_cash_balance(self, repair: bool = False) -> Dict[str, object]:
+        """
+        Checkpoint konzisztencia ellenőrzés a teljes összeggel szemben.
+
+        A zárásra nem rendelt összes pénzmozgást összegzi (teljes scan), és
+        összeveti a checkpoint alapú egyenleggel. repair=True esetén eltérésnél
+        a checkpoint egyenlegét a teljes összegből újraszámolja.
+
+        Args:
+            repair: Eltérés esetén javítás
+
+        Returns:
+            dict: checkpoint_balance, last_movement_id, expected_checkpoint_balance,
+                  balance, full_sum_balance, difference, consistent, repaired
+        """
+        checkpoint = self._lock_checkpoint() if repair else self.db.query(CashBalanceCheckpoint).filter(
+            CashBalanceCheckpoint.id == CASH_BALANCE_CHECKPOINT_ID
+        ).first()
+
+        last_movement_id = checkpoint.last_movement_id if checkpoint else 0
+        checkpoint_balance = Decimal(checkpoint.balance) if checkpoint else Decimal("0.00")
+
+        expected_checkpoint_balance = self._open_movements_sum(up_to_id=last_movement_id)
+        full_sum_balance = self._open_movements_sum()
+        balance = self._balance_from(checkpoint)
+        consistent = balance == full_sum_balance and checkpoint_balance == expected_checkpoint_balance
+
+        repaired = False
+        if repair and not consistent:
+            logger.warning(
+                f"Cash balance checkpoint drift: checkpoint={checkpoint_balance}, "
+                f"expected={expected_checkpoint_balance} (last_movement_id={last_movement_id})"
+            )
+            checkpoint.balance = expected_checkpoint_balance
+            self.db.commit()
+            repaired = True
+        elif repair:
+            self.db.rollback()
+
+        return {
+            "checkpoint_balance": checkpoint_balance,
+            "last_movement_id": last_movement_id,
+            "expected_checkpoint_balance": expected_checkpoint_balance,
+            "balance": balance,
+            "full_sum_balance": full_sum_balance,
+            "difference": balance - full_sum_balance,
+            "consistent": consistent,
+            "repaired": repaired,
+        }
+
+    # ========================================================================
+    # Cash Balance Checkpoint (belső)
+    # ========================================================================
+
+    def _open_movements_sum(self, after_id: int = 0, up_to_id: Optional[int] = None) -> Decimal:
+        """Zárásra nem rendelt pénzmozgások összege az (after_id, up_to_id] ID tartományban."""
+        query = self.db.query(func.sum(CashMovement.amount)).filter(
             CashMovement.daily_closure_id.is_(None)
-        ).scalar()
+        )
+        if after_id:
+            query = query.filter(CashMovement.id > after_id)
+        if up_to_id is not None:
+            query = query.filter(CashMovement.id <= up_to_id)
+
+        return Decimal(query.scalar() or 0).quantize(Decimal("0.01"))
+
+    def _balance_from(self, checkpoint: Optional[CashBalanceCheckpoint]) -> Decimal:
+        """Egyenleg = checkpoint + a checkpoint utáni nyitott mozgások (checkpoint nélkül teljes összeg)."""
+        if checkpoint is None:
+            return self._open_movements_sum()
+
+        tail = self._open_movements_sum(after_id=checkpoint.last_movement_id)
+        return Decimal(checkpoint.balance) + tail
+
+    def _lock_checkpoint(self) -> CashBalanceCheckpoint:
+        """
+        Checkpoint sor zárolása (SELECT ... FOR UPDATE) a tranzakció végéig.
+
+        A pénzmozgás rögzítések és a napi zárás így sorba rendeződnek, a
+        mozgás ID-k a checkpoint léptetésének sorrendjében keletkeznek.
+        Ha a sor hiányzik, létrehozza (balance=0, last_movement_id=0: a
+        következő lekérdezés a teljes nyitott összeget számolja).
+        """
+        checkpoint = self.db.query(CashBalanceCheckpoint).filter(
+            CashBalanceCheckpoint.id == CASH_BALANCE_CHECKPOINT_ID
+        ).with_for_update().first()
+
+        if checkpoint is None:
+            checkpoint = CashBalanceCheckpoint(
+                id=CASH_BALANCE_CHECKPOINT_ID,
+                balance=Decimal("0.00"),
+                last_movement_id=0
+            )
+            self.db.add(checkpoint)
+            self.db.flush()
+
+        return checkpoint
+
+    def _record_movement(self, checkpoint: CashBalanceCheckpoint, movement: CashMovement) -> CashMovement:
+        """
+        Pénzmozgás mentése és a checkpoint léptetése egy tranzakcióban.
+
+        Args:
+            checkpoint: _lock_checkpoint által zárolt checkpoint
+            movement: Új pénzmozgás
+
+        Returns:
+            CashMovement: Mentett pénzmozgás
+        """
+        self.db.add(movement)
+        self.db.flush()  # ID kiosztás
+
+        # A checkpoint óta (más úton) rögzített mozgások is beszámítanak
+        checkpoint.balance = Decimal(checkpoint.balance) + self._open_movements_sum(
+            after_id=checkpoint.last_movement_id,
+            up_to_id=movement.id
+        )
+        checkpoint.last_movement_id = movement.id
+
+        self.db.commit()
+        self.db.refresh(movement)
 
-        return result or Decimal("0.00")
+        return movement
 
     # ========================================================================
     # Daily Closure Operations (Napi Pénztárzárás)
@@ -242,8 +397,10 @@ class FinanceService:
         """
         Napi pénztárzárás létrehozása.
 
-        Automatikusan aggregálja a lezárt rendelésekből a bevételeket
-        fizetési módok szerint (KESZPENZ, KARTYA, SZEP_KARTYA).
+        A nap lezárt rendeléseinek bevételeit fizetési módok szerint
+        (KESZPENZ, KARTYA, SZEP_KARTYA, VOUCHER, ATUTALAS), a rendelésszámot
+        és az ÁFA bontást a materializált napi számokból veszi
+        (get_closure_figures).
 
         Args:
             opening_balance: Nyitó egyenleg
@@ -258,11 +415,11 @@ class FinanceService:
             ValueError: Ha már van nyitott zárás a mai napra
         """
         # Ellenőrizzük hogy van-e már nyitott zárás ma
-        target_date = closure_date or datetime.now()
-        today = target_date.date()
+        target_date = closure_date or datetime.now(timezone.utc)
+        today = business_date_of(target_date, settings.venue_timezone)
         existing_closure = self.db.query(DailyClosure).filter(
             and_(
-                func.date(DailyClosure.closure_date) == today,
+                self._closure_day_filter(today),
                 DailyClosure.status != ClosureStatus.CLOSED
             )
         ).first()
@@ -270,94 +427,189 @@ class FinanceService:
         if existing_closure:
             raise ValueError("Már van nyitott pénztárzárás a mai napra")
 
-        # Aggregáljuk a bevételeket fizetési módok szerint
+        # Bevételek fizetési módok szerint
         # FONTOS: Csak LEZART státuszú rendelésekből és SIKERES fizetésekből számolunk
-        revenue_data = self._aggregate_daily_revenue(today)
+        figures = self.get_closure_figures(today)
 
         closure = DailyClosure(
             closure_date=target_date,
             status=ClosureStatus.OPEN,
             opening_balance=opening_balance,
-            total_cash=revenue_data['total_cash'],
-            total_card=revenue_data['total_card'],
-            total_szep_card=revenue_data['total_szep_card'],
-            total_revenue=revenue_data['total_revenue'],
             notes=notes,
             closed_by_employee_id=closed_by_employee_id
         )
 
+        self._apply_figures(closure, figures)
+
         self.db.add(closure)
         self.db.commit()
         self.db.refresh(closure)
 
         return closure
 
-    def _aggregate_daily_revenue(self, target_date: date) -> dict:
+    @staticmethod
+    def _apply_figures(closure: DailyClosure, figures: Dict[str, object]) -> None:
+        """A napi számok átmásolása a zárás rekordba."""
+        for column in CLOSURE_TOTAL_COLUMNS:
+            setattr(closure, column, figures[column])
+        closure.order_count = figures["order_count"]
+        closure.payment_summary = figures["payment_summary"]
+        closure.vat_breakdown = figures["vat_breakdown"]
+
+    def get_closure_figures(self, business_date: date) -> Dict[str, object]:
         """
-        Aggregálja a napi bevételeket fizetési módok szerint.
+        Napi pénztárzárás számai egy üzleti napra (materializált).
 
-        Csak LEZART státuszú rendelésekből és SIKERES fizetésekből számol.
+        A daily_closure_figures sorát használja, amíg az nem elavult; a
+        service_orders minden lezárásnál / fizetésnél (késői fizetésnél is)
+        elavultnak jelöli a rendelés napjának sorát. Elavult vagy hiányzó
+        sor esetén zárolja a sort, egyetlen aggregáló lekérdezéssel
+        újraszámol, és elmenti (commit).
 
         Args:
-            target_date: Cél dátum amihez a bevételeket aggregáljuk
+            business_date: Az üzleti nap
 
         Returns:
-            dict: Bevételek fizetési módok szerint
-                {
-                    'total_cash': Decimal,
-                    'total_card': Decimal,
-                    'total_szep_card': Decimal,
-                    'total_revenue': Decimal
-                }
-        """
-        from backend.service_orders.models.order import Order
-        from backend.service_orders.models.payment import Payment
-
-        # Lekérdezzük a mai napi LEZART rendeléseket
-        start_of_day = datetime.combine(target_date, datetime.min.time())
-        end_of_day = datetime.combine(target_date, datetime.max.time())
-
-        # Összesítjük a fizetéseket típus szerint
-        # CSAK LEZART rendelésekből és SIKERES fizetésekből
-        payment_query = self.db.query(
-            Payment.payment_method,
-            func.sum(Payment.amount).label('total')
-        ).join(
-            Order, Payment.order_id == Order.id
-        ).filter(
-            and_(
-                Order.status == 'LEZART',
-                Payment.status == 'SIKERES',
-                Order.created_at >= start_of_day,
-                Order.created_at <= end_of_day
-            )
-        ).group_by(Payment.payment_method)
-
-        payment_results = payment_query.all()
+            dict: total_cash, total_card, total_szep_card, total_voucher,
+                total_transfer, total_revenue (Decimal), order_count,
+                payment_summary, vat_breakdown, computed_at
+        """
+        from backend.service_orders.models.sales_rollup import DailyClosureFigures
 
-        # Inicializáljuk az összegeket nullára
-        total_cash = Decimal('0.00')
-        total_card = Decimal('0.00')
-        total_szep_card = Decimal('0.00')
+        row = self.db.query(DailyClosureFigures).filter(
+            DailyClosureFigures.business_date == business_date
+        ).first()
+        if row is not None and not row.is_stale:
+            return self._figures_from_row(row)
 
-        # Osztályozzuk a fizetéseket
-        for payment_method, total in payment_results:
-            if payment_method == 'KESZPENZ':
-                total_cash += total
-            elif payment_method == 'KARTYA':
-                total_card += total
-            elif payment_method == 'SZEP_KARTYA':
-                total_szep_card += total
+        self._ensure_figures_row(business_date)
 
-        # Összes bevétel
-        total_revenue = total_cash + total_card + total_szep_card
+        try:
+            # Zárolás: a nap közben rögzített fizetés megvárja az újraszámolást,
+            # utána ismét elavultnak jelöli a sort
+            row = self.db.query(DailyClosureFigures).filter(
+                DailyClosureFigures.business_date == business_date
+            ).populate_existing().with_for_update().one()
+
+            if row.is_stale:
+                figures = self._compute_closure_figures(business_date)
+                for column, value in figures.items():
+                    setattr(row, column, value)
+                row.is_stale = False
+                row.computed_at = datetime.now(timezone.utc)
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return self._figures_from_row(row)
+
+    def _ensure_figures_row(self, business_date: date) -> None:
+        """Elavult figures sor beszúrása, ha a napra még nincs (commit)."""
+        from backend.service_orders.models.sales_rollup import DailyClosureFigures
+
+        table = DailyClosureFigures.__table__
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            if self.db.get(DailyClosureFigures, business_date) is None:
+                self.db.add(DailyClosureFigures(business_date=business_date, is_stale=True))
+                self.db.commit()
+            return
+
+        self.db.execute(
+            insert(table)
+            .values(business_date=business_date, is_stale=True)
+            .on_conflict_do_nothing(index_elements=['business_date'])
+        )
+        self.db.commit()
 
-        return {
-            'total_cash': total_cash,
-            'total_card': total_card,
-            'total_szep_card': total_szep_card,
-            'total_revenue': total_revenue
+    @staticmethod
+    def _figures_from_row(row) -> Dict[str, object]:
+        """DailyClosureFigures sor -> figures dict."""
+        figures: Dict[str, object] = {
+            column: Decimal(str(getattr(row, column) or 0)).quantize(Decimal("0.01"))
+            for column in CLOSURE_TOTAL_COLUMNS
         }
+        figures["order_count"] = row.order_count or 0
+        figures["payment_summary"] = row.payment_summary or {}
+        figures["vat_breakdown"] = row.vat_breakdown or {}
+        figures["computed_at"] = row.computed_at
+        return figures
+
+    def _compute_closure_figures(self, business_date: date) -> Dict[str, object]:
+        """
+        Egy üzleti nap pénztárzárás számai egyetlen aggregáló lekérdezéssel.
+
+        A nap LEZART rendelései (félig nyitott created_at tartomány az
+        étterem időzónájában, ix_orders_status_created_at) alapján:
+        - SIKERES fizetések fizetési módonként
+        - Rendelésszám és bruttó összeg ÁFA kulcsonként
+
+        Args:
+            business_date: Az üzleti nap
+
+        Returns:
+            dict: DailyClosureFigures oszlopai (total_*, order_count,
+                payment_summary, vat_breakdown)
+        """
+        start_of_day, end_of_day = business_day_bounds(business_date, settings.venue_timezone)
+
+        query = text("""
+            WITH day_orders AS (
+                SELECT id, final_vat_rate, total_amount
+                FROM orders
+                WHERE status = 'LEZART'
+                    AND created_at >= :start_of_day AND created_at < :end_of_day
+            )
+            SELECT p.payment_method AS payment_method, CAST(NULL AS NUMERIC) AS vat_rate,
+                   COUNT(*) AS row_count, COALESCE(SUM(p.amount), 0) AS amount
+            FROM payments p
+            JOIN day_orders d ON d.id = p.order_id
+            WHERE p.status = 'SIKERES'
+            GROUP BY p.payment_method
+            UNION ALL
+            SELECT CAST(NULL AS VARCHAR(50)), final_vat_rate,
+                   COUNT(*), COALESCE(SUM(total_amount), 0)
+            FROM day_orders
+            GROUP BY final_vat_rate
+        """)
+
+        figures: Dict[str, object] = {column: Decimal("0.00") for column in CLOSURE_TOTAL_COLUMNS}
+        payment_summary: Dict[str, float] = {}
+        vat_breakdown: Dict[str, Dict[str, float]] = {}
+        order_count = 0
+
+        for row in self.db.execute(query, {"start_of_day": start_of_day, "end_of_day": end_of_day}):
+            amount = Decimal(str(row.amount)).quantize(Decimal("0.01"))
+
+            if row.payment_method is not None:
+                payment_summary[row.payment_method] = float(amount)
+                column = PAYMENT_METHOD_TOTAL_COLUMNS.get(row.payment_method)
+                if column:
+                    figures[column] += amount
+                figures["total_revenue"] += amount
+                continue
+
+            order_count += row.row_count
+            rate = Decimal(str(row.vat_rate if row.vat_rate is not None else 0)).quantize(Decimal("0.01"))
+            net = (amount / (1 + rate / 100)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            vat_breakdown[str(rate)] = {
+                "order_count": row.row_count,
+                "gross": float(amount),
+                "net": float(net),
+                "vat": float(amount - net),
+            }
+
+        figures["order_count"] = order_count
+        figures["payment_summary"] = payment_summary
+        figures["vat_breakdown"] = vat_breakdown
+        return figures
 
     def close_daily_closure(
         self,
@@ -389,23 +641,24 @@ class FinanceService:
         if closure.status == ClosureStatus.CLOSED:
             raise ValueError("A zárás már lezárt")
 
-        # Várható záró egyenleg számítása
-        movements_sum = self.db.query(
-            func.sum(CashMovement.amount)
-        ).filter(
-            CashMovement.daily_closure_id.is_(None)
-        ).scalar() or Decimal("0.00")
+        # A nap számai (a nyitás óta rögzített / késői fizetésekkel frissítve);
+        # a checkpoint zárolása előtt, mert a frissítés commitol
+        figures = self.get_closure_figures(
+            business_date_of(closure.closure_date, settings.venue_timezone)
+        )
 
-        expected_closing_balance = closure.opening_balance + movements_sum
+        # Várható záró egyenleg számítása a checkpointból (zárolva: a zárás
+        # és a mozgások hozzárendelése alatt nem kerül be új pénzmozgás)
+        checkpoint = self._lock_checkpoint()
+        movements_sum = self._balance_from(checkpoint)
 
-        # Fizetési módok szerinti összegzés lekérése a service_orders-től
-        payment_summary = self._fetch_payment_summary(closure.closure_date)
+        expected_closing_balance = closure.opening_balance + movements_sum
 
         # Frissítjük a zárást
         closure.expected_closing_balance = expected_closing_balance
         closure.actual_closing_balance = actual_closing_balance
         closure.difference = actual_closing_balance - expected_closing_balance
-        closure.payment_summary = payment_summary  # Fizetési módok szerinti bontás
+        self._apply_figures(closure, figures)  # Fizetési módok és ÁFA szerinti bontás
         closure.status = ClosureStatus.CLOSED
         closure.closed_at = datetime.now()
 
@@ -417,50 +670,16 @@ class FinanceService:
             CashMovement.daily_closure_id.is_(None)
         ).update({"daily_closure_id": closure_id})
 
+        # Új checkpoint: minden eddigi mozgás lezárva, a nyitott egyenleg nulla
+        checkpoint.balance = Decimal("0.00")
+        checkpoint.last_movement_id = self.db.query(func.max(CashMovement.id)).scalar() or 0
+        checkpoint.daily_closure_id = closure_id
+
         self.db.commit()
         self.db.refresh(closure)
 
         return closure
 
-    def _fetch_payment_summary(self, closure_date: datetime) -> Optional[Dict[str, float]]:
-        """
-        Fizetési módok szerinti összegzés lekérése a service_orders-től.
-
-        Args:
-            closure_date: A zárás dátuma
-
-        Returns:
-            Optional[Dict[str, float]]: Fizetési módok szerinti összegzés vagy None hiba esetén
-        """
-        try:
-            # Dátum konvertálása ISO formátumra (YYYY-MM-DD)
-            target_date = closure_date.date().isoformat()
-
-            # HTTP kérés a service_orders felé
-            url = f"{settings.orders_service_url}/api/v1/reports/daily-payments"
-            params = {"target_date": target_date}
-
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(url, params=params)
-                response.raise_for_status()  # Raise exception for 4xx/5xx responses
-
-            payment_summary = response.json()
-            logger.info(f"Fizetési összegzés sikeresen lekérve: {payment_summary}")
-
-            return payment_summary
-
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                f"HTTP hiba a fizetési összegzés lekérésekor: {e.response.status_code} - {e.response.text}"
-            )
-            return None
-        except httpx.RequestError as e:
-            logger.error(f"Hálózati hiba a fizetési összegzés lekérésekor: {str(e)}")
-            return None
-        except Exception as e:
-            logger.error(f"Váratlan hiba a fizetési összegzés lekérésekor: {str(e)}")
-            return None
-
     def get_daily_closures(
         self,
         start_date: Optional[date] = None,
@@ -485,10 +704,12 @@ class FinanceService:
         query = self.db.query(DailyClosure)
 
         if start_date:
-            query = query.filter(func.date(DailyClosure.closure_date) >= start_date)
+            range_start, _ = business_day_bounds(start_date, settings.venue_timezone)
+            query = query.filter(DailyClosure.closure_date >= range_start)
 
         if end_date:
-            query = query.filter(func.date(DailyClosure.closure_date) <= end_date)
+            _, range_end = business_day_bounds(end_date, settings.venue_timezone)
+            query = query.filter(DailyClosure.closure_date < range_end)
 
         if status:
             query = query.filter(DailyClosure.status == status)
@@ -523,7 +744,7 @@ class FinanceService:
             Optional[DailyClosure]: Napi zárás vagy None
         """
         return self.db.query(DailyClosure).filter(
-            func.date(DailyClosure.closure_date) == target_date
+            self._closure_day_filter(target_date)
         ).first()
 
     def get_current_open_closure(self) -> Optional[DailyClosure]:
@@ -533,10 +754,10 @@ class FinanceService:
         Returns:
             Optional[DailyClosure]: Nyitott napi zárás vagy None
         """
-        today = datetime.now().date()
+        today = business_date_of(None, settings.venue_timezone)
         return self.db.query(DailyClosure).filter(
             and_(
-                func.date(DailyClosure.closure_date) == today,
+                self._closure_day_filter(today),
                 DailyClosure.status == ClosureStatus.OPEN
             )
         ).first()
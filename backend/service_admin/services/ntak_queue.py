@@ -0,0 +1,592 @@
+"""
+NTAK Queue - Kötegelt NTAK adatszolgáltatás háttér-workerrel
+Module 8: Adminisztráció és NTAK
+
+A /internal/report-order végpont korábban rendelésenként, a kérés
+szálában kérte le a rendelést HTTP-n, küldte el az NTAK-nak, és
+(NtakService.send_order_summary esetén) egy második HTTP PATCH-csel írta
+vissza az eredményt az Orders Service-be.
+
+Működés:
+1. NtakQueueService.enqueue(): a végpont csak sorba állítja a rendelést
+   (ntak_submissions, rendelésenként egy sor; ismételt jelentés nem duplikál)
+2. Az NtakBatchWorker beküldési ablakonként (ntak_batch_window_seconds)
+   lefoglalja a due sorokat (FOR UPDATE SKIP LOCKED + lease), a
+   rendeléseket tömegesen olvassa a megosztott adatbázisból, és
+   legfeljebb ntak_batch_size rendelést EGY NTAK kérésben küld el
+3. Az eredményeket egy tranzakcióban rögzíti: sor státuszok, a rendelések
+   ntak_data mezője (tömeges UPDATE) és az audit log bejegyzések
+4. Hiba esetén exponenciális backoff, max próbálkozás után FAILED
+
+Metrikák: queue_stats() (sor mélység, legrégebbi várakozó kora) és
+NtakBatchWorker.stats() (kötegek, elfogadott / elutasított rendelések).
+"""
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.service_admin.config import settings
+from backend.service_admin.models.database import SessionLocal
+from backend.service_admin.models.ntak_submission import NtakSubmission, NtakSubmissionStatus
+from backend.service_admin.schemas.ntak import NTAKResponse
+from backend.service_admin.services.audit_log_service import AuditLogService
+from backend.service_admin.services.ntak_service import ntak_service, order_ntak_data
+from backend.service_admin.services.product_catalog import product_catalog
+
+logger = logging.getLogger(__name__)
+
+# NTAK válasz hibakódok, amelyek után érdemes újrapróbálni
+RETRYABLE_ERROR_CODES = {"MISSING_RESULT"}
+
+
+def _utcnow() -> datetime:
+    """Aktuális időpont (UTC, timezone-aware)."""
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Időbélyeg UTC-ként (a naiv értékek UTC-ben tárolódnak)."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+class NtakQueueService:
+    """
+    NTAK beküldési sor kezelése (sorba állítás, lefoglalás, eredmény rögzítés).
+    """
+
+    @staticmethod
+    def enqueue(db: Session, order_id: int, force_resend: bool = False) -> NtakSubmission:
+        """
+        Rendelés sorba állítása NTAK beküldésre (commit).
+
+        Idempotens: a már sorban lévő vagy elküldött rendelés nem kerül be
+        újra. Végleg sikertelen (FAILED) rendelés ismételt jelentése, illetve
+        force_resend újra esedékessé teszi a sort.
+
+        Args:
+            db: Database session
+            order_id: Rendelés azonosító
+            force_resend: Már elküldött rendelés újraküldése
+
+        Returns:
+            NtakSubmission: A rendelés beküldési sora
+        """
+        now = _utcnow()
+        submission = db.query(NtakSubmission).filter(NtakSubmission.order_id == order_id).first()
+
+        if submission is None:
+            submission = NtakSubmission(
+                order_id=order_id,
+                status=NtakSubmissionStatus.PENDING,
+                attempts=0,
+                next_attempt_at=now,
+                enqueued_at=now
+            )
+            db.add(submission)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Párhuzamos jelentés ugyanarra a rendelésre
+                db.rollback()
+                return db.query(NtakSubmission).filter(NtakSubmission.order_id == order_id).one()
+            db.refresh(submission)
+            return submission
+
+        if submission.status == NtakSubmissionStatus.FAILED or (
+            force_resend and submission.status == NtakSubmissionStatus.SENT
+        ):
+            submission.status = NtakSubmissionStatus.PENDING
+            submission.attempts = 0
+            submission.next_attempt_at = now
+            submission.enqueued_at = now
+            submission.last_error = None
+            db.commit()
+            db.refresh(submission)
+
+        return submission
+
+    @staticmethod
+    def claim_due(db: Session, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        """
+        Esedékes sorok lefoglalása beküldésre (commit).
+
+        FOR UPDATE SKIP LOCKED: több worker / példány párhuzamosan is futhat.
+        A next_attempt_at a lease idejére előre tolódik; ha a worker a lease
+        alatt leáll, a sor a lease lejárta után újra esedékes.
+
+        Args:
+            db: Database session
+            limit: Maximálisan lefoglalt sorok száma (köteg méret)
+            lease_seconds: Lefoglalás időtartama másodpercben
+
+        Returns:
+            List[dict]: Lefoglalt sorok (id, order_id, attempts, enqueued_at)
+        """
+        now = _utcnow()
+        rows = db.query(NtakSubmission).filter(
+            NtakSubmission.status == NtakSubmissionStatus.PENDING,
+            NtakSubmission.next_attempt_at <= now
+        ).order_by(
+            NtakSubmission.next_attempt_at, NtakSubmission.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=lease_seconds)
+            claimed.append({
+                "id": row.id,
+                "order_id": row.order_id,
+                "attempts": row.attempts,
+                "enqueued_at": _as_utc(row.enqueued_at),
+            })
+
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def load_orders(db: Session, order_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Rendelések tételekkel és sikeres fizetésekkel, tömegesen (3 lekérdezés).
+
+        Rendelésenkénti HTTP lekérés helyett a megosztott adatbázisból olvas;
+        a dict formátuma megegyezik az Orders Service válaszával
+        (NtakService.build_order_summary bemenete).
+
+        Args:
+            db: Database session
+            order_ids: Rendelés azonosítók
+
+        Returns:
+            Dict[int, dict]: order_id -> rendelés adatok (order_items, payments)
+        """
+        from backend.service_orders.models.order import Order
+        from backend.service_orders.models.order_item import OrderItem
+        from backend.service_orders.models.payment import Payment
+
+        if not order_ids:
+            return {}
+
+        orders: Dict[int, Dict[str, Any]] = {}
+        for order in db.query(
+            Order.id, Order.order_type, Order.status, Order.total_amount,
+            Order.final_vat_rate, Order.table_id, Order.created_at
+        ).filter(Order.id.in_(order_ids)):
+            orders[order.id] = {
+                "id": order.id,
+                "order_type": order.order_type,
+                "status": order.status,
+                "total_amount": order.total_amount,
+                "final_vat_rate": order.final_vat_rate,
+                "table_id": order.table_id,
+                "created_at": _as_utc(order.created_at).isoformat(),
+                "order_items": [],
+                "payments": [],
+            }
+
+        for item in db.query(
+            OrderItem.order_id, OrderItem.product_id, OrderItem.quantity, OrderItem.unit_price
+        ).filter(OrderItem.order_id.in_(list(orders))).order_by(OrderItem.id):
+            orders[item.order_id]["order_items"].append({
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+            })
+
+        for payment in db.query(
+            Payment.order_id, Payment.payment_method, Payment.amount
+        ).filter(
+            Payment.order_id.in_(list(orders)),
+            Payment.status == 'SIKERES'
+        ).order_by(Payment.id):
+            orders[payment.order_id]["payments"].append({
+                "payment_method": payment.payment_method,
+                "amount": payment.amount,
+            })
+
+        return orders
+
+    @staticmethod
+    def record_results(db: Session, results: List[Dict[str, Any]], batch_id: str) -> Dict[str, int]:
+        """
+        Beküldési eredmények rögzítése EGY tranzakcióban.
+
+        - Sor státuszok (SENT / újrapróbálás backoff-fal / FAILED)
+        - Végleges eredmények: a rendelések ntak_data mezője (tömeges UPDATE)
+          és NTAK_SEND audit log bejegyzések
+
+        Args:
+            db: Database session
+            results: [{"id", "order_id", "success", "retryable", "error",
+                "response": Optional[NTAKResponse]}, ...]
+            batch_id: A köteg azonosítója
+
+        Returns:
+            dict: sent, retrying, failed darabszámok
+        """
+        from backend.service_orders.models.order import Order
+
+        counts = {"sent": 0, "retrying": 0, "failed": 0}
+        if not results:
+            return counts
+
+        now = _utcnow()
+        submissions = {
+            row.id: row
+            for row in db.query(NtakSubmission).filter(
+                NtakSubmission.id.in_([result["id"] for result in results])
+            )
+        }
+
+        order_updates: List[Dict[str, Any]] = []
+        audit_entries: List[Dict[str, Any]] = []
+
+        try:
+            for result in results:
+                submission = submissions.get(result["id"])
+                if submission is None:
+                    continue
+                response: Optional[NTAKResponse] = result.get("response")
+
+                if result["success"]:
+                    submission.status = NtakSubmissionStatus.SENT
+                    submission.sent_at = now
+                    submission.transaction_id = response.transaction_id if response else None
+                    submission.batch_id = batch_id
+                    submission.last_error = None
+                    counts["sent"] += 1
+                elif result["retryable"] and submission.attempts < settings.ntak_max_attempts:
+                    submission.next_attempt_at = now + timedelta(
+                        seconds=NtakQueueService.backoff_seconds(submission.attempts)
+                    )
+                    submission.last_error = result["error"]
+                    counts["retrying"] += 1
+                    continue
+                else:
+                    submission.status = NtakSubmissionStatus.FAILED
+                    submission.batch_id = batch_id
+                    submission.last_error = result["error"]
+                    counts["failed"] += 1
+                    logger.error(
+                        f"NTAK submission of order {submission.order_id} failed permanently "
+                        f"after {submission.attempts} attempts: {result['error']}"
+                    )
+
+                if response is not None:
+                    order_updates.append({"id": submission.order_id, "ntak_data": order_ntak_data(response)})
+
+                audit_entries.append({
+                    "order_id": submission.order_id,
+                    "success": result["success"],
+                    "message": (
+                        f"NTAK rendelésösszesítő elküldve - TX: {response.transaction_id}"
+                        if result["success"] and response
+                        else f"NTAK beküldés sikertelen: {result['error']}"
+                    ),
+                    "details": {
+                        "batch_id": batch_id,
+                        "attempts": submission.attempts,
+                        "transaction_id": response.transaction_id if response else None,
+                        "ntak_response": response.model_dump(mode="json", exclude={"submitted_data"}) if response else None,
+                        "error": result["error"],
+                    },
+                })
+
+            if order_updates:
+                db.execute(update(Order), order_updates)
+            AuditLogService(db).log_ntak_batch(audit_entries, commit=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return counts
+
+    @staticmethod
+    def backoff_seconds(attempts: int) -> float:
+        """
+        Exponenciális backoff jitterrel.
+
+        Args:
+            attempts: Eddigi próbálkozások száma (>= 1)
+
+        Returns:
+            float: Várakozás másodpercben
+        """
+        delay = min(
+            settings.ntak_backoff_base_seconds * (2 ** max(attempts - 1, 0)),
+            settings.ntak_backoff_max_seconds
+        )
+        return delay * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def queue_stats(db: Session) -> Dict[str, Any]:
+        """
+        Sor metrikák (monitoringhoz).
+
+        Returns:
+            dict: pending, due, sent, failed darabszámok, oldest_pending_at,
+                lag_seconds (a legrégebben várakozó rendelés kora)
+        """
+        now = _utcnow()
+        counts = dict(
+            db.query(NtakSubmission.status, func.count(NtakSubmission.id))
+            .group_by(NtakSubmission.status)
+            .all()
+        )
+        due = db.query(func.count(NtakSubmission.id)).filter(
+            NtakSubmission.status == NtakSubmissionStatus.PENDING,
+            NtakSubmission.next_attempt_at <= now
+        ).scalar()
+        oldest = _as_utc(
+            db.query(func.min(NtakSubmission.enqueued_at)).filter(
+                NtakSubmission.status == NtakSubmissionStatus.PENDING
+            ).scalar()
+        )
+
+        return {
+            "pending": counts.get(NtakSubmissionStatus.PENDING, 0),
+            "due": due or 0,
+            "sent": counts.get(NtakSubmissionStatus.SENT, 0),
+            "failed": counts.get(NtakSubmissionStatus.FAILED, 0),
+            "oldest_pending_at": oldest,
+            "lag_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+        }
+
+
+# ============================================================================
+# Background Worker
+# ============================================================================
+
+
+class NtakBatchWorker:
+    """
+    Háttérben futó kötegelt NTAK beküldő (asyncio task az admin szolgáltatásban).
+
+    A DB műveletek threadpool-ban futnak (szinkron SQLAlchemy session),
+    az NTAK hívás a megosztott, poolozott core_http kliensen.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._batches = 0
+        self._accepted = 0
+        self._rejected = 0
+        self._failed_attempts = 0
+        self._last_batch: Optional[Dict[str, Any]] = None
+
+    async def start(self) -> None:
+        """Worker indítása (startup eseményből)."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info("NTAK batch worker started")
+
+    async def stop(self) -> None:
+        """Worker leállítása (shutdown eseményből)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("NTAK batch worker stopped")
+
+    async def _run(self) -> None:
+        """Fő ciklus: beküldési ablakonként egy köteg (backlog esetén azonnal a következő)."""
+        while True:
+            try:
+                processed = await self.submit_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"NTAK batch cycle failed: {e}")
+                processed = 0
+
+            # Teli köteg után azonnal folytatjuk (backlog feldolgozás)
+            if processed >= settings.ntak_batch_size:
+                continue
+
+            await asyncio.sleep(settings.ntak_batch_window_seconds)
+
+    async def submit_once(self) -> int:
+        """
+        Egy köteg: lefoglalás, rendelések betöltése, beküldés, eredmény rögzítés.
+
+        Returns:
+            int: A kötegben feldolgozott rendelések száma
+        """
+        claimed = await asyncio.to_thread(self._claim)
+        if not claimed:
+            return 0
+
+        started = time.perf_counter()
+        batch_id = uuid.uuid4().hex
+        orders = await asyncio.to_thread(self._load, [entry["order_id"] for entry in claimed])
+        await self._attach_product_names(orders)
+
+        results: Dict[int, Dict[str, Any]] = {}
+        summaries = []
+        for entry in claimed:
+            result = {
+                "id": entry["id"],
+                "order_id": entry["order_id"],
+                "success": False,
+                "retryable": False,
+                "error": None,
+                "response": None,
+            }
+            results[entry["order_id"]] = result
+
+            order_data = orders.get(entry["order_id"])
+            if order_data is None:
+                result["error"] = "Rendelés nem található"
+                continue
+            try:
+                summaries.append(ntak_service.build_order_summary(order_data))
+            except ValueError as e:
+                result["error"] = str(e)
+
+        if summaries:
+            await self._submit(summaries, batch_id, results)
+
+        counts = await asyncio.to_thread(self._record, list(results.values()), batch_id)
+
+        now = _utcnow()
+        lags = [
+            (now - entry["enqueued_at"]).total_seconds()
+            for entry in claimed if entry["enqueued_at"] is not None
+        ]
+        self._batches += 1
+        self._accepted += counts["sent"]
+        self._rejected += counts["failed"]
+        self._failed_attempts += counts["retrying"] + counts["failed"]
+        self._last_batch = {
+            "batch_id": batch_id,
+            "size": len(claimed),
+            "submitted": len(summaries),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "max_lag_seconds": round(max(lags), 3) if lags else None,
+            "finished_at": now,
+            **counts,
+        }
+        return len(claimed)
+
+    async def _submit(self, summaries: List[Any], batch_id: str, results: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Egy NTAK kérés a köteg összes rendelésével; az eredmények a results-ba.
+
+        2xx: rendelésenkénti eredmény. 4xx (408/429 kivételével): nem
+        újrapróbálható. 5xx / hálózati hiba / timeout: újrapróbálható.
+        """
+        try:
+            responses = await ntak_service.send_batch(summaries, batch_id=batch_id)
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            retryable = status_code >= 500 or status_code in (408, 429)
+            error = f"HTTP {status_code}: {e.response.text[:500]}"
+            for summary in summaries:
+                results[summary.order_id].update(retryable=retryable, error=error)
+            logger.warning(f"NTAK batch {batch_id} rejected ({len(summaries)} orders): {error}")
+            return
+        except Exception as e:
+            # Hálózati hiba, DNS, timeout, stb.
+            error = f"{type(e).__name__}: {e}"
+            for summary in summaries:
+                results[summary.order_id].update(retryable=True, error=error)
+            logger.warning(f"NTAK batch {batch_id} failed ({len(summaries)} orders): {error}")
+            return
+
+        for order_id, response in responses.items():
+            results[order_id].update(
+                success=response.success,
+                retryable=not response.success and response.error_code in RETRYABLE_ERROR_CODES,
+                error=None if response.success else f"{response.error_code}: {response.message}",
+                response=response
+            )
+
+    @staticmethod
+    async def _attach_product_names(orders: Dict[int, Dict[str, Any]]) -> None:
+        """Tétel termék nevek a service_menu katalógusból (hiba esetén név nélkül)."""
+        product_ids = {
+            item["product_id"]
+            for order in orders.values()
+            for item in order["order_items"]
+        }
+        if not product_ids:
+            return
+        try:
+            products = await product_catalog.aget_many(product_ids)
+        except Exception as e:
+            logger.warning(f"Product names unavailable for NTAK batch: {e}")
+            return
+        for order in orders.values():
+            for item in order["order_items"]:
+                info = products.get(item["product_id"])
+                if info and info.get("name"):
+                    item["product_name"] = info["name"]
+
+    @staticmethod
+    def _claim() -> List[Dict[str, Any]]:
+        """Lefoglalás saját, rövid életű session-nel (threadpool-ban fut)."""
+        db = SessionLocal()
+        try:
+            return NtakQueueService.claim_due(
+                db,
+                limit=settings.ntak_batch_size,
+                lease_seconds=settings.ntak_lease_seconds
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def _load(order_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Rendelések betöltése saját session-nel (threadpool-ban fut)."""
+        db = SessionLocal()
+        try:
+            return NtakQueueService.load_orders(db, order_ids)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _record(results: List[Dict[str, Any]], batch_id: str) -> Dict[str, int]:
+        """Eredmények rögzítése saját session-nel (threadpool-ban fut)."""
+        db = SessionLocal()
+        try:
+            return NtakQueueService.record_results(db, results, batch_id)
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Worker statisztikák (monitoringhoz).
+
+        Returns:
+            dict: running, batches, accepted, rejected, failed_attempts, last_batch
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "batches": self._batches,
+            "accepted": self._accepted,
+            "rejected": self._rejected,
+            "failed_attempts": self._failed_attempts,
+            "last_batch": self._last_batch,
+        }
+
+
+# Singleton instance (folyamatonként egy)
+ntak_batch_worker = NtakBatchWorker()
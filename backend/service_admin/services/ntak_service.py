@@ -6,7 +6,7 @@ This service handles all NTAK (Nemzeti Turizmus Adatszolgáltatási Központ)
 data submission operations, including:
 - Fetching order data from the Orders Service
 - Transforming order data to NTAK-compliant format
-- Submitting data to NTAK API
+- Submitting data to NTAK API (single order or batch, see ntak_queue)
 - Updating order records with NTAK submission results
 
 Critical service for Hungarian tax compliance and tourism reporting.
@@ -19,6 +19,7 @@ from typing import Dict, Any, Optional, List
 
 import httpx
 
+from backend.core_http import get_async_client
 from backend.service_admin.config import settings
 from backend.service_admin.schemas.ntak import (
     NTAKOrderSummaryData,
@@ -31,6 +32,26 @@ from backend.service_admin.schemas.ntak import (
 logger = logging.getLogger(__name__)
 
 
+def order_ntak_data(ntak_response: NTAKResponse) -> Dict[str, Any]:
+    """
+    NTAK response -> the order's ntak_data field (submission audit trail).
+
+    Args:
+        ntak_response: NTAK API response for the order
+
+    Returns:
+        Dict: ntak_data value stored on the order
+    """
+    return {
+        "ntak_submitted": True,
+        "ntak_transaction_id": ntak_response.transaction_id,
+        "ntak_submission_timestamp": ntak_response.timestamp.isoformat(),
+        "ntak_submission_success": ntak_response.success,
+        "ntak_message": ntak_response.message,
+        "ntak_error_code": ntak_response.error_code
+    }
+
+
 class NtakService:
     """
     Service class for NTAK data submission and management.
@@ -98,12 +119,8 @@ class NtakService:
             raise
 
         # Step 2: Transform order data to NTAK format
-        try:
-            ntak_data = self._format_ntak_data(order_data)
-            logger.debug(f"Formatted NTAK data: {ntak_data}")
-        except (ValueError, KeyError) as e:
-            logger.error(f"Failed to format NTAK data for order {order_id}: {e}")
-            raise ValueError(f"Invalid order data for NTAK submission: {e}")
+        ntak_data = self.build_order_summary(order_data)
+        logger.debug(f"Formatted NTAK data: {ntak_data}")
 
         # Step 3: Submit to NTAK API
         try:
@@ -157,14 +174,33 @@ class NtakService:
         url = f"{self.orders_service_url}/orders/{order_id}"
         logger.debug(f"Fetching order from: {url}")
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()  # Raise exception for 4xx/5xx responses
+        client = get_async_client("orders")
+        response = await client.get(url, timeout=10.0)
+        response.raise_for_status()  # Raise exception for 4xx/5xx responses
 
         order_data = response.json()
         logger.debug(f"Successfully fetched order {order_id}")
         return order_data
 
+    def build_order_summary(self, order_data: Dict[str, Any]) -> NTAKOrderSummaryData:
+        """
+        Validate and transform order data to an NTAK order summary.
+
+        Args:
+            order_data: Order data (Orders Service response or queue loader dict)
+
+        Returns:
+            NTAKOrderSummaryData: NTAK-compliant order summary
+
+        Raises:
+            ValueError: If order data is invalid or incomplete
+        """
+        try:
+            return self._format_ntak_data(order_data)
+        except (ValueError, KeyError) as e:
+            logger.error(f"Failed to format NTAK data for order {order_data.get('id')}: {e}")
+            raise ValueError(f"Invalid order data for NTAK submission: {e}")
+
     def _format_ntak_data(self, order_data: Dict[str, Any]) -> NTAKOrderSummaryData:
         """
         Transform order data to NTAK-compliant format.
@@ -325,82 +361,124 @@ class NtakService:
 
     async def _send_to_ntak_api(self, ntak_data: NTAKOrderSummaryData) -> NTAKResponse:
         """
-        [DUMMY/MOCK] Submit NTAK data to the NTAK API.
-
-        This is a MOCK implementation that simulates successful NTAK API submission.
-        In production, this would make an actual HTTPS request to the NTAK
-        government service with proper authentication and encryption.
+        Submit a single order summary to the NTAK API.
 
-        NTAK API Requirements (for production implementation):
-        - HTTPS with TLS 1.2+
-        - API key authentication (settings.ntak_api_key)
-        - XML or JSON payload format (TBD based on NTAK specs)
-        - Digital signature for data integrity
-        - Response validation and error handling
+        Thin wrapper around send_batch() with a one-element batch; the
+        queued pipeline (NtakBatchWorker) calls send_batch() directly.
 
         Args:
             ntak_data: NTAK-compliant order summary data
 
         Returns:
-            NTAKResponse: Mock success response with transaction ID
+            NTAKResponse: NTAK response for the order
 
         Raises:
-            Exception: In production, would raise for network/API errors
+            httpx.HTTPStatusError: If NTAK rejects the request
+            httpx.RequestError: If network communication fails
+        """
+        responses = await self.send_batch([ntak_data])
+        return responses[ntak_data.order_id]
 
-        TODO: Replace with actual NTAK API integration when specs available
+    async def send_batch(
+        self,
+        summaries: List[NTAKOrderSummaryData],
+        batch_id: Optional[str] = None
+    ) -> Dict[int, NTAKResponse]:
         """
-        logger.info(
-            f"[MOCK] Sending NTAK data to API for order {ntak_data.order_id}"
-        )
+        Submit several order summaries to NTAK in one request.
+
+        Request: POST {ntak_api_url}/order-summaries/batch
+            {"restaurant_id", "tax_number", "batch_id", "summaries": [...]}
+        Response: {"results": [{"order_id", "success", "transaction_id",
+            "message", "error_code"}, ...]}
+
+        Orders missing from the response get an error response with
+        error_code "MISSING_RESULT" (the caller may retry them).
+
+        Args:
+            summaries: NTAK-compliant order summaries
+            batch_id: Batch identifier (sent to NTAK, stored with the results)
+
+        Returns:
+            Dict[int, NTAKResponse]: order_id -> NTAK response
+
+        Raises:
+            httpx.HTTPStatusError: If NTAK returns a 4xx/5xx status
+            httpx.RequestError: If network communication fails
+        """
+        now = datetime.utcnow()
 
-        # Check if NTAK is enabled
         if not self.ntak_enabled:
             logger.warning("NTAK submission skipped: NTAK is disabled in settings")
-            return NTAKResponse(
-                success=False,
-                message="NTAK adatszolgáltatás ki van kapcsolva",
-                transaction_id=None,
-                timestamp=datetime.utcnow(),
-                error_code="NTAK_DISABLED",
-                submitted_data=ntak_data
-            )
+            return {
+                summary.order_id: NTAKResponse(
+                    success=False,
+                    message="NTAK adatszolgáltatás ki van kapcsolva",
+                    transaction_id=None,
+                    timestamp=now,
+                    error_code="NTAK_DISABLED",
+                    submitted_data=summary
+                )
+                for summary in summaries
+            }
 
-        # MOCK: Simulate API call delay
-        # In production, this would be:
-        # async with httpx.AsyncClient() as client:
-        #     headers = {
-        #         "Authorization": f"Bearer {self.ntak_api_key}",
-        #         "Content-Type": "application/json",
-        #         "X-Restaurant-ID": self.ntak_restaurant_id,
-        #         "X-Tax-Number": self.ntak_tax_number
-        #     }
-        #     response = await client.post(
-        #         f"{self.ntak_api_url}/order-summary",
-        #         json=ntak_data.model_dump(),
-        #         headers=headers,
-        #         timeout=30.0
-        #     )
-        #     response.raise_for_status()
-        #     result = response.json()
-
-        # MOCK: Simulate successful response
-        transaction_id = (
-            f"NTAK-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-"
-            f"{ntak_data.order_id:06d}"
-        )
+        payload = {
+            "restaurant_id": self.ntak_restaurant_id,
+            "tax_number": self.ntak_tax_number,
+            "batch_id": batch_id,
+            "summaries": [summary.model_dump(mode="json") for summary in summaries],
+        }
+        headers = {
+            "Authorization": f"Bearer {self.ntak_api_key}",
+            "X-Restaurant-ID": self.ntak_restaurant_id,
+            "X-Tax-Number": self.ntak_tax_number,
+        }
 
-        logger.info(
-            f"[MOCK] NTAK submission successful: transaction_id={transaction_id}"
+        client = get_async_client("ntak")
+        response = await client.post(
+            f"{self.ntak_api_url}/order-summaries/batch",
+            json=payload,
+            headers=headers,
+            timeout=settings.ntak_request_timeout_seconds
         )
+        response.raise_for_status()
+
+        results = {
+            int(result["order_id"]): result
+            for result in response.json().get("results", [])
+        }
+
+        responses: Dict[int, NTAKResponse] = {}
+        for summary in summaries:
+            result = results.get(summary.order_id)
+            if result is None:
+                responses[summary.order_id] = NTAKResponse(
+                    success=False,
+                    message="Az NTAK válasz nem tartalmazza a rendelést",
+                    transaction_id=None,
+                    timestamp=now,
+                    error_code="MISSING_RESULT",
+                    submitted_data=summary
+                )
+                continue
+
+            responses[summary.order_id] = NTAKResponse(
+                success=bool(result.get("success")),
+                message=result.get("message") or (
+                    "Rendelésösszesítő sikeresen elküldve"
+                    if result.get("success") else "NTAK elutasította a rendelésösszesítőt"
+                ),
+                transaction_id=result.get("transaction_id"),
+                timestamp=now,
+                error_code=result.get("error_code"),
+                submitted_data=summary
+            )
 
-        return NTAKResponse(
-            success=True,
-            message="Rendelésösszesítő sikeresen elküldve (MOCK)",
-            transaction_id=transaction_id,
-            timestamp=datetime.utcnow(),
-            error_code=None,
-            submitted_data=ntak_data
+        logger.info(
+            f"NTAK batch {batch_id} submitted: {len(summaries)} orders, "
+            f"{sum(1 for item in responses.values() if item.success)} accepted"
         )
+        return responses
 
     async def _update_order_ntak_data(
         self,
@@ -429,14 +507,7 @@ class NtakService:
         logger.debug(f"Updating order NTAK data at: {url}")
 
         # Prepare NTAK data for order update
-        ntak_data_update = {
-            "ntak_submitted": True,
-            "ntak_transaction_id": ntak_response.transaction_id,
-            "ntak_submission_timestamp": ntak_response.timestamp.isoformat(),
-            "ntak_submission_success": ntak_response.success,
-            "ntak_message": ntak_response.message,
-            "ntak_error_code": ntak_response.error_code
-        }
+        ntak_data_update = order_ntak_data(ntak_response)
 
         # Prepare PATCH request payload
         update_payload = {
@@ -444,13 +515,14 @@ class NtakService:
         }
 
         # Send PATCH request to Orders Service
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.patch(
-                url,
-                json=update_payload,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
+        client = get_async_client("orders")
+        response = await client.patch(
+            url,
+            json=update_payload,
+            headers={"Content-Type": "application/json"},
+            timeout=10.0
+        )
+        response.raise_for_status()
 
         updated_order = response.json()
         logger.info(f"Successfully updated order {order_id} with NTAK data")
@@ -12,6 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from backend.service_admin.models.permission import Permission
+from backend.service_admin.permission_cache import permission_cache, permission_epoch_tracker
 from backend.service_admin.schemas.permission import PermissionCreate, PermissionUpdate
 
 
@@ -232,7 +233,9 @@ class PermissionService:
             permission.action = permission_data.action
 
         try:
+            permission_epoch_tracker.bump(self.db)
             self.db.commit()
+            permission_cache.invalidate_all()
             self.db.refresh(permission)
             return permission
         except IntegrityError as e:
@@ -267,7 +270,9 @@ class PermissionService:
 
         try:
             self.db.delete(permission)
+            permission_epoch_tracker.bump(self.db)
             self.db.commit()
+            permission_cache.invalidate_all()
             return True
         except IntegrityError as e:
             self.db.rollback()
@@ -324,7 +329,9 @@ class PermissionService:
         permission = self.get_permission(permission_id)
         permission.is_active = False
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_all()
         self.db.refresh(permission)
         return permission
 
@@ -344,7 +351,9 @@ class PermissionService:
         permission = self.get_permission(permission_id)
         permission.is_active = True
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_all()
         self.db.refresh(permission)
         return permission
 
@@ -0,0 +1,19 @@
+"""
+Product Catalog - Termék metaadatok a service_menu felől (riportokhoz)
+
+A top termék riportok termék nevei és kategóriái a megosztott core_http
+ProductCatalog gyorsítótárból jönnek: a hiányzókra egy tömeges hívás
+(POST /api/v1/internal/products/lookup), érvénytelenítés a service_menu katalógus
+verziója (ETag) szerint, legfeljebb `product_catalog_revalidate_seconds`
+késéssel.
+"""
+
+from backend.core_http import ProductCatalog
+from backend.service_admin.config import settings
+
+
+# Singleton instance (folyamatonként egy)
+product_catalog = ProductCatalog(
+    base_url=settings.menu_service_url,
+    revalidate_seconds=settings.product_catalog_revalidate_seconds
+)
@@ -5,14 +5,16 @@ This service provides aggregated data from multiple services (orders, inventory)
 for sales reports, top products analysis, and inventory consumption tracking.
 """
 
+import logging
 from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional, Dict, Any
 from sqlalchemy import func, desc, and_, text
 from sqlalchemy.orm import Session
-import httpx
 
-from backend.service_admin.config import settings
+from backend.service_admin.services.product_catalog import product_catalog
+
+logger = logging.getLogger(__name__)
 
 
 class ReportingService:
@@ -40,34 +42,20 @@ class ReportingService:
         Returns:
             Dictionary containing sales metrics and breakdowns
         """
-        # Query orders within date range
+        # Az orders szolgáltatás által karbantartott napi összesítőből olvasunk
+        # (daily_sales_rollup): payment_method = '*' sorok a lezárt rendelések,
+        # a többi a sikeres fizetések fizetési módonként
         query = text("""
-            WITH daily_sales AS (
-                SELECT
-                    DATE(o.created_at) as sale_date,
-                    COUNT(DISTINCT o.id) as order_count,
-                    COALESCE(SUM(o.total_amount), 0) as total_revenue,
-                    COALESCE(AVG(o.total_amount), 0) as avg_cart_value
-                FROM orders o
-                WHERE o.status IN ('FELDOLGOZVA', 'LEZART')
-                    AND DATE(o.created_at) BETWEEN :start_date AND :end_date
-                GROUP BY DATE(o.created_at)
-            ),
-            payment_breakdown AS (
-                SELECT
-                    DATE(o.created_at) as sale_date,
-                    p.payment_method,
-                    COUNT(DISTINCT o.id) as order_count,
-                    COALESCE(SUM(p.amount), 0) as total_amount
-                FROM orders o
-                JOIN payments p ON o.id = p.order_id
-                WHERE o.status IN ('FELDOLGOZVA', 'LEZART')
-                    AND p.status = 'SIKERES'
-                    AND DATE(o.created_at) BETWEEN :start_date AND :end_date
-                GROUP BY DATE(o.created_at), p.payment_method
-            )
-            SELECT * FROM daily_sales
-            ORDER BY sale_date ASC
+            SELECT
+                r.sale_date,
+                SUM(r.order_count) as order_count,
+                COALESCE(SUM(r.revenue), 0) as total_revenue
+            FROM daily_sales_rollup r
+            WHERE r.payment_method = '*'
+                AND r.sale_date BETWEEN :start_date AND :end_date
+            GROUP BY r.sale_date
+            HAVING SUM(r.order_count) > 0
+            ORDER BY r.sale_date ASC
         """)
 
         daily_results = db.execute(
@@ -78,17 +66,15 @@ class ReportingService:
         # Query payment breakdown
         payment_query = text("""
             SELECT
-                DATE(o.created_at) as sale_date,
-                p.payment_method,
-                COUNT(DISTINCT o.id) as order_count,
-                COALESCE(SUM(p.amount), 0) as total_amount
-            FROM orders o
-            JOIN payments p ON o.id = p.order_id
-            WHERE o.status IN ('FELDOLGOZVA', 'LEZART')
-                AND p.status = 'SIKERES'
-                AND DATE(o.created_at) BETWEEN :start_date AND :end_date
-            GROUP BY DATE(o.created_at), p.payment_method
-            ORDER BY sale_date ASC, p.payment_method
+                r.sale_date,
+                r.payment_method,
+                SUM(r.payment_count) as payment_count,
+                COALESCE(SUM(r.payment_amount), 0) as total_amount
+            FROM daily_sales_rollup r
+            WHERE r.payment_method <> '*'
+                AND r.sale_date BETWEEN :start_date AND :end_date
+            GROUP BY r.sale_date, r.payment_method
+            ORDER BY r.sale_date ASC, r.payment_method
         """)
 
         payment_results = db.execute(
@@ -121,7 +107,7 @@ class ReportingService:
             sale_date = row[0]
             order_count = row[1]
             revenue = Decimal(str(row[2]))
-            avg_cart = Decimal(str(row[3]))
+            avg_cart = revenue / order_count if order_count else Decimal(0)
 
             # Get payment breakdown for this date
             date_payments = payment_by_date.get(sale_date, {})
@@ -193,22 +179,21 @@ class ReportingService:
         params = {"limit": limit}
 
         if start_date and end_date:
-            date_filter = "AND DATE(o.created_at) BETWEEN :start_date AND :end_date"
+            date_filter = "WHERE ps.sale_date BETWEEN :start_date AND :end_date"
             params["start_date"] = start_date
             params["end_date"] = end_date
 
+        # Napi termék összesítőből (daily_product_sales, lezárt rendelések)
         query = text(f"""
             SELECT
-                oi.product_id,
-                SUM(oi.quantity) as total_quantity,
-                SUM(oi.quantity * oi.unit_price) as total_revenue,
-                COUNT(DISTINCT oi.order_id) as order_count,
-                AVG(oi.unit_price) as avg_price
-            FROM order_items oi
-            JOIN orders o ON oi.order_id = o.id
-            WHERE o.status IN ('FELDOLGOZVA', 'LEZART')
-                {date_filter}
-            GROUP BY oi.product_id
+                ps.product_id,
+                SUM(ps.quantity) as total_quantity,
+                SUM(ps.revenue) as total_revenue,
+                SUM(ps.order_count) as order_count,
+                SUM(ps.unit_price_sum) / NULLIF(SUM(ps.line_count), 0) as avg_price
+            FROM daily_product_sales ps
+            {date_filter}
+            GROUP BY ps.product_id
             ORDER BY total_quantity DESC
             LIMIT :limit
         """)
@@ -221,11 +206,9 @@ class ReportingService:
 
         # Get total products count
         count_query = text(f"""
-            SELECT COUNT(DISTINCT oi.product_id)
-            FROM order_items oi
-            JOIN orders o ON oi.order_id = o.id
-            WHERE o.status IN ('FELDOLGOZVA', 'LEZART')
-                {date_filter}
+            SELECT COUNT(DISTINCT ps.product_id)
+            FROM daily_product_sales ps
+            {date_filter}
         """)
 
         total_products = db.execute(count_query, params).scalar() or 0
@@ -244,7 +227,7 @@ class ReportingService:
                 'total_quantity_sold': float(total_quantity),
                 'total_revenue': float(total_revenue),
                 'order_count': order_count,
-                'average_price': float(avg_price)
+                'average_price': float(avg_price or 0)
             })
 
         return {
@@ -341,7 +324,7 @@ class ReportingService:
     @staticmethod
     async def _fetch_product_names(product_ids: List[int]) -> Dict[int, str]:
         """
-        Fetch product names from menu service.
+        Fetch product names from menu service (cached product catalog, one batched lookup).
 
         Args:
             product_ids: List of product IDs to fetch
@@ -353,23 +336,11 @@ class ReportingService:
             return {}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.menu_service_url}/api/v1/products",
-                    params={"limit": 1000},
-                    timeout=10.0
-                )
-
-                if response.status_code == 200:
-                    products = response.json()
-                    return {
-                        product['id']: product['name']
-                        for product in products
-                        if product['id'] in product_ids
-                    }
+            products = await product_catalog.aget_many(product_ids)
         except Exception as e:
             # If menu service is unavailable, return empty dict
             # Product names will fall back to "Product #ID"
-            print(f"Failed to fetch product names: {e}")
+            logger.warning(f"Failed to fetch product names: {e}")
+            return {}
 
-        return {}
+        return {product_id: product['name'] for product_id, product in products.items()}
@@ -13,12 +13,14 @@ a szükséges adatok összegyűjtéséhez.
 import httpx
 import logging
 from typing import List, Optional
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
+from backend.core_http import get_async_client
 from backend.service_admin.config import settings
+from backend.service_admin.services.product_catalog import product_catalog
 from backend.service_admin.schemas.reports import (
     SalesReportResponse,
     DailySalesData,
@@ -83,40 +85,27 @@ class ReportsService:
             start_date = end_date - timedelta(days=30)
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Lekérjük a rendeléseket és fizetéseket a service_orders-ből
-                orders_url = f"{self.orders_service_url}/api/v1/orders"
-                params = {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "status": "LEZART"  # Csak lezárt rendelések
-                }
-
-                logger.info(f"Fetching orders from {orders_url} with params {params}")
-                response = await client.get(orders_url, params=params)
-                response.raise_for_status()
-                orders_data = response.json()
+            # A service_orders szerver oldalon aggregál (napi / fizetési mód
+            # szerinti sorok), így nem töltjük le a rendeléseket tételekkel
+            aggregate_url = f"{self.orders_service_url}/api/v1/internal/reports/sales-aggregate"
+            params = {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat()
+            }
+
+            logger.info(f"Fetching sales aggregate from {aggregate_url} with params {params}")
+            response = await get_async_client("orders").get(aggregate_url, params=params, timeout=30.0)
+            response.raise_for_status()
+            aggregate_data = response.json()
 
-            # Feldolgozzuk az adatokat napi bontásban
             daily_sales_map = {}
 
-            for order in orders_data:
-                # Dátum kinyerése
-                order_date_str = order.get("created_at", "")
-                if not order_date_str:
-                    continue
-
-                order_date = datetime.fromisoformat(order_date_str.replace("Z", "+00:00")).date()
-
-                # Összegek
-                total_amount = Decimal(str(order.get("total_amount", 0)))
-
+            for day in aggregate_data.get("days", []):
                 # Fizetési módok szerinti bontás
                 cash_amount = Decimal("0")
                 card_amount = Decimal("0")
 
-                payments = order.get("payments", [])
-                for payment in payments:
+                for payment in day.get("payments", []):
                     payment_method = payment.get("payment_method", "")
                     amount = Decimal(str(payment.get("amount", 0)))
 
@@ -125,21 +114,13 @@ class ReportsService:
                     elif payment_method in ["KARTYA", "SZEP_KARTYA"]:
                         card_amount += amount
 
-                # Hozzáadjuk a napi összesítéshez
-                date_key = order_date.isoformat()
-                if date_key not in daily_sales_map:
-                    daily_sales_map[date_key] = {
-                        "date": order_date,
-                        "total_revenue": Decimal("0"),
-                        "cash_revenue": Decimal("0"),
-                        "card_revenue": Decimal("0"),
-                        "order_count": 0
-                    }
-
-                daily_sales_map[date_key]["total_revenue"] += total_amount
-                daily_sales_map[date_key]["cash_revenue"] += cash_amount
-                daily_sales_map[date_key]["card_revenue"] += card_amount
-                daily_sales_map[date_key]["order_count"] += 1
+                daily_sales_map[day["date"]] = {
+                    "date": date.fromisoformat(day["date"]),
+                    "total_revenue": Decimal(str(day.get("revenue", 0))),
+                    "cash_revenue": cash_amount,
+                    "card_revenue": card_amount,
+                    "order_count": day.get("order_count", 0)
+                }
 
             # Átlagos rendelés értékek számítása
             sales_data = []
@@ -216,97 +197,49 @@ class ReportsService:
             start_date = end_date - timedelta(days=30)
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Lekérjük a rendeléseket
-                orders_url = f"{self.orders_service_url}/api/v1/orders"
-                params = {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "status": "LEZART"
-                }
-
-                logger.info(f"Fetching orders for top products from {orders_url}")
-                response = await client.get(orders_url, params=params)
-                response.raise_for_status()
-                orders_data = response.json()
-
-                # Feldolgozzuk a termékeket
-                product_stats = {}
-
-                for order in orders_data:
-                    order_items = order.get("order_items", [])
-
-                    for item in order_items:
-                        product_id = item.get("product_id")
-                        quantity = item.get("quantity", 0)
-                        unit_price = Decimal(str(item.get("unit_price", 0)))
-                        revenue = quantity * unit_price
-
-                        if product_id not in product_stats:
-                            product_stats[product_id] = {
-                                "quantity_sold": 0,
-                                "total_revenue": Decimal("0"),
-                                "price_sum": Decimal("0"),
-                                "price_count": 0
-                            }
-
-                        product_stats[product_id]["quantity_sold"] += quantity
-                        product_stats[product_id]["total_revenue"] += revenue
-                        product_stats[product_id]["price_sum"] += unit_price
-                        product_stats[product_id]["price_count"] += 1
-
-                # Lekérjük a termék neveket és kategóriákat a service_menu-ből
-                product_ids = list(product_stats.keys())
+            # Szerver oldali aggregálás (GROUP BY product_id), csak a top `limit` sor
+            product_sales_url = f"{self.orders_service_url}/api/v1/internal/reports/product-sales"
+            params = {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "limit": limit
+            }
+
+            logger.info(f"Fetching product sales aggregate from {product_sales_url}")
+            response = await get_async_client("orders").get(product_sales_url, params=params, timeout=30.0)
+            response.raise_for_status()
+            aggregate_data = response.json()
+
+            product_stats = {
+                product["product_id"]: product
+                for product in aggregate_data.get("products", [])
+            }
+
+            # Termék nevek és kategóriák: katalógus cache, a hiányzókra egy tömeges hívás
+            try:
+                products_details = await product_catalog.aget_many(product_stats.keys())
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not fetch product details from service_menu: {str(e)}")
                 products_details = {}
 
-                for product_id in product_ids:
-                    try:
-                        product_url = f"{self.menu_service_url}/api/v1/products/{product_id}"
-                        logger.info(f"Fetching product details from {product_url}")
-                        response = await client.get(product_url)
-                        response.raise_for_status()
-                        product_data = response.json()
-                        products_details[product_id] = product_data
-                    except httpx.HTTPError as e:
-                        logger.warning(f"Could not fetch product {product_id}: {str(e)}")
-                        products_details[product_id] = {
-                            "name": f"Termék #{product_id}",
-                            "category": None
-                        }
-
             # Összeállítjuk a top termékek listáját
             top_products = []
 
             for product_id, stats in product_stats.items():
                 product_details = products_details.get(product_id, {})
-                avg_price = (
-                    stats["price_sum"] / stats["price_count"]
-                    if stats["price_count"] > 0
-                    else Decimal("0")
-                )
-
-                category_name = None
-                if product_details.get("category"):
-                    category_name = product_details["category"].get("name")
 
                 top_products.append(TopProductData(
                     product_id=product_id,
                     product_name=product_details.get("name", f"Termék #{product_id}"),
-                    quantity_sold=stats["quantity_sold"],
-                    total_revenue=stats["total_revenue"],
-                    average_price=avg_price,
-                    category_name=category_name
+                    quantity_sold=stats["quantity"],
+                    total_revenue=Decimal(str(stats["revenue"])),
+                    average_price=Decimal(str(stats["average_price"])),
+                    category_name=product_details.get("category_name")
                 ))
 
-            # Rendezés eladott mennyiség szerint csökkenő sorrendben
-            top_products.sort(key=lambda x: x.quantity_sold, reverse=True)
-
-            # Limitáljuk az eredményeket
-            limited_products = top_products[:limit]
-
             return TopProductsResponse(
-                products=limited_products,
-                total_products_analyzed=len(product_stats)
+                products=top_products,
+                total_products_analyzed=aggregate_data.get("total_products", len(product_stats))
             )
 
         except httpx.HTTPError as e:
@@ -342,29 +275,29 @@ class ReportsService:
             start_date = end_date - timedelta(days=30)
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Lekérjük a készletmozgásokat az inventory service-ből
-                inventory_url = f"{self.inventory_service_url}/api/v1/inventory/movements"
-                params = {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                    "movement_type": "CONSUMPTION"  # Csak fogyások
-                }
-
-                logger.info(f"Fetching inventory movements from {inventory_url}")
-                response = await client.get(inventory_url, params=params)
-
-                # Ha nincs ilyen endpoint, akkor üres listát adunk vissza
-                if response.status_code == 404:
-                    logger.warning("Inventory movements endpoint not found, returning empty consumption report")
-                    return ConsumptionReportResponse(
-                        consumption_data=[],
-                        total_items=0,
-                        total_estimated_cost=Decimal("0")
-                    )
+            client = get_async_client("inventory")
+            # Lekérjük a készletmozgásokat az inventory service-ből
+            inventory_url = f"{self.inventory_service_url}/api/v1/inventory/movements"
+            params = {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "movement_type": "CONSUMPTION"  # Csak fogyások
+            }
+
+            logger.info(f"Fetching inventory movements from {inventory_url}")
+            response = await client.get(inventory_url, params=params, timeout=30.0)
+
+            # Ha nincs ilyen endpoint, akkor üres listát adunk vissza
+            if response.status_code == 404:
+                logger.warning("Inventory movements endpoint not found, returning empty consumption report")
+                return ConsumptionReportResponse(
+                    consumption_data=[],
+                    total_items=0,
+                    total_estimated_cost=Decimal("0")
+                )
 
-                response.raise_for_status()
-                movements_data = response.json()
+            response.raise_for_status()
+            movements_data = response.json()
 
             # Feldolgozzuk a fogyásokat
             consumption_map = {}
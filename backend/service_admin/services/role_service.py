@@ -13,6 +13,7 @@ from fastapi import HTTPException, status
 
 from backend.service_admin.models.role import Role
 from backend.service_admin.models.permission import Permission
+from backend.service_admin.permission_cache import permission_cache, permission_epoch_tracker
 from backend.service_admin.schemas.role import RoleCreate, RoleUpdate
 
 
@@ -218,7 +219,9 @@ class RoleService:
             role.permissions = permissions
 
         try:
+            permission_epoch_tracker.bump(self.db)
             self.db.commit()
+            permission_cache.invalidate_all()
             self.db.refresh(role)
             return role
         except IntegrityError as e:
@@ -253,7 +256,9 @@ class RoleService:
 
         try:
             self.db.delete(role)
+            permission_epoch_tracker.bump(self.db)
             self.db.commit()
+            permission_cache.invalidate_all()
             return True
         except IntegrityError as e:
             self.db.rollback()
@@ -299,7 +304,9 @@ class RoleService:
         role.add_permission(permission)
 
         try:
+            permission_epoch_tracker.bump(self.db)
             self.db.commit()
+            permission_cache.invalidate_all()
             self.db.refresh(role)
             return role
         except IntegrityError as e:
@@ -346,7 +353,9 @@ class RoleService:
         role.remove_permission(permission)
 
         try:
+            permission_epoch_tracker.bump(self.db)
             self.db.commit()
+            permission_cache.invalidate_all()
             self.db.refresh(role)
             return role
         except IntegrityError as e:
@@ -412,7 +421,9 @@ class RoleService:
         role = self.get_role(role_id)
         role.is_active = False
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_all()
         self.db.refresh(role)
         return role
 
@@ -432,6 +443,8 @@ class RoleService:
         role = self.get_role(role_id)
         role.is_active = True
 
+        permission_epoch_tracker.bump(self.db)
         self.db.commit()
+        permission_cache.invalidate_all()
         self.db.refresh(role)
         return role
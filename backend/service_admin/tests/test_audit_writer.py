@@ -0,0 +1,123 @@
+"""
+Unit Tests - Audit Log Writer (pufferelt, kötegelt naplózás)
+Module 8: Adminisztráció és NTAK (Performance)
+
+Teszteli a következő funkciókat:
+- Kötegelt kiírás: egy INSERT több sorral, az esemény időpontja megmarad
+- Leálláskor (shutdown) a puffer kiürül
+- must_persist esemény azonnal, szinkron íródik
+- Sikertelen kiírás után az események a pufferben maradnak
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.service_admin.models.audit_log import AuditLog
+from backend.service_admin.models.database import Base
+from backend.service_admin.services import audit_log_service as audit_log_service_module
+from backend.service_admin.services.audit_log_service import AuditLogService
+from backend.service_admin.services.audit_writer import AuditLogWriter
+
+
+@pytest.fixture(scope="function")
+def engine():
+    """Közös in-memory SQLite az audit log táblával (író és kérés session-jeihez)."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables['ntak_audit_logs']])
+    return engine
+
+
+@pytest.fixture(scope="function")
+def writer(engine):
+    return AuditLogWriter(
+        batch_size=100,
+        flush_interval_ms=60000,
+        max_buffer=1000,
+        session_factory=sessionmaker(bind=engine)
+    )
+
+
+def test_flush_writes_batch_with_event_time(engine, writer):
+    """Test: 5 esemény egyetlen INSERT utasítással; a created_at a beküldés ideje."""
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    event_time = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+    for order_id in range(5):
+        writer.submit({"event_type": "NTAK_SEND", "entity_type": "ORDER", "entity_id": order_id,
+                       "details": {"n": order_id}, "created_at": event_time})
+
+    assert writer.flush() == 5
+
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT")]) == 1
+    db = sessionmaker(bind=engine)()
+    rows = db.query(AuditLog).order_by(AuditLog.entity_id).all()
+    assert [row.entity_id for row in rows] == list(range(5))
+    assert rows[0].status == "SUCCESS"
+    assert rows[3].details == {"n": 3}
+    assert rows[0].created_at.replace(tzinfo=None) == event_time.replace(tzinfo=None)
+    assert writer.stats()["written"] == 5
+    db.close()
+
+
+def test_buffered_events_are_flushed_on_shutdown(engine, writer, monkeypatch):
+    """Test: Futó író mellett a log_event pufferel; a stop() mindent kiír."""
+    monkeypatch.setattr(audit_log_service_module, "audit_log_writer", writer)
+    db = sessionmaker(bind=engine)()
+    service = AuditLogService(db)
+
+    async def scenario():
+        await writer.start()
+        assert service.log_event(event_type="NTAK_CANCEL", status="FAILURE") is None
+        assert service.log_event(event_type="NTAK_CANCEL", status="FAILURE") is None
+        assert db.query(AuditLog).count() == 0
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert db.query(AuditLog).count() == 2
+    assert writer.stats()["buffered"] == 0
+    db.close()
+
+
+def test_must_persist_is_written_synchronously(engine, writer, monkeypatch):
+    """Test: must_persist esemény a visszatérés előtt commitolva van, nem pufferel."""
+    monkeypatch.setattr(audit_log_service_module, "audit_log_writer", writer)
+    db = sessionmaker(bind=engine)()
+    service = AuditLogService(db)
+
+    async def scenario():
+        await writer.start()
+        audit_log = service.log_ntak_cancel(order_id=9, success=True, message="sztornó", must_persist=True)
+        assert audit_log.id is not None
+        assert writer.stats()["buffered"] == 0
+        await writer.stop()
+
+    asyncio.run(scenario())
+
+    assert db.query(AuditLog).filter_by(entity_id=9).count() == 1
+    db.close()
+
+
+def test_failed_flush_keeps_events(engine, writer):
+    """Test: Adatbázis hiba esetén az események a pufferben maradnak, később kiíródnak."""
+    writer.submit({"event_type": "USER_LOGIN"})
+    Base.metadata.drop_all(bind=engine, tables=[Base.metadata.tables['ntak_audit_logs']])
+
+    assert writer.flush() == 0
+    assert writer.stats()["buffered"] == 1
+    assert writer.stats()["failed_flushes"] == 1
+
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables['ntak_audit_logs']])
+    assert writer.flush() == 1
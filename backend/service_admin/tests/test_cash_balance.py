@@ -0,0 +1,83 @@
+"""
+Unit Tests - Cash Balance Checkpoint
+Module 8 (A8): Cash Drawer (Performance)
+
+Teszteli a következő funkciókat:
+- Befizetés / kivétel / értékesítés a checkpointot is lépteti
+- Checkpoint nélkül (más úton) rögzített mozgás is beszámít
+- Konzisztencia ellenőrzés: eltérés felismerése és javítása
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_admin.models.database import Base
+from backend.service_admin.models.finance import (
+    CashBalanceCheckpoint,
+    CashMovement,
+    CashMovementType
+)
+from backend.service_admin.services.finance_service import FinanceService
+
+
+@pytest.fixture(scope="function")
+def finance_service():
+    """FinanceService in-memory SQLite adatbázissal (pénzmozgás és checkpoint táblák)."""
+    engine = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ('cash_movements', 'cash_balance_checkpoints')]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield FinanceService(db)
+    finally:
+        db.close()
+
+
+def test_movements_advance_checkpoint(finance_service):
+    """Test: Minden rögzítés után a checkpoint tartalmazza a teljes egyenleget."""
+    finance_service.record_cash_deposit(Decimal("10000.00"))
+    finance_service.record_sale(Decimal("2500.00"), order_id=7)
+    movement = finance_service.record_cash_withdrawal(Decimal("3000.00"))
+
+    checkpoint = finance_service.db.query(CashBalanceCheckpoint).one()
+    assert checkpoint.last_movement_id == movement.id
+    assert Decimal(checkpoint.balance) == Decimal("9500.00")
+    assert finance_service.get_current_cash_balance() == Decimal("9500.00")
+
+    with pytest.raises(ValueError):
+        finance_service.record_cash_withdrawal(Decimal("9500.01"))
+
+
+def test_movements_after_checkpoint_are_counted(finance_service):
+    """Test: A checkpoint után közvetlenül beszúrt mozgás is az egyenleg része."""
+    finance_service.record_cash_deposit(Decimal("1000.00"))
+    finance_service.db.add(CashMovement(movement_type=CashMovementType.CASH_IN, amount=Decimal("250.00")))
+    finance_service.db.commit()
+
+    assert finance_service.get_current_cash_balance() == Decimal("1250.00")
+
+    finance_service.record_cash_deposit(Decimal("50.00"))
+    checkpoint = finance_service.db.query(CashBalanceCheckpoint).one()
+    assert Decimal(checkpoint.balance) == Decimal("1300.00")
+
+
+def test_verify_detects_and_repairs_drift(finance_service):
+    """Test: Elállítódott checkpoint: az ellenőrzés jelzi, a javítás helyreállítja."""
+    finance_service.record_cash_deposit(Decimal("800.00"))
+    assert finance_service.verify_cash_balance()["consistent"] is True
+
+    checkpoint = finance_service.db.query(CashBalanceCheckpoint).one()
+    checkpoint.balance = Decimal("999.00")
+    finance_service.db.commit()
+
+    report = finance_service.verify_cash_balance()
+    assert report["consistent"] is False
+    assert report["difference"] == Decimal("199.00")
+
+    repaired = finance_service.verify_cash_balance(repair=True)
+    assert repaired["repaired"] is True
+    assert finance_service.verify_cash_balance()["consistent"] is True
+    assert finance_service.get_current_cash_balance() == Decimal("800.00")
@@ -0,0 +1,111 @@
+"""
+Unit Tests - Daily Closure Figures
+Module 8 (A8): Cash Drawer and Daily Closure (Performance)
+
+Teszteli a következő funkciókat:
+- Egyetlen aggregáló lekérdezés: fizetési módok, rendelésszám, ÁFA bontás
+- Materializált számok: friss sor esetén nincs újraszámolás
+- Késői fizetés után a számok újraszámolódnak
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_admin.services.finance_service import FinanceService
+from backend.service_orders.models.database import Base as OrdersBase
+from backend.service_orders.models.order import Order
+from backend.service_orders.models.payment import Payment
+from backend.service_orders.services.sales_rollup_service import SalesRollupService
+
+SALE_DAY = date(2024, 1, 15)
+SALE_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="function")
+def finance_service():
+    """FinanceService in-memory SQLite adatbázissal (rendelés, fizetés és figures táblák)."""
+    engine = create_engine("sqlite://")
+    tables = [
+        OrdersBase.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'orders', 'payments', 'daily_closure_figures')
+    ]
+    OrdersBase.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield FinanceService(db)
+    finally:
+        db.close()
+
+
+def _order(db, total, vat_rate, payments, status='LEZART'):
+    """Rendelés fizetésekkel (a fizetések a rendelés idejére)."""
+    order = Order(
+        order_type='Helyben', status=status, total_amount=Decimal(total),
+        final_vat_rate=Decimal(vat_rate), created_at=SALE_TIME
+    )
+    db.add(order)
+    db.flush()
+    for method, amount, payment_status in payments:
+        db.add(Payment(
+            order_id=order.id, payment_method=method, amount=Decimal(amount),
+            status=payment_status, created_at=SALE_TIME
+        ))
+    db.commit()
+    return order
+
+
+def test_figures_cover_methods_order_count_and_vat(finance_service):
+    """Test: Fizetési módok összegei, rendelésszám és ÁFA bontás egy lekérdezésből."""
+    db = finance_service.db
+    _order(db, "12700.00", "27.00", [('KESZPENZ', "7700.00", 'SIKERES'), ('KARTYA', "5000.00", 'SIKERES')])
+    _order(db, "1050.00", "5.00", [('SZEP_KARTYA', "1000.00", 'SIKERES'), ('VOUCHER', "50.00", 'SIKERES')])
+    _order(db, "2540.00", "27.00", [('ATUTALAS', "2540.00", 'SIKERES'), ('KARTYA', "999.00", 'SIKERTELEN')])
+    _order(db, "9999.00", "27.00", [('KESZPENZ', "9999.00", 'SIKERES')], status='NYITOTT')
+
+    figures = finance_service.get_closure_figures(SALE_DAY)
+
+    assert figures["total_cash"] == Decimal("7700.00")
+    assert figures["total_card"] == Decimal("5000.00")
+    assert figures["total_szep_card"] == Decimal("1000.00")
+    assert figures["total_voucher"] == Decimal("50.00")
+    assert figures["total_transfer"] == Decimal("2540.00")
+    assert figures["total_revenue"] == Decimal("16290.00")
+    assert figures["order_count"] == 3
+    assert figures["vat_breakdown"] == {
+        "27.00": {"order_count": 2, "gross": 15240.0, "net": 12000.0, "vat": 3240.0},
+        "5.00": {"order_count": 1, "gross": 1050.0, "net": 1000.0, "vat": 50.0},
+    }
+
+
+def test_figures_are_reused_until_late_payment(finance_service):
+    """Test: Friss számok újraszámolás nélkül; késői fizetés után frissülnek."""
+    db = finance_service.db
+    order = _order(db, "3000.00", "27.00", [('KESZPENZ', "1000.00", 'SIKERES')])
+
+    first = finance_service.get_closure_figures(SALE_DAY)
+    assert first["total_cash"] == Decimal("1000.00")
+
+    # Rollup nélkül (közvetlenül) rögzített fizetés: a materializált számok nem változnak
+    db.add(Payment(order_id=order.id, payment_method='KARTYA', amount=Decimal("500.00"),
+                   status='SIKERES', created_at=SALE_TIME))
+    db.commit()
+    cached = finance_service.get_closure_figures(SALE_DAY)
+    assert cached["total_card"] == Decimal("0.00")
+    assert cached["computed_at"] == first["computed_at"]
+
+    # Késői (másnapi) fizetés a service_orders útján: a nap számai elavulnak
+    late_payment = Payment(
+        order_id=order.id, payment_method='KARTYA', amount=Decimal("1500.00"),
+        status='SIKERES', created_at=datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc)
+    )
+    db.add(late_payment)
+    SalesRollupService.invalidate_closure_figures(db, SALE_DAY)
+    db.commit()
+
+    refreshed = finance_service.get_closure_figures(SALE_DAY)
+    assert refreshed["total_card"] == Decimal("2000.00")
+    assert refreshed["total_revenue"] == Decimal("3000.00")
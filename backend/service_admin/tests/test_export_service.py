@@ -0,0 +1,94 @@
+"""
+Unit Tests - ExportService
+Module 8: Adminisztráció és NTAK (Performance)
+
+Teszteli a következő funkciókat:
+- CSV kódolás: fejléc, darabolás soronként, JSON / None cellák
+- NDJSON kódolás: soronként egy JSON objektum (dátum, Decimal)
+- Audit log sorok szűrése és időrendje szerver oldali kurzorral
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_admin.models.audit_log import AuditLog
+from backend.service_admin.services.export_service import ExportService
+
+FIELDS = ["id", "created_at", "amount", "details", "message"]
+
+ROWS = [
+    {
+        "id": index,
+        "created_at": datetime(2024, 1, 15, 12, index, tzinfo=timezone.utc),
+        "amount": Decimal("1500.50"),
+        "details": {"note": "ár, \"idézet\""},
+        "message": None,
+    }
+    for index in range(5)
+]
+
+
+def test_csv_is_chunked_with_single_header():
+    """Test: 5 sor 2-esével 3 darab; a fejléc csak egyszer szerepel."""
+    chunks = list(ExportService.encode_rows(iter(ROWS), FIELDS, "csv", chunk_rows=2))
+
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO("".join(chunks))))
+    assert parsed[0] == FIELDS
+    assert len(parsed) == 6
+    assert parsed[1] == ["0", "2024-01-15T12:00:00+00:00", "1500.50", '{"note": "ár, \\"idézet\\""}', ""]
+
+
+def test_ndjson_writes_one_object_per_line():
+    """Test: NDJSON-ban minden sor önálló JSON objektum, fejléc nélkül."""
+    body = "".join(ExportService.encode_rows(iter(ROWS[:2]), FIELDS, "ndjson", chunk_rows=1000))
+
+    lines = body.splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[1])
+    assert record == {
+        "id": 1,
+        "created_at": "2024-01-15T12:01:00+00:00",
+        "amount": "1500.50",
+        "details": {"note": "ár, \"idézet\""},
+        "message": None,
+    }
+
+
+def test_empty_export_has_only_header():
+    """Test: Üres eredmény: CSV-nél csak fejléc, NDJSON-nál semmi."""
+    assert list(ExportService.encode_rows(iter([]), FIELDS, "csv", chunk_rows=10)) == [",".join(FIELDS) + "\r\n"]
+    assert list(ExportService.encode_rows(iter([]), FIELDS, "ndjson", chunk_rows=10)) == []
+
+
+def test_audit_log_rows_are_filtered_and_ordered():
+    """Test: Esemény típus és nap szerinti szűrés, időrendben."""
+    engine = create_engine("sqlite://")
+    AuditLog.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        db.add_all([
+            AuditLog(event_type="NTAK_SEND", entity_type="ORDER", entity_id=2, status="SUCCESS",
+                     details={"a": 1}, created_at=datetime(2024, 1, 15, 15, 0)),
+            AuditLog(event_type="NTAK_SEND", entity_type="ORDER", entity_id=1, status="SUCCESS",
+                     created_at=datetime(2024, 1, 15, 9, 0)),
+            AuditLog(event_type="USER_LOGIN", status="SUCCESS", created_at=datetime(2024, 1, 15, 10, 0)),
+            AuditLog(event_type="NTAK_SEND", entity_type="ORDER", entity_id=3, status="FAILURE",
+                     created_at=datetime(2024, 1, 20, 10, 0)),
+        ])
+        db.commit()
+
+        rows = list(ExportService.iter_audit_log_rows(
+            db, event_type="NTAK_SEND", start_date=date(2024, 1, 15), end_date=date(2024, 1, 15)
+        ))
+    finally:
+        db.close()
+
+    assert [row["entity_id"] for row in rows] == [1, 2]
+    assert rows[1]["details"] == {"a": 1}
@@ -0,0 +1,198 @@
+"""
+Unit Tests - NTAK Queue (kötegelt beküldés)
+Module 8: Adminisztráció és NTAK (Performance)
+
+Teszteli a következő funkciókat (helyi mock NTAK végponttal):
+- Idempotens sorba állítás
+- Egy köteg = egy NTAK kérés; eredmények, ntak_data és audit log rögzítése
+- Újrapróbálható hiba (5xx): backoff, majd sikeres beküldés
+- Sor metrikák (mélység, lag)
+"""
+
+import asyncio
+import importlib
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.service_admin.models.audit_log import AuditLog
+from backend.service_admin.models.database import Base as AdminBase
+from backend.service_admin.models.ntak_submission import NtakSubmission, NtakSubmissionStatus
+from backend.service_admin.services import ntak_queue as ntak_queue_module
+from backend.service_admin.services.ntak_queue import NtakBatchWorker, NtakQueueService
+from backend.service_orders.models.database import Base as OrdersBase
+from backend.service_orders.models.order import Order
+from backend.service_orders.models.order_item import OrderItem
+from backend.service_orders.models.payment import Payment
+
+# A services csomag a `ntak_service` nevet a singletonra köti, ezért a modult név szerint töltjük be
+ntak_service_module = importlib.import_module("backend.service_admin.services.ntak_service")
+
+
+@pytest.fixture(scope="function")
+def session_factory(monkeypatch):
+    """Közös in-memory SQLite (admin sor / audit + orders táblák), a worker session-jeihez is."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    AdminBase.metadata.create_all(
+        bind=engine,
+        tables=[AdminBase.metadata.tables[name] for name in ('ntak_submissions', 'ntak_audit_logs')]
+    )
+    OrdersBase.metadata.create_all(
+        bind=engine,
+        tables=[
+            OrdersBase.metadata.tables[name]
+            for name in ('rooms', 'tables', 'seats', 'orders', 'order_items', 'payments')
+        ]
+    )
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(ntak_queue_module, "SessionLocal", factory)
+    monkeypatch.setattr(ntak_service_module.ntak_service, "ntak_enabled", True)
+
+    async def product_names(product_ids):
+        return {product_id: {"name": f"Termék {product_id}"} for product_id in product_ids}
+
+    monkeypatch.setattr(ntak_queue_module.product_catalog, "aget_many", product_names)
+    return factory
+
+
+def mock_ntak(monkeypatch, handler):
+    """Helyi mock NTAK végpont; a beérkezett kérések listáját adja vissza."""
+    requests = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return handler(request)
+
+    monkeypatch.setattr(
+        ntak_service_module,
+        "get_async_client",
+        lambda target: httpx.AsyncClient(transport=httpx.MockTransport(record))
+    )
+    return requests
+
+
+def _closed_order(db, total="2540.00"):
+    """Lezárt rendelés egy tétellel és készpénzes fizetéssel."""
+    order = Order(
+        order_type='Helyben', status='LEZART', total_amount=Decimal(total),
+        final_vat_rate=Decimal("27.00"), created_at=datetime(2024, 1, 15, 12, 0)
+    )
+    db.add(order)
+    db.flush()
+    db.add(OrderItem(order_id=order.id, product_id=7, quantity=2, unit_price=Decimal("1000.00")))
+    db.add(Payment(order_id=order.id, payment_method='KESZPENZ', amount=Decimal(total), status='SIKERES'))
+    db.commit()
+    return order.id
+
+
+def test_enqueue_is_idempotent(session_factory):
+    """Test: Ismételt jelentés nem duplikál; FAILED sor újra esedékes lesz."""
+    db = session_factory()
+    try:
+        first = NtakQueueService.enqueue(db, 42)
+        again = NtakQueueService.enqueue(db, 42)
+        assert first.id == again.id
+        assert db.query(NtakSubmission).count() == 1
+
+        again.status = NtakSubmissionStatus.FAILED
+        again.attempts = 10
+        db.commit()
+
+        requeued = NtakQueueService.enqueue(db, 42)
+        assert requeued.status == NtakSubmissionStatus.PENDING
+        assert requeued.attempts == 0
+    finally:
+        db.close()
+
+
+def test_batch_is_submitted_in_one_request(session_factory, monkeypatch):
+    """Test: 3 rendelés egy kérésben; elfogadott / elutasított eredmények rögzítése."""
+    db = session_factory()
+    order_ids = [_closed_order(db) for _ in range(3)]
+    for order_id in order_ids:
+        NtakQueueService.enqueue(db, order_id)
+    rejected_id = order_ids[1]
+
+    def handler(request):
+        summaries = json.loads(request.content)["summaries"]
+        return httpx.Response(200, json={"results": [
+            {"order_id": summary["order_id"], "success": False, "error_code": "VALIDATION", "message": "Hibás ÁFA"}
+            if summary["order_id"] == rejected_id else
+            {"order_id": summary["order_id"], "success": True, "transaction_id": f"TX-{summary['order_id']}"}
+            for summary in summaries
+        ]})
+
+    requests = mock_ntak(monkeypatch, handler)
+
+    processed = asyncio.run(NtakBatchWorker().submit_once())
+
+    assert processed == 3
+    assert len(requests) == 1
+    assert [summary["order_id"] for summary in requests[0]["summaries"]] == order_ids
+    assert requests[0]["summaries"][0]["line_items"][0]["product_name"] == "Termék 7"
+
+    db.expire_all()
+    statuses = {row.order_id: row.status for row in db.query(NtakSubmission)}
+    assert statuses[rejected_id] == NtakSubmissionStatus.FAILED
+    assert statuses[order_ids[0]] == statuses[order_ids[2]] == NtakSubmissionStatus.SENT
+
+    accepted = db.get(Order, order_ids[0])
+    assert accepted.ntak_data["ntak_transaction_id"] == f"TX-{order_ids[0]}"
+    assert db.get(Order, rejected_id).ntak_data["ntak_error_code"] == "VALIDATION"
+
+    audit = {row.entity_id: row.status for row in db.query(AuditLog).filter_by(event_type='NTAK_SEND')}
+    assert audit == {order_ids[0]: 'SUCCESS', rejected_id: 'FAILURE', order_ids[2]: 'SUCCESS'}
+    db.close()
+
+
+def test_server_error_is_retried_with_backoff(session_factory, monkeypatch):
+    """Test: 503 után a sor várakozik (backoff), a következő próbálkozás sikeres."""
+    db = session_factory()
+    order_id = _closed_order(db)
+    NtakQueueService.enqueue(db, order_id)
+
+    responses = [
+        httpx.Response(503, text="maintenance"),
+        httpx.Response(200, json={"results": [{"order_id": order_id, "success": True, "transaction_id": "TX-1"}]}),
+    ]
+    requests = mock_ntak(monkeypatch, lambda request: responses.pop(0))
+    worker = NtakBatchWorker()
+
+    asyncio.run(worker.submit_once())
+
+    db.expire_all()
+    submission = db.query(NtakSubmission).one()
+    assert submission.status == NtakSubmissionStatus.PENDING
+    assert submission.attempts == 1
+    assert submission.last_error.startswith("HTTP 503")
+    assert db.query(AuditLog).count() == 0
+
+    stats = NtakQueueService.queue_stats(db)
+    assert stats["pending"] == 1
+    assert stats["due"] == 0
+    assert stats["lag_seconds"] >= 0
+
+    # Backoff még tart: nincs beküldés
+    assert asyncio.run(worker.submit_once()) == 0
+
+    submission.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+    assert asyncio.run(worker.submit_once()) == 1
+
+    db.expire_all()
+    submission = db.query(NtakSubmission).one()
+    assert submission.status == NtakSubmissionStatus.SENT
+    assert submission.transaction_id == "TX-1"
+    assert len(requests) == 2
+    assert worker.stats()["accepted"] == 1
+    db.close()
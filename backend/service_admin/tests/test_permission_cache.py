@@ -0,0 +1,204 @@
+"""
+Unit Tests - PermissionCache
+Module 6: RBAC (Performance)
+
+Teszteli a következő funkciókat:
+- Cache hit / miss számlálás
+- TTL lejárat
+- Verzió alapú érvénytelenítés (invalidate_all, invalidate_employee)
+- Elavult betöltés eldobása (put régi verzióval, teljes és munkatársankénti érvénytelenítés után)
+- Token claim alapú principal és epoch alapú érvénytelenítés
+- Epoch léptetés upsert-tel (hiányzó sor esetén is)
+- Kikapcsolt stateless módban nincs epoch lekérdezés
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_admin import dependencies
+from backend.service_admin.models.permission_epoch import PermissionEpoch
+from backend.service_admin.permission_cache import (
+    CachedPrincipal,
+    PermissionCache,
+    PermissionEpochTracker
+)
+
+
+def _employee(employee_id: int = 1, permissions=("orders:manage",), is_active: bool = True):
+    """Egyszerű Employee-szerű objektum roles/permissions attribútumokkal."""
+    perms = [SimpleNamespace(name=name) for name in permissions]
+    return SimpleNamespace(
+        id=employee_id,
+        username=f"user{employee_id}",
+        name=f"User {employee_id}",
+        is_active=is_active,
+        roles=[SimpleNamespace(name="Waiter")],
+        permissions=perms,
+    )
+
+
+def test_put_and_get_counts_hits_and_misses():
+    """Test: Első lekérés miss, eltárolás után hit."""
+    cache = PermissionCache(ttl_seconds=60)
+
+    assert cache.get(1) is None
+    cache.put(_employee(1))
+    principal = cache.get(1)
+
+    assert principal is not None
+    assert principal.has_permission("orders:manage")
+    assert not principal.has_permission("admin:all")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_expired_entry_is_a_miss():
+    """Test: Lejárt bejegyzés nem kerül visszaadásra."""
+    cache = PermissionCache(ttl_seconds=60)
+    cache.put(_employee(1))
+    cache._entries[1] = (cache._entries[1][0], 0.0, cache.version)
+
+    assert cache.get(1) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidate_all_bumps_version_and_drops_entries():
+    """Test: invalidate_all után minden bejegyzés érvénytelen."""
+    cache = PermissionCache(ttl_seconds=60)
+    cache.put(_employee(1))
+    cache.put(_employee(2))
+
+    cache.invalidate_all()
+
+    assert cache.version == 1
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+
+
+def test_invalidate_employee_only_drops_one_entry():
+    """Test: invalidate_employee csak az adott munkatársat érinti."""
+    cache = PermissionCache(ttl_seconds=60)
+    cache.put(_employee(1))
+    cache.put(_employee(2))
+
+    cache.invalidate_employee(1)
+
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+
+def test_put_with_stale_version_is_not_stored():
+    """Test: Betöltés közbeni érvénytelenítés után a régi adat nem kerül a cache-be."""
+    cache = PermissionCache(ttl_seconds=60)
+    version = cache.version
+    cache.invalidate_all()
+
+    principal = cache.put(_employee(1), version)
+
+    assert principal.has_permission("orders:manage")
+    assert cache.get(1) is None
+
+
+def test_put_after_employee_invalidation_is_not_stored():
+    """Test: A munkatárs érvénytelenítése előtt indult betöltés nem kerül vissza, más munkatársé igen."""
+    cache = PermissionCache(ttl_seconds=60)
+    cache.put(_employee(2))
+    version = cache.version
+    cache.invalidate_employee(1)
+
+    principal = cache.put(_employee(1, permissions=("admin:all",)), version)
+    cache.put(_employee(3), version)
+
+    assert principal.has_permission("admin:all")
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.get(3) is not None
+
+    cache.put(_employee(1), cache.version)
+    assert cache.get(1) is not None
+
+
+def test_disabled_cache_never_stores():
+    """Test: ttl_seconds=0 esetén a cache ki van kapcsolva."""
+    cache = PermissionCache(ttl_seconds=0)
+    cache.put(_employee(1))
+
+    assert cache.get(1) is None
+    assert cache.stats()["enabled"] is False
+
+
+def test_principal_from_token_claims():
+    """Test: Token claim-ekből épített principal (stateless mód)."""
+    principal = CachedPrincipal.from_token_claims(
+        7,
+        {"username": "kds1", "roles": ["Chef"], "permissions": ["orders:manage"], "perm_epoch": 3}
+    )
+
+    assert principal.id == 7
+    assert principal.is_active is True
+    assert principal.has_permission("orders:manage")
+    assert not principal.has_permission("admin:all")
+
+
+def test_epoch_change_invalidates_local_cache(monkeypatch):
+    """Test: Más folyamatban léptetett epoch a helyi cache-t is üríti."""
+    cache = PermissionCache(ttl_seconds=60)
+    tracker = PermissionEpochTracker(ttl_seconds=0, cache=cache)
+    epochs = iter([1, 1, 2])
+    monkeypatch.setattr(PermissionEpochTracker, "read_epoch", staticmethod(lambda db: next(epochs)))
+
+    assert tracker.current(db=None) == 1
+    cache.put(_employee(1))
+    assert tracker.current(db=None) == 1
+    assert cache.get(1) is not None
+
+    assert tracker.current(db=None) == 2
+    assert cache.get(1) is None
+
+
+def test_bump_upserts_epoch_row():
+    """Test: Az első léptetés létrehozza az epoch sort, a további léptetések növelik."""
+    engine = create_engine("sqlite://")
+    PermissionEpoch.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    assert PermissionEpochTracker.read_epoch(db) == 0
+    PermissionEpochTracker.bump(db)
+    PermissionEpochTracker.bump(db)
+    db.commit()
+
+    assert PermissionEpochTracker.read_epoch(db) == 2
+    assert db.query(PermissionEpoch).count() == 1
+    db.close()
+
+
+def _principal_with_epoch_spy(monkeypatch, stateless: bool):
+    """get_current_principal futtatása cache-elt principal-lal; visszaadja az epoch lekérések számát."""
+    cache = PermissionCache(ttl_seconds=60)
+    cache.put(_employee(1))
+    epoch_reads = []
+    monkeypatch.setattr(dependencies, "permission_cache", cache)
+    monkeypatch.setattr(dependencies.settings, "auth_stateless_tokens", stateless)
+    monkeypatch.setattr(dependencies, "_decode_credentials", lambda credentials: (1, {}))
+    monkeypatch.setattr(
+        dependencies.permission_epoch_tracker, "current", lambda db: epoch_reads.append(db) or 0
+    )
+
+    principal = asyncio.run(dependencies.get_current_principal(credentials=None, db=None))
+
+    assert principal.id == 1
+    return len(epoch_reads)
+
+
+def test_stateless_off_skips_epoch_lookup(monkeypatch):
+    """Test: auth_stateless_tokens kikapcsolva a principal feloldása nem kérdezi le az epoch-ot."""
+    assert _principal_with_epoch_spy(monkeypatch, stateless=False) == 0
+
+
+def test_stateless_on_checks_epoch(monkeypatch):
+    """Test: Stateless módban az epoch ellenőrzés lefut."""
+    assert _principal_with_epoch_spy(monkeypatch, stateless=True) == 1
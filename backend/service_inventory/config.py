@@ -74,6 +74,14 @@ class Settings(BaseSettings):
         description="URL of the Menu Service for inter-service communication"
     )
 
+    # Recipe BOM index (in-memory recipe explosion cache)
+    recipe_bom_resync_seconds: int = Field(
+        default=300,
+        description="Full reload interval of the in-memory recipe BOM index in seconds (0 = load once)",
+        ge=0,
+        le=86400
+    )
+
     # Pydantic Settings Configuration
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -17,6 +17,12 @@ from backend.service_inventory.models.database import init_db
 # Import RBAC dependencies
 from backend.service_admin.dependencies import require_permission
 
+# Shared pooled HTTP clients (shutdown)
+from backend.core_http import close_all_clients
+
+# In-memory recipe BOM index (health stats)
+from backend.service_inventory.services.recipe_bom_index import recipe_bom_index
+
 # Import all routers
 from backend.service_inventory.routers import (
     inventory_items_router,
@@ -79,6 +85,16 @@ async def startup_event():
     print("✅ Inventory Service initialized successfully!")
 
 
+# Shutdown Event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Alkalmazás leállításakor futó eseménykezelő.
+    Lezárja a megosztott (poolozott) HTTP klienseket.
+    """
+    await close_all_clients()
+
+
 # Health Check Endpoint
 @app.get("/health")
 async def health_check():
@@ -96,7 +112,8 @@ async def health_check():
             "document_ai": "enabled",
             "gcs_storage": "enabled",
             "perpetual_inventory": "pending"
-        }
+        },
+        "recipe_bom_index": recipe_bom_index.stats()
     }
 
 
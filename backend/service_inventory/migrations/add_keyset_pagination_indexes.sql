@@ -0,0 +1,18 @@
+-- Migration: Keyset pagination indexes for stock movement and incoming invoice lists
+-- List endpoints follow next_cursor: (created_at, id) < (:c, :i) ORDER BY created_at DESC, id DESC
+-- Date: 2026-10-16
+--
+-- CONCURRENTLY: no write lock on busy tables; run outside a transaction block.
+
+-- Item history: inventory_item_id = :id ORDER BY created_at DESC, id DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_movements_item_created_at_id
+    ON stock_movements (inventory_item_id, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_movements_created_at_id
+    ON stock_movements (created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_incoming_invoices_created_at_id
+    ON incoming_invoices (created_at, id);
+
+ANALYZE stock_movements;
+ANALYZE incoming_invoices;
@@ -0,0 +1,32 @@
+-- Migration: Dedupe key for order stock deductions
+-- One movement per (order, inventory item): a concurrent redelivery of the
+-- same order (outbox retry) fails on this index instead of deducting twice.
+-- Date: 2026-10-16
+--
+-- The key is a dedicated order_id column, not related_id: legacy SALE rows
+-- stored the order item ID in related_id (one row per recipe line per order
+-- item, so duplicates exist) and would collide with new order IDs. Legacy rows
+-- keep order_id NULL and are outside the partial index.
+--
+-- CONCURRENTLY: no write lock on busy tables; run outside a transaction block.
+
+ALTER TABLE stock_movements ADD COLUMN IF NOT EXISTS order_id INTEGER;
+
+-- Earlier related_id based key (may be INVALID if its build failed on legacy duplicates)
+DROP INDEX CONCURRENTLY IF EXISTS uq_stock_movements_sale_order_item;
+
+-- A failed previous run of this statement leaves an INVALID index that
+-- IF NOT EXISTS would skip; drop it first (no-op otherwise)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'uq_stock_movements_order_item' AND NOT i.indisvalid
+    ) THEN
+        EXECUTE 'DROP INDEX uq_stock_movements_order_item';
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_stock_movements_order_item
+    ON stock_movements (order_id, inventory_item_id)
+    WHERE order_id IS NOT NULL;
@@ -2,7 +2,7 @@
 Incoming Invoice Models for Inventory Management
 Handles procurement/purchasing workflow with DRAFT/FINALIZED status
 """
-from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, DateTime, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import date, datetime
@@ -42,6 +42,11 @@ class IncomingInvoice(Base):
     # Relationships
     items = relationship("IncomingInvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index('ix_incoming_invoices_created_at_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<IncomingInvoice(id={self.id}, invoice_number='{self.invoice_number}', status='{self.status}')>"
 
@@ -2,7 +2,7 @@
 Stock Movement Model for Inventory Audit Trail
 Logs all stock changes for complete traceability
 """
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Enum as SQLEnum, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -52,6 +52,11 @@ class StockMovement(Base):
     # - For CORRECTION: null or adjustment_id
     related_id = Column(Integer, nullable=True, index=True)
 
+    # Order deduction dedupe key (order from the orders service); set only by
+    # StockDeductionService. Legacy SALE rows keep NULL (their related_id was
+    # the order item ID), so they never match a new order.
+    order_id = Column(Integer, nullable=True)
+
     # Optional notes/description
     notes = Column(Text, nullable=True)
 
@@ -64,6 +69,19 @@ class StockMovement(Base):
     # Relationships
     inventory_item = relationship("InventoryItem")
 
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC (optionally per item)
+        Index('ix_stock_movements_item_created_at_id', 'inventory_item_id', 'created_at', 'id'),
+        Index('ix_stock_movements_created_at_id', 'created_at', 'id'),
+        # Order deduction dedupe key: one movement per (order, inventory item)
+        Index(
+            'uq_stock_movements_order_item', 'order_id', 'inventory_item_id',
+            unique=True,
+            postgresql_where=text("order_id IS NOT NULL"),
+            sqlite_where=text("order_id IS NOT NULL")
+        ),
+    )
+
     def __repr__(self):
         return (
             f"<StockMovement(id={self.id}, item_id={self.inventory_item_id}, "
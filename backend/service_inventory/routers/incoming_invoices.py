@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from backend.core_domain.pagination import InvalidCursorError, next_page_cursor
 from backend.service_inventory.models.database import get_db
 from backend.service_inventory.models import InvoiceStatus
 from backend.service_inventory.services.incoming_invoice_service import IncomingInvoiceService
@@ -74,6 +75,8 @@ def list_invoices(
     supplier_name: Optional[str] = None,
     page: int = 1,
     page_size: int = 50,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -83,6 +86,8 @@ def list_invoices(
     - **supplier_name**: Filter by supplier name (partial match)
     - **page**: Page number (starts at 1)
     - **page_size**: Items per page
+    - **cursor**: Keyset cursor (next_cursor of the previous page); page is ignored
+    - **include_total**: Compute the total count (default: true without cursor, false with cursor)
     """
     # Validate page parameters
     if page < 1:
@@ -106,15 +111,20 @@ def list_invoices(
             status=status_enum,
             supplier_name=supplier_name,
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total
         )
 
         return IncomingInvoiceListResponse(
             invoices=invoices,
             total=total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_page_cursor(invoices, page_size)
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -7,7 +7,9 @@ These endpoints are NOT meant to be called by external clients.
 They do NOT have RBAC protection (service-to-service trust assumed).
 """
 import logging
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any
@@ -30,9 +32,20 @@ internal_router = APIRouter(
 
 
 # Request/Response Schemas
+class StockDeductionItem(BaseModel):
+    """Order item pushed by the Orders Service"""
+    id: int | None = Field(None, description="Rendelési tétel azonosítója")
+    product_id: int | None = Field(None, description="Termék azonosítója")
+    quantity: int = Field(1, description="Mennyiség", gt=0)
+
+
 class StockDeductionRequest(BaseModel):
     """Request schema for stock deduction"""
     order_id: int = Field(..., description="ID rendelés amelyre a készletcsökkentést végre kell hajtani", gt=0)
+    items: List[StockDeductionItem] | None = Field(
+        None,
+        description="Rendelési tételek; ha hiányzik, az Orders Service-ből kerülnek lekérésre"
+    )
     orders_service_url: str | None = Field(
         None,
         description="Optional override for Orders Service URL (for testing)"
@@ -40,14 +53,14 @@ class StockDeductionRequest(BaseModel):
 
 
 class IngredientDeduction(BaseModel):
-    """Details of a single ingredient deduction"""
-    order_item_id: int
-    product_id: int
+    """Details of a single (aggregated) ingredient deduction"""
+    product_ids: List[int]
     inventory_item_id: int
     inventory_item_name: str
     quantity_deducted: float
     remaining_stock: float
     unit: str
+    stock_movement_id: int | None = None
 
 
 class SkippedItem(BaseModel):
@@ -59,10 +72,10 @@ class SkippedItem(BaseModel):
 
 
 class DeductionError(BaseModel):
-    """Details of a deduction error"""
-    order_item_id: int | None = None
-    product_id: int | None = None
-    quantity: int | None = None
+    """Details of a deduction error (per inventory item)"""
+    inventory_item_id: int | None = None
+    product_ids: List[int] | None = None
+    quantity: float | None = None
     error: str
 
 
@@ -86,15 +99,23 @@ class StockDeductionResponse(BaseModel):
     **INTERNAL ENDPOINT** - Called by Orders Service when an order is closed.
 
     This endpoint:
-    1. Fetches order items from Orders Service
-    2. Looks up recipes for each product
-    3. Calculates ingredient consumption
-    4. Deducts ingredients from inventory
+    1. Takes the order items from the request body (`items`); if omitted,
+       fetches them from the Orders Service
+    2. Explodes the products into ingredients (in-memory recipe BOM index)
+    3. Aggregates ingredient consumption per inventory item
+    4. Deducts all ingredients in a single transaction
     5. Returns a summary of successful/failed deductions
 
+    **Idempotent**: a repeated request for an already deducted order
+    (outbox retry) does not deduct again.
+
     **Graceful Failure**: Even if some deductions fail (e.g., insufficient stock),
     the endpoint returns 200 OK with error details in the response body.
     This allows the Orders Service to continue closing the order.
+
+    **Transient failures** (Orders Service unreachable, deadlock, lock timeout)
+    return 503 and other unexpected errors 500, so the Orders Service outbox
+    retries the delivery; nothing is deducted in these cases.
     """
 )
 def deduct_stock_for_order(
@@ -109,7 +130,7 @@ def deduct_stock_for_order(
     It processes all order items, looks up recipes, and deducts ingredients from inventory.
 
     Args:
-        request: StockDeductionRequest with order_id
+        request: StockDeductionRequest with order_id and (optionally) the order items
         db: Database session
         service: StockDeductionService instance
 
@@ -119,6 +140,7 @@ def deduct_stock_for_order(
     Raises:
         HTTPException 400: If order_id is invalid
         HTTPException 404: If order not found in Orders Service
+        HTTPException 503: If Orders Service or the database is temporarily unavailable
         HTTPException 500: If unexpected error occurs
     """
     logger.info(f"[INTERNAL API] Stock deduction request for order {request.order_id}")
@@ -127,7 +149,11 @@ def deduct_stock_for_order(
         # Execute stock deduction
         result = service.deduct_stock_for_order(
             order_id=request.order_id,
-            orders_service_url=request.orders_service_url
+            orders_service_url=request.orders_service_url,
+            order_items=(
+                [item.model_dump() for item in request.items]
+                if request.items is not None else None
+            )
         )
 
         # Log result summary
@@ -152,6 +178,16 @@ def deduct_stock_for_order(
             detail=str(e)
         )
 
+    except (httpx.HTTPError, OperationalError) as e:
+        # Transient error (retryable by the outbox)
+        logger.error(
+            f"[INTERNAL API] Stock deduction temporarily failed for order {request.order_id}: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Stock deduction temporarily unavailable: {str(e)}"
+        )
+
     except Exception as e:
         # Unexpected error
         logger.error(
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
+from backend.core_domain.pagination import InvalidCursorError, next_page_cursor
 from backend.service_inventory.models.database import get_db
 from backend.service_inventory.models import MovementReason, InventoryItem
 from backend.service_inventory.services.stock_movement_service import StockMovementService
@@ -47,6 +48,8 @@ def list_stock_movements(
     date_to: Optional[datetime] = None,
     page: int = 1,
     page_size: int = 50,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -59,6 +62,8 @@ def list_stock_movements(
     - **date_to**: Filter by date (to)
     - **page**: Page number (starts at 1)
     - **page_size**: Items per page
+    - **cursor**: Keyset cursor (next_cursor of the previous page); page is ignored
+    - **include_total**: Compute the total count (default: true without cursor, false with cursor)
     """
     # Validate page parameters
     if page < 1:
@@ -85,7 +90,9 @@ def list_stock_movements(
             date_from=date_from,
             date_to=date_to,
             skip=skip,
-            limit=page_size
+            limit=page_size,
+            cursor=cursor,
+            include_total=cursor is None if include_total is None else include_total
         )
 
         # Enrich with inventory item details
@@ -115,9 +122,12 @@ def list_stock_movements(
             movements=responses,
             total=total,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            next_cursor=next_page_cursor(movements, page_size)
         )
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -95,9 +95,10 @@ class IncomingInvoiceResponse(IncomingInvoiceBase):
 class IncomingInvoiceListResponse(BaseModel):
     """Paginated list of invoices"""
     invoices: List[IncomingInvoiceResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total count (null when not requested, e.g. on cursor pages)")
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor of the next page; null on the last page")
 
 
 class IncomingInvoiceFinalizeRequest(BaseModel):
@@ -59,9 +59,10 @@ class StockMovementResponse(StockMovementBase):
 class StockMovementListResponse(BaseModel):
     """Paginated list of stock movements"""
     movements: List[StockMovementResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total count (null when not requested, e.g. on cursor pages)")
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor of the next page; null on the last page")
 
 
 class StockMovementFilter(BaseModel):
@@ -3,11 +3,12 @@ Incoming Invoice Service - Business logic for procurement/purchasing
 Handles invoice creation, item management, and finalization with stock updates
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
 
+from backend.core_domain.pagination import decode_cursor
 from backend.service_inventory.models import (
     IncomingInvoice,
     IncomingInvoiceItem,
@@ -114,13 +115,22 @@ class IncomingInvoiceService:
         status: Optional[InvoiceStatus] = None,
         supplier_name: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[IncomingInvoice], int]:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[IncomingInvoice], Optional[int]]:
         """
         List invoices with filters and pagination
 
+        With a cursor (next_cursor of the previous page) the list continues
+        by keyset on (created_at, id) and skip is ignored, so deep pages do
+        not scan the rows before them.
+
+        Raises:
+            InvalidCursorError: If the cursor cannot be decoded (ValueError)
+
         Returns:
-            Tuple of (invoices_list, total_count)
+            Tuple of (invoices_list, total_count or None if include_total is False)
         """
         query = db.query(IncomingInvoice)
 
@@ -130,11 +140,18 @@ class IncomingInvoiceService:
         if supplier_name:
             query = query.filter(IncomingInvoice.supplier_name.ilike(f"%{supplier_name}%"))
 
-        # Get total count
-        total = query.count()
+        # Get total count (optional: scans the whole filtered set)
+        total = query.count() if include_total else None
 
-        # Apply pagination and ordering (newest first)
-        invoices = query.order_by(desc(IncomingInvoice.created_at)).offset(skip).limit(limit).all()
+        # Apply ordering (newest first, id as tie-breaker) and pagination
+        query = query.order_by(desc(IncomingInvoice.created_at), desc(IncomingInvoice.id))
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.filter(tuple_(IncomingInvoice.created_at, IncomingInvoice.id) < tuple_(cursor_created_at, cursor_id))
+        else:
+            query = query.offset(skip)
+
+        invoices = query.limit(limit).all()
 
         return invoices, total
 
@@ -279,29 +296,28 @@ class IncomingInvoiceService:
         if not invoice.items:
             raise ValueError("Cannot finalize invoice with no items")
 
-        # Create stock movements for each item
-        movements_created = 0
-        for item in invoice.items:
-            # Update inventory item cost
-            inv_item = db.query(InventoryItem).filter(
-                InventoryItem.id == item.inventory_item_id
-            ).first()
-            if inv_item:
-                inv_item.last_cost_per_unit = item.unit_price
-
-            # Create stock movement (increases stock)
-            movement_notes = notes or f"Incoming invoice: {invoice.invoice_number}"
-            StockMovementService.create_movement(
-                db=db,
-                inventory_item_id=item.inventory_item_id,
-                change_amount=item.quantity,  # Positive = increase
-                reason=MovementReason.INTAKE,
-                related_id=invoice.id,
-                notes=movement_notes,
-                employee_id=employee_id,
-                commit=False  # We'll commit at the end
-            )
-            movements_created += 1
+        # Stock movements for all items: rows locked, one batched insert
+        movement_notes = notes or f"Incoming invoice: {invoice.invoice_number}"
+        movements, _ = StockMovementService.create_movements_bulk(
+            db,
+            [
+                {
+                    "inventory_item_id": item.inventory_item_id,
+                    "change_amount": item.quantity,  # Positive = increase
+                    "related_id": invoice.id,
+                    "notes": movement_notes,
+                }
+                for item in invoice.items
+            ],
+            reason=MovementReason.INTAKE,
+            employee_id=employee_id,
+            commit=False  # We'll commit at the end
+        )
+        movements_created = len(movements)
+
+        # Update inventory item costs (items are already locked and loaded)
+        for item, movement in zip(invoice.items, movements):
+            movement.inventory_item.last_cost_per_unit = item.unit_price
 
         # Mark invoice as finalized
         invoice.status = InvoiceStatus.FINALIZED
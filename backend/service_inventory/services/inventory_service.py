@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from backend.service_inventory.models.inventory_item import InventoryItem
+from backend.service_inventory.services.recipe_bom_index import recipe_bom_index
 from backend.service_inventory.schemas.inventory_item import (
     InventoryItemCreate,
     InventoryItemUpdate,
@@ -178,6 +179,10 @@ class InventoryService:
         self.db.commit()
         self.db.refresh(db_item)
 
+        # A BOM index az alapanyag mértékegységét is tárolja
+        if "unit" in update_data:
+            recipe_bom_index.invalidate()
+
         return db_item
 
     def delete_item(self, item_id: int) -> bool:
@@ -198,6 +203,9 @@ class InventoryService:
         self.db.delete(db_item)
         self.db.commit()
 
+        # A receptjei CASCADE törlődtek
+        recipe_bom_index.invalidate()
+
         return True
 
     def update_stock(
@@ -0,0 +1,213 @@
+"""
+Recipe BOM Index - Precomputed recipe explosion cache
+Module 5: Készletkezelés
+
+A receptek (product -> alapanyagok) hetente néhányszor változnak, de minden
+lezárt rendelésnél (készletlevonás), elérhetőség-ellenőrzésnél és
+alapanyag-igény számításnál olvassuk őket. Korábban ez recept lekérdezést,
+majd alapanyagonként külön InventoryItem lekérdezést jelentett.
+
+Ez a modul egy folyamaton belüli bill-of-materials indexet tart:
+    product_id -> ((inventory_item_id, quantity, unit), ...)
+
+Frissítés:
+- Inkrementális: a RecipeService create/update/delete a commit után
+  újratölti az érintett termék(ek) sorait
+- Teljes: az első olvasáskor, `invalidate()` után (pl. alapanyag
+  módosítás/törlés), illetve `recipe_bom_resync_seconds` időközönként
+  (ez korlátozza a más worker-ekben végzett módosítások késését)
+
+A készletszint (current_stock_perpetual) NINCS az indexben - az mindig
+friss lekérdezésből jön.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.service_inventory.config import settings
+from backend.service_inventory.models.inventory_item import InventoryItem
+from backend.service_inventory.models.recipe import Recipe
+
+
+@dataclass(frozen=True)
+class BOMLine:
+    """
+    Egy termék egy alapanyag-sora (1 db termékre vetítve).
+
+    Attributes:
+        inventory_item_id: Alapanyag azonosítója
+        quantity: Felhasznált mennyiség 1 db termékhez
+        unit: Alapanyag mértékegysége
+    """
+
+    inventory_item_id: int
+    quantity: Decimal
+    unit: str
+
+
+class RecipeBOMIndex:
+    """
+    Szálbiztos, memóriában tartott product_id -> BOM sorok index.
+
+    Az olvasások a lock nélkül, az aktuális (immutábilis tuple-öket tartalmazó)
+    dict-ből szolgálnak ki; betöltés és frissítés a lock alatt történik.
+    """
+
+    def __init__(self, resync_seconds: int = 0):
+        """
+        Args:
+            resync_seconds: Teljes újratöltés időköze másodpercben (0 = csak egyszer)
+        """
+        self.resync_seconds = resync_seconds
+        self._index: Dict[int, Tuple[BOMLine, ...]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._full_loads = 0
+        self._partial_loads = 0
+
+    @staticmethod
+    def _query_lines(db: Session, product_ids: Optional[List[int]] = None) -> Dict[int, Tuple[BOMLine, ...]]:
+        """
+        BOM sorok betöltése egyetlen JOIN lekérdezéssel.
+
+        Args:
+            db: Database session
+            product_ids: Csak ezek a termékek (None = összes)
+
+        Returns:
+            Dict[int, Tuple[BOMLine, ...]]: product_id -> BOM sorok
+        """
+        query = db.query(
+            Recipe.product_id,
+            Recipe.inventory_item_id,
+            Recipe.quantity_used,
+            InventoryItem.unit
+        ).join(InventoryItem, Recipe.inventory_item_id == InventoryItem.id)
+
+        if product_ids is not None:
+            query = query.filter(Recipe.product_id.in_(product_ids))
+
+        lines: Dict[int, List[BOMLine]] = {}
+        for row in query.order_by(Recipe.product_id, Recipe.inventory_item_id).all():
+            lines.setdefault(row.product_id, []).append(
+                BOMLine(
+                    inventory_item_id=row.inventory_item_id,
+                    quantity=Decimal(str(row.quantity_used)),
+                    unit=row.unit
+                )
+            )
+        return {product_id: tuple(product_lines) for product_id, product_lines in lines.items()}
+
+    def _is_stale(self, now: float) -> bool:
+        """True, ha teljes (újra)töltés szükséges."""
+        if self._loaded_at is None:
+            return True
+        return self.resync_seconds > 0 and now - self._loaded_at >= self.resync_seconds
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        Teljes betöltés, ha még nincs betöltve vagy lejárt.
+
+        Args:
+            db: Database session
+        """
+        if not self._is_stale(time.monotonic()):
+            return
+
+        with self._lock:
+            if not self._is_stale(time.monotonic()):
+                return
+            self._index = self._query_lines(db)
+            self._loaded_at = time.monotonic()
+            self._full_loads += 1
+
+    def get(self, db: Session, product_id: int) -> Tuple[BOMLine, ...]:
+        """
+        Egy termék BOM sorai.
+
+        Args:
+            db: Database session (csak (újra)töltéshez)
+            product_id: Termék azonosítója
+
+        Returns:
+            Tuple[BOMLine, ...]: BOM sorok (üres, ha nincs recept)
+        """
+        self.ensure_loaded(db)
+        return self._index.get(product_id, ())
+
+    def get_many(self, db: Session, product_ids: Iterable[int]) -> Dict[int, Tuple[BOMLine, ...]]:
+        """
+        Több termék BOM sorai.
+
+        Args:
+            db: Database session (csak (újra)töltéshez)
+            product_ids: Termék azonosítók
+
+        Returns:
+            Dict[int, Tuple[BOMLine, ...]]: product_id -> BOM sorok (recept nélküli termék nem szerepel)
+        """
+        self.ensure_loaded(db)
+        index = self._index
+        return {
+            product_id: index[product_id]
+            for product_id in set(product_ids)
+            if product_id in index
+        }
+
+    def refresh_products(self, db: Session, product_ids: Iterable[int]) -> None:
+        """
+        Inkrementális frissítés: a megadott termékek sorainak újratöltése.
+
+        Recept módosítás commit-ja után hívandó. Ha az index még nincs
+        betöltve, nincs teendő (az első olvasás úgyis teljes betöltés).
+
+        Args:
+            db: Database session
+            product_ids: Az érintett termékek azonosítói
+        """
+        unique_ids = [product_id for product_id in set(product_ids) if product_id is not None]
+        if not unique_ids or self._loaded_at is None:
+            return
+
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            fresh = self._query_lines(db, unique_ids)
+            index = dict(self._index)
+            for product_id in unique_ids:
+                if product_id in fresh:
+                    index[product_id] = fresh[product_id]
+                else:
+                    index.pop(product_id, None)
+            self._index = index
+            self._partial_loads += 1
+
+    def invalidate(self) -> None:
+        """Teljes újratöltés kérése a következő olvasáskor."""
+        with self._lock:
+            self._loaded_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Index statisztikák (monitoringhoz).
+
+        Returns:
+            dict: loaded, products, lines, full_loads, partial_loads
+        """
+        index = self._index
+        return {
+            "loaded": self._loaded_at is not None,
+            "products": len(index),
+            "lines": sum(len(lines) for lines in index.values()),
+            "full_loads": self._full_loads,
+            "partial_loads": self._partial_loads,
+        }
+
+
+# Singleton instance (folyamatonként egy)
+recipe_bom_index = RecipeBOMIndex(resync_seconds=settings.recipe_bom_resync_seconds)
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from backend.service_inventory.models.recipe import Recipe
 from backend.service_inventory.models.inventory_item import InventoryItem
+from backend.service_inventory.services.recipe_bom_index import recipe_bom_index
 from backend.service_inventory.schemas.recipe import (
     RecipeCreate,
     RecipeUpdate,
@@ -83,6 +84,8 @@ class RecipeService:
         self.db.commit()
         self.db.refresh(db_recipe)
 
+        recipe_bom_index.refresh_products(self.db, [db_recipe.product_id])
+
         return db_recipe
 
     def get_recipe(self, recipe_id: int) -> Optional[Recipe]:
@@ -201,12 +204,15 @@ class RecipeService:
         # Frissítjük csak azokat a mezőket, amelyek meg vannak adva
         update_data = recipe_data.model_dump(exclude_unset=True)
 
+        previous_product_id = db_recipe.product_id
         for field, value in update_data.items():
             setattr(db_recipe, field, value)
 
         self.db.commit()
         self.db.refresh(db_recipe)
 
+        recipe_bom_index.refresh_products(self.db, [previous_product_id, db_recipe.product_id])
+
         return db_recipe
 
     def delete_recipe(self, recipe_id: int) -> bool:
@@ -224,9 +230,12 @@ class RecipeService:
         if not db_recipe:
             return False
 
+        product_id = db_recipe.product_id
         self.db.delete(db_recipe)
         self.db.commit()
 
+        recipe_bom_index.refresh_products(self.db, [product_id])
+
         return True
 
     def get_recipes_by_product(self, product_id: int) -> List[Recipe]:
@@ -272,37 +281,46 @@ class RecipeService:
         Kiszámítja, hogy egy termék elkészítéséhez milyen
         alapanyagok szükségesek és mennyiben.
 
+        A recept sorok a memóriában tartott BOM indexből jönnek, a készletszint
+        egyetlen lekérdezéssel (alapanyagonkénti lekérdezés helyett).
+
         Args:
             product_id: A termék azonosítója
             quantity: A termékből készítendő mennyiség (alapértelmezett: 1)
 
         Returns:
             dict: Az alapanyagok és szükséges mennyiségek
-                  Formátum: {inventory_item_id: {name, unit, quantity_needed}}
+                  Formátum: {inventory_item_id: {name, unit, quantity_needed, current_stock, quantity_per_unit}}
 
         Raises:
             ValueError: Ha a termékhez nincs recept
         """
-        recipes = self.get_recipes_by_product(product_id)
+        lines = recipe_bom_index.get(self.db, product_id)
 
-        if not recipes:
+        if not lines:
             raise ValueError(f"No recipes found for product_id={product_id}")
 
+        inventory_items = {
+            item.id: item
+            for item in self.db.query(InventoryItem).filter(
+                InventoryItem.id.in_([line.inventory_item_id for line in lines])
+            ).all()
+        }
+
         required_ingredients = {}
 
-        for recipe in recipes:
-            inventory_item = self.db.query(InventoryItem).filter(
-                InventoryItem.id == recipe.inventory_item_id
-            ).first()
+        for line in lines:
+            inventory_item = inventory_items.get(line.inventory_item_id)
 
             if inventory_item:
-                quantity_needed = float(recipe.quantity_used) * quantity
+                quantity_needed = float(line.quantity) * quantity
 
-                required_ingredients[recipe.inventory_item_id] = {
+                required_ingredients[line.inventory_item_id] = {
                     "name": inventory_item.name,
                     "unit": inventory_item.unit,
                     "quantity_needed": quantity_needed,
-                    "current_stock": float(inventory_item.current_stock_perpetual)
+                    "current_stock": float(inventory_item.current_stock_perpetual),
+                    "quantity_per_unit": float(line.quantity)
                 }
 
         return required_ingredients
@@ -352,9 +370,7 @@ class RecipeService:
                 })
 
             # Kiszámítjuk, hogy ebből az alapanyagból hány termék készíthető
-            recipe = next(r for r in self.get_recipes_by_product(product_id)
-                         if r.inventory_item_id == item_id)
-            qty_per_unit = float(recipe.quantity_used)
+            qty_per_unit = ingredient_info["quantity_per_unit"]
 
             if qty_per_unit > 0:
                 max_qty_from_this = int(current_stock / qty_per_unit)
@@ -3,19 +3,24 @@ Stock Deduction Service - Business Logic Layer
 Handles automatic inventory deduction when orders are closed
 
 This service is triggered by the Orders Service when an order is marked as LEZART (closed).
-It fetches order items, looks up recipes, and deducts ingredients from inventory.
+The order items arrive in the request payload (fallback: fetched from the Orders Service),
+recipes come from the in-memory BOM index, ingredient totals are aggregated per inventory item and
+all movements are applied in a single transaction.
 """
 import logging
 from typing import Dict, Any, List, Optional
 from decimal import Decimal
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import Depends
 import httpx
 
+from backend.core_http import get_sync_client
 from backend.service_inventory.services.recipe_service import RecipeService
+from backend.service_inventory.services.recipe_bom_index import recipe_bom_index
 from backend.service_inventory.services.inventory_service import InventoryService
 from backend.service_inventory.services.stock_movement_service import StockMovementService
-from backend.service_inventory.models import MovementReason, InventoryItem
+from backend.service_inventory.models import MovementReason, StockMovement
 from backend.service_inventory.config import settings
 from backend.service_inventory.models.database import get_db
 
@@ -27,10 +32,10 @@ class StockDeductionService:
     Service for automatic stock deduction based on order consumption
 
     This service:
-    1. Fetches order items from Orders Service via HTTP
-    2. For each order item (product), looks up recipes
-    3. Calculates ingredient consumption based on recipes and quantities
-    4. Deducts ingredients from inventory using InventoryService
+    1. Takes the order items from the request (or fetches them from Orders Service)
+    2. Explodes the products into ingredients from the in-memory recipe BOM index
+    3. Aggregates ingredient consumption per inventory item
+    4. Applies all stock movements in a single transaction
     5. Returns a deduction summary with success/failure details
     """
 
@@ -42,7 +47,8 @@ class StockDeductionService:
     def deduct_stock_for_order(
         self,
         order_id: int,
-        orders_service_url: Optional[str] = None
+        orders_service_url: Optional[str] = None,
+        order_items: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Deduct inventory stock for a closed order
@@ -50,6 +56,8 @@ class StockDeductionService:
         Args:
             order_id: The ID of the order to process
             orders_service_url: Optional override for Orders Service URL
+            order_items: Order items pushed by the Orders Service
+                (id, product_id, quantity); if None, they are fetched via HTTP
 
         Returns:
             Dict with deduction summary:
@@ -58,13 +66,17 @@ class StockDeductionService:
                 "order_id": int,
                 "items_processed": int,
                 "ingredients_deducted": List[dict],
+                "skipped_items": List[dict],
                 "errors": List[dict],
                 "message": str
             }
 
         Raises:
-            ValueError: If order cannot be fetched
+            ValueError: If the order is not found in the Orders Service
             httpx.HTTPError: If Orders Service is unreachable
+            Exception: Database errors (deadlock, lock timeout) after rollback;
+                only business rejections (insufficient stock) are reported
+                in the returned summary
         """
         service_url = orders_service_url or settings.menu_service_url.replace("8001", "8002")
         # NOTE: Using hardcoded port replacement as temporary workaround
@@ -73,11 +85,9 @@ class StockDeductionService:
         logger.info(f"[STOCK DEDUCTION] Processing order {order_id}")
 
         try:
-            # Step 1: Fetch order details from Orders Service
-            order_data = self._fetch_order_from_service(order_id, service_url)
-
-            # Step 2: Fetch order items
-            order_items = self._fetch_order_items_from_service(order_id, service_url)
+            # Step 1: Order items (pushed in the request, legacy fallback: HTTP fetch)
+            if order_items is None:
+                order_items = self._fetch_order_items_from_service(order_id, service_url)
 
             if not order_items:
                 logger.warning(f"[STOCK DEDUCTION] Order {order_id} has no items")
@@ -90,10 +100,13 @@ class StockDeductionService:
                     "message": "No items to process"
                 }
 
-            # Step 3: Process each order item and deduct ingredients
-            deduction_results = self._process_order_items(order_items)
+            # Step 2: Aggregate ingredients and deduct them in one transaction
+            # (None = a previous delivery of this order already deducted it)
+            deduction_results = self._process_order_items(order_id, order_items)
+            if deduction_results is None:
+                return self._already_deducted_result(order_id, order_items)
 
-            # Step 4: Compile summary
+            # Step 3: Compile summary
             total_items = len(order_items)
             successful_deductions = deduction_results["successful"]
             failed_deductions = deduction_results["failed"]
@@ -118,22 +131,23 @@ class StockDeductionService:
                 "message": message
             }
 
+        except IntegrityError:
+            # Unique (order, item) index: a concurrent delivery of the same order committed first
+            self.db.rollback()
+            logger.info(f"[STOCK DEDUCTION] Order {order_id} deducted by a concurrent delivery, skipping")
+            return self._already_deducted_result(order_id, order_items)
+
         except httpx.HTTPError as e:
-            error_msg = f"Failed to fetch order {order_id} from Orders Service: {str(e)}"
-            logger.error(f"[STOCK DEDUCTION] {error_msg}")
-            raise ValueError(error_msg)
+            # Transient: the caller answers 503 so the outbox retries the delivery
+            logger.error(f"[STOCK DEDUCTION] Failed to fetch order {order_id} from Orders Service: {str(e)}")
+            raise
 
         except Exception as e:
-            error_msg = f"Unexpected error processing order {order_id}: {str(e)}"
-            logger.error(f"[STOCK DEDUCTION] {error_msg}")
-            return {
-                "success": False,
-                "order_id": order_id,
-                "items_processed": 0,
-                "ingredients_deducted": [],
-                "errors": [{"message": error_msg}],
-                "message": error_msg
-            }
+            # Deadlock, lock timeout, dropped connection or a bug: nothing is
+            # committed, the error propagates (5xx) so the outbox retries
+            self.db.rollback()
+            logger.error(f"[STOCK DEDUCTION] Unexpected error processing order {order_id}: {str(e)}")
+            raise
 
     def _fetch_order_from_service(
         self,
@@ -154,17 +168,17 @@ class StockDeductionService:
             httpx.HTTPError: If request fails
             ValueError: If order not found
         """
-        with httpx.Client(timeout=5.0) as client:
-            url = f"{service_url}/api/orders/{order_id}"
-            logger.debug(f"[STOCK DEDUCTION] Fetching order from: {url}")
+        client = get_sync_client("orders")
+        url = f"{service_url}/api/orders/{order_id}"
+        logger.debug(f"[STOCK DEDUCTION] Fetching order from: {url}")
 
-            response = client.get(url)
+        response = client.get(url, timeout=5.0)
 
-            if response.status_code == 404:
-                raise ValueError(f"Order {order_id} not found in Orders Service")
+        if response.status_code == 404:
+            raise ValueError(f"Order {order_id} not found in Orders Service")
 
-            response.raise_for_status()
-            return response.json()
+        response.raise_for_status()
+        return response.json()
 
     def _fetch_order_items_from_service(
         self,
@@ -184,128 +198,203 @@ class StockDeductionService:
         Raises:
             httpx.HTTPError: If request fails
         """
-        with httpx.Client(timeout=5.0) as client:
-            url = f"{service_url}/api/orders/{order_id}/items"
-            logger.debug(f"[STOCK DEDUCTION] Fetching order items from: {url}")
+        client = get_sync_client("orders")
+        url = f"{service_url}/api/orders/{order_id}/items"
+        logger.debug(f"[STOCK DEDUCTION] Fetching order items from: {url}")
+
+        response = client.get(url, timeout=5.0)
+
+        if response.status_code == 404:
+            # Order exists but no items endpoint - try to get from order object
+            logger.warning(f"[STOCK DEDUCTION] /items endpoint not found, extracting from order")
+            order_data = self._fetch_order_from_service(order_id, service_url)
+            return order_data.get("order_items", [])
+
+        response.raise_for_status()
+        return response.json()
+
+    def _is_order_deducted(self, order_id: int) -> bool:
+        """
+        Whether the order already has deduction stock movements
+
+        The Orders Service delivers deductions at-least-once (outbox retries),
+        so a repeated request for the same order must not deduct twice. All
+        movements of an order are committed together, so one is enough.
+        Keyed on StockMovement.order_id: legacy SALE rows (related_id = order
+        item ID) have no order_id and cannot match.
 
-            response = client.get(url)
+        Must run after the order's stock rows are locked (see
+        _process_order_items): a concurrent delivery of the same order then
+        waits for the first one to commit and sees its movements.
 
-            if response.status_code == 404:
-                # Order exists but no items endpoint - try to get from order object
-                logger.warning(f"[STOCK DEDUCTION] /items endpoint not found, extracting from order")
-                order_data = self._fetch_order_from_service(order_id, service_url)
-                return order_data.get("order_items", [])
+        Args:
+            order_id: Order ID
 
-            response.raise_for_status()
-            return response.json()
+        Returns:
+            True if the order was already deducted
+        """
+        return self.db.query(StockMovement.id).filter(
+            StockMovement.order_id == order_id
+        ).first() is not None
+
+    @staticmethod
+    def _already_deducted_result(
+        order_id: int,
+        order_items: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Deduction summary for a repeated delivery (nothing deducted)"""
+        return {
+            "success": True,
+            "order_id": order_id,
+            "items_processed": 0,
+            "ingredients_deducted": [],
+            "skipped_items": [
+                {
+                    "order_item_id": item.get("id"),
+                    "product_id": item.get("product_id"),
+                    "quantity": item.get("quantity", 1),
+                    "reason": "Already deducted"
+                }
+                for item in order_items
+            ],
+            "errors": [],
+            "message": "Order already deducted"
+        }
 
     def _process_order_items(
         self,
+        order_id: int,
         order_items: List[Dict[str, Any]]
-    ) -> Dict[str, List[Dict[str, Any]]]:
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
         """
-        Process all order items and deduct ingredients from inventory
+        Aggregate ingredient consumption and deduct it from inventory
+
+        Recipes come from the in-memory BOM index, consumption is summed
+        per inventory_item_id, and every movement is committed together.
+        An ingredient with insufficient stock is reported in `failed`; the
+        remaining ingredients are still deducted.
 
         Args:
+            order_id: The ID of the order (movement related_id and notes)
             order_items: List of order item dicts with product_id and quantity
 
         Returns:
-            Dict with three lists: successful, failed, skipped
+            Dict with three lists: successful, failed, skipped;
+            None if the order was already deducted
         """
         successful = []
         failed = []
         skipped = []
 
+        items_with_product = []
         for item in order_items:
-            product_id = item.get("product_id")
-            quantity = item.get("quantity", 1)
-            item_id = item.get("id")
-
-            if not product_id:
-                logger.warning(f"[STOCK DEDUCTION] Order item {item_id} has no product_id")
+            if not item.get("product_id"):
+                logger.warning(f"[STOCK DEDUCTION] Order item {item.get('id')} has no product_id")
                 skipped.append({
-                    "order_item_id": item_id,
+                    "order_item_id": item.get("id"),
                     "reason": "No product_id"
                 })
                 continue
+            items_with_product.append(item)
 
-            logger.debug(f"[STOCK DEDUCTION] Processing product {product_id} (qty: {quantity})")
-
-            try:
-                # Get recipes for this product
-                recipes = self.recipe_service.get_recipes_by_product(product_id)
-
-                if not recipes:
-                    logger.info(f"[STOCK DEDUCTION] Product {product_id} has no recipes, skipping")
-                    skipped.append({
-                        "order_item_id": item_id,
-                        "product_id": product_id,
-                        "quantity": quantity,
-                        "reason": "No recipe found"
-                    })
-                    continue
-
-                # Deduct ingredients for each recipe
-                for recipe in recipes:
-                    inventory_item_id = recipe.inventory_item_id
-                    quantity_per_unit = float(recipe.quantity_used)
-                    total_quantity = quantity_per_unit * quantity
-
-                    # Deduct from inventory using StockMovementService (logs movement automatically)
-                    movement = StockMovementService.create_movement(
-                        db=self.db,
-                        inventory_item_id=inventory_item_id,
-                        change_amount=Decimal(str(-total_quantity)),  # Negative = decrease
-                        reason=MovementReason.SALE,
-                        related_id=item_id,  # Order item ID
-                        notes=f"Order {order_id}: {quantity}x product {product_id}",
-                        commit=True
-                    )
-
-                    # Get updated item info
-                    updated_item = self.db.query(InventoryItem).filter(
-                        InventoryItem.id == inventory_item_id
-                    ).first()
-
-                    if updated_item:
-                        successful.append({
-                            "order_item_id": item_id,
-                            "product_id": product_id,
-                            "inventory_item_id": inventory_item_id,
-                            "inventory_item_name": updated_item.name,
-                            "quantity_deducted": total_quantity,
-                            "remaining_stock": float(updated_item.current_stock_perpetual),
-                            "unit": updated_item.unit,
-                            "stock_movement_id": movement.id
-                        })
-
-                        logger.info(
-                            f"[STOCK DEDUCTION] Deducted {total_quantity} {updated_item.unit} "
-                            f"of {updated_item.name} (remaining: {updated_item.current_stock_perpetual}) "
-                            f"[Movement ID: {movement.id}]"
-                        )
-
-            except ValueError as e:
-                # Insufficient stock or other business logic error
-                error_detail = {
-                    "order_item_id": item_id,
-                    "product_id": product_id,
-                    "quantity": quantity,
-                    "error": str(e)
-                }
-                failed.append(error_detail)
-                logger.error(f"[STOCK DEDUCTION] Failed to deduct for item {item_id}: {str(e)}")
+        # Recipe explosion from the in-memory BOM index (no per-order recipe query)
+        bom_by_product = recipe_bom_index.get_many(
+            self.db,
+            [item["product_id"] for item in items_with_product]
+        )
+
+        # inventory_item_id -> total consumption / contributing product IDs
+        totals: Dict[int, Decimal] = {}
+        product_ids_by_ingredient: Dict[int, List[int]] = {}
 
-            except Exception as e:
-                # Unexpected error
-                error_detail = {
-                    "order_item_id": item_id,
+        for item in items_with_product:
+            product_id = item["product_id"]
+            quantity = item.get("quantity", 1)
+            bom_lines = bom_by_product.get(product_id)
+
+            if not bom_lines:
+                logger.info(f"[STOCK DEDUCTION] Product {product_id} has no recipes, skipping")
+                skipped.append({
+                    "order_item_id": item.get("id"),
                     "product_id": product_id,
                     "quantity": quantity,
-                    "error": f"Unexpected error: {str(e)}"
+                    "reason": "No recipe found"
+                })
+                continue
+
+            for line in bom_lines:
+                inventory_item_id = line.inventory_item_id
+                totals[inventory_item_id] = (
+                    totals.get(inventory_item_id, Decimal("0"))
+                    + line.quantity * quantity
+                )
+                contributing = product_ids_by_ingredient.setdefault(inventory_item_id, [])
+                if product_id not in contributing:
+                    contributing.append(product_id)
+
+        if not totals:
+            return {"successful": successful, "failed": failed, "skipped": skipped}
+
+        # Lock the stock rows before the idempotency check, in this transaction:
+        # a concurrent redelivery of the order blocks here until the first
+        # delivery commits, and then sees its SALE movements
+        StockMovementService.lock_items(self.db, totals.keys())
+        if self._is_order_deducted(order_id):
+            self.db.rollback()
+            logger.info(f"[STOCK DEDUCTION] Order {order_id} already deducted, skipping")
+            return None
+
+        # Apply all movements in one transaction (rows locked, one batched insert)
+        movements, rejected = StockMovementService.create_movements_bulk(
+            self.db,
+            [
+                {
+                    "inventory_item_id": inventory_item_id,
+                    "change_amount": -total_quantity,  # Negative = decrease
+                    "related_id": order_id,
+                    "order_id": order_id,
+                    "notes": f"Order {order_id}: products {product_ids_by_ingredient[inventory_item_id]}",
                 }
-                failed.append(error_detail)
-                logger.error(f"[STOCK DEDUCTION] Unexpected error for item {item_id}: {str(e)}")
+                for inventory_item_id, total_quantity in totals.items()
+            ],
+            reason=MovementReason.SALE,
+            allow_partial=True,
+            commit=False
+        )
+
+        for rejection in rejected:
+            # Insufficient stock or missing inventory item
+            inventory_item_id = rejection["inventory_item_id"]
+            failed.append({
+                "inventory_item_id": inventory_item_id,
+                "product_ids": product_ids_by_ingredient[inventory_item_id],
+                "quantity": float(totals[inventory_item_id]),
+                "error": rejection["error"]
+            })
+            logger.error(
+                f"[STOCK DEDUCTION] Failed to deduct inventory item {inventory_item_id}: {rejection['error']}"
+            )
+
+        for movement in movements:
+            updated_item = movement.inventory_item
+            successful.append({
+                "product_ids": product_ids_by_ingredient[updated_item.id],
+                "inventory_item_id": updated_item.id,
+                "inventory_item_name": updated_item.name,
+                "quantity_deducted": float(-movement.change_amount),
+                "remaining_stock": float(movement.stock_after),
+                "unit": updated_item.unit,
+                "stock_movement_id": movement.id
+            })
+
+            logger.info(
+                f"[STOCK DEDUCTION] Deducted {-movement.change_amount} {updated_item.unit} "
+                f"of {updated_item.name} (remaining: {movement.stock_after}) "
+                f"[Movement ID: {movement.id}]"
+            )
+
+        if movements:
+            self.db.commit()
 
         return {
             "successful": successful,
@@ -3,11 +3,12 @@ Stock Movement Service - Business logic for stock movement tracking
 Provides centralized logging for all inventory stock changes
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import Optional, List
+from sqlalchemy import desc, tuple_
+from typing import Any, Dict, Iterable, Optional, List, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+from backend.core_domain.pagination import decode_cursor
 from backend.service_inventory.models import StockMovement, InventoryItem, MovementReason
 from backend.service_inventory.schemas.stock_movement import (
     StockMovementCreate,
@@ -33,6 +34,8 @@ class StockMovementService:
         """
         Create a stock movement log entry
 
+        Single-movement wrapper around create_movements_bulk (same row lock).
+
         Args:
             db: Database session
             inventory_item_id: ID of inventory item
@@ -49,45 +52,149 @@ class StockMovementService:
         Raises:
             ValueError: If inventory item not found or stock would go negative
         """
-        # Get inventory item
-        item = db.query(InventoryItem).filter(InventoryItem.id == inventory_item_id).first()
-        if not item:
-            raise ValueError(f"Inventory item with ID {inventory_item_id} not found")
-
-        # Calculate new stock level
-        current_stock = item.current_stock_perpetual or Decimal('0')
-        new_stock = current_stock + change_amount
-
-        # Validate stock doesn't go negative
-        if new_stock < 0:
-            raise ValueError(
-                f"Insufficient stock for {item.name}. "
-                f"Current: {current_stock} {item.unit}, "
-                f"Requested change: {change_amount} {item.unit}"
-            )
-
-        # Create movement record
-        movement = StockMovement(
-            inventory_item_id=inventory_item_id,
-            change_amount=change_amount,
-            stock_after=new_stock,
+        movements, _ = StockMovementService.create_movements_bulk(
+            db,
+            [{
+                "inventory_item_id": inventory_item_id,
+                "change_amount": change_amount,
+                "related_id": related_id,
+                "notes": notes,
+            }],
             reason=reason,
-            related_id=related_id,
-            notes=notes,
-            employee_id=employee_id
+            employee_id=employee_id,
+            commit=commit
+        )
+        return movements[0]
+
+    @staticmethod
+    def lock_items(db: Session, inventory_item_ids: Iterable[int]) -> Dict[int, InventoryItem]:
+        """
+        Lock InventoryItem rows for the rest of the transaction
+
+        Rows are locked in ascending ID order (SELECT ... FOR UPDATE,
+        consistent order = no deadlock between concurrent callers) and
+        re-read under the lock. Locking the same rows again in the same
+        transaction is a no-op.
+
+        Args:
+            db: Database session
+            inventory_item_ids: IDs of the items to lock
+
+        Returns:
+            Dict of inventory_item_id -> locked InventoryItem (missing IDs are absent)
+        """
+        # Pending changes first: the locking query re-reads the rows (autoflush is off)
+        db.flush()
+
+        item_ids = sorted(set(inventory_item_ids))
+        return {
+            item.id: item
+            for item in db.query(InventoryItem)
+            .filter(InventoryItem.id.in_(item_ids))
+            .order_by(InventoryItem.id)
+            .with_for_update()
+            .populate_existing()
+            .all()
+        }
+
+    @staticmethod
+    def create_movements_bulk(
+        db: Session,
+        deltas: List[Dict[str, Any]],
+        reason: MovementReason,
+        employee_id: Optional[int] = None,
+        allow_partial: bool = False,
+        commit: bool = True
+    ) -> Tuple[List[StockMovement], List[Dict[str, Any]]]:
+        """
+        Apply many stock changes in one transaction
+
+        The affected InventoryItem rows are locked via lock_items (ascending
+        ID order, re-read under the lock), so stock_after is always computed
+        from the current committed value. Movements are
+        inserted together in one flush and committed once.
+
+        Several deltas for the same item are applied in the given order.
+
+        Args:
+            db: Database session
+            deltas: Changes, each a dict with inventory_item_id, change_amount
+                (positive=increase, negative=decrease) and optional related_id,
+                order_id, notes, employee_id
+            reason: Reason for all movements (MovementReason enum)
+            employee_id: Default employee ID (a delta's own employee_id wins)
+            allow_partial: If True, invalid deltas (missing item, stock would
+                go negative) are skipped and reported; if False, the first one
+                raises ValueError and nothing is written
+            commit: Whether to commit the transaction (default True)
+
+        Returns:
+            Tuple of (created movements, rejected deltas with an "error" key)
+
+        Raises:
+            ValueError: If allow_partial is False and a delta is invalid
+        """
+        if not deltas:
+            return [], []
+
+        items = StockMovementService.lock_items(
+            db, [delta["inventory_item_id"] for delta in deltas]
         )
 
-        db.add(movement)
+        # Compute in Python first, so a rejected batch leaves no partial writes
+        new_stock = {
+            item_id: item.current_stock_perpetual or Decimal('0')
+            for item_id, item in items.items()
+        }
+        accepted = []
+        rejected = []
 
-        # Update inventory item stock
-        item.current_stock_perpetual = new_stock
+        for delta in deltas:
+            item_id = delta["inventory_item_id"]
+            change_amount = Decimal(str(delta["change_amount"]))
+            item = items.get(item_id)
+
+            if item is None:
+                error = f"Inventory item with ID {item_id} not found"
+            elif new_stock[item_id] + change_amount < 0:
+                error = (
+                    f"Insufficient stock for {item.name}. "
+                    f"Current: {new_stock[item_id]} {item.unit}, "
+                    f"Requested change: {change_amount} {item.unit}"
+                )
+            else:
+                new_stock[item_id] += change_amount
+                accepted.append((delta, item, change_amount, new_stock[item_id]))
+                continue
+
+            if not allow_partial:
+                raise ValueError(error)
+            rejected.append({**delta, "error": error})
+
+        movements = [
+            StockMovement(
+                inventory_item=item,
+                change_amount=change_amount,
+                stock_after=stock_after,
+                reason=reason,
+                related_id=delta.get("related_id"),
+                order_id=delta.get("order_id"),
+                notes=delta.get("notes"),
+                employee_id=delta.get("employee_id", employee_id)
+            )
+            for delta, item, change_amount, stock_after in accepted
+        ]
+
+        for item_id, item in items.items():
+            item.current_stock_perpetual = new_stock[item_id]
+
+        db.add_all(movements)
+        db.flush()  # One batched INSERT, IDs assigned
 
         if commit:
             db.commit()
-            db.refresh(movement)
-            db.refresh(item)
 
-        return movement
+        return movements, rejected
 
     @staticmethod
     def get_movement(db: Session, movement_id: int) -> Optional[StockMovement]:
@@ -103,13 +210,22 @@ class StockMovementService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[StockMovement], int]:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[StockMovement], Optional[int]]:
         """
         List stock movements with filters and pagination
 
+        With a cursor (next_cursor of the previous page) the list continues
+        by keyset on (created_at, id) and skip is ignored, so deep pages do
+        not scan the rows before them.
+
+        Raises:
+            InvalidCursorError: If the cursor cannot be decoded (ValueError)
+
         Returns:
-            Tuple of (movements_list, total_count)
+            Tuple of (movements_list, total_count or None if include_total is False)
         """
         query = db.query(StockMovement)
 
@@ -125,11 +241,18 @@ class StockMovementService:
         if date_to:
             query = query.filter(StockMovement.created_at <= date_to)
 
-        # Get total count
-        total = query.count()
+        # Get total count (optional: scans the whole filtered set)
+        total = query.count() if include_total else None
 
-        # Apply pagination and ordering (newest first)
-        movements = query.order_by(desc(StockMovement.created_at)).offset(skip).limit(limit).all()
+        # Apply ordering (newest first, id as tie-breaker) and pagination
+        query = query.order_by(desc(StockMovement.created_at), desc(StockMovement.id))
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.filter(tuple_(StockMovement.created_at, StockMovement.id) < tuple_(cursor_created_at, cursor_id))
+        else:
+            query = query.offset(skip)
+
+        movements = query.limit(limit).all()
 
         return movements, total
 
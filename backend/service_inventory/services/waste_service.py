@@ -7,7 +7,7 @@ from typing import Optional
 from decimal import Decimal
 from datetime import date
 
-from backend.service_inventory.models import WasteLog, InventoryItem, MovementReason
+from backend.service_inventory.models import WasteLog, MovementReason
 from backend.service_inventory.schemas.waste import WasteCreateRequest
 from backend.service_inventory.services.stock_movement_service import StockMovementService
 
@@ -33,16 +33,17 @@ class WasteService:
         Raises:
             ValueError: If inventory item not found or insufficient stock
         """
-        # Validate inventory item exists
-        inv_item = db.query(InventoryItem).filter(
-            InventoryItem.id == waste_data.inventory_item_id
-        ).first()
+        # Lock the item row and validate before anything is written
+        items = StockMovementService.lock_items(db, [waste_data.inventory_item_id])
+        inv_item = items.get(waste_data.inventory_item_id)
         if not inv_item:
+            db.rollback()
             raise ValueError(f"Inventory item with ID {waste_data.inventory_item_id} not found")
 
-        # Check sufficient stock
+        # Check sufficient stock (under the row lock)
         current_stock = inv_item.current_stock_perpetual or Decimal('0')
         if current_stock < waste_data.quantity:
+            db.rollback()
             raise ValueError(
                 f"Insufficient stock for {inv_item.name}. "
                 f"Current: {current_stock} {inv_item.unit}, "
@@ -67,16 +68,19 @@ class WasteService:
         if waste_data.notes:
             movement_notes += f" - {waste_data.notes}"
 
-        movement = StockMovementService.create_movement(
-            db=db,
-            inventory_item_id=waste_data.inventory_item_id,
-            change_amount=-waste_data.quantity,  # Negative = decrease
+        movements, _ = StockMovementService.create_movements_bulk(
+            db,
+            [{
+                "inventory_item_id": waste_data.inventory_item_id,
+                "change_amount": -waste_data.quantity,  # Negative = decrease
+                "related_id": waste_log.id,
+                "notes": movement_notes,
+            }],
             reason=MovementReason.WASTE,
-            related_id=waste_log.id,
-            notes=movement_notes,
             employee_id=waste_data.employee_id,
             commit=False  # We'll commit at the end
         )
+        movement = movements[0]
 
         db.commit()
         db.refresh(waste_log)
@@ -0,0 +1,105 @@
+"""
+Internal Router Tests - Készletlevonás végpont hibakódjai
+Module 5: Készletkezelés
+
+A service_orders outbox a 2xx választ kézbesítettnek veszi, 5xx (és 408/429)
+esetén újrapróbál, egyéb 4xx esetén feladja.
+
+Teszteli a következő funkciókat:
+- Üzleti elutasítás (hiányzó készlet) 200 tételes hibákkal
+- Orders Service / adatbázis átmeneti hiba 503 (újrapróbálható)
+- Váratlan hiba 500 (újrapróbálható), nem 200 success=False
+- Nem létező rendelés 404
+"""
+
+import httpx
+import pytest
+
+# A services csomag az OCR szolgáltatáson át a Google Cloud Document AI klienst importálja
+pytest.importorskip("google.cloud.documentai")
+
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from backend.service_inventory.main import app
+from backend.service_inventory.models.database import get_db
+from backend.service_inventory.services.stock_deduction_service import (
+    StockDeductionService,
+    get_stock_deduction_service
+)
+
+DEDUCT_PATH = "/api/v1/inventory/internal/deduct-stock"
+REQUEST = {"order_id": 42, "items": [{"id": 1, "product_id": 1, "quantity": 2}]}
+
+
+class RaisingDeductionService(StockDeductionService):
+    """StockDeductionService, amely a megadott kivételt dobja (adatbázis nélkül)."""
+
+    error: Exception = None
+
+    def __init__(self):
+        pass
+
+    def deduct_stock_for_order(self, order_id, orders_service_url=None, order_items=None):
+        if self.error is not None:
+            raise self.error
+        return {
+            "success": False,
+            "order_id": order_id,
+            "items_processed": 1,
+            "ingredients_deducted": [],
+            "skipped_items": [],
+            "errors": [{"inventory_item_id": 3, "error": "Insufficient stock for Zsemle"}],
+            "message": "Processed 1 order items: 0 ingredients deducted, 0 items skipped (no recipe), 1 errors"
+        }
+
+
+@pytest.fixture
+def client():
+    """A mountolt inventory app; az adatbázis és a levonási szolgáltatás felülírva."""
+    service = RaisingDeductionService()
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_stock_deduction_service] = lambda: service
+    try:
+        yield TestClient(app), service
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_insufficient_stock_is_200_with_item_errors(client):
+    """Test: Hiányzó készlet üzleti elutasítás: 200, a hiba a válasz törzsében."""
+    http, _ = client
+
+    response = http.post(DEDUCT_PATH, json=REQUEST)
+
+    assert response.status_code == 200
+    assert response.json()["success"] is False
+    assert "Insufficient stock" in response.json()["errors"][0]["error"]
+
+
+@pytest.mark.parametrize("error", [
+    OperationalError("SELECT ... FOR UPDATE", {}, Exception("deadlock detected")),
+    httpx.ConnectError("connection refused"),
+])
+def test_transient_errors_are_503(client, error):
+    """Test: Holtpont / lock timeout / elérhetetlen Orders Service: 503, az outbox újrapróbálja."""
+    http, service = client
+    service.error = error
+
+    assert http.post(DEDUCT_PATH, json=REQUEST).status_code == 503
+
+
+def test_unexpected_error_is_500(client):
+    """Test: Váratlan hiba 500 (nem 200 success=False), így nem veszik el a levonás."""
+    http, service = client
+    service.error = RuntimeError("connection dropped")
+
+    assert http.post(DEDUCT_PATH, json=REQUEST).status_code == 500
+
+
+def test_missing_order_is_404(client):
+    """Test: Az Orders Service-ben nem létező rendelés 404 (nem újrapróbálható)."""
+    http, service = client
+    service.error = ValueError("Order 42 not found in Orders Service")
+
+    assert http.post(DEDUCT_PATH, json=REQUEST).status_code == 404
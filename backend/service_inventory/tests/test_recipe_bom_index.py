@@ -0,0 +1,138 @@
+"""
+Recipe BOM Index Tests - Memóriában tartott recept robbantás
+Module 5: Készletkezelés
+
+Teszteli a következő funkciókat:
+- Teljes betöltés egyetlen lekérdezéssel, első olvasáskor és invalidate() után
+- Inkrementális (részleges) újratöltés recept módosítás / törlés után
+- Recept nélküli termék (üres BOM, get_many-ből kimarad)
+"""
+
+from decimal import Decimal
+
+import pytest
+
+# A services csomag az OCR szolgáltatáson át a Google Cloud Document AI klienst importálja
+pytest.importorskip("google.cloud.documentai")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_inventory.models import Base, InventoryItem, Recipe
+from backend.service_inventory.schemas.recipe import RecipeCreate, RecipeUpdate
+from backend.service_inventory.services.recipe_bom_index import BOMLine, RecipeBOMIndex, recipe_bom_index
+from backend.service_inventory.services.recipe_service import RecipeService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis alapanyag és recept táblákkal."""
+    engine = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ('inventory_items', 'recipes')]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    recipe_bom_index.invalidate()
+    try:
+        yield db
+    finally:
+        db.close()
+        recipe_bom_index.invalidate()
+
+
+@pytest.fixture
+def ingredients(db_session):
+    """Két alapanyag és a Hamburger (product 1) receptje; a Sör (product 2) recept nélküli."""
+    beef = InventoryItem(name="Marhahús", unit="kg", current_stock_perpetual=Decimal("10.000"))
+    bun = InventoryItem(name="Zsemle", unit="db", current_stock_perpetual=Decimal("50.000"))
+    db_session.add_all([beef, bun])
+    db_session.flush()
+    db_session.add_all([
+        Recipe(product_id=1, inventory_item_id=beef.id, quantity_used=Decimal("0.200")),
+        Recipe(product_id=1, inventory_item_id=bun.id, quantity_used=Decimal("1.000")),
+    ])
+    db_session.commit()
+    return beef, bun
+
+
+def test_full_load_on_first_read(db_session, ingredients):
+    """Test: Az első olvasás teljes betöltés, a további olvasások nem kérdeznek le újra."""
+    beef, bun = ingredients
+    index = RecipeBOMIndex(resync_seconds=0)
+
+    assert index.stats()["loaded"] is False
+    assert index.get(db_session, 1) == (
+        BOMLine(inventory_item_id=beef.id, quantity=Decimal("0.200"), unit="kg"),
+        BOMLine(inventory_item_id=bun.id, quantity=Decimal("1.000"), unit="db"),
+    )
+    index.get_many(db_session, [1, 2])
+
+    stats = index.stats()
+    assert (stats["loaded"], stats["products"], stats["lines"]) == (True, 1, 2)
+    assert (stats["full_loads"], stats["partial_loads"]) == (1, 0)
+
+
+def test_invalidate_forces_full_reload(db_session, ingredients):
+    """Test: invalidate() után a következő olvasás újra teljes betöltés (közvetlen DB módosítás is látszik)."""
+    beef, _ = ingredients
+    index = RecipeBOMIndex(resync_seconds=0)
+    index.ensure_loaded(db_session)
+
+    db_session.add(Recipe(product_id=3, inventory_item_id=beef.id, quantity_used=Decimal("0.150")))
+    db_session.commit()
+    assert index.get(db_session, 3) == ()
+
+    index.invalidate()
+
+    assert [line.quantity for line in index.get(db_session, 3)] == [Decimal("0.150")]
+    assert index.stats()["full_loads"] == 2
+
+
+def test_partial_reload_after_recipe_edit(db_session, ingredients):
+    """Test: Recept módosítás / termékváltás / törlés csak az érintett termék(ek)et tölti újra."""
+    beef, bun = ingredients
+    service = RecipeService(db_session)
+    recipe_bom_index.ensure_loaded(db_session)
+    before = recipe_bom_index.stats()
+    beef_recipe = db_session.query(Recipe).filter_by(product_id=1, inventory_item_id=beef.id).one()
+
+    service.update_recipe(beef_recipe.id, RecipeUpdate(quantity_used=Decimal("0.250")))
+
+    assert [line.quantity for line in recipe_bom_index.get(db_session, 1)] == [Decimal("0.250"), Decimal("1.000")]
+
+    # Termékváltás: a régi és az új termék sorai is frissülnek
+    service.update_recipe(beef_recipe.id, RecipeUpdate(product_id=4))
+    assert [line.inventory_item_id for line in recipe_bom_index.get(db_session, 1)] == [bun.id]
+    assert [line.inventory_item_id for line in recipe_bom_index.get(db_session, 4)] == [beef.id]
+
+    service.delete_recipe(beef_recipe.id)
+    assert recipe_bom_index.get(db_session, 4) == ()
+
+    stats = recipe_bom_index.stats()
+    assert stats["full_loads"] == before["full_loads"]
+    assert stats["partial_loads"] == before["partial_loads"] + 3
+    assert (stats["products"], stats["lines"]) == (1, 1)
+
+
+def test_partial_reload_before_load_is_noop(db_session, ingredients):
+    """Test: Betöltés előtt a recept módosítás nem tölt be semmit (az első olvasás teljes betöltés)."""
+    beef, _ = ingredients
+    before = recipe_bom_index.stats()
+    RecipeService(db_session).create_recipe(
+        RecipeCreate(product_id=5, inventory_item_id=beef.id, quantity_used=Decimal("0.300"))
+    )
+
+    assert recipe_bom_index.stats()["partial_loads"] == before["partial_loads"]
+    assert [line.quantity for line in recipe_bom_index.get(db_session, 5)] == [Decimal("0.300")]
+    assert recipe_bom_index.stats()["full_loads"] == before["full_loads"] + 1
+
+
+def test_product_without_recipe(db_session, ingredients):
+    """Test: Recept nélküli termék: üres BOM, get_many-ből kimarad, required ingredients hibát ad."""
+    index = RecipeBOMIndex(resync_seconds=0)
+
+    assert index.get(db_session, 2) == ()
+    assert set(index.get_many(db_session, [1, 2, 2])) == {1}
+
+    with pytest.raises(ValueError):
+        RecipeService(db_session).calculate_required_ingredients(product_id=2)
+
@@ -0,0 +1,201 @@
+"""
+Stock Deduction Tests - Lezárt rendelés készletlevonása
+Module 5: Készletkezelés
+
+Teszteli a következő funkciókat:
+- Ugyanazon rendelés ismételt kézbesítése (outbox retry) nem von le kétszer
+- Az idempotencia-ellenőrzés a készletsorok zárolása után fut
+- Párhuzamos kézbesítés: az egyedi (rendelés, alapanyag) index megfogja
+- Régi SALE sorok (related_id = rendelési tétel azonosító) nem ütköznek új rendeléssel
+- Részleges elutasítás: hiányzó készlet hibaként, a többi alapanyag levonva
+- Átmeneti adatbázis hiba továbbdobva (nem success=False), semmi nem íródik
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+# A services csomag az OCR szolgáltatáson át a Google Cloud Document AI klienst importálja
+pytest.importorskip("google.cloud.documentai")
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_inventory.models import Base, InventoryItem, Recipe, StockMovement, MovementReason
+from backend.service_inventory.services.recipe_bom_index import recipe_bom_index
+from backend.service_inventory.services.stock_deduction_service import StockDeductionService
+from backend.service_inventory.services.stock_movement_service import StockMovementService
+
+ORDER_ID = 42
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis alapanyag, recept és készletmozgás táblákkal."""
+    engine = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ('inventory_items', 'recipes', 'stock_movements')]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    recipe_bom_index.invalidate()
+    try:
+        yield db
+    finally:
+        db.close()
+        recipe_bom_index.invalidate()
+
+
+@pytest.fixture
+def burger(db_session):
+    """Hamburger (product 1): 0.2 kg hús + 1 db zsemle; Sör (product 2): nincs recept."""
+    beef = InventoryItem(name="Marhahús", unit="kg", current_stock_perpetual=Decimal("10.000"))
+    bun = InventoryItem(name="Zsemle", unit="db", current_stock_perpetual=Decimal("1.000"))
+    db_session.add_all([beef, bun])
+    db_session.flush()
+    db_session.add_all([
+        Recipe(product_id=1, inventory_item_id=beef.id, quantity_used=Decimal("0.200")),
+        Recipe(product_id=1, inventory_item_id=bun.id, quantity_used=Decimal("1.000")),
+    ])
+    db_session.commit()
+    return beef, bun
+
+
+def _sale_movements(db):
+    return db.query(StockMovement).filter(StockMovement.reason == MovementReason.SALE).all()
+
+
+def test_same_order_delivered_twice_deducts_once(db_session, burger):
+    """A második kézbesítés 'Order already deducted', a készlet egyszer csökken."""
+    beef, bun = burger
+    items = [{"id": 1, "product_id": 1, "quantity": 1}]
+    service = StockDeductionService(db_session)
+
+    first = service.deduct_stock_for_order(ORDER_ID, order_items=items)
+    second = service.deduct_stock_for_order(ORDER_ID, order_items=items)
+
+    assert first["success"] is True
+    assert len(first["ingredients_deducted"]) == 2
+    assert second["success"] is True
+    assert second["message"] == "Order already deducted"
+    assert second["ingredients_deducted"] == []
+    assert [item["reason"] for item in second["skipped_items"]] == ["Already deducted"]
+
+    assert len(_sale_movements(db_session)) == 2
+    db_session.refresh(beef)
+    db_session.refresh(bun)
+    assert beef.current_stock_perpetual == Decimal("9.800")
+    assert bun.current_stock_perpetual == Decimal("0.000")
+
+
+def test_deducted_check_runs_after_stock_rows_locked(db_session, burger):
+    """Az idempotencia-ellenőrzés a FOR UPDATE zárolás után, ugyanabban a tranzakcióban fut."""
+    calls = []
+    lock_items = StockMovementService.lock_items
+    is_order_deducted = StockDeductionService._is_order_deducted
+
+    def spy_lock(db, item_ids):
+        calls.append("lock")
+        return lock_items(db, item_ids)
+
+    def spy_check(self, order_id):
+        calls.append("check")
+        return is_order_deducted(self, order_id)
+
+    with patch.object(StockMovementService, "lock_items", side_effect=spy_lock), \
+            patch.object(StockDeductionService, "_is_order_deducted", spy_check):
+        StockDeductionService(db_session).deduct_stock_for_order(
+            ORDER_ID, order_items=[{"id": 1, "product_id": 1, "quantity": 1}]
+        )
+
+    assert calls[:2] == ["lock", "check"]
+
+
+def test_concurrent_delivery_rejected_by_unique_index(db_session, burger):
+    """Ha az ellenőrzés nem látja a másik kézbesítést, az egyedi index akadályozza meg a dupla levonást."""
+    beef, _ = burger
+    items = [{"id": 1, "product_id": 1, "quantity": 1}]
+    StockDeductionService(db_session).deduct_stock_for_order(ORDER_ID, order_items=items)
+
+    with patch.object(StockDeductionService, "_is_order_deducted", return_value=False):
+        result = StockDeductionService(db_session).deduct_stock_for_order(ORDER_ID, order_items=items)
+
+    assert result["success"] is True
+    assert result["message"] == "Order already deducted"
+    assert len(_sale_movements(db_session)) == 2
+    db_session.refresh(beef)
+    assert beef.current_stock_perpetual == Decimal("9.800")
+
+
+def test_sale_movement_unique_per_order_and_item(db_session, burger):
+    """Ugyanarra a rendelésre és alapanyagra nem lehet két levonási mozgás."""
+    beef, _ = burger
+    for _ in range(2):
+        db_session.add(StockMovement(
+            inventory_item_id=beef.id, change_amount=Decimal("-0.100"), stock_after=Decimal("9.900"),
+            reason=MovementReason.SALE, related_id=ORDER_ID, order_id=ORDER_ID
+        ))
+
+    with pytest.raises(IntegrityError):
+        db_session.flush()
+
+
+def test_legacy_sale_rows_do_not_block_new_order(db_session, burger):
+    """Régi SALE sorok (related_id = tétel azonosító, ismétlődhet) mellett az azonos számú rendelés is levonódik."""
+    beef, bun = burger
+    for _ in range(2):
+        db_session.add(StockMovement(
+            inventory_item_id=beef.id, change_amount=Decimal("-0.100"), stock_after=Decimal("10.000"),
+            reason=MovementReason.SALE, related_id=ORDER_ID
+        ))
+    db_session.commit()
+
+    result = StockDeductionService(db_session).deduct_stock_for_order(
+        ORDER_ID, order_items=[{"id": 1, "product_id": 1, "quantity": 1}]
+    )
+
+    assert result["success"] is True
+    assert len(result["ingredients_deducted"]) == 2
+    db_session.refresh(beef)
+    assert beef.current_stock_perpetual == Decimal("9.800")
+    assert {m.inventory_item_id for m in _sale_movements(db_session) if m.order_id == ORDER_ID} == {beef.id, bun.id}
+
+
+def test_partial_rejection_deducts_remaining_ingredients(db_session, burger):
+    """2 hamburger: a hús levonva, a zsemle (1 db készlet) hibaként jelentve, a készlete változatlan."""
+    beef, bun = burger
+    items = [
+        {"id": 1, "product_id": 1, "quantity": 2},
+        {"id": 2, "product_id": 2, "quantity": 1},
+    ]
+
+    result = StockDeductionService(db_session).deduct_stock_for_order(ORDER_ID, order_items=items)
+
+    assert result["success"] is False
+    assert result["items_processed"] == 2
+    assert [row["inventory_item_id"] for row in result["ingredients_deducted"]] == [beef.id]
+    assert result["ingredients_deducted"][0]["quantity_deducted"] == pytest.approx(0.4)
+    assert [row["inventory_item_id"] for row in result["errors"]] == [bun.id]
+    assert "Insufficient stock" in result["errors"][0]["error"]
+    assert [row["reason"] for row in result["skipped_items"]] == ["No recipe found"]
+
+    db_session.expire_all()
+    assert db_session.get(InventoryItem, beef.id).current_stock_perpetual == Decimal("9.600")
+    assert db_session.get(InventoryItem, bun.id).current_stock_perpetual == Decimal("1.000")
+    assert [movement.inventory_item_id for movement in _sale_movements(db_session)] == [beef.id]
+
+
+def test_database_error_propagates_without_deducting(db_session, burger):
+    """Holtpont / lock timeout: a kivétel továbbmegy (a végpont 5xx-et ad), nincs levonás."""
+    beef, _ = burger
+    deadlock = OperationalError("SELECT ... FOR UPDATE", {}, Exception("deadlock detected"))
+
+    with patch.object(StockMovementService, "lock_items", side_effect=deadlock):
+        with pytest.raises(OperationalError):
+            StockDeductionService(db_session).deduct_stock_for_order(
+                ORDER_ID, order_items=[{"id": 1, "product_id": 1, "quantity": 1}]
+            )
+
+    assert _sale_movements(db_session) == []
+    db_session.refresh(beef)
+    assert beef.current_stock_perpetual == Decimal("10.000")
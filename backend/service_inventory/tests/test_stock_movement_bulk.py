@@ -0,0 +1,177 @@
+"""
+Stock Movement Bulk Tests - Kötegelt készletmozgás motor
+Module 5: Készletkezelés
+
+Teszteli a következő funkciókat:
+- Az érintett alapanyag sorok zárolása (FOR UPDATE) azonosító szerinti sorrendben
+- Hiányzó készlet: allow_partial=False esetén ValueError, semmi nem íródik
+- Részleges elfogadás: az érvénytelen változások visszautasítva, a többi rögzítve
+- Egy tételre több változás sorrendben, stock_after halmozva
+- create_movement (egy mozgás) ugyanazt adja, mint a kötegelt motor
+"""
+
+from decimal import Decimal
+
+import pytest
+
+# A services csomag az OCR szolgáltatáson át a Google Cloud Document AI klienst importálja
+pytest.importorskip("google.cloud.documentai")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_inventory.models import Base, InventoryItem, StockMovement, MovementReason
+from backend.service_inventory.services.stock_movement_service import StockMovementService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis alapanyag, recept és készletmozgás táblákkal (autoflush nélkül, mint a service)."""
+    engine = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ('inventory_items', 'recipes', 'stock_movements')]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def items(db_session):
+    """Három alapanyag: liszt 5 kg, tej 2 liter, tojás 10 db."""
+    rows = [
+        InventoryItem(name="Liszt", unit="kg", current_stock_perpetual=Decimal("5.000")),
+        InventoryItem(name="Tej", unit="liter", current_stock_perpetual=Decimal("2.000")),
+        InventoryItem(name="Tojás", unit="db", current_stock_perpetual=Decimal("10.000")),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def _stock(db, item):
+    db.expire_all()
+    return db.get(InventoryItem, item.id).current_stock_perpetual
+
+
+def test_rows_locked_in_id_order(db_session, items):
+    """Test: A zároló lekérdezés FOR UPDATE, azonosító szerint rendezve (a bemeneti sorrendtől függetlenül)."""
+    flour, milk, eggs = items
+    statements = []
+
+    @event.listens_for(db_session, "do_orm_execute")
+    def capture(orm_execute_state):
+        if orm_execute_state.is_select:
+            statements.append(orm_execute_state.statement)
+
+    StockMovementService.create_movements_bulk(
+        db_session,
+        [
+            {"inventory_item_id": eggs.id, "change_amount": Decimal("-2")},
+            {"inventory_item_id": flour.id, "change_amount": Decimal("-1")},
+            {"inventory_item_id": milk.id, "change_amount": Decimal("-0.5")},
+        ],
+        reason=MovementReason.SALE
+    )
+
+    lock_statements = [stmt for stmt in statements if stmt._for_update_arg is not None]
+    assert len(lock_statements) == 1
+    sql = str(lock_statements[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert "FOR UPDATE" in sql
+    assert sql.index("ORDER BY inventory_items.id") < sql.index("FOR UPDATE")
+    assert f"IN ({flour.id}, {milk.id}, {eggs.id})" in sql
+
+
+def test_insufficient_stock_rejects_whole_batch(db_session, items):
+    """Test: allow_partial=False esetén az első hibás változás ValueError, semmi nem íródik."""
+    flour, milk, _ = items
+
+    with pytest.raises(ValueError, match="Insufficient stock for Tej"):
+        StockMovementService.create_movements_bulk(
+            db_session,
+            [
+                {"inventory_item_id": flour.id, "change_amount": Decimal("-1")},
+                {"inventory_item_id": milk.id, "change_amount": Decimal("-3")},
+            ],
+            reason=MovementReason.SALE
+        )
+    db_session.rollback()
+
+    assert db_session.query(StockMovement).count() == 0
+    assert _stock(db_session, flour) == Decimal("5.000")
+    assert _stock(db_session, milk) == Decimal("2.000")
+
+
+def test_partial_accept_reports_rejected_deltas(db_session, items):
+    """Test: allow_partial=True esetén a hiányzó készlet és a nem létező tétel visszautasítva, a többi rögzítve."""
+    flour, milk, _ = items
+
+    movements, rejected = StockMovementService.create_movements_bulk(
+        db_session,
+        [
+            {"inventory_item_id": flour.id, "change_amount": Decimal("-1"), "related_id": 7},
+            {"inventory_item_id": milk.id, "change_amount": Decimal("-3"), "related_id": 7},
+            {"inventory_item_id": 999, "change_amount": Decimal("-1"), "related_id": 7},
+        ],
+        reason=MovementReason.SALE,
+        allow_partial=True
+    )
+
+    assert [(m.inventory_item_id, m.stock_after) for m in movements] == [(flour.id, Decimal("4.000"))]
+    assert [(r["inventory_item_id"], r["related_id"]) for r in rejected] == [(milk.id, 7), (999, 7)]
+    assert "Insufficient stock" in rejected[0]["error"]
+    assert "not found" in rejected[1]["error"]
+    assert _stock(db_session, flour) == Decimal("4.000")
+    assert _stock(db_session, milk) == Decimal("2.000")
+
+
+def test_several_deltas_for_one_item_apply_in_order(db_session, items):
+    """Test: Ugyanarra a tételre több változás a megadott sorrendben, stock_after halmozva."""
+    _, milk, _ = items
+
+    movements, rejected = StockMovementService.create_movements_bulk(
+        db_session,
+        [
+            {"inventory_item_id": milk.id, "change_amount": Decimal("-1.5")},
+            {"inventory_item_id": milk.id, "change_amount": Decimal("-1")},
+            {"inventory_item_id": milk.id, "change_amount": Decimal("3")},
+        ],
+        reason=MovementReason.CORRECTION,
+        allow_partial=True
+    )
+
+    assert [m.stock_after for m in movements] == [Decimal("0.500"), Decimal("3.500")]
+    assert [r["change_amount"] for r in rejected] == [Decimal("-1")]
+    assert _stock(db_session, milk) == Decimal("3.500")
+
+
+def test_single_movement_matches_bulk_result(db_session, items):
+    """Test: create_movement ugyanazt a mozgást és készletet adja, mint egyelemű köteg."""
+    flour, _, eggs = items
+
+    single = StockMovementService.create_movement(
+        db_session, flour.id, Decimal("-1.250"), MovementReason.WASTE,
+        related_id=3, notes="Kiömlött", employee_id=11
+    )
+    (bulk,), rejected = StockMovementService.create_movements_bulk(
+        db_session,
+        [{"inventory_item_id": eggs.id, "change_amount": Decimal("-1.250"), "related_id": 3, "notes": "Kiömlött"}],
+        reason=MovementReason.WASTE,
+        employee_id=11
+    )
+
+    def fields(movement):
+        return (movement.change_amount, movement.reason, movement.related_id, movement.notes, movement.employee_id)
+
+    assert rejected == []
+    assert fields(single) == fields(bulk)
+    assert single.stock_after == Decimal("3.750")
+    assert bulk.stock_after == Decimal("8.750")
+    assert _stock(db_session, flour) == single.stock_after
+
+    with pytest.raises(ValueError, match="Insufficient stock"):
+        StockMovementService.create_movement(db_session, flour.id, Decimal("-10"), MovementReason.WASTE)
@@ -0,0 +1,92 @@
+"""
+Waste Service Tests - Selejt rögzítése
+Module 5: Készletkezelés
+
+Teszteli a következő funkciókat:
+- Selejt rögzítése: készlet csökken, WASTE mozgás a selejt naplóra hivatkozik
+- Nem létező alapanyag: ValueError (400), nem idegen kulcs hiba
+- Hiányzó készlet: ValueError, sem napló, sem mozgás nem íródik
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+# A services csomag az OCR szolgáltatáson át a Google Cloud Document AI klienst importálja
+pytest.importorskip("google.cloud.documentai")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_inventory.models import Base, InventoryItem, StockMovement, MovementReason, WasteLog
+from backend.service_inventory.schemas.waste import WasteCreateRequest
+from backend.service_inventory.services.waste_service import WasteService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis idegen kulcs ellenőrzéssel (mint PostgreSQL-en)."""
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    tables = [Base.metadata.tables[name] for name in ('inventory_items', 'stock_movements', 'waste_logs')]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def milk(db_session):
+    """Tej, 2 liter készlettel."""
+    item = InventoryItem(name="Tej", unit="liter", current_stock_perpetual=Decimal("2.000"))
+    db_session.add(item)
+    db_session.commit()
+    return item
+
+
+def _waste(inventory_item_id, quantity):
+    return WasteCreateRequest(
+        inventory_item_id=inventory_item_id,
+        quantity=Decimal(quantity),
+        reason="Lejárt",
+        waste_date=date(2026, 10, 16),
+        employee_id=5
+    )
+
+
+def test_record_waste_reduces_stock(db_session, milk):
+    """Test: A készlet csökken, a WASTE mozgás related_id-ja a selejt napló."""
+    waste_log, movement_id = WasteService.record_waste(db_session, _waste(milk.id, "0.5"))
+
+    movement = db_session.get(StockMovement, movement_id)
+    assert movement.reason == MovementReason.WASTE
+    assert movement.related_id == waste_log.id
+    assert movement.stock_after == Decimal("1.500")
+    db_session.refresh(milk)
+    assert milk.current_stock_perpetual == Decimal("1.500")
+
+
+def test_unknown_item_is_value_error(db_session, milk):
+    """Test: Nem létező alapanyag ValueError, a napló nem kerül beszúrásra."""
+    with pytest.raises(ValueError, match="Inventory item with ID 999 not found"):
+        WasteService.record_waste(db_session, _waste(999, "1"))
+
+    assert db_session.query(WasteLog).count() == 0
+
+
+def test_insufficient_stock_writes_nothing(db_session, milk):
+    """Test: Hiányzó készlet ValueError; sem napló, sem mozgás, a készlet változatlan."""
+    with pytest.raises(ValueError, match="Insufficient stock for Tej"):
+        WasteService.record_waste(db_session, _waste(milk.id, "3"))
+
+    assert db_session.query(WasteLog).count() == 0
+    assert db_session.query(StockMovement).count() == 0
+    db_session.refresh(milk)
+    assert milk.current_stock_perpetual == Decimal("2.000")
@@ -23,6 +23,7 @@ from backend.service_menu.routers import (
     images_router,
     channels_router,
     allergens_router,
+    internal_router,
 )
 
 # Create FastAPI application
@@ -115,6 +116,13 @@ app.include_router(
     dependencies=[Depends(require_permission("menu:view"))]
 )
 
+# Internal API Router (NO RBAC - service-to-service trust)
+app.include_router(
+    internal_router,
+    prefix="/api/v1",
+    tags=["Internal API"]
+)
+
 
 # Root endpoint
 @app.get("/")
@@ -15,6 +15,7 @@ from .modifier_groups import router as modifier_groups_router
 from .images import router as images_router
 from .channels import router as channels_router
 from .allergens import router as allergens_router
+from .internal_router import internal_router
 
 __all__ = [
     "categories_router",
@@ -23,4 +24,5 @@ __all__ = [
     "images_router",
     "channels_router",
     "allergens_router",
+    "internal_router",
 ]
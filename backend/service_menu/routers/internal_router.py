@@ -0,0 +1,75 @@
+"""
+Internal API Router for Service-to-Service Communication
+Module 0: Terméktörzs és Menü
+
+This router handles internal API calls from other microservices
+(service_orders, service_admin, NTAK worker). These endpoints are NOT meant
+to be called by external clients. They do NOT have RBAC protection
+(service-to-service trust assumed): the callers send no user token.
+"""
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.orm import Session
+
+from backend.service_menu.database import get_db_connection
+from backend.service_menu.routers.products import get_product_service
+from backend.service_menu.services.product_service import ProductService
+from backend.service_menu.schemas.product import ProductLookupRequest, ProductLookupResponse
+
+internal_router = APIRouter(
+    prefix="/internal",
+    tags=["Internal API"],
+    responses={
+        500: {"description": "Internal Server Error"}
+    }
+)
+
+
+@internal_router.post(
+    "/products/lookup",
+    response_model=ProductLookupResponse,
+    summary="Bulk product lookup (internal)",
+    description="""
+    Look up many products at once with their category names.
+
+    Intended for inter-service calls (service_orders order type change check,
+    receipt printing, KDS, admin reports, NTAK worker) that would otherwise
+    fetch every product and its category one by one.
+
+    **Request Body:**
+    - `product_ids`: Product identifiers (1-500, duplicates ignored)
+
+    **Returns:**
+    - 200: Found products (id, name, category_id, category_name, is_active),
+      the list of requested IDs that do not exist and the catalog version
+      (also in the `ETag` header)
+    """
+)
+def lookup_products(
+    lookup: ProductLookupRequest,
+    response: Response,
+    db: Session = Depends(get_db_connection),
+    service: ProductService = Depends(get_product_service)
+):
+    """
+    Termékek tömeges lekérdezése kategória névvel (egy DB lekérdezés).
+
+    Args:
+        lookup: ProductLookupRequest a keresett ID-kkal
+        response: Response (ETag header)
+        db: Database session (injected)
+        service: ProductService instance (injected)
+
+    Returns:
+        ProductLookupResponse: Talált termékek, a hiányzó ID-k és a katalógus verzió
+    """
+    items = service.lookup_products(db, lookup.product_ids)
+    found_ids = {item["id"] for item in items}
+    version = service.catalog_version(db)
+    response.headers["ETag"] = f'"{version}"'
+
+    return ProductLookupResponse(
+        items=items,
+        missing_ids=sorted(set(lookup.product_ids) - found_ids),
+        catalog_version=version
+    )
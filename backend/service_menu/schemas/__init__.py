@@ -37,6 +37,9 @@ from .product import (
     ProductResponse,
     ProductDetailResponse,
     ProductListResponse,
+    ProductLookupRequest,
+    ProductLookupItem,
+    ProductLookupResponse,
     ChannelVisibilityBase,
     ChannelVisibilityCreate,
     ChannelVisibilityUpdate,
@@ -106,6 +109,9 @@ __all__ = [
     "ProductResponse",
     "ProductDetailResponse",
     "ProductListResponse",
+    "ProductLookupRequest",
+    "ProductLookupItem",
+    "ProductLookupResponse",
     "ChannelVisibilityBase",
     "ChannelVisibilityCreate",
     "ChannelVisibilityUpdate",
@@ -199,6 +199,46 @@ class ProductListResponse(BaseModel):
     )
 
 
+class ProductLookupRequest(BaseModel):
+    """Schema for bulk product lookup requests (inter-service)."""
+
+    product_ids: list[int] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Product identifiers to look up (duplicates are ignored)",
+        examples=[[1, 2, 42]]
+    )
+
+
+class ProductLookupItem(BaseModel):
+    """Compact product record with its resolved category name."""
+
+    id: int = Field(..., description="Product identifier", examples=[42])
+    name: str = Field(..., description="Product name", examples=["Coca-Cola 0.5L"])
+    category_id: Optional[int] = Field(None, description="Category identifier", examples=[3])
+    category_name: Optional[str] = Field(None, description="Category name", examples=["Ital"])
+    is_active: bool = Field(..., description="Whether the product is active", examples=[True])
+
+
+class ProductLookupResponse(BaseModel):
+    """Schema for bulk product lookup responses."""
+
+    items: list[ProductLookupItem] = Field(
+        ...,
+        description="Products found, in ascending ID order"
+    )
+    missing_ids: list[int] = Field(
+        default_factory=list,
+        description="Requested IDs that do not exist"
+    )
+    catalog_version: Optional[str] = Field(
+        None,
+        description="Current catalog version (also sent as the ETag header); "
+                    "clients drop their cached product metadata when it changes"
+    )
+
+
 class ChannelVisibilityBase(BaseModel):
     """Base schema for channel visibility settings."""
 
@@ -10,11 +10,14 @@ Alfeladat 7.2: AI fordítás integráció - A create_product és update_product
 metódusok támogatják az automatikus fordítást a TranslationService használatával.
 """
 
+import hashlib
 import logging
 from typing import Optional, List
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
+from backend.service_menu.models.category import Category
 from backend.service_menu.models.product import Product
 from backend.service_menu.schemas.product import ProductCreate, ProductUpdate
 from backend.service_menu.services.translation_service import TranslationService
@@ -245,6 +248,74 @@ class ProductService:
 
         return query.offset(skip).limit(limit).all()
 
+    @staticmethod
+    def lookup_products(db: Session, product_ids: List[int]) -> List[dict]:
+        """
+        Több termék tömeges lekérdezése kategória névvel együtt.
+
+        Egyetlen lekérdezés (LEFT JOIN categories), csak a szükséges oszlopokkal;
+        más szolgáltatások (pl. service_orders) N+1 HTTP hívás helyett ezt használják.
+
+        Args:
+            db: SQLAlchemy database session
+            product_ids: Termék ID-k listája
+
+        Returns:
+            List[dict]: id, name, category_id, category_name, is_active (ID szerint rendezve)
+        """
+        unique_ids = sorted(set(product_ids))
+        if not unique_ids:
+            return []
+
+        rows = db.query(
+            Product.id,
+            Product.name,
+            Product.category_id,
+            Category.name.label("category_name"),
+            Product.is_active
+        ).outerjoin(
+            Category, Product.category_id == Category.id
+        ).filter(
+            Product.id.in_(unique_ids)
+        ).order_by(Product.id).all()
+
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "category_id": row.category_id,
+                "category_name": row.category_name,
+                "is_active": bool(row.is_active),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def catalog_version(db: Session) -> str:
+        """
+        A termék katalógus aktuális verziója (ETag).
+
+        A termékek és kategóriák darabszámából és legutóbbi módosítási
+        idejéből képzett rövid hash: bármely létrehozás, módosítás vagy
+        törlés megváltoztatja. Más szolgáltatások ez alapján érvénytelenítik
+        a helyi termék név / kategória gyorsítótárukat.
+
+        Args:
+            db: SQLAlchemy database session
+
+        Returns:
+            str: Verzió azonosító (16 hex karakter)
+        """
+        product_count, product_updated, category_count, category_updated = db.query(
+            db.query(func.count(Product.id)).scalar_subquery(),
+            db.query(func.max(Product.updated_at)).scalar_subquery(),
+            db.query(func.count(Category.id)).scalar_subquery(),
+            db.query(func.max(Category.updated_at)).scalar_subquery()
+        ).one()
+
+        fingerprint = f"{product_count}:{product_updated}:{category_count}:{category_updated}"
+        return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+
     @staticmethod
     def count_products(db: Session, include_inactive: bool = True) -> int:
         """
@@ -0,0 +1,70 @@
+"""
+Internal Router Tests - Szolgáltatások közötti termék lookup
+Module 0: Terméktörzs és Menü
+
+A teszt a service_menu alkalmazást a main.py szerinti routerekkel és
+RBAC függőségekkel (require_permission) hívja; csak az adatbázis és a
+ProductService van helyettesítve.
+
+Teszteli a következő funkciókat:
+- A belső lookup végpont Authorization fejléc nélkül is elérhető
+- A felhasználói termék végpontok továbbra is tokent kérnek
+"""
+
+import pytest
+
+# A service_menu képfeltöltés és fordítás a Google Cloud klienseket importálja
+pytest.importorskip("google.cloud.translate_v3")
+pytest.importorskip("google.cloud.storage")
+
+from fastapi.testclient import TestClient
+
+from backend.service_menu.database import get_db_connection
+from backend.service_menu.main import app
+from backend.service_menu.routers.products import get_product_service
+from backend.service_menu.services.product_service import ProductService
+
+LOOKUP_PATH = "/api/v1/internal/products/lookup"
+
+PRODUCTS = {
+    1: {"id": 1, "name": "Limonádé", "category_id": 10, "category_name": "Ital", "is_active": True},
+    2: {"id": 2, "name": "Gulyásleves", "category_id": 20, "category_name": "Levesek", "is_active": True},
+}
+
+
+class CatalogProductService(ProductService):
+    """ProductService rögzített katalógussal (adatbázis nélkül)."""
+
+    def lookup_products(self, db, product_ids):
+        return [PRODUCTS[product_id] for product_id in product_ids if product_id in PRODUCTS]
+
+    @staticmethod
+    def catalog_version(db):
+        return "v1"
+
+
+@pytest.fixture
+def client():
+    """A mountolt menu app; az adatbázis és a termék szolgáltatás felülírva."""
+    app.dependency_overrides[get_db_connection] = lambda: None
+    app.dependency_overrides[get_product_service] = CatalogProductService
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_internal_lookup_needs_no_token(client):
+    """Test: Token nélküli hívás 200, ETag fejléccel és a hiányzó ID-kkal."""
+    response = client.post(LOOKUP_PATH, json={"product_ids": [1, 2, 99]})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"v1"'
+    body = response.json()
+    assert [item["name"] for item in body["items"]] == ["Limonádé", "Gulyásleves"]
+    assert body["missing_ids"] == [99]
+
+
+def test_user_product_routes_still_require_token(client):
+    """Test: A /products router RBAC védelme változatlan."""
+    assert client.get("/api/v1/products/1").status_code in (401, 403)
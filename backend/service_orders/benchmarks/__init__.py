@@ -0,0 +1,5 @@
+"""
+Benchmarks - Lekérdezés és algoritmus mérések (kézi futtatásra)
+Module 1: Rendeléskezelés és Asztalok
+Module 4: Fizetések
+"""
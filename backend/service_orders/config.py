@@ -33,12 +33,25 @@ class Settings(BaseSettings):
         le=65535
     )
 
+    # Venue Configuration
+    venue_timezone: str = Field(
+        default="Europe/Budapest",
+        description="IANA timezone of the venue; business days in reports are cut at local midnight"
+    )
+
     # Menu Service URL (for inter-service communication)
     menu_service_url: str = Field(
         default="http://localhost:8001",
         description="URL of the Menu Service for fetching product information"
     )
 
+    product_catalog_revalidate_seconds: int = Field(
+        default=60,
+        description="Catalog version (ETag) revalidation interval of the local product metadata cache in seconds (0 = every request)",
+        ge=0,
+        le=86400
+    )
+
     # Admin Service URL (for NTAK reporting)
     admin_service_url: str = Field(
         default="http://localhost:8008",
@@ -72,6 +85,110 @@ class Settings(BaseSettings):
         ge=1,
         le=60
     )
+    kds_stream_keepalive_seconds: int = Field(
+        default=15,
+        description="Keepalive comment interval for the KDS event stream (SSE) in seconds",
+        ge=1,
+        le=120
+    )
+    kds_board_resync_seconds: int = Field(
+        default=300,
+        description="Full reload interval of the in-memory KDS board in seconds (0 = load once)",
+        ge=0,
+        le=3600
+    )
+
+    # Reservation availability grid (online foglalás, napi bitmap cache)
+    reservation_grid_bucket_minutes: int = Field(
+        default=5,
+        description="Time bucket of the availability grid in minutes (must divide 30)",
+        ge=1,
+        le=30
+    )
+    reservation_grid_ttl_seconds: int = Field(
+        default=60,
+        description="Rebuild interval of a cached day grid in seconds (0 = disable the grid cache)",
+        ge=0,
+        le=3600
+    )
+    reservation_grid_max_days: int = Field(
+        default=120,
+        description="Maximum number of days kept in the availability grid cache",
+        ge=1,
+        le=1000
+    )
+
+    # Asztal összevonás nagy társaságoknak (online foglalás)
+    table_combination_max_tables: int = Field(
+        default=3,
+        description="Maximum number of adjacent tables offered as one combination (1 = single tables only)",
+        ge=1,
+        le=6
+    )
+    table_combination_max_gap: int = Field(
+        default=30,
+        description="Maximum gap between two tables on the floor plan (position units) to count as adjacent",
+        ge=0,
+        le=500
+    )
+    table_combination_max_results: int = Field(
+        default=3,
+        description="Maximum number of table combinations returned per time slot",
+        ge=1,
+        le=20
+    )
+
+    # Napi forgalmi összesítők (riportok)
+    sales_rollup_rebuild_max_days: int = Field(
+        default=92,
+        description="Maximum number of days one sales rollup rebuild request may cover",
+        ge=1,
+        le=3660
+    )
+
+    # Outbox Configuration (close_order mellékhatások háttér-kézbesítése)
+    outbox_poll_interval_seconds: float = Field(
+        default=2.0,
+        description="Outbox dispatcher poll interval in seconds",
+        ge=0.1,
+        le=60.0
+    )
+    outbox_batch_size: int = Field(
+        default=50,
+        description="Maximum number of outbox events claimed per dispatch cycle",
+        ge=1,
+        le=1000
+    )
+    outbox_max_attempts: int = Field(
+        default=10,
+        description="Delivery attempts before an outbox event is marked FAILED",
+        ge=1,
+        le=100
+    )
+    outbox_backoff_base_seconds: float = Field(
+        default=2.0,
+        description="Base delay of the exponential retry backoff in seconds",
+        ge=0.1,
+        le=600.0
+    )
+    outbox_backoff_max_seconds: float = Field(
+        default=300.0,
+        description="Maximum retry backoff delay in seconds",
+        ge=1.0,
+        le=86400.0
+    )
+    outbox_lease_seconds: int = Field(
+        default=60,
+        description="Claim lease; an unfinished delivery is retried after this many seconds",
+        ge=5,
+        le=3600
+    )
+    outbox_request_timeout_seconds: float = Field(
+        default=5.0,
+        description="HTTP timeout for outbox deliveries in seconds",
+        ge=0.5,
+        le=120.0
+    )
 
     # Pydantic Settings Configuration
     model_config = SettingsConfigDict(
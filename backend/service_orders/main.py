@@ -22,9 +22,16 @@ from backend.service_orders.routers import (
     seats_router,
     orders_router,
     order_items_router,
-    floorplan_router
+    kds_router,
+    floorplan_router,
+    reports_router,
+    internal_router
 )
 from backend.service_orders.routers.rooms import router as rooms_router
+from backend.service_orders.services.outbox_service import outbox_dispatcher
+from backend.core_http import close_all_clients, http_client_stats
+from backend.service_orders.services.product_lookup import product_catalog
+from backend.service_orders.services.availability_grid import availability_grid
 
 # Create FastAPI application
 app = FastAPI(
@@ -75,11 +82,29 @@ app.include_router(
     tags=["Order Items"],
     dependencies=[Depends(require_permission("orders:manage"))]
 )
+# KDS router az /orders prefix alatt (a frontend /api/orders/kds/* útvonalakat hív);
+# az order_items router után, hogy az ott definiált állomás végpont maradjon elsődleges
+app.include_router(
+    kds_router,
+    prefix="/api/v1/orders",
+    tags=["KDS"],
+    dependencies=[Depends(require_permission("orders:manage"))]
+)
 app.include_router(
     floorplan_router.floorplan_router,
     prefix="/api/v1",
     tags=["Floorplan"]
 )
+# Riportok (napi pénztárzárás): a service_admin belső hívása auth nélkül olvassa;
+# az írási (rebuild) végpont saját jogosultság-ellenőrzéssel
+app.include_router(reports_router)
+
+# Internal API Router (NO RBAC - service-to-service trust): forgalmi aggregátumok
+app.include_router(
+    internal_router,
+    prefix="/api/v1",
+    tags=["Internal API"]
+)
 
 
 # Startup Event
@@ -94,9 +119,22 @@ async def startup_event():
     init_db()
     print(f"📊 Database URL: {str(settings.database_url).split('@')[1]}")
     print(f"🔗 Menu Service URL: {settings.menu_service_url}")
+    await outbox_dispatcher.start()
+    print("📮 Outbox dispatcher started")
     print("✅ Orders Service initialized successfully!")
 
 
+# Shutdown Event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Alkalmazás leállításakor futó eseménykezelő.
+    Leállítja az outbox háttér-kézbesítőt és lezárja a megosztott HTTP klienseket.
+    """
+    await outbox_dispatcher.stop()
+    await close_all_clients()
+
+
 # Health Check Endpoint
 @app.get("/health")
 async def health_check():
@@ -109,7 +147,11 @@ async def health_check():
     return {
         "status": "ok",
         "service": "orders",
-        "version": "0.1.0"
+        "version": "0.1.0",
+        "outbox": outbox_dispatcher.stats(),
+        "http_clients": http_client_stats(),
+        "product_catalog": product_catalog.stats(),
+        "availability_grid": availability_grid.stats()
     }
 
 
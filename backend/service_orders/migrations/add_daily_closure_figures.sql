@@ -0,0 +1,23 @@
+-- Migration: Materialized daily closure figures
+-- Per business day closure totals (payment methods, order count, VAT split),
+-- computed by service_admin and marked stale by service_orders on every
+-- order close / payment of that day (late payments included)
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS daily_closure_figures (
+    business_date DATE PRIMARY KEY,
+    is_stale BOOLEAN NOT NULL DEFAULT TRUE,
+    invalidated_at TIMESTAMPTZ,
+    computed_at TIMESTAMPTZ,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    total_cash NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_card NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_szep_card NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_voucher NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_transfer NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    total_revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    payment_summary JSON,
+    vat_breakdown JSON
+);
+
+COMMENT ON TABLE daily_closure_figures IS 'Napi pénztárzárás számok (service_admin tölti, service_orders jelöli elavultnak)';
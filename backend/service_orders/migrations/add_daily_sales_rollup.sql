@@ -0,0 +1,58 @@
+-- Migration: Daily sales rollup tables for reporting
+-- Pre-aggregated daily totals for the sales / top products reports and the daily closure
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS daily_sales_rollup (
+    id SERIAL PRIMARY KEY,
+    sale_date DATE NOT NULL,
+    order_type VARCHAR(50) NOT NULL,
+    payment_method VARCHAR(50) NOT NULL,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    payment_count INTEGER NOT NULL DEFAULT 0,
+    payment_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT now(),
+    CONSTRAINT uq_daily_sales_rollup_key UNIQUE (sale_date, order_type, payment_method)
+);
+
+CREATE TABLE IF NOT EXISTS daily_product_sales (
+    id SERIAL PRIMARY KEY,
+    sale_date DATE NOT NULL,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    order_count INTEGER NOT NULL DEFAULT 0,
+    line_count INTEGER NOT NULL DEFAULT 0,
+    unit_price_sum NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT now(),
+    CONSTRAINT uq_daily_product_sales_key UNIQUE (sale_date, product_id)
+);
+
+COMMENT ON TABLE daily_sales_rollup IS 'Napi forgalom: payment_method = ''*'' sorok a lezárt rendelések, a többi a sikeres fizetések';
+COMMENT ON TABLE daily_product_sales IS 'Napi termék forgalom a lezárt rendelésekből (top products riport)';
+
+-- Backfill from existing data (same rules as SalesRollupService.rebuild;
+-- days are cut in the venue timezone, adjust if VENUE_TIMEZONE differs)
+INSERT INTO daily_sales_rollup (sale_date, order_type, payment_method, order_count, revenue)
+SELECT (o.created_at AT TIME ZONE 'Europe/Budapest')::date, o.order_type, '*', COUNT(*), COALESCE(SUM(o.total_amount), 0)
+FROM orders o
+WHERE o.status = 'LEZART'
+GROUP BY (o.created_at AT TIME ZONE 'Europe/Budapest')::date, o.order_type
+ON CONFLICT ON CONSTRAINT uq_daily_sales_rollup_key DO NOTHING;
+
+INSERT INTO daily_sales_rollup (sale_date, order_type, payment_method, payment_count, payment_amount)
+SELECT (p.created_at AT TIME ZONE 'Europe/Budapest')::date, o.order_type, p.payment_method, COUNT(*), COALESCE(SUM(p.amount), 0)
+FROM payments p
+JOIN orders o ON o.id = p.order_id
+WHERE p.status = 'SIKERES'
+GROUP BY (p.created_at AT TIME ZONE 'Europe/Budapest')::date, o.order_type, p.payment_method
+ON CONFLICT ON CONSTRAINT uq_daily_sales_rollup_key DO NOTHING;
+
+INSERT INTO daily_product_sales (sale_date, product_id, quantity, revenue, order_count, line_count, unit_price_sum)
+SELECT (o.created_at AT TIME ZONE 'Europe/Budapest')::date, oi.product_id, SUM(oi.quantity), SUM(oi.quantity * oi.unit_price),
+       COUNT(DISTINCT oi.order_id), COUNT(*), SUM(oi.unit_price)
+FROM order_items oi
+JOIN orders o ON o.id = oi.order_id
+WHERE o.status = 'LEZART'
+GROUP BY (o.created_at AT TIME ZONE 'Europe/Budapest')::date, oi.product_id
+ON CONFLICT ON CONSTRAINT uq_daily_product_sales_key DO NOTHING;
@@ -0,0 +1,10 @@
+-- Migration: Keyset pagination index for the order list
+-- GET /api/v1/orders follows next_cursor: (created_at, id) < (:c, :i) ORDER BY created_at DESC, id DESC
+-- Date: 2026-10-16
+--
+-- CONCURRENTLY: no write lock on busy tables; run outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_created_at_id
+    ON orders (created_at, id);
+
+ANALYZE orders;
@@ -0,0 +1,20 @@
+-- Migration: Composite indexes for report / closure date-range queries
+-- Reports filter with half-open created_at ranges (venue timezone) instead of DATE(created_at)
+-- Date: 2026-10-16
+--
+-- CONCURRENTLY: no write lock on busy tables; run outside a transaction block.
+
+-- orders: status = 'LEZART' AND created_at >= :start AND created_at < :end
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_status_created_at
+    ON orders (status, created_at);
+
+-- payments: order_id = :id AND status = 'SIKERES' (is_order_fully_paid, closure join)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_order_id_status
+    ON payments (order_id, status);
+
+-- payments: status = 'SIKERES' AND created_at >= :start AND created_at < :end (rollup rebuild)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_status_created_at
+    ON payments (status, created_at);
+
+ANALYZE orders;
+ANALYZE payments;
@@ -21,6 +21,13 @@ from backend.service_orders.models.order_item import OrderItem
 from backend.service_orders.models.payment import Payment
 from backend.service_orders.models.reservation import Reservation, ReservationStatus, ReservationSource
 from backend.service_orders.models.opening_hours import OpeningHours
+from backend.service_orders.models.outbox_event import OutboxEvent, OutboxStatus
+from backend.service_orders.models.sales_rollup import (
+    DailySalesRollup,
+    DailyProductSales,
+    DailyClosureFigures,
+    ORDER_LEVEL_METHOD
+)
 from backend.service_orders.models.room import Room
 
 # Export all models
@@ -36,5 +43,11 @@ __all__ = [
     'ReservationStatus',
     'ReservationSource',
     'OpeningHours',
+    'OutboxEvent',
+    'OutboxStatus',
+    'DailySalesRollup',
+    'DailyProductSales',
+    'DailyClosureFigures',
+    'ORDER_LEVEL_METHOD',
     'Room',
 ]
@@ -6,7 +6,7 @@ A rendelések táblája, amely tartalmazza a rendelés típusát, státuszát,
 összegét, ÁFA kulcsát és NTAK adatokat.
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP, Text
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -46,5 +46,12 @@ class Order(Base):
     order_items = relationship('OrderItem', back_populates='order', cascade='all, delete-orphan')
     payments = relationship('Payment', back_populates='order', cascade='all, delete-orphan')
 
+    __table_args__ = (
+        # Riportok / lezárások: status = ... AND created_at >= :start AND created_at < :end
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+        # Keyset lapozás: ORDER BY created_at DESC, id DESC / (created_at, id) < (:c, :i)
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Order(id={self.id}, type='{self.order_type}', status='{self.status}', total={self.total_amount})>"
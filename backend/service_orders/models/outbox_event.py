@@ -0,0 +1,72 @@
+"""
+OutboxEvent Model - SQLAlchemy ORM
+Module 1: Rendeléskezelés és Asztalok - Transactional Outbox
+
+Tranzakciós outbox tábla a más szolgáltatások felé irányuló mellékhatásokhoz
+(NTAK jelentés, készletlevonás). A sor ugyanabban a commit-ban jön létre,
+mint az üzleti változás (pl. rendelés lezárása), a kézbesítést pedig a
+háttérben futó OutboxDispatcher végzi újrapróbálással (at-least-once).
+"""
+
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Index
+from sqlalchemy.sql import func
+
+from backend.service_orders.models.database import Base, CompatibleJSON
+
+
+class OutboxStatus:
+    """Outbox esemény státuszok."""
+    PENDING = "PENDING"   # Kézbesítésre vár (vagy újrapróbálásra)
+    SENT = "SENT"         # Sikeresen kézbesítve
+    FAILED = "FAILED"     # Végleg sikertelen (max próbálkozás / nem újrapróbálható hiba)
+
+
+class OutboxEvent(Base):
+    """
+    Outbox esemény modell.
+
+    Egy sor = egy kézbesítendő HTTP hívás egy másik szolgáltatás felé.
+    Az idempotency_key egyedi: ugyanaz a mellékhatás nem kerülhet kétszer
+    a sorba, és a fogadó oldal is ez alapján szűrheti a duplikátumokat.
+    """
+    __tablename__ = 'outbox_events'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Esemény típusa (pl. 'ntak.report_order', 'inventory.deduct_stock')
+    event_type = Column(String(100), nullable=False, index=True)
+
+    # Érintett entitás azonosítója (pl. order_id)
+    aggregate_id = Column(Integer, nullable=False, index=True)
+
+    # Kézbesítendő adat (JSON)
+    payload = Column(CompatibleJSON, nullable=True)
+
+    # Egyedi idempotencia kulcs (Idempotency-Key header)
+    idempotency_key = Column(String(200), nullable=False, unique=True)
+
+    # Státusz: PENDING, SENT, FAILED
+    status = Column(String(20), nullable=False, default=OutboxStatus.PENDING)
+
+    # Próbálkozások száma
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # Legkorábbi következő próbálkozás (backoff / lease)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+    # Utolsó hibaüzenet
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    sent_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # A dispatcher lekérdezése: status = PENDING AND next_attempt_at <= now
+        Index('ix_outbox_events_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<OutboxEvent(id={self.id}, type='{self.event_type}', "
+            f"aggregate_id={self.aggregate_id}, status='{self.status}', attempts={self.attempts})>"
+        )
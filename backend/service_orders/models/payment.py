@@ -6,7 +6,7 @@ A fizetések táblája, amely tartalmazza a fizetési módot, összeget,
 státuszát és tranzakció azonosítót.
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -37,5 +37,12 @@ class Payment(Base):
     # Relationships
     order = relationship('Order', back_populates='payments')
 
+    __table_args__ = (
+        # Fizetettség ellenőrzés / összesítés: order_id = ... AND status = 'SIKERES'
+        Index('ix_payments_order_id_status', 'order_id', 'status'),
+        # Napi összesítő újraszámolás: status = 'SIKERES' AND created_at >= :start AND created_at < :end
+        Index('ix_payments_status_created_at', 'status', 'created_at'),
+    )
+
     def __repr__(self):
         return f"<Payment(id={self.id}, order_id={self.order_id}, method='{self.payment_method}', amount={self.amount}, status='{self.status}')>"
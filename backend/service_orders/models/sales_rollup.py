@@ -0,0 +1,132 @@
+"""
+Sales Rollup Models - SQLAlchemy ORM
+Module 4: Fizetések - Riport összesítők
+
+Előre aggregált napi forgalmi táblák a riportokhoz (sales, top products,
+napi pénztárzárás). A sorokat a SalesRollupService inkrementálisan
+frissíti a rendelés lezárásával / a fizetés rögzítésével azonos
+tranzakcióban, így a riportok nem olvassák újra a nyers orders /
+payments / order_items táblákat.
+
+daily_sales_rollup kulcsa: (sale_date, order_type, payment_method)
+- payment_method = '*' (ORDER_LEVEL_METHOD): rendelés szintű tények
+  (lezárt rendelések száma és bruttó összege, a rendelés napjára)
+- payment_method = 'KESZPENZ', 'KARTYA', ...: sikeres fizetések
+  (darab és összeg, a fizetés napjára)
+
+daily_closure_figures kulcsa: business_date
+- A napi pénztárzárás számai (service_admin számolja és tárolja);
+  minden fizetés / lezárás a rendelés napjának sorát elavultnak jelöli
+"""
+
+from sqlalchemy import Boolean, Column, Integer, String, Numeric, Date, JSON, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+
+from backend.service_orders.models.database import Base
+
+# Rendelés szintű sorok "fizetési módja" (nem valódi fizetési mód)
+ORDER_LEVEL_METHOD = '*'
+
+
+class DailySalesRollup(Base):
+    """
+    Napi forgalom összesítő nap / rendelés típus / fizetési mód szerint.
+    """
+    __tablename__ = 'daily_sales_rollup'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sale_date = Column(Date, nullable=False)
+    order_type = Column(String(50), nullable=False)  # 'Helyben', 'Elvitel', 'Kiszállítás'
+    payment_method = Column(String(50), nullable=False)  # ORDER_LEVEL_METHOD vagy 'KESZPENZ', 'KARTYA', ...
+
+    # Rendelés szintű tények (csak ORDER_LEVEL_METHOD sorokban)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+    # Fizetés szintű tények (csak fizetési mód sorokban)
+    payment_count = Column(Integer, nullable=False, default=0)
+    payment_amount = Column(Numeric(14, 2), nullable=False, default=0)
+
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Upsert kulcs; a dátum tartomány szűrés is ezt az indexet használja
+        UniqueConstraint('sale_date', 'order_type', 'payment_method', name='uq_daily_sales_rollup_key'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<DailySalesRollup(date={self.sale_date}, type='{self.order_type}', "
+            f"method='{self.payment_method}', orders={self.order_count}, revenue={self.revenue})>"
+        )
+
+
+class DailyProductSales(Base):
+    """
+    Napi termék forgalom összesítő (top products riport).
+
+    Az order_count a terméket tartalmazó lezárt rendelések száma az adott
+    napon; mivel egy rendelés egy naphoz tartozik, napok között összegezhető.
+    Az átlagár = unit_price_sum / line_count (tétel soronkénti átlag).
+    """
+    __tablename__ = 'daily_product_sales'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sale_date = Column(Date, nullable=False)
+    product_id = Column(Integer, nullable=False)  # Reference to service_menu.products.id
+
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
+    line_count = Column(Integer, nullable=False, default=0)
+    unit_price_sum = Column(Numeric(14, 2), nullable=False, default=0)
+
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('sale_date', 'product_id', name='uq_daily_product_sales_key'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<DailyProductSales(date={self.sale_date}, product_id={self.product_id}, "
+            f"quantity={self.quantity}, revenue={self.revenue})>"
+        )
+
+
+class DailyClosureFigures(Base):
+    """
+    Materializált napi pénztárzárás számok egy üzleti napra.
+
+    A service_admin FinanceService egyetlen aggregáló lekérdezéssel tölti
+    fel (fizetési módok, rendelésszám, ÁFA bontás), és amíg a sor nem
+    elavult, újraszámolás nélkül használja. A SalesRollupService a
+    rendelés lezárásával / fizetés rögzítésével azonos tranzakcióban
+    elavultnak jelöli a rendelés napjának sorát (késői fizetés is).
+    """
+    __tablename__ = 'daily_closure_figures'
+
+    business_date = Column(Date, primary_key=True)
+
+    is_stale = Column(Boolean, nullable=False, default=True)
+    invalidated_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    computed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    order_count = Column(Integer, nullable=False, default=0)
+    total_cash = Column(Numeric(14, 2), nullable=False, default=0)
+    total_card = Column(Numeric(14, 2), nullable=False, default=0)
+    total_szep_card = Column(Numeric(14, 2), nullable=False, default=0)
+    total_voucher = Column(Numeric(14, 2), nullable=False, default=0)
+    total_transfer = Column(Numeric(14, 2), nullable=False, default=0)
+    total_revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+    # {"KESZPENZ": 10000.0, "KARTYA": 5000.0, ...}
+    payment_summary = Column(JSON, nullable=True)
+    # {"27.00": {"order_count": 3, "gross": 12700.0, "net": 10000.0, "vat": 2700.0}, ...}
+    vat_breakdown = Column(JSON, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<DailyClosureFigures(date={self.business_date}, stale={self.is_stale}, "
+            f"orders={self.order_count}, revenue={self.total_revenue})>"
+        )
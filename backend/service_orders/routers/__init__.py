@@ -15,7 +15,8 @@ from backend.service_orders.routers.order_items import router as order_items_rou
 from backend.service_orders.routers.kds import router as kds_router
 from .reservations import router as reservations_router
 from backend.service_orders.routers.reports import reports_router
-from backend.service_orders.routers.rooms import rooms_router
+from backend.service_orders.routers.internal_router import internal_router
+from backend.service_orders.routers.rooms import router as rooms_router
 
 __all__ = [
     "tables_router",
@@ -25,5 +26,6 @@ __all__ = [
     "kds_router",
     "reservations_router",
     "reports_router",
+    "internal_router",
     "rooms_router",
 ]
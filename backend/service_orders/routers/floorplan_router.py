@@ -2,11 +2,18 @@
 Floorplan Router - Frontend API
 """
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from backend.service_orders.models.database import get_db
 from backend.service_orders.services.floorplan_service import FloorplanService
-from backend.service_orders.schemas.floorplan import FloorplanFullMapResponse
+from backend.service_orders.schemas.floorplan import (
+    FloorplanFullMapResponse,
+    FloorplanLayoutDiff,
+    FloorplanLayoutSaveRequest,
+    FloorplanSnapshotResponse
+)
 # Import RBAC dependencies
 from backend.service_admin.dependencies import require_permission
 
@@ -29,3 +36,114 @@ def get_full_map(
     Get the full map (Rooms + Tables) for the frontend editor.
     """
     return FloorplanService.get_full_map(db)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match fejléc egyezés (lista, `*` és gyenge `W/` előtag is).
+
+    Args:
+        if_none_match: A kliens If-None-Match fejléce
+        etag: Az aktuális ETag (idézőjelekkel)
+
+    Returns:
+        bool: True, ha a kliens példánya naprakész
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+@floorplan_router.get(
+    "/snapshot",
+    response_model=FloorplanSnapshotResponse,
+    summary="Get live floorplan snapshot",
+    description="""
+    Rooms, tables, seats and the open order of every table (elapsed time,
+    amount) in a single request, built from one joined query.
+
+    The response carries an `ETag` header (same as `version`). Send it back in
+    `If-None-Match` to receive 304 while nothing changed on the floor. Elapsed
+    minutes are part of the snapshot, so an occupied floor changes at most
+    once per minute on its own.
+
+    **Returns:**
+    - 200: Snapshot with `ETag` header
+    - 304: Unchanged since the ETag in `If-None-Match`
+    """,
+    responses={304: {"description": "Snapshot unchanged"}},
+    dependencies=[Depends(require_permission("orders:view"))]
+)
+def get_snapshot(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Alaprajz pillanatkép élő asztal státusszal, feltételes GET támogatással.
+
+    Args:
+        response: Response (ETag header)
+        if_none_match: A kliens utolsó ismert ETag-je
+        db: Database session (injected)
+
+    Returns:
+        FloorplanSnapshotResponse | Response: Snapshot, vagy 304 ha nem változott
+    """
+    snapshot = FloorplanService.get_snapshot(db)
+    etag = f'"{snapshot.version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return snapshot
+
+
+@floorplan_router.put(
+    "/layout",
+    response_model=FloorplanLayoutDiff,
+    summary="Save floorplan layout in one transaction",
+    description="""
+    Bulk upsert of rooms, tables and seats for the floor plan editor.
+
+    - Items without `id` are created, items with `id` are updated (tables:
+      only the fields that are sent). New tables can reference a new room of
+      the same request via `room_ref`.
+    - `seat_numbers` sets the exact seats of a table; omitted = unchanged.
+    - `delete_table_ids` / `delete_room_ids` remove rows; tables with orders
+      or reservations and rooms that still contain tables are rejected.
+
+    Everything is saved in one transaction: on any error nothing changes.
+
+    **Returns:**
+    - 200: IDs created / updated (changed values only) / deleted per entity
+    - 400: Validation error, missing reference or uniqueness conflict
+    """,
+    dependencies=[Depends(require_permission("orders:manage"))]
+)
+def save_layout(
+    layout: FloorplanLayoutSaveRequest,
+    db: Session = Depends(get_db)
+) -> FloorplanLayoutDiff:
+    """
+    Alaprajz mentése egy kérésben és egy tranzakcióban.
+
+    Args:
+        layout: Termek, asztalok, székek és törlések
+        db: Database session (injected)
+
+    Returns:
+        FloorplanLayoutDiff: A ténylegesen változott sorok
+
+    Raises:
+        HTTPException 400: Érvénytelen vagy ütköző mentés
+    """
+    try:
+        return FloorplanService.save_layout(db, layout)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,96 @@
+"""
+Internal API Router for Service-to-Service Communication
+Module 4: Fizetések és Számla Kezelés
+
+This router handles internal API calls from other microservices
+(service_admin sales and top product reports). These endpoints are NOT meant
+to be called by external clients. They do NOT have RBAC protection
+(service-to-service trust assumed): the callers send no user token.
+"""
+
+from datetime import date
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from backend.service_orders.models.database import get_db
+from backend.service_orders.routers.reports import _validate_range
+from backend.service_orders.schemas.report import SalesAggregateResponse, ProductSalesAggregateResponse
+from backend.service_orders.services.sales_rollup_service import SalesRollupService
+
+internal_router = APIRouter(
+    prefix="/internal",
+    tags=["Internal API"],
+    responses={
+        500: {"description": "Internal Server Error"}
+    }
+)
+
+
+@internal_router.get(
+    "/reports/sales-aggregate",
+    response_model=SalesAggregateResponse,
+    summary="Forgalom napi és fizetési mód szerinti bontásban",
+    description="""
+    Lezárt rendelések (darab, bruttó összeg) és sikeres fizetések (fizetési módonként)
+    üzleti naponként, szerver oldalon aggregálva (GROUP BY nap / fizetési mód).
+
+    A service_admin sales riportja ezt hívja a teljes rendelés lista helyett;
+    egy 30 napos riport legfeljebb 30 nap sorát adja vissza.
+    """
+)
+def get_sales_aggregate(
+    start_date: date = Query(..., description="Kezdő dátum (ISO formátum: YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Záró dátum (ISO formátum: YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Forgalom napi / fizetési mód szerinti aggregátuma.
+
+    Args:
+        start_date: Kezdő nap (inkluzív)
+        end_date: Záró nap (inkluzív)
+        db: Database session (dependency injection)
+
+    Returns:
+        SalesAggregateResponse: Napi sorok fizetési mód bontással
+
+    Raises:
+        HTTPException 400: Ha a kezdő dátum a záró dátum után van
+    """
+    _validate_range(start_date, end_date)
+    return SalesRollupService.aggregate_sales(db, start_date, end_date)
+
+
+@internal_router.get(
+    "/reports/product-sales",
+    response_model=ProductSalesAggregateResponse,
+    summary="Termék forgalom (top termékek)",
+    description="""
+    Lezárt rendelések tételei termékenként aggregálva (GROUP BY product_id),
+    eladott mennyiség szerint csökkenő sorrendben, `limit` termékig.
+    """
+)
+def get_product_sales(
+    start_date: date = Query(..., description="Kezdő dátum (ISO formátum: YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Záró dátum (ISO formátum: YYYY-MM-DD)"),
+    limit: int = Query(10, ge=1, le=500, description="Visszaadott termékek maximális száma"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Termék forgalom aggregátuma.
+
+    Args:
+        start_date: Kezdő nap (inkluzív)
+        end_date: Záró nap (inkluzív)
+        limit: Termékek maximális száma
+        db: Database session (dependency injection)
+
+    Returns:
+        ProductSalesAggregateResponse: Top termékek és az eladott termékek száma
+
+    Raises:
+        HTTPException 400: Ha a kezdő dátum a záró dátum után van
+    """
+    _validate_range(start_date, end_date)
+    return SalesRollupService.aggregate_product_sales(db, start_date, end_date, limit)
@@ -9,12 +9,20 @@ rendelés státusz kezelést.
 Epic B1: KDS Backend Core Implementation
 """
 
-from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+import asyncio
+import json
+from typing import Optional, List, Dict, Any, AsyncIterator
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Body, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from backend.service_orders.models.database import get_db
+from backend.service_orders.config import settings
+from backend.service_orders.models.database import get_db, SessionLocal
 from backend.service_orders.services.kds_service import KDSService
+from backend.service_orders.services.kds_event_bus import kds_event_bus, KDSSubscription
+from backend.service_orders.services.kds_board import kds_board
+from backend.service_orders.services.product_lookup import lookup_product_names
 from backend.service_orders.schemas.order_item import (
     OrderItemResponse,
     KDSStatusEnum
@@ -114,6 +122,59 @@ def get_active_items(
         )
 
 
+@router.get(
+    "/active",
+    response_model=Dict[str, Any],
+    summary="Get active KDS tickets incrementally",
+    description="""
+    Active KDS tickets served from the in-memory board (no per-request SQL rebuild).
+
+    The board is loaded once and then kept up to date by the order item / KDS
+    write paths. Clients pass the `version` of their last response as
+    `since_version` to receive only the tickets that changed since then.
+
+    **Query Parameters:**
+    - `station`: Optional filter by KDS station (e.g., 'KONYHA', 'PIZZA', 'PULT')
+    - `since_version`: Optional version from a previous response
+
+    **Returns:**
+    - 200: `{"version", "full", "tickets", "removed"}`
+      - `full=true`: `tickets` is the complete active list (replace local state)
+      - `full=false`: `tickets` are changed tickets (replace by `order_id`),
+        `removed` lists `order_id`s with no active items left on the station
+    - 304: Nothing changed since `since_version`
+    """
+)
+def get_active_tickets(
+    station: Optional[str] = Query(None, description="Filter by KDS station"),
+    since_version: Optional[int] = Query(None, ge=0, description="Last seen board version"),
+    db: Session = Depends(get_db)
+):
+    """
+    Aktív KDS jegyek a memóriában tartott táblából, opcionálisan csak a változások.
+
+    Args:
+        station: Opcionális KDS állomás szűrés
+        since_version: A kliens utolsó ismert verziója
+        db: Database session (injected, csak első betöltéshez / resync-hez)
+
+    Returns:
+        dict | Response: Változott jegyek, vagy 304 ha nincs változás
+    """
+    try:
+        kds_board.ensure_loaded(db)
+        changes = kds_board.changes_since(station, since_version)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while retrieving active tickets: {str(e)}"
+        )
+
+    if changes is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    return changes
+
+
 @router.patch(
     "/items/{item_id}/status",
     response_model=OrderItemResponse,
@@ -252,6 +313,9 @@ def get_drink_items(
             OrderItem.kds_status != 'SERVED'
         ).all()
 
+        # Product names: one batched lookup for the whole queue (cached per catalog version)
+        product_names = lookup_product_names(item.product_id for item, _ in items)
+
         result = []
         now = datetime.now(timezone.utc)
 
@@ -266,7 +330,7 @@ def get_drink_items(
             result.append({
                 "id": item.id,
                 "orderNumber": order.id,
-                "itemName": f"Product {item.product_id}",  # TODO: Join with product table for actual name
+                "itemName": product_names.get(item.product_id, f"Product {item.product_id}"),
                 "quantity": item.quantity,
                 "status": item.kds_status.value if hasattr(item.kds_status, 'value') else item.kds_status,
                 "urgent": is_urgent,
@@ -410,3 +474,148 @@ def toggle_urgent_flag(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while toggling urgent flag: {str(e)}"
         )
+
+
+# ============================================================================
+# Push feed (Server-Sent Events)
+# ============================================================================
+
+
+def _load_active_snapshot(station: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Aktív tételek snapshot-ja a memóriában tartott KDS táblából.
+
+    DB kapcsolat csak első betöltéskor / resync-kor kell; ilyenkor saját,
+    rövid életű session-t használunk (a stream élettartama alatt nem
+    tartunk nyitva kapcsolatot).
+
+    Args:
+        station: Opcionális KDS állomás szűrés
+
+    Returns:
+        List[Dict]: get_active_items struktúrájú, JSON-szerializálható lista
+    """
+    db = SessionLocal()
+    try:
+        kds_board.ensure_loaded(db)
+    finally:
+        db.close()
+    return kds_board.snapshot(station)
+
+
+def _format_sse(event: str, data: Any) -> str:
+    """
+    Egy SSE üzenet formázása.
+
+    Args:
+        event: Esemény neve ('snapshot' vagy 'delta')
+        data: JSON-szerializálható adat
+
+    Returns:
+        str: text/event-stream formátumú üzenet
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _kds_event_stream(
+    request: Request,
+    subscription: KDSSubscription,
+    snapshot: List[Dict[str, Any]]
+) -> AsyncIterator[str]:
+    """
+    SSE generátor: előbb snapshot, utána tétel-szintű delta események.
+
+    Ha a kliens sora megtelt (lassú kliens), a várakozó eseményeket eldobjuk
+    és új snapshot-ot küldünk, így a kliens állapota mindig konzisztens.
+    """
+    keepalive = settings.kds_stream_keepalive_seconds
+    try:
+        yield _format_sse("snapshot", snapshot)
+
+        while True:
+            if await request.is_disconnected():
+                break
+
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                # Keepalive komment (proxy-k ne zárják le a kapcsolatot)
+                yield ": keepalive\n\n"
+                continue
+
+            if subscription.overflowed:
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.overflowed = False
+                snapshot = await run_in_threadpool(_load_active_snapshot, subscription.station)
+                yield _format_sse("snapshot", snapshot)
+                continue
+
+            yield _format_sse("delta", event)
+    finally:
+        kds_event_bus.unsubscribe(subscription)
+
+
+@router.get(
+    "/stream",
+    summary="Stream KDS item changes (SSE)",
+    description="""
+    Push-based KDS feed using Server-Sent Events (text/event-stream).
+
+    Replaces periodic polling of the station endpoints. The stream first sends a
+    `snapshot` event (same structure as `/active-items`), then one `delta` event per
+    item change:
+
+    ```json
+    {
+        "type": "item_upserted",
+        "station": "KONYHA",
+        "order_id": 12,
+        "order": {"order_id": 12, "table_id": 5, "table_number": "T5", ...},
+        "item": {OrderItemResponse}
+    }
+    ```
+
+    `item_removed` is sent when an item is deleted, served, or moved to another station.
+    If the client falls behind, a fresh `snapshot` is sent instead of the missed deltas.
+
+    **Query Parameters:**
+    - `station`: Optional KDS station filter (e.g., 'KONYHA', 'PIZZA', 'PULT')
+    """
+)
+async def stream_kds_events(
+    request: Request,
+    station: Optional[str] = Query(None, description="Filter by KDS station")
+):
+    """
+    KDS push feed (SSE).
+
+    A feliratkozás a snapshot lekérése ELŐTT történik, így a kettő között
+    történt változások sem vesznek el (legfeljebb duplán érkeznek, ami
+    az upsert szemantika miatt ártalmatlan).
+
+    Args:
+        request: HTTP kérés (kapcsolatbontás figyeléséhez)
+        station: Optional station filter
+
+    Returns:
+        StreamingResponse: text/event-stream válasz
+    """
+    subscription = kds_event_bus.subscribe(station)
+    try:
+        snapshot = await run_in_threadpool(_load_active_snapshot, station)
+    except Exception as e:
+        kds_event_bus.unsubscribe(subscription)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while loading KDS snapshot: {str(e)}"
+        )
+
+    return StreamingResponse(
+        _kds_event_stream(request, subscription, snapshot),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
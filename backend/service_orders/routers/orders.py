@@ -13,6 +13,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from backend.core_domain.pagination import next_page_cursor
 from backend.service_orders.models.database import get_db
 from backend.service_orders.services.order_service import OrderService
 from backend.service_orders.services.payment_service import PaymentService
@@ -92,24 +93,38 @@ def get_orders(
     order_type: Optional[OrderTypeEnum] = Query(None, description="Filter by order type"),
     order_status: Optional[OrderStatusEnum] = Query(None, alias="status", description="Filter by status"),
     table_id: Optional[int] = Query(None, description="Filter by table ID"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor of the previous page); skip is ignored"),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute the total count (default: true without cursor, false on cursor pages)"
+    ),
     db: Session = Depends(get_db)
 ) -> OrderListResponse:
     """
     Get a list of orders with optional filtering.
 
+    Deep scrolling should follow `next_cursor` (keyset on created_at, id)
+    instead of increasing `skip`; cursor pages skip the total count by default.
+
     Args:
         skip: Number of records to skip (for pagination)
         limit: Maximum number of records to return
         order_type: Optional filter by order type (Helyben, Elvitel, Kiszállítás)
         order_status: Optional filter by status (NYITOTT, FELDOLGOZVA, LEZART, SZTORNO)
         table_id: Optional filter by table ID
+        cursor: Optional keyset cursor from the previous page
+        include_total: Whether to count all matching orders
         db: Database session (injected)
 
     Returns:
         OrderListResponse: Paginated list of orders with metadata
 
+    Raises:
+        HTTPException 400: If the cursor is invalid
+
     Example:
-        GET /orders?skip=0&limit=20&status=NYITOTT
+        GET /orders?limit=20&status=NYITOTT
+        GET /orders?limit=20&status=NYITOTT&cursor=<next_cursor>
     """
     # Convert enum to string for service layer
     order_type_str = order_type.value if order_type else None
@@ -122,25 +137,31 @@ def get_orders(
         limit=limit,
         order_type=order_type_str,
         status=status_str,
-        table_id=table_id
+        table_id=table_id,
+        cursor=cursor
     )
 
-    # Get total count for pagination
-    total = OrderService.count_orders(
-        db,
-        order_type=order_type_str,
-        status=status_str,
-        table_id=table_id
-    )
+    # Total count only when requested (full scan of the filtered set)
+    if include_total is None:
+        include_total = cursor is None
+    total = None
+    if include_total:
+        total = OrderService.count_orders(
+            db,
+            order_type=order_type_str,
+            status=status_str,
+            table_id=table_id
+        )
 
     # Calculate page number
-    page = (skip // limit) + 1 if limit > 0 else 1
+    page = (skip // limit) + 1 if limit > 0 and cursor is None else 1
 
     return OrderListResponse(
         items=[OrderResponse.model_validate(order) for order in orders],
         total=total,
         page=page,
-        page_size=limit
+        page_size=limit,
+        next_cursor=next_page_cursor(orders, limit)
     )
 
 
@@ -7,12 +7,15 @@ különös tekintettel a napi pénztárzáráshoz szükséges fizetési összegz
 """
 
 from datetime import date
-from typing import Dict
-from fastapi import APIRouter, Depends, Query
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from backend.service_admin.dependencies import require_permission
+from backend.service_orders.config import settings
 from backend.service_orders.models.database import get_db
 from backend.service_orders.services.payment_service import PaymentService
+from backend.service_orders.services.sales_rollup_service import SalesRollupService
 
 # Router létrehozása
 reports_router = APIRouter(
@@ -74,3 +77,57 @@ async def get_daily_payments(
     payment_summary = PaymentService.get_daily_payment_summary(db, target_date)
 
     return payment_summary
+
+
+def _validate_range(start_date: date, end_date: date) -> None:
+    """400-as hiba, ha a kezdő dátum a záró dátum után van."""
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A kezdő dátum nem lehet későbbi a záró dátumnál"
+        )
+
+
+@reports_router.post(
+    "/sales-rollup/rebuild",
+    response_model=Dict[str, Any],
+    dependencies=[Depends(require_permission("orders:manage"))],
+    summary="Napi forgalmi összesítők újraszámolása",
+    description="""
+    Újraszámolja a daily_sales_rollup és daily_product_sales táblákat a megadott
+    dátum tartományra a nyers rendelés / fizetés adatokból, naponként commitolva.
+    Egy kérés legfeljebb `SALES_ROLLUP_REBUILD_MAX_DAYS` napot fedhet le.
+
+    A riportok (sales, top products, napi pénztárzárás) ezekből az összesítőkből
+    dolgoznak; a táblák a lezárásokkal / fizetésekkel együtt frissülnek, ez az
+    endpoint a bevezetés előtti napok visszatöltésére és eltérések javítására szolgál.
+    """
+)
+def rebuild_sales_rollup(
+    start_date: date = Query(..., description="Kezdő dátum (ISO formátum: YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Záró dátum (ISO formátum: YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Napi forgalmi összesítők újraszámolása egy dátum tartományra.
+
+    Args:
+        start_date: Kezdő nap (inkluzív)
+        end_date: Záró nap (inkluzív)
+        db: Database session (dependency injection)
+
+    Returns:
+        Dict[str, Any]: start_date, end_date, sales_rows, product_rows
+
+    Raises:
+        HTTPException 400: Ha a kezdő dátum a záró dátum után van, vagy a tartomány
+            hosszabb a megengedettnél
+    """
+    _validate_range(start_date, end_date)
+    max_days = settings.sales_rollup_rebuild_max_days
+    if (end_date - start_date).days + 1 > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Legfeljebb {max_days} nap számolható újra egy kérésben"
+        )
+    return SalesRollupService.rebuild(db, start_date, end_date)
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from backend.service_orders.models.database import get_db
 from backend.service_orders.models.room import Room
 from backend.service_orders.schemas.room import RoomCreate, RoomResponse, RoomUpdate
+from backend.service_orders.services.availability_grid import availability_grid
 
 router = APIRouter(
     prefix="/rooms",
@@ -58,4 +59,6 @@ def delete_room(room_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_room)
     db.commit()
+    # A terem asztalai már nem vonhatók össze
+    availability_grid.invalidate()
     return None
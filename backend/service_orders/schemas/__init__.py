@@ -72,6 +72,15 @@ from .payment import (
     SplitCheckResponse,
 )
 
+# Report aggregate schemas
+from .report import (
+    PaymentMethodAggregate,
+    DailySalesAggregate,
+    SalesAggregateResponse,
+    ProductSalesAggregate,
+    ProductSalesAggregateResponse,
+)
+
 __all__ = [
     # Table
     "TableBase",
@@ -110,4 +119,10 @@ __all__ = [
     "PaymentResponse",
     "SplitCheckItemSchema",
     "SplitCheckResponse",
+    # Report
+    "PaymentMethodAggregate",
+    "DailySalesAggregate",
+    "SalesAggregateResponse",
+    "ProductSalesAggregate",
+    "ProductSalesAggregateResponse",
 ]
@@ -2,9 +2,13 @@
 Pydantic schemas for Floorplan entities.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 from backend.core_domain.enums import RoomType, TableShape
+from backend.service_orders.schemas.room import RoomBase
+from backend.service_orders.schemas.table import TableBase
 
 class FloorplanTableDTO(BaseModel):
     id: int
@@ -32,3 +36,96 @@ class FloorplanRoomDTO(BaseModel):
 class FloorplanFullMapResponse(BaseModel):
     rooms: List[FloorplanRoomDTO]
     tables: List[FloorplanTableDTO]
+
+
+# ============================================================================
+# Snapshot (live table status)
+# ============================================================================
+
+class FloorplanSeatDTO(BaseModel):
+    id: int
+    seat_number: int
+
+
+class FloorplanOpenOrderDTO(BaseModel):
+    id: int = Field(..., description="Oldest open order on the table")
+    status: str
+    opened_at: Optional[datetime] = Field(None, description="Creation time of the oldest open order")
+    elapsed_minutes: int = Field(..., ge=0, description="Minutes since opened_at")
+    amount: Decimal = Field(..., description="Item total of all open orders on the table")
+    order_count: int = Field(1, ge=1, description="Number of open orders on the table")
+
+
+class FloorplanSnapshotTableDTO(BaseModel):
+    id: int
+    room_id: Optional[int] = None
+    number: str
+    capacity: Optional[int] = None
+    shape: Optional[str] = None
+    x: int
+    y: int
+    width: int
+    height: int
+    rotation: float = 0.0
+    seats: List[FloorplanSeatDTO] = Field(default_factory=list)
+    open_order: Optional[FloorplanOpenOrderDTO] = None
+
+
+class FloorplanSnapshotRoomDTO(BaseModel):
+    id: int
+    name: str
+    type: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    background_image_url: Optional[str] = None
+
+
+class FloorplanSnapshotResponse(BaseModel):
+    version: str = Field(..., description="Snapshot version (also sent as the ETag header)")
+    rooms: List[FloorplanSnapshotRoomDTO]
+    tables: List[FloorplanSnapshotTableDTO]
+
+
+# ============================================================================
+# Layout save (bulk upsert)
+# ============================================================================
+
+class FloorplanRoomUpsert(RoomBase):
+    id: Optional[int] = Field(None, description="Existing room ID (None = create)")
+    ref: Optional[str] = Field(
+        None,
+        max_length=50,
+        description="Client key of a new room; tables in the same request reference it via room_ref"
+    )
+
+
+class FloorplanTableUpsert(TableBase):
+    id: Optional[int] = Field(None, description="Existing table ID (None = create)")
+    room_ref: Optional[str] = Field(None, max_length=50, description="ref of a room created in the same request")
+    seat_numbers: Optional[List[int]] = Field(
+        None,
+        description="Exact seat numbers of the table (None = leave the seats unchanged)"
+    )
+
+
+class FloorplanLayoutSaveRequest(BaseModel):
+    rooms: List[FloorplanRoomUpsert] = Field(default_factory=list)
+    tables: List[FloorplanTableUpsert] = Field(
+        default_factory=list,
+        description="Existing tables only update the fields that are sent"
+    )
+    delete_table_ids: List[int] = Field(default_factory=list)
+    delete_room_ids: List[int] = Field(default_factory=list, description="Rooms must be empty after the save")
+
+
+class FloorplanEntityDiff(BaseModel):
+    created: List[int] = Field(default_factory=list)
+    updated: List[int] = Field(default_factory=list, description="Only rows whose values actually changed")
+    deleted: List[int] = Field(default_factory=list)
+
+
+class FloorplanLayoutDiff(BaseModel):
+    rooms: FloorplanEntityDiff
+    tables: FloorplanEntityDiff
+    seats: FloorplanEntityDiff
+    room_refs: Dict[str, int] = Field(default_factory=dict, description="ref -> ID of the created rooms")
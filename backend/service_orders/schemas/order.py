@@ -171,9 +171,9 @@ class OrderListResponse(BaseModel):
         ...,
         description="List of orders"
     )
-    total: int = Field(
-        ...,
-        description="Total number of orders",
+    total: Optional[int] = Field(
+        None,
+        description="Total number of orders (null when not requested, e.g. on cursor pages)",
         examples=[250]
     )
     page: int = Field(
@@ -189,6 +189,10 @@ class OrderListResponse(BaseModel):
         description="Number of items per page",
         examples=[20]
     )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor of the next page (pass as `cursor`); null on the last page"
+    )
 
 
 # ============================================================================
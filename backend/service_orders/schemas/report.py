@@ -0,0 +1,88 @@
+"""
+Pydantic schemas for aggregated report endpoints.
+
+This module defines the response schemas of the server-side aggregation
+endpoints (sales by day / payment method, product sales) in the Service
+Orders module (Module 4). The rows come from the daily sales rollup, so
+a 30-day report is ~30 rows instead of every order with nested items.
+"""
+
+from datetime import date as DateType
+from decimal import Decimal
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class PaymentMethodAggregate(BaseModel):
+    """Successful payments of one payment method on one business day."""
+
+    payment_method: str = Field(
+        ...,
+        description="Payment method (e.g., 'KESZPENZ', 'KARTYA', 'SZEP_KARTYA')",
+        examples=["KESZPENZ", "KARTYA"]
+    )
+    payment_count: int = Field(
+        ...,
+        ge=0,
+        description="Number of successful payments"
+    )
+    amount: Decimal = Field(
+        ...,
+        description="Sum of successful payments in HUF"
+    )
+
+
+class DailySalesAggregate(BaseModel):
+    """Closed orders and successful payments of one business day."""
+
+    date: DateType = Field(
+        ...,
+        description="Business day (venue timezone)"
+    )
+    order_count: int = Field(
+        ...,
+        ge=0,
+        description="Number of closed orders"
+    )
+    revenue: Decimal = Field(
+        ...,
+        description="Gross total of closed orders in HUF"
+    )
+    payments: List[PaymentMethodAggregate] = Field(
+        default_factory=list,
+        description="Successful payments grouped by payment method"
+    )
+
+
+class SalesAggregateResponse(BaseModel):
+    """Sales aggregated by business day and payment method."""
+
+    start_date: DateType = Field(..., description="First day of the range (inclusive)")
+    end_date: DateType = Field(..., description="Last day of the range (inclusive)")
+    days: List[DailySalesAggregate] = Field(
+        default_factory=list,
+        description="Days with at least one closed order or payment, ascending"
+    )
+
+
+class ProductSalesAggregate(BaseModel):
+    """Sales of one product over the requested range."""
+
+    product_id: int = Field(..., description="Product identifier (service_menu)")
+    quantity: int = Field(..., ge=0, description="Quantity sold")
+    revenue: Decimal = Field(..., description="Sum of quantity * unit_price in HUF")
+    order_count: int = Field(..., ge=0, description="Number of closed orders containing the product")
+    average_price: Decimal = Field(..., description="Average unit price per order line in HUF")
+
+
+class ProductSalesAggregateResponse(BaseModel):
+    """Product sales aggregated by product_id, ordered by quantity sold."""
+
+    start_date: DateType = Field(..., description="First day of the range (inclusive)")
+    end_date: DateType = Field(..., description="Last day of the range (inclusive)")
+    total_products: int = Field(..., ge=0, description="Number of distinct products sold in the range")
+    products: List[ProductSalesAggregate] = Field(
+        default_factory=list,
+        description="Top products by quantity sold (at most `limit`)"
+    )
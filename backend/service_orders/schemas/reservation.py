@@ -220,6 +220,11 @@ class TimeSlot(BaseModel):
         description="List of table IDs available at this time",
         examples=[[1, 2, 5], [3, 7]]
     )
+    table_combinations: list[list[int]] = Field(
+        default_factory=list,
+        description="Adjacent table combinations that together seat the party (only when no single table fits)",
+        examples=[[[4, 5], [5, 6, 7]]]
+    )
 
 
 class AvailabilityResponse(BaseModel):
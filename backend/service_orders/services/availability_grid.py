@@ -0,0 +1,407 @@
+"""
+Availability Grid - Napi foglaltsági bitmap cache az online foglaláshoz
+Module 1: Rendeléskezelés és Asztalok (Performance)
+
+Az online foglalás (saját oldal és külső aggregátorok) minden dátum /
+vendégszám / időtartam kombinációra lekéri a szabad időpontokat. Ezeket
+NEM SQL-ből számoljuk kérésenként: naponként egyszer épül egy rács
+(asztalok x `bucket_minutes` perces idősávok a nyitvatartáson belül,
+a _get_opening_hours speciális / hétköznapi szabályai szerint), amelyben
+asztalonként egy Python int bitmap jelzi a foglalt sávokat.
+
+Lekérdezés (bármely vendégszám és időtartam): asztalonként egy
+"kezdhető-e" maszk a foglalt bitek időtartamnyi eltolásainak OR-jával
+(log2(időtartam) lépésben), majd időpontonként egy bit vizsgálat. Ha
+egy asztal sem elég nagy, a szabad asztalokból a rács építésekor előre
+számolt szomszédság alapján összevonható kombinációkat keresünk
+(table_combinations).
+
+Inkrementális frissítés: create / update / cancel / delete_reservation a
+commit után a foglalás sávjait beírja / kiveszi (a foglalás ID szerint
+idempotens). Asztal létrehozás / módosítás / törlés a teljes cache-t üríti.
+
+Sávokra kerekítés: a foglalás a részben érintett sávokat is lefoglalja,
+a kért időtartam felfelé kerekül - nem sávhatárra eső időpontoknál a
+rács óvatosabb (foglaltat mutathat), soha nem ad ki ütköző asztalt.
+
+Felépítés zárolás nélkül: a nap SQL lekérdezései a közös lock-on kívül
+futnak (naponként egyetlen építő, a többi kérés ugyanarra a napra
+megvárja), így egy nap újraépítése nem tartja fel a többi nap
+lekérdezéseit. Az építés közben érkező foglalás változások a kész rácsra
+is rákerülnek; invalidate() után a régi építés eredménye nem kerül
+a cache-be.
+
+Biztonsági háló: a napi rács `ttl_seconds` után újraépül, ami a más
+worker / folyamat által rögzített foglalásokat is pótolja. A foglalás
+létrehozása ettől függetlenül SQL ütközés-ellenőrzéssel történik, így
+egy elavult rács legfeljebb egy elutasított foglalási kísérletet okoz.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.service_orders.config import settings
+from backend.service_orders.models.table import Table
+from backend.service_orders.services.reservation_availability import (
+    BLOCKING_STATUSES,
+    SLOT_INTERVAL,
+    load_blocking_reservations,
+    local_wall_clock,
+    opening_hours_for
+)
+from backend.service_orders.services.table_combinations import (
+    Adjacency,
+    assign_slot_tables,
+    build_adjacency
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED_MESSAGE = "A étterem ezen a napon zárva tart"
+
+
+class _DayGrid:
+    """Egy nap rácsa: asztal kapacitások, foglalások sávjai és foglaltsági bitmapek."""
+
+    __slots__ = (
+        "open_at", "close_at", "bucket_count", "capacities", "adjacency", "reservations", "busy", "built_at"
+    )
+
+    def __init__(self, open_at: Optional[datetime], close_at: Optional[datetime], bucket_count: int):
+        # None: zárva
+        self.open_at = open_at
+        self.close_at = close_at
+        self.bucket_count = bucket_count
+        # table_id -> capacity (ID szerint rendezve)
+        self.capacities: Dict[int, Optional[int]] = {}
+        # table_id -> összevonható szomszédos asztalok
+        self.adjacency: Adjacency = {}
+        # reservation_id -> (table_id, első sáv, utolsó utáni sáv)
+        self.reservations: Dict[int, Tuple[int, int, int]] = {}
+        # table_id -> foglalt sávok bitmapje (bit i = i. sáv)
+        self.busy: Dict[int, int] = {}
+        self.built_at = time.monotonic()
+
+    @property
+    def closed(self) -> bool:
+        return self.open_at is None
+
+    def rebuild_table(self, table_id: int) -> None:
+        """Egy asztal bitmapjének újraszámolása a foglalásaiból (törlés után)."""
+        mask = 0
+        for reservation_table_id, first, last in self.reservations.values():
+            if reservation_table_id == table_id:
+                mask |= ((1 << (last - first)) - 1) << first
+        self.busy[table_id] = mask
+
+
+class _PendingBuild:
+    """Folyamatban lévő napi építés: a várakozók eseménye és a közben érkezett foglalás változások."""
+
+    __slots__ = ("generation", "done", "changes")
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        # (reservation_id, table_id, start_time, duration_minutes, status); status None = törlés
+        self.changes: List[Tuple[int, Optional[int], Optional[datetime], Optional[int], object]] = []
+
+
+class AvailabilityGrid:
+    """
+    Szálbiztos, inkrementálisan frissülő napi foglaltsági rács cache.
+
+    LRU szerint legfeljebb `max_days` napot tart memóriában.
+    """
+
+    def __init__(self, bucket_minutes: int = 5, ttl_seconds: int = 60, max_days: int = 120):
+        """
+        Args:
+            bucket_minutes: Idősáv hossza percben (a 30 perces lépésköz osztója)
+            ttl_seconds: Napi rács újraépítési ideje (0 = cache kikapcsolva)
+            max_days: Memóriában tartott napok maximális száma
+
+        Raises:
+            ValueError: Ha a sávhossz nem osztója az időpont lépésköznek
+        """
+        slot_minutes = int(SLOT_INTERVAL.total_seconds() // 60)
+        if bucket_minutes <= 0 or slot_minutes % bucket_minutes:
+            raise ValueError(f"bucket_minutes ({bucket_minutes}) must divide the {slot_minutes} minute slot interval")
+
+        self.bucket = timedelta(minutes=bucket_minutes)
+        self.slot_step = slot_minutes // bucket_minutes
+        self.ttl_seconds = ttl_seconds
+        self.max_days = max_days
+        self._lock = threading.RLock()
+        self._days: "OrderedDict[date, _DayGrid]" = OrderedDict()
+        self._building: Dict[date, _PendingBuild] = {}
+        # invalidate() lépteti: a korábban indult építések eredménye nem kerül cache-be
+        self._generation = 0
+        self._builds = 0
+        self._hits = 0
+        self._applied = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    # ========================================================================
+    # Felépítés
+    # ========================================================================
+
+    def _grid(self, db: Session, day: date) -> _DayGrid:
+        """
+        A nap rácsa a cache-ből, vagy a lock-on kívül felépítve (lock NÉLKÜL hívandó).
+
+        Naponként egy építő fut; az ugyanarra a napra érkező kérések megvárják,
+        a többi nap lekérdezései közben zavartalanul futnak.
+        """
+        while True:
+            with self._lock:
+                grid = self._days.get(day)
+                if grid is not None and time.monotonic() - grid.built_at < self.ttl_seconds:
+                    self._days.move_to_end(day)
+                    self._hits += 1
+                    return grid
+
+                pending = self._building.get(day)
+                if pending is None:
+                    pending = _PendingBuild(self._generation)
+                    self._building[day] = pending
+                    self._builds += 1
+                    break
+            # Másik kérés építi a napot: megvárjuk, majd újra a cache-ből olvasunk
+            pending.done.wait()
+
+        try:
+            grid = self._build(db, day)
+        except Exception:
+            with self._lock:
+                self._building.pop(day, None)
+            pending.done.set()
+            raise
+
+        with self._lock:
+            self._building.pop(day, None)
+            # Építés közben átvezetett foglalás változások (ID szerint idempotens)
+            for change in pending.changes:
+                self._apply_to_grid(grid, *change)
+            if pending.generation == self._generation:
+                self._days[day] = grid
+                self._days.move_to_end(day)
+                while len(self._days) > self.max_days:
+                    self._days.popitem(last=False)
+        pending.done.set()
+        return grid
+
+    def _build(self, db: Session, day: date) -> _DayGrid:
+        """Nap rácsa: nyitvatartás, asztalok (szomszédsággal) és a nap foglalásai (3-4 lekérdezés)."""
+        opening_hours = opening_hours_for(db, day)
+        if not opening_hours or opening_hours.is_closed:
+            return _DayGrid(None, None, 0)
+
+        open_at = datetime.combine(day, opening_hours.open_time)
+        close_at = datetime.combine(day, opening_hours.close_time)
+        bucket_count = max(math.ceil((close_at - open_at) / self.bucket), 0)
+        grid = _DayGrid(open_at, close_at, bucket_count)
+
+        tables = db.query(
+            Table.id, Table.capacity, Table.room_id,
+            Table.position_x, Table.position_y, Table.width, Table.height
+        ).order_by(Table.id).all()
+        for table in tables:
+            grid.capacities[table.id] = table.capacity
+            grid.busy[table.id] = 0
+        grid.adjacency = build_adjacency(tables)
+
+        for reservation_id, table_id, start_time, duration_minutes in load_blocking_reservations(db, open_at, close_at):
+            self._place(grid, reservation_id, table_id, start_time, duration_minutes)
+
+        logger.debug(f"Availability grid built for {day}: {len(grid.capacities)} tables, "
+                     f"{len(grid.reservations)} reservations")
+        return grid
+
+    def _place(
+        self,
+        grid: _DayGrid,
+        reservation_id: int,
+        table_id: int,
+        start_time: datetime,
+        duration_minutes: int
+    ) -> None:
+        """Foglalás sávjainak beírása (a nyitvatartáson kívüli rész elhagyva)."""
+        if grid.closed or table_id not in grid.busy:
+            return
+        start = local_wall_clock(start_time)
+        first = max(math.floor((start - grid.open_at) / self.bucket), 0)
+        last = min(math.ceil((start + timedelta(minutes=duration_minutes) - grid.open_at) / self.bucket), grid.bucket_count)
+        if first >= last:
+            return
+        grid.reservations[reservation_id] = (table_id, first, last)
+        grid.busy[table_id] |= ((1 << (last - first)) - 1) << first
+
+    # ========================================================================
+    # Inkrementális frissítés (ReservationService, commit után)
+    # ========================================================================
+
+    def apply_reservation(
+        self,
+        reservation_id: int,
+        table_id: int,
+        start_time: datetime,
+        duration_minutes: int,
+        status
+    ) -> None:
+        """
+        Foglalás aktuális állapotának átvezetése a cache-elt napokra.
+
+        A korábbi sávjai (bármely napon, bármely asztalon) kikerülnek, és ha
+        a státusza asztalt foglal, az új sávjai bekerülnek.
+
+        Args:
+            reservation_id: Foglalás ID
+            table_id: Asztal ID
+            start_time: Kezdés
+            duration_minutes: Időtartam percben
+            status: ReservationStatus
+        """
+        with self._lock:
+            self._record_change(reservation_id, table_id, start_time, duration_minutes, status)
+
+    def discard_reservation(self, reservation_id: int) -> None:
+        """Törölt foglalás sávjainak eltávolítása."""
+        with self._lock:
+            self._record_change(reservation_id, None, None, None, None)
+
+    def _record_change(
+        self,
+        reservation_id: int,
+        table_id: Optional[int],
+        start_time: Optional[datetime],
+        duration_minutes: Optional[int],
+        status
+    ) -> None:
+        """Változás átvezetése a cache-elt napokra és a folyamatban lévő építésekre (lock alatt hívandó)."""
+        self._applied += 1
+        for grid in self._days.values():
+            self._apply_to_grid(grid, reservation_id, table_id, start_time, duration_minutes, status)
+        for pending in self._building.values():
+            pending.changes.append((reservation_id, table_id, start_time, duration_minutes, status))
+
+    def _apply_to_grid(
+        self,
+        grid: _DayGrid,
+        reservation_id: int,
+        table_id: Optional[int],
+        start_time: Optional[datetime],
+        duration_minutes: Optional[int],
+        status
+    ) -> None:
+        """Foglalás korábbi sávjainak kivétele egy napból, és ha asztalt foglal, az új sávok beírása."""
+        placed = grid.reservations.pop(reservation_id, None)
+        if placed is not None:
+            grid.rebuild_table(placed[0])
+        if status not in BLOCKING_STATUSES or grid.closed:
+            return
+        start = local_wall_clock(start_time)
+        end = start + timedelta(minutes=duration_minutes)
+        if start < grid.close_at and end > grid.open_at:
+            self._place(grid, reservation_id, table_id, start_time, duration_minutes)
+
+    def invalidate(self) -> None:
+        """Minden nap újraépül a következő lekérdezéskor (pl. asztal változás)."""
+        with self._lock:
+            self._generation += 1
+            self._days.clear()
+
+    # ========================================================================
+    # Lekérdezés
+    # ========================================================================
+
+    def available_slots(
+        self,
+        db: Session,
+        day: date,
+        guests: int,
+        duration_minutes: int
+    ) -> Tuple[List[Tuple[datetime, List[int], List[List[int]]]], Optional[str]]:
+        """
+        Szabad időpontok (asztalok, kombinációk) a rácsból; cache találatnál SQL nélkül.
+
+        Args:
+            db: SQLAlchemy session (csak a nap első felépítéséhez)
+            day: Dátum
+            guests: Vendégek száma
+            duration_minutes: Időtartam percben
+
+        Returns:
+            tuple: ([(időpont, [szabad asztal ID-k], [asztal kombinációk]), ...]
+                csak a foglalható időpontok, opcionális üzenet)
+        """
+        grid = self._grid(db, day)
+        with self._lock:
+            if grid.closed:
+                return [], CLOSED_MESSAGE
+
+            if not any(capacity and capacity >= guests for capacity in grid.capacities.values()) \
+                    and settings.table_combination_max_tables <= 1:
+                return [], f"Nincs megfelelő asztal {guests} fő részére"
+            tables = [table_id for table_id, capacity in grid.capacities.items() if capacity]
+
+            span = math.ceil(timedelta(minutes=duration_minutes) / self.bucket)
+            # Utolsó kezdés: a foglalás vége nem lehet a zárás után
+            last_start = (grid.close_at - timedelta(minutes=duration_minutes) - grid.open_at) / self.bucket
+            slot_buckets = range(0, math.floor(last_start) + 1, self.slot_step) if last_start >= 0 else range(0)
+
+            # Kezdés i. sávban tiltott, ha [i, i + span) bármely sávja foglalt
+            blocked_starts = {table_id: self._dilate(grid.busy[table_id], span) for table_id in tables}
+
+            slot_frees = [
+                (
+                    grid.open_at + bucket * self.bucket,
+                    [table_id for table_id in tables if not (blocked_starts[table_id] >> bucket) & 1]
+                )
+                for bucket in slot_buckets
+            ]
+            return assign_slot_tables(slot_frees, grid.capacities, grid.adjacency, guests), None
+
+    @staticmethod
+    def _dilate(busy: int, span: int) -> int:
+        """busy | busy >> 1 | ... | busy >> (span - 1), log2(span) lépésben."""
+        covered = 1
+        while covered < span and busy:
+            shift = min(covered, span - covered)
+            busy |= busy >> shift
+            covered += shift
+        return busy
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Cache statisztikák (monitoringhoz).
+
+        Returns:
+            dict: enabled, days, builds, hits, applied
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "days": len(self._days),
+                "builds": self._builds,
+                "hits": self._hits,
+                "applied": self._applied,
+            }
+
+
+# Singleton instance (folyamatonként egy)
+availability_grid = AvailabilityGrid(
+    bucket_minutes=settings.reservation_grid_bucket_minutes,
+    ttl_seconds=settings.reservation_grid_ttl_seconds,
+    max_days=settings.reservation_grid_max_days
+)
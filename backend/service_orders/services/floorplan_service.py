@@ -1,16 +1,56 @@
 """
 Floorplan Service - Aggregation Logic
+
+Alaprajz mentés (save_layout): az editor korábban asztalonként külön
+kérésben (és commit-tal) mentett, így egy 120 asztalos terem több száz
+kérés volt, és egy hiba félkész állapotot hagyott. A mentés most termeket,
+asztalokat és székeket egy tranzakcióban, halmaz alapú utasításokkal
+(executemany INSERT ... RETURNING / UPDATE / DELETE ... IN) végzi, és
+visszaadja a ténylegesen létrehozott / módosított / törölt sorokat.
+
+Snapshot (get_snapshot): a hostess tabletek folyamatosan frissítik az
+alaprajzot, korábban asztalonként külön lekérdezve a nyitott rendelést.
+A snapshot termek, asztalok, székek és asztalonként a nyitott rendelés
+(eltelt idő, összeg) egyetlen JOIN-olt lekérdezésből épül, a tartalmából
+képzett verzió (ETag) alapján a változatlan nézetre 304 válasz adható.
 """
 
-from typing import List, Dict, Any
+import hashlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from backend.service_orders.models.order import Order
+from backend.service_orders.models.order_item import OrderItem
+from backend.service_orders.models.reservation import Reservation
+from backend.service_orders.models.room import Room
+from backend.service_orders.models.seat import Seat
 from backend.service_orders.models.table import Table
 from backend.service_orders.schemas.floorplan import (
+    FloorplanEntityDiff,
     FloorplanFullMapResponse,
+    FloorplanLayoutDiff,
+    FloorplanLayoutSaveRequest,
+    FloorplanOpenOrderDTO,
     FloorplanRoomDTO,
+    FloorplanSeatDTO,
+    FloorplanSnapshotResponse,
+    FloorplanSnapshotRoomDTO,
+    FloorplanSnapshotTableDTO,
     FloorplanTableDTO
 )
-from backend.core_domain.enums import RoomType, TableShape
+from backend.service_orders.services.availability_grid import availability_grid
+from backend.service_orders.services.table_service import AVAILABILITY_FIELDS
+from backend.core_domain.enums import OrderStatus, RoomType, TableShape
+
+# Az asztalt foglaló (még nem lezárt / sztornózott) rendelés státuszok
+OPEN_ORDER_STATUSES = (OrderStatus.OPEN.value, OrderStatus.IN_PROGRESS.value)
+
+# A Table modell alapértelmezett mérete (width / height hiányában)
+DEFAULT_TABLE_SIZE = 80
 
 class FloorplanService:
     @staticmethod
@@ -77,3 +117,429 @@ class FloorplanService:
             rooms=room_list,
             tables=table_dtos
         )
+
+    @staticmethod
+    def get_snapshot(db: Session, now: Optional[datetime] = None) -> FloorplanSnapshotResponse:
+        """
+        Alaprajz pillanatkép élő asztal státusszal, egyetlen lekérdezéssel.
+
+        rooms FULL OUTER JOIN tables (üres terem és terem nélküli asztal is
+        megjelenik), LEFT JOIN seats, LEFT JOIN a nyitott rendelések és a
+        tételösszegük (rendelésenként előre aggregálva). A sorokat Pythonban
+        csoportosítjuk asztalonként.
+
+        A verzió a teljes tartalom (az eltelt perceket is beleértve) hash-e,
+        így percenként legfeljebb egyszer változik, ha semmi más nem történik.
+
+        Args:
+            db: SQLAlchemy database session
+            now: Az eltelt idő számításának időpontja (alapértelmezés: most, UTC)
+
+        Returns:
+            FloorplanSnapshotResponse: Termek, asztalok és a snapshot verziója
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        item_totals = (
+            select(
+                OrderItem.order_id.label("order_id"),
+                func.sum(OrderItem.quantity * OrderItem.unit_price).label("items_total")
+            )
+            .group_by(OrderItem.order_id)
+            .subquery()
+        )
+        statement = (
+            select(
+                Room.id, Room.name, Room.type, Room.width, Room.height, Room.background_image_url,
+                Table.id, Table.room_id, Table.table_number, Table.capacity, Table.shape,
+                Table.position_x, Table.position_y, Table.width, Table.height, Table.rotation,
+                Seat.id, Seat.seat_number,
+                Order.id, Order.status, Order.created_at, Order.total_amount, item_totals.c.items_total
+            )
+            .select_from(Room)
+            .join(Table, Table.room_id == Room.id, full=True)
+            .outerjoin(Seat, Seat.table_id == Table.id)
+            .outerjoin(Order, (Order.table_id == Table.id) & Order.status.in_(OPEN_ORDER_STATUSES))
+            .outerjoin(item_totals, item_totals.c.order_id == Order.id)
+            .order_by(Room.id, Table.id, Seat.seat_number, Order.created_at, Order.id)
+        )
+
+        rooms: Dict[int, FloorplanSnapshotRoomDTO] = {}
+        tables: Dict[int, FloorplanSnapshotTableDTO] = {}
+        seats: Dict[int, Dict[int, FloorplanSeatDTO]] = {}
+        orders: Dict[int, Dict[int, tuple]] = {}
+
+        for (room_id, room_name, room_type, room_width, room_height, background,
+             table_id, table_room_id, number, capacity, shape, x, y, width, height, rotation,
+             seat_id, seat_number,
+             order_id, order_status, opened_at, total_amount, items_total) in db.execute(statement):
+            if room_id is not None and room_id not in rooms:
+                rooms[room_id] = FloorplanSnapshotRoomDTO(
+                    id=room_id, name=room_name, type=room_type, width=room_width,
+                    height=room_height, background_image_url=background
+                )
+            if table_id is None:
+                continue
+            if table_id not in tables:
+                tables[table_id] = FloorplanSnapshotTableDTO(
+                    id=table_id,
+                    room_id=table_room_id,
+                    number=number,
+                    capacity=capacity,
+                    shape=shape,
+                    x=x or 0,
+                    y=y or 0,
+                    width=width or DEFAULT_TABLE_SIZE,
+                    height=height or DEFAULT_TABLE_SIZE,
+                    rotation=rotation or 0.0
+                )
+                seats[table_id] = {}
+                orders[table_id] = {}
+            # A szék x rendelés szorzat miatt ugyanaz a szék / rendelés több sorban is szerepel
+            if seat_id is not None:
+                seats[table_id].setdefault(seat_id, FloorplanSeatDTO(id=seat_id, seat_number=seat_number))
+            if order_id is not None:
+                amount = items_total if items_total is not None else (total_amount or 0)
+                orders[table_id].setdefault(order_id, (order_status, opened_at, Decimal(str(amount))))
+
+        for table_id, table in tables.items():
+            table.seats = list(seats[table_id].values())
+            table.open_order = FloorplanService._open_order(orders[table_id], now)
+
+        room_list = list(rooms.values())
+        table_list = list(tables.values())
+        return FloorplanSnapshotResponse(
+            version=FloorplanService._snapshot_version(room_list, table_list),
+            rooms=room_list,
+            tables=table_list
+        )
+
+    @staticmethod
+    def _open_order(orders: Dict[int, tuple], now: datetime) -> Optional[FloorplanOpenOrderDTO]:
+        """
+        Egy asztal nyitott rendeléseiből a legrégebbi, az összes rendelés összegével.
+
+        Args:
+            orders: order_id -> (status, created_at, összeg), created_at szerint rendezve
+            now: Az eltelt idő számításának időpontja
+
+        Returns:
+            FloorplanOpenOrderDTO | None: None, ha az asztal szabad
+        """
+        if not orders:
+            return None
+
+        order_id, (order_status, opened_at, _) = next(iter(orders.items()))
+        elapsed_minutes = 0
+        if opened_at is not None:
+            # SQLite naiv időbélyeget ad vissza: UTC-nek tekintjük (server_default=now())
+            if opened_at.tzinfo is None:
+                opened_at = opened_at.replace(tzinfo=timezone.utc)
+            elapsed_minutes = max(0, int((now - opened_at).total_seconds() // 60))
+
+        return FloorplanOpenOrderDTO(
+            id=order_id,
+            status=order_status,
+            opened_at=opened_at,
+            elapsed_minutes=elapsed_minutes,
+            amount=sum((amount for _, _, amount in orders.values()), Decimal("0")).quantize(Decimal("0.01")),
+            order_count=len(orders)
+        )
+
+    @staticmethod
+    def _snapshot_version(
+        rooms: List[FloorplanSnapshotRoomDTO],
+        tables: List[FloorplanSnapshotTableDTO]
+    ) -> str:
+        """
+        A snapshot tartalmából képzett verzió (ETag).
+
+        Args:
+            rooms: Termek
+            tables: Asztalok székekkel és nyitott rendeléssel
+
+        Returns:
+            str: Verzió azonosító (16 hex karakter)
+        """
+        digest = hashlib.sha1()
+        for room in rooms:
+            digest.update(room.model_dump_json().encode("utf-8"))
+        digest.update(b"|")
+        for table in tables:
+            digest.update(table.model_dump_json().encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    # ========================================================================
+    # Layout save (bulk upsert)
+    # ========================================================================
+
+    @staticmethod
+    def save_layout(db: Session, layout: FloorplanLayoutSaveRequest) -> FloorplanLayoutDiff:
+        """
+        Alaprajz mentése egy tranzakcióban: termek, asztalok, székek upsert + törlés.
+
+        Sorrend: termek létrehozása / módosítása, asztalok (az új termekre
+        room_ref-fel hivatkozhatnak), székek (seat_numbers szerint pontos
+        halmaz), végül a törlések. Csak a ténylegesen változott sorokra fut
+        UPDATE. Bármely hiba esetén semmi nem kerül mentésre.
+
+        Args:
+            db: SQLAlchemy session
+            layout: A mentendő alaprajz
+
+        Returns:
+            FloorplanLayoutDiff: Létrehozott / módosított / törölt ID-k típusonként
+
+        Raises:
+            ValueError: Hivatkozott terem / asztal nem létezik, ismétlődő
+                azonosító, törlendő asztalhoz rendelés / foglalás tartozik,
+                törlendő teremben asztal marad, vagy egyediség ütközés
+        """
+        FloorplanService._validate_layout(layout)
+        try:
+            diff, availability_changed = FloorplanService._apply_layout(db, layout)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise ValueError(
+                "Nem sikerült menteni az alaprajzot. Lehetséges ok: "
+                "egy asztalszám vagy székszám már használatban van."
+            ) from e
+        except Exception:
+            db.rollback()
+            raise
+
+        if availability_changed:
+            availability_grid.invalidate()
+        return diff
+
+    @staticmethod
+    def _validate_layout(layout: FloorplanLayoutSaveRequest) -> None:
+        """
+        A kérés belső ellentmondásainak ellenőrzése (adatbázis nélkül).
+
+        Raises:
+            ValueError: Ismétlődő ID / ref / asztalszám / székszám, ismeretlen
+                room_ref, room_id és room_ref együtt, mentett és törölt azonosító
+        """
+        def duplicates(values) -> List:
+            seen, repeated = set(), []
+            for value in values:
+                if value in seen:
+                    repeated.append(value)
+                seen.add(value)
+            return repeated
+
+        room_ids = [room.id for room in layout.rooms if room.id is not None]
+        table_ids = [table.id for table in layout.tables if table.id is not None]
+        refs = [room.ref for room in layout.rooms if room.ref is not None]
+        checks = {
+            "terem ID": room_ids + layout.delete_room_ids,
+            "asztal ID": table_ids + layout.delete_table_ids,
+            "terem ref": refs,
+            "asztalszám": [table.table_number for table in layout.tables],
+        }
+        for label, values in checks.items():
+            repeated = duplicates(values)
+            if repeated:
+                raise ValueError(f"Ismétlődő {label} a mentésben: {repeated[0]}")
+
+        if any(room.id is not None and room.ref is not None for room in layout.rooms):
+            raise ValueError("A ref csak új teremhez adható meg")
+        for table in layout.tables:
+            label = table.table_number
+            if table.room_ref is not None:
+                if table.room_id is not None:
+                    raise ValueError(f"Asztal {label}: room_id és room_ref nem adható meg együtt")
+                if table.room_ref not in refs:
+                    raise ValueError(f"Asztal {label}: ismeretlen room_ref '{table.room_ref}'")
+            if table.seat_numbers is not None:
+                if duplicates(table.seat_numbers):
+                    raise ValueError(f"Asztal {label}: ismétlődő székszám")
+                if any(number < 1 for number in table.seat_numbers):
+                    raise ValueError(f"Asztal {label}: a székszám legalább 1")
+
+    @staticmethod
+    def _apply_layout(db: Session, layout: FloorplanLayoutSaveRequest) -> tuple:
+        """
+        A mentés utasításai (commit nélkül).
+
+        Returns:
+            tuple: (FloorplanLayoutDiff, érinti-e a foglalási rácsot)
+        """
+        diff = FloorplanLayoutDiff(
+            rooms=FloorplanEntityDiff(), tables=FloorplanEntityDiff(), seats=FloorplanEntityDiff()
+        )
+        availability_changed = False
+
+        # --- Meglévő sorok: egy lekérdezés típusonként ---
+        upsert_table_ids = [table.id for table in layout.tables if table.id is not None]
+        referenced_room_ids = (
+            {room.id for room in layout.rooms if room.id is not None}
+            | {table.room_id for table in layout.tables if table.room_id is not None}
+            | set(layout.delete_room_ids)
+        )
+        current_rooms = FloorplanService._rows_by_id(db, Room, referenced_room_ids)
+        current_tables = FloorplanService._rows_by_id(db, Table, set(upsert_table_ids) | set(layout.delete_table_ids))
+
+        missing_rooms = sorted(referenced_room_ids - current_rooms.keys())
+        if missing_rooms:
+            raise ValueError(f"Terem (ID: {missing_rooms[0]}) nem található")
+        missing_tables = sorted((set(upsert_table_ids) | set(layout.delete_table_ids)) - current_tables.keys())
+        if missing_tables:
+            raise ValueError(f"Asztal (ID: {missing_tables[0]}) nem található")
+
+        # --- Termek ---
+        new_rooms = [room for room in layout.rooms if room.id is None]
+        if new_rooms:
+            # Kevés sor: a ref -> ID párosításhoz a paraméterek sorrendje kell
+            created = db.execute(
+                insert(Room).returning(Room.id, sort_by_parameter_order=True),
+                [room.model_dump(exclude={"id", "ref"}) for room in new_rooms]
+            ).scalars().all()
+            diff.rooms.created = list(created)
+            diff.room_refs = {room.ref: room_id for room, room_id in zip(new_rooms, created) if room.ref is not None}
+
+        room_changes = FloorplanService._changed_rows(
+            current_rooms,
+            [(room.id, room.model_dump(exclude_unset=True, exclude={"id", "ref"}))
+             for room in layout.rooms if room.id is not None]
+        )
+        if room_changes:
+            db.execute(update(Room), room_changes)
+            diff.rooms.updated = [row["id"] for row in room_changes]
+
+        # --- Asztalok ---
+        def table_values(table, exclude_unset: bool) -> Dict[str, Any]:
+            values = table.model_dump(exclude_unset=exclude_unset, exclude={"id", "room_ref", "seat_numbers"})
+            if table.room_ref is not None:
+                values["room_id"] = diff.room_refs[table.room_ref]
+            return values
+
+        new_tables = [table for table in layout.tables if table.id is None]
+        seat_targets: Dict[int, List[int]] = {}
+        if new_tables:
+            # Az asztalszám egyedi: a RETURNING sorrendje nem számít (SQLite-on a
+            # sort_by_parameter_order soronkénti INSERT-re váltana)
+            created = dict(db.execute(
+                insert(Table).returning(Table.table_number, Table.id),
+                [table_values(table, exclude_unset=False) for table in new_tables]
+            ).all())
+            diff.tables.created = [created[table.table_number] for table in new_tables]
+            availability_changed = True
+            for table in new_tables:
+                if table.seat_numbers:
+                    seat_targets[created[table.table_number]] = table.seat_numbers
+
+        table_changes = FloorplanService._changed_rows(
+            current_tables,
+            [(table.id, table_values(table, exclude_unset=True)) for table in layout.tables if table.id is not None]
+        )
+        if table_changes:
+            db.execute(update(Table), table_changes)
+            diff.tables.updated = [row["id"] for row in table_changes]
+            availability_changed = availability_changed or any(AVAILABILITY_FIELDS & row.keys() for row in table_changes)
+
+        # --- Székek: seat_numbers szerinti pontos halmaz ---
+        seat_targets.update({
+            table.id: table.seat_numbers for table in layout.tables
+            if table.id is not None and table.seat_numbers is not None
+        })
+        removed_seats: List[int] = []
+        existing_numbers: Dict[int, set] = {}
+        resized = [table_id for table_id in upsert_table_ids if table_id in seat_targets]
+        if resized:
+            for seat_id, table_id, seat_number in db.execute(
+                select(Seat.id, Seat.table_id, Seat.seat_number).where(Seat.table_id.in_(resized))
+            ):
+                existing_numbers.setdefault(table_id, set()).add(seat_number)
+                if seat_number not in seat_targets[table_id]:
+                    removed_seats.append(seat_id)
+        new_seats = [
+            {"table_id": table_id, "seat_number": number}
+            for table_id, numbers in seat_targets.items()
+            for number in numbers if number not in existing_numbers.get(table_id, ())
+        ]
+
+        # --- Törlések (előtte: hivatkozások ellenőrzése) ---
+        delete_table_ids = sorted(layout.delete_table_ids)
+        if delete_table_ids:
+            for model, label in ((Order, "rendelés"), (Reservation, "foglalás")):
+                blocked = db.execute(
+                    select(model.table_id).where(model.table_id.in_(delete_table_ids)).limit(1)
+                ).scalar()
+                if blocked is not None:
+                    raise ValueError(f"Asztal (ID: {blocked}) nem törölhető: {label} tartozik hozzá")
+            removed_seats.extend(db.execute(
+                select(Seat.id).where(Seat.table_id.in_(delete_table_ids))
+            ).scalars().all())
+
+        if removed_seats:
+            used = db.execute(
+                select(OrderItem.seat_id).where(OrderItem.seat_id.in_(removed_seats)).limit(1)
+            ).scalar()
+            if used is not None:
+                raise ValueError(f"Szék (ID: {used}) nem törölhető: rendelés tétel hivatkozik rá")
+            db.execute(delete(Seat).where(Seat.id.in_(removed_seats)))
+            diff.seats.deleted = sorted(removed_seats)
+
+        if new_seats:
+            diff.seats.created = sorted(db.execute(insert(Seat).returning(Seat.id), new_seats).scalars().all())
+
+        if delete_table_ids:
+            db.execute(delete(Table).where(Table.id.in_(delete_table_ids)))
+            diff.tables.deleted = delete_table_ids
+            availability_changed = True
+
+        delete_room_ids = sorted(layout.delete_room_ids)
+        if delete_room_ids:
+            occupied = db.execute(
+                select(Table.room_id).where(Table.room_id.in_(delete_room_ids)).limit(1)
+            ).scalar()
+            if occupied is not None:
+                raise ValueError(f"Terem (ID: {occupied}) nem törölhető: asztalok maradnak benne")
+            db.execute(delete(Room).where(Room.id.in_(delete_room_ids)))
+            diff.rooms.deleted = delete_room_ids
+
+        return diff, availability_changed
+
+    @staticmethod
+    def _rows_by_id(db: Session, model, ids) -> Dict[int, Dict[str, Any]]:
+        """
+        Meglévő sorok oszlopértékei ID szerint (egy lekérdezés).
+
+        Args:
+            db: SQLAlchemy session
+            model: Room vagy Table
+            ids: Lekérdezendő ID-k
+
+        Returns:
+            dict: id -> {oszlop: érték}
+        """
+        if not ids:
+            return {}
+        rows = db.execute(select(model.__table__).where(model.id.in_(ids))).mappings()
+        return {row["id"]: dict(row) for row in rows}
+
+    @staticmethod
+    def _changed_rows(
+        current: Dict[int, Dict[str, Any]],
+        updates: List[tuple]
+    ) -> List[Dict[str, Any]]:
+        """
+        Bulk UPDATE paraméterek csak a ténylegesen eltérő mezőkkel.
+
+        Args:
+            current: _rows_by_id eredménye
+            updates: [(id, {mező: új érték}), ...]
+
+        Returns:
+            list: [{"id": ..., mező: érték, ...}, ...] a változott sorokra
+        """
+        changes = []
+        for row_id, values in updates:
+            changed = {field: value for field, value in values.items() if current[row_id].get(field) != value}
+            if changed:
+                changes.append({"id": row_id, **changed})
+        return changes
@@ -0,0 +1,345 @@
+"""
+KDS Board - Incremental in-memory Kitchen Display state
+Module 1: Rendeléskezelés és Asztalok / Epic B: Konyha/KDS
+
+Állomásonkénti, memóriában tartott KDS tábla: aktív jegyek (ticket =
+egy rendelés tételei egy állomáson) rendelés szerint csoportosítva.
+
+A táblát NEM SQL-ből építjük újra minden kérésnél: egyszer töltődik be
+(get_active_items), utána a kds_event_bus delta eseményei frissítik
+(ugyanaz a publish útvonal, amit a /kds/stream SSE feed is használ).
+
+Verziózás:
+- Globális, monoton növekvő verziószám; minden jegy-változás kap egyet
+- Állomásonként nyilvántartjuk az utolsó változás verzióját, így a
+  `since_version` lekérdezés változatlan állomásra 304-et adhat
+- Eltűnt jegyekről tombstone marad (removed), korlátos számban; ha a
+  kliens verziója régebbi a legrégebbi megőrzött tombstone-nál, teljes
+  listát kap (full=True)
+
+Biztonsági háló: `kds_board_resync_seconds` időnként teljes újratöltés,
+ami a busz által nem látott írásokat (más worker, közvetlen SQL) is pótolja.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from backend.service_orders.config import settings
+from backend.service_orders.services.kds_event_bus import ITEM_REMOVED, kds_event_bus
+from backend.service_orders.services.kds_service import KDSService
+
+logger = logging.getLogger(__name__)
+
+
+class _StationBoard:
+    """Egy állomás jegyei, tombstone-jai és verziói."""
+
+    def __init__(self):
+        # order_id -> {"header": dict, "items": {item_id: dict}, "version": int}
+        self.tickets: Dict[int, Dict[str, Any]] = {}
+        # order_id -> verzió, amikor a jegy eltűnt
+        self.removed: Dict[int, int] = {}
+        # Az utolsó változás verziója ezen az állomáson
+        self.version = 0
+        # Ennél régebbi since_version-re nincs megbízható delta (teljes lista kell)
+        self.min_delta_version = 0
+
+
+class KDSBoard:
+    """
+    Szálbiztos, inkrementálisan frissülő KDS tábla.
+
+    Az adatokat JSON-szerializált formában tárolja (ugyanaz a struktúra,
+    mint a get_active_items + jsonable_encoder), így a válaszoknál
+    nincs újraszerializálás a modell objektumokból.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Session], List[Dict[str, Any]]],
+        resync_seconds: int = 300,
+        max_tombstones: int = 1000
+    ):
+        """
+        Args:
+            loader: Teljes aktív lista betöltése (db -> get_active_items struktúra)
+            resync_seconds: Teljes újratöltés gyakorisága (0 = csak egyszer)
+            max_tombstones: Állomásonként megőrzött eltűnt jegyek maximális száma
+        """
+        self._loader = loader
+        self.resync_seconds = resync_seconds
+        self.max_tombstones = max_tombstones
+        self._lock = threading.RLock()
+        self._stations: Dict[str, _StationBoard] = {}
+        # Időalapú kezdőérték: újraindítás után a régi kliens-verziók
+        # (szinte) biztosan nem esnek egybe az újakkal
+        self._version = int(time.time() * 1000)
+        self._hydrated_at: Optional[float] = None
+        self._hydrations = 0
+        self._applied = 0
+
+    # ========================================================================
+    # Betöltés
+    # ========================================================================
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        Első használatkor (vagy resync időköz lejártakor) teljes betöltés.
+
+        Args:
+            db: Database session
+        """
+        with self._lock:
+            if self._hydrated_at is not None and (
+                self.resync_seconds <= 0
+                or time.monotonic() - self._hydrated_at < self.resync_seconds
+            ):
+                return
+            self._hydrate(db)
+
+    def _hydrate(self, db: Session) -> None:
+        """Teljes tábla felépítése a loader eredményéből (lock alatt hívandó)."""
+        groups = jsonable_encoder(self._loader(db))
+
+        self._version += 1
+        version = self._version
+        previous = self._stations
+        stations: Dict[str, _StationBoard] = {}
+
+        for group in groups:
+            header = {key: value for key, value in group.items() if key != "items"}
+            for item in group["items"]:
+                board = stations.setdefault(item["kds_station"], _StationBoard())
+                ticket = board.tickets.setdefault(
+                    group["order_id"],
+                    {"header": header, "items": {}, "version": version}
+                )
+                ticket["items"][item["id"]] = item
+
+        # Újratöltéskor minden állomás verziót lép; delta nem adható (full)
+        for station in set(previous) | set(stations):
+            board = stations.setdefault(station, _StationBoard())
+            board.version = version
+            board.min_delta_version = version
+
+        self._stations = stations
+        self._hydrated_at = time.monotonic()
+        self._hydrations += 1
+
+    def invalidate(self) -> None:
+        """A következő lekérés teljes újratöltést végez."""
+        with self._lock:
+            self._hydrated_at = None
+
+    # ========================================================================
+    # Delta alkalmazás (kds_event_bus listener)
+    # ========================================================================
+
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        """
+        kds_event_bus esemény alkalmazása a táblára.
+
+        Betöltés előtt érkező eseményeket figyelmen kívül hagy (a betöltés
+        úgyis a friss állapotot olvassa).
+
+        Args:
+            event: item_upserted / item_removed esemény
+        """
+        station = event.get("station")
+        item = event.get("item") or {}
+        order_id = event.get("order_id")
+        item_id = item.get("id")
+        if station is None or order_id is None or item_id is None:
+            return
+
+        with self._lock:
+            if self._hydrated_at is None:
+                return
+
+            self._version += 1
+            version = self._version
+            board = self._stations.setdefault(station, _StationBoard())
+            ticket = board.tickets.get(order_id)
+
+            if event.get("type") == ITEM_REMOVED:
+                if ticket is None or item_id not in ticket["items"]:
+                    return
+                del ticket["items"][item_id]
+                if not ticket["items"]:
+                    del board.tickets[order_id]
+                    self._add_tombstone(board, order_id, version)
+                else:
+                    ticket["version"] = version
+            else:
+                if ticket is None:
+                    ticket = {"header": event.get("order") or {"order_id": order_id}, "items": {}}
+                    board.tickets[order_id] = ticket
+                    board.removed.pop(order_id, None)
+                elif event.get("order"):
+                    ticket["header"] = event["order"]
+                ticket["items"][item_id] = item
+                ticket["version"] = version
+
+            board.version = version
+            self._applied += 1
+
+    def _add_tombstone(self, board: _StationBoard, order_id: int, version: int) -> None:
+        """Eltűnt jegy rögzítése; a legrégebbiek eldobása a korlát felett."""
+        board.removed[order_id] = version
+        if len(board.removed) > self.max_tombstones:
+            oldest_order_id = min(board.removed, key=board.removed.get)
+            board.min_delta_version = board.removed.pop(oldest_order_id)
+
+    # ========================================================================
+    # Lekérdezések
+    # ========================================================================
+
+    def snapshot(self, station: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Teljes aktív lista a get_active_items struktúrájában.
+
+        Args:
+            station: KDS állomás (None = összes)
+
+        Returns:
+            List[Dict]: Rendelésenként csoportosított tételek
+        """
+        with self._lock:
+            tickets = self._collect(station, since_version=None)
+        return [self._render(header, items) for header, items, _ in tickets]
+
+    def changes_since(
+        self,
+        station: Optional[str],
+        since_version: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Változott jegyek egy korábbi verzió óta.
+
+        Args:
+            station: KDS állomás (None = összes)
+            since_version: A kliens utolsó ismert verziója (None = teljes lista)
+
+        Returns:
+            Optional[dict]: None ha nincs változás, különben
+                {"version", "full", "tickets", "removed"}
+        """
+        with self._lock:
+            boards = self._select(station)
+            version = max((board.version for _, board in boards), default=self._version)
+
+            if since_version is not None and since_version == version:
+                return None
+
+            # since_version > version: a kliens egy korábbi (újraindított) táblát ismer
+            full = since_version is None or since_version > version or any(
+                since_version < board.min_delta_version for _, board in boards
+            )
+            tickets = self._collect(station, since_version=None if full else since_version)
+
+            removed: List[int] = []
+            if not full:
+                # Csak az összes kiválasztott állomásról eltűnt rendelés (a többi jegyként megy)
+                active = {order_id for _, board in boards for order_id in board.tickets}
+                removed = sorted({
+                    order_id
+                    for _, board in boards
+                    for order_id, removed_at in board.removed.items()
+                    if removed_at > since_version and order_id not in active
+                })
+
+        return {
+            "version": version,
+            "full": full,
+            "tickets": [
+                {**self._render(header, items), "version": ticket_version}
+                for header, items, ticket_version in tickets
+            ],
+            "removed": removed,
+        }
+
+    def _select(self, station: Optional[str]) -> List[Tuple[str, _StationBoard]]:
+        """Kiválasztott állomás(ok) (lock alatt hívandó)."""
+        if station is None:
+            return list(self._stations.items())
+        board = self._stations.get(station)
+        return [(station, board)] if board is not None else []
+
+    def _collect(
+        self,
+        station: Optional[str],
+        since_version: Optional[int]
+    ) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]], int]]:
+        """
+        Jegyek összegyűjtése (lock alatt hívandó); több állomás esetén
+        az azonos rendeléshez tartozó jegyek összevonva.
+
+        A since_version szűrés az összevont jegyre vonatkozik: egy rendelés
+        akkor változott, ha bármelyik állomáson nőtt a jegy verziója, vagy
+        valamelyik állomásról eltűnt (tombstone). Ilyenkor az összes állomás
+        tételeivel megy ki, mert a kliens rendelésenként cseréli a jegyet.
+        """
+        boards = self._select(station)
+        merged: Dict[int, Tuple[Dict[str, Any], List[Dict[str, Any]], int]] = {}
+        for _, board in boards:
+            for order_id, ticket in board.tickets.items():
+                header, items, version = merged.get(order_id, (ticket["header"], [], 0))
+                merged[order_id] = (
+                    header,
+                    items + list(ticket["items"].values()),
+                    max(version, ticket["version"])
+                )
+
+        for _, board in boards:
+            for order_id, removed_at in board.removed.items():
+                if order_id in merged and removed_at > merged[order_id][2]:
+                    header, items, _ = merged[order_id]
+                    merged[order_id] = (header, items, removed_at)
+
+        if since_version is not None:
+            merged = {
+                order_id: ticket
+                for order_id, ticket in merged.items()
+                if ticket[2] > since_version
+            }
+
+        return sorted(
+            merged.values(),
+            key=lambda ticket: (ticket[0].get("created_at") or "", ticket[0].get("order_id") or 0)
+        )
+
+    @staticmethod
+    def _render(header: Dict[str, Any], items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Jegy get_active_items formátumban (tételek azonosító szerint rendezve)."""
+        return {**header, "items": sorted(items, key=lambda item: item["id"])}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Tábla statisztikák (monitoringhoz).
+
+        Returns:
+            dict: version, stations, tickets, hydrations, applied_events
+        """
+        with self._lock:
+            return {
+                "loaded": self._hydrated_at is not None,
+                "version": self._version,
+                "stations": {
+                    station: len(board.tickets) for station, board in self._stations.items()
+                },
+                "hydrations": self._hydrations,
+                "applied_events": self._applied,
+            }
+
+
+# Singleton instance (folyamatonként egy), a KDS event bus-ra kötve
+kds_board = KDSBoard(
+    loader=lambda db: KDSService.get_active_items(db=db),
+    resync_seconds=settings.kds_board_resync_seconds
+)
+kds_event_bus.add_listener(kds_board.apply_event)
@@ -0,0 +1,253 @@
+"""
+KDS Event Bus - Push-based Kitchen Display feed
+Module 1: Rendeléskezelés és Asztalok / Epic B: Konyha/KDS
+
+Folyamaton belüli publish/subscribe busz a KDS képernyők számára.
+A tétel írási útvonalak (OrderItemService, KDSService) a commit után
+tétel-szintű delta eseményt publikálnak; a /kds/stream SSE végpont
+állomásonként (kds_station) feliratkozik és továbbítja az eseményeket.
+
+Esemény formátum:
+    {
+        "type": "item_upserted" | "item_removed",
+        "station": "KONYHA",
+        "order_id": 12,
+        "order": {"order_id": 12, "table_id": 5, ... },   # get_active_items fejléc
+        "item": {OrderItemResponse JSON}
+    }
+
+Megjegyzés:
+    A busz folyamaton belüli; több uvicorn worker esetén minden worker
+    csak a saját írásait látja. A KDS stream-et kiszolgáló orders
+    példányt egy workerrel kell futtatni (vagy egy külső brokerre cserélni).
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.service_orders.models.order_item import OrderItem, KDSStatus
+from backend.service_orders.schemas.order_item import OrderItemResponse
+
+logger = logging.getLogger(__name__)
+
+
+# Esemény típusok
+ITEM_UPSERTED = "item_upserted"
+ITEM_REMOVED = "item_removed"
+
+
+@dataclass(eq=False)
+class KDSSubscription:
+    """
+    Egy SSE kliens feliratkozása.
+
+    Attributes:
+        station: Figyelt KDS állomás (None = minden állomás)
+        queue: Az eseményeket fogadó asyncio.Queue
+        loop: A feliratkozó event loop-ja (thread-safe publikáláshoz)
+        overflowed: True, ha a sor megtelt és a kliensnek új snapshot kell
+    """
+
+    station: Optional[str]
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    overflowed: bool = field(default=False)
+
+    def matches(self, stations: List[Optional[str]]) -> bool:
+        """True, ha az esemény érinti a figyelt állomást."""
+        return self.station is None or self.station in stations
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Esemény sorba helyezése (csak a saját event loop-ból hívható)."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class KDSEventBus:
+    """
+    Szálbiztos publish/subscribe busz KDS delta eseményekhez.
+
+    A szinkron (threadpool-ban futó) végpontok a publish()-t hívják,
+    az aszinkron SSE végpontok a subscribe()/unsubscribe() párost.
+    """
+
+    def __init__(self, queue_size: int = 1000):
+        """
+        Args:
+            queue_size: Feliratkozónkénti maximális várakozó eseményszám
+        """
+        self.queue_size = queue_size
+        self._subscriptions: List[KDSSubscription] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._published = 0
+
+    def subscribe(self, station: Optional[str] = None) -> KDSSubscription:
+        """
+        Feliratkozás egy állomás eseményeire (az event loop-ból hívandó).
+
+        Args:
+            station: KDS állomás (None = minden állomás)
+
+        Returns:
+            KDSSubscription: A feliratkozás (unsubscribe()-hoz szükséges)
+        """
+        subscription = KDSSubscription(
+            station=station,
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            loop=asyncio.get_running_loop(),
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Szinkron listener regisztrálása (pl. a memóriában tartott KDS tábla).
+
+        A listener a publish()-t hívó szálon, minden eseményre lefut.
+
+        Args:
+            listener: Eseményt fogadó függvény
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, subscription: KDSSubscription) -> None:
+        """
+        Feliratkozás megszüntetése.
+
+        Args:
+            subscription: A subscribe() által visszaadott feliratkozás
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, event: Dict[str, Any], stations: List[Optional[str]]) -> None:
+        """
+        Esemény továbbítása az érintett állomások feliratkozóinak.
+
+        Bármely szálból hívható.
+
+        Args:
+            event: JSON-szerializálható esemény
+            stations: Érintett állomások (állomásváltásnál a régi és az új)
+        """
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.matches(stations)]
+            listeners = list(self._listeners)
+            self._published += 1
+
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"KDS event listener failed: {e}")
+
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # A kliens event loop-ja már leállt
+                self.unsubscribe(subscription)
+
+    def publish_item_change(
+        self,
+        order_item: OrderItem,
+        previous_station: Optional[str] = None,
+        removed: bool = False
+    ) -> None:
+        """
+        Tétel változás publikálása (commit után hívandó).
+
+        A SERVED státuszú vagy törölt tétel "item_removed" eseményt kap,
+        minden más változás "item_upserted"-et.
+
+        Args:
+            order_item: A változott (frissített) OrderItem
+            previous_station: Korábbi állomás, ha a tétel állomást váltott
+            removed: True, ha a tétel törlésre került
+        """
+        try:
+            event = self.build_item_event(order_item, removed=removed)
+        except Exception as e:
+            # A push feed hibája nem akaszthatja meg az írási útvonalat
+            logger.warning(f"KDS event build failed for item {order_item.id}: {e}")
+            return
+
+        if previous_station is not None and previous_station != order_item.kds_station:
+            # A régi állomásról eltűnik a tétel
+            self.publish(
+                {**event, "type": ITEM_REMOVED, "station": previous_station},
+                [previous_station]
+            )
+
+        self.publish(event, [order_item.kds_station])
+
+    @staticmethod
+    def build_item_event(order_item: OrderItem, removed: bool = False) -> Dict[str, Any]:
+        """
+        Delta esemény összeállítása egy tételből.
+
+        Args:
+            order_item: OrderItem (az order kapcsolat lazy betöltődik)
+            removed: True, ha a tétel törlésre került
+
+        Returns:
+            dict: JSON-szerializálható esemény
+        """
+        is_active = not removed and order_item.kds_status != KDSStatus.SERVED
+        order = order_item.order
+
+        return {
+            "type": ITEM_UPSERTED if is_active else ITEM_REMOVED,
+            "station": order_item.kds_station,
+            "order_id": order_item.order_id,
+            "order": build_order_header(order) if order is not None else None,
+            "item": jsonable_encoder(OrderItemResponse.model_validate(order_item)),
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Busz statisztikák (monitoringhoz).
+
+        Returns:
+            dict: subscribers, published
+        """
+        with self._lock:
+            return {
+                "subscribers": len(self._subscriptions),
+                "published": self._published,
+            }
+
+
+def build_order_header(order) -> Dict[str, Any]:
+    """
+    KDS rendelés-fejléc (ugyanaz a struktúra, mint a get_active_items csoportjaié).
+
+    Args:
+        order: Order objektum
+
+    Returns:
+        dict: order_id, table_id, table_number, order_type, order_status, created_at
+    """
+    return {
+        "order_id": order.id,
+        "table_id": order.table_id,
+        "table_number": f"T{order.table_id}" if order.table_id else None,
+        "order_type": order.order_type,
+        "order_status": order.status,
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+    }
+
+
+# Singleton instance (folyamatonként egy)
+kds_event_bus = KDSEventBus()
@@ -16,6 +16,7 @@ from backend.service_orders.models.order_item import OrderItem, KDSStatus
 from backend.service_orders.models.order import Order
 from backend.service_orders.schemas.order_item import OrderItemResponse, KDSStatusEnum
 from backend.service_orders.schemas.order import OrderStatusEnum
+from backend.service_orders.services.kds_event_bus import kds_event_bus, build_order_header
 
 
 class KDSService:
@@ -78,12 +79,7 @@ class KDSService:
                 order = item.order
                 if order.id not in orders_dict:
                     orders_dict[order.id] = {
-                        "order_id": order.id,
-                        "table_id": order.table_id,
-                        "table_number": f"T{order.table_id}" if order.table_id else None,
-                        "order_type": order.order_type,
-                        "order_status": order.status,
-                        "created_at": order.created_at.isoformat() if order.created_at else None,
+                        **build_order_header(order),
                         "items": []
                     }
 
@@ -156,6 +152,9 @@ class KDSService:
             db.commit()
             db.refresh(order_item)
 
+            # KDS push feed értesítése
+            kds_event_bus.publish_item_change(order_item)
+
             return OrderItemResponse.model_validate(order_item)
 
         except ValueError as e:
@@ -238,6 +237,9 @@ class KDSService:
             db.commit()
             db.refresh(order_item)
 
+            # KDS push feed értesítése
+            kds_event_bus.publish_item_change(order_item)
+
             return OrderItemResponse.model_validate(order_item)
 
         except SQLAlchemyError as e:
@@ -7,10 +7,11 @@ Támogatja a CRUD műveleteket, a selected_modifiers JSONB mező
 helyes kezelését, valamint a KDS (Kitchen Display System) integrációt.
 """
 
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from backend.service_orders.models.order import Order
 from backend.service_orders.models.order_item import OrderItem, KDSStatus
 from backend.service_orders.schemas.order_item import (
     OrderItemCreate,
@@ -19,6 +20,14 @@ from backend.service_orders.schemas.order_item import (
     SelectedModifierSchema,
     KDSStatusEnum
 )
+from backend.service_orders.services.kds_event_bus import kds_event_bus
+from backend.service_orders.services.sales_rollup_service import (
+    SalesRollupService,
+    ROLLUP_ORDER_STATUS
+)
+
+# Tétel mezők, amelyek egy lezárt rendelés napi termék összesítőit érintik
+ROLLUP_ITEM_FIELDS = frozenset({'order_id', 'product_id', 'quantity', 'unit_price'})
 
 
 class OrderItemService:
@@ -33,6 +42,29 @@ class OrderItemService:
     - Selected modifiers JSONB kezelése
     """
 
+    @staticmethod
+    def _closed_orders(db: Session, order_ids: Iterable[Optional[int]]) -> List[Order]:
+        """
+        A megadott rendelések közül a lezártak (ezek szerepelnek a napi összesítőkben).
+
+        Lezárt rendelés tételének módosításakor a rendelést a módosítás előtt
+        levonjuk az összesítőkből, utána újra hozzáadjuk.
+
+        Args:
+            db: SQLAlchemy database session
+            order_ids: Rendelés azonosítók (None elemek kihagyva)
+
+        Returns:
+            List[Order]: A lezárt rendelések azonosító szerint rendezve
+        """
+        unique_ids = sorted({order_id for order_id in order_ids if order_id is not None})
+        if not unique_ids:
+            return []
+        return db.query(Order).filter(
+            Order.id.in_(unique_ids),
+            Order.status == ROLLUP_ORDER_STATUS
+        ).order_by(Order.id).all()
+
     @staticmethod
     def add_item_to_order(
         db: Session,
@@ -85,11 +117,22 @@ class OrderItemService:
                 kds_status=kds_status_value
             )
 
+            # Lezárt rendelés: napi összesítők frissítése ugyanabban a tranzakcióban
+            closed_orders = OrderItemService._closed_orders(db, [new_order_item.order_id])
+            for order in closed_orders:
+                SalesRollupService.revert_order_closed(db, order)
+
             # Adatbázisba mentés
             db.add(new_order_item)
+            db.flush()
+            for order in closed_orders:
+                SalesRollupService.apply_order_closed(db, order)
             db.commit()
             db.refresh(new_order_item)
 
+            # KDS push feed értesítése
+            kds_event_bus.publish_item_change(new_order_item)
+
             return OrderItemResponse.model_validate(new_order_item)
 
         except SQLAlchemyError as e:
@@ -182,6 +225,8 @@ class OrderItemService:
             if not order_item:
                 return None
 
+            previous_station = order_item.kds_station
+
             # Csak a megadott mezők frissítése
             update_dict = update_data.model_dump(exclude_unset=True)
 
@@ -191,14 +236,29 @@ class OrderItemService:
                     modifier.model_dump() for modifier in update_data.selected_modifiers
                 ]
 
+            # Lezárt rendelés (régi és új): napi összesítők frissítése ugyanabban a tranzakcióban
+            closed_orders = []
+            if not ROLLUP_ITEM_FIELDS.isdisjoint(update_dict):
+                closed_orders = OrderItemService._closed_orders(
+                    db, [order_item.order_id, update_dict.get('order_id')]
+                )
+            for order in closed_orders:
+                SalesRollupService.revert_order_closed(db, order)
+
             # Mezők frissítése
             for field, value in update_dict.items():
                 setattr(order_item, field, value)
 
             # Adatbázisba mentés
+            db.flush()
+            for order in closed_orders:
+                SalesRollupService.apply_order_closed(db, order)
             db.commit()
             db.refresh(order_item)
 
+            # KDS push feed értesítése (állomásváltásnál a régi állomás is)
+            kds_event_bus.publish_item_change(order_item, previous_station=previous_station)
+
             return OrderItemResponse.model_validate(order_item)
 
         except SQLAlchemyError as e:
@@ -232,10 +292,23 @@ class OrderItemService:
             if not order_item:
                 return False
 
+            # KDS esemény a törlés előtt (utána a tétel már nem olvasható)
+            removed_event = kds_event_bus.build_item_event(order_item, removed=True)
+
+            # Lezárt rendelés: napi összesítők frissítése ugyanabban a tranzakcióban
+            closed_orders = OrderItemService._closed_orders(db, [order_item.order_id])
+            for order in closed_orders:
+                SalesRollupService.revert_order_closed(db, order)
+
             # Tétel törlése
             db.delete(order_item)
+            db.flush()
+            for order in closed_orders:
+                SalesRollupService.apply_order_closed(db, order)
             db.commit()
 
+            kds_event_bus.publish(removed_event, [removed_event["station"]])
+
             return True
 
         except SQLAlchemyError as e:
@@ -352,6 +425,8 @@ class OrderItemService:
             db.commit()
             db.refresh(order_item)
 
+            kds_event_bus.publish_item_change(order_item)
+
             return OrderItemResponse.model_validate(order_item)
 
         except SQLAlchemyError as e:
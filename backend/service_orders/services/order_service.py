@@ -16,7 +16,7 @@ from decimal import Decimal
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, tuple_
 from fastapi import HTTPException, status
 import httpx
 import logging
@@ -30,11 +30,26 @@ from backend.service_orders.schemas.order import (
 )
 # TODO: Sprint 1 - Use shared domain enums
 from backend.core_domain.enums import OrderStatus, OrderType
+from backend.core_domain.pagination import InvalidCursorError, decode_cursor
 
+from backend.core_http import get_sync_client
 from backend.service_orders.config import settings
+from backend.service_orders.services.product_lookup import lookup_product_categories
+from backend.service_orders.services.sales_rollup_service import SalesRollupService, sale_date_of
+from backend.service_orders.services.outbox_service import (
+    OutboxService,
+    outbox_dispatcher,
+    NTAK_REPORT_ORDER,
+    INVENTORY_DEDUCT_STOCK
+)
 
 logger = logging.getLogger(__name__)
 
+# Rendelés mezők, amelyek egy lezárt rendelés napi összesítő sorait érintik
+ROLLUP_ORDER_FIELDS = frozenset({'status', 'total_amount', 'order_type'})
+# ... és a nap materializált pénztárzárás számait (ÁFA bontás is)
+CLOSURE_ORDER_FIELDS = ROLLUP_ORDER_FIELDS | {'final_vat_rate'}
+
 # Circular import elkerülése: TYPE_CHECKING használata
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -138,6 +153,22 @@ class OrderService:
 
         return order
 
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """
+        Lapozási kurzor dekódolása (created_at, id).
+
+        Raises:
+            HTTPException 400: Ha a kurzor hibás
+        """
+        try:
+            return decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
     @staticmethod
     def get_orders(
         db: Session,
@@ -145,11 +176,16 @@ class OrderService:
         limit: int = 100,
         order_type: Optional[str] = None,
         status: Optional[str] = None,
-        table_id: Optional[int] = None
+        table_id: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> List[Order]:
         """
         Rendelések listájának lekérdezése szűrési lehetőségekkel.
 
+        Lapozás: `cursor` megadásakor keyset (created_at, id) szerint folytat
+        (a skip figyelmen kívül marad), így a mély oldalak is index szerint
+        olvashatók; kurzor nélkül offset alapú.
+
         Args:
             db: SQLAlchemy session
             skip: Kihagyandó elemek száma (pagination)
@@ -157,9 +193,13 @@ class OrderService:
             order_type: Szűrés rendelés típusra (pl. 'Helyben')
             status: Szűrés státuszra (pl. 'NYITOTT')
             table_id: Szűrés asztal ID-ra
+            cursor: Az előző oldal next_cursor értéke (opcionális)
 
         Returns:
-            List[Order]: Rendelések listája
+            List[Order]: Rendelések listája (legutóbbi először)
+
+        Raises:
+            HTTPException 400: Ha a kurzor hibás
 
         Example:
             >>> orders = OrderService.get_orders(
@@ -180,11 +220,17 @@ class OrderService:
         if table_id:
             query = query.filter(Order.table_id == table_id)
 
-        # Rendezés: legutóbbi először
-        query = query.order_by(desc(Order.created_at))
+        # Rendezés: legutóbbi először (id a holtversenyre, stabil keyset kulcs)
+        query = query.order_by(desc(Order.created_at), desc(Order.id))
+
+        # Pagination: keyset, ha van kurzor, egyébként offset
+        if cursor:
+            cursor_created_at, cursor_id = OrderService._decode_cursor(cursor)
+            query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(cursor_created_at, cursor_id))
+        else:
+            query = query.offset(skip)
 
-        # Pagination
-        orders = query.offset(skip).limit(limit).all()
+        orders = query.limit(limit).all()
 
         return orders
 
@@ -197,6 +243,11 @@ class OrderService:
         """
         Rendelés módosítása.
 
+        Lezárt rendelés státusz / összeg / típus módosításakor a napi
+        összesítők ugyanabban a tranzakcióban frissülnek; a LEZART-ra
+        állított rendelés bekerül az összesítőkbe. Ezek és az ÁFA kulcs
+        módosítása a nap pénztárzárás számait elavulttá teszik.
+
         Args:
             db: SQLAlchemy session
             order_id: A módosítandó rendelés azonosítója
@@ -220,6 +271,14 @@ class OrderService:
             # Csak a megadott mezők frissítése (exclude_unset=True)
             update_dict = order_data.model_dump(exclude_unset=True)
 
+            # Napi összesítők / pénztárzárás: a lezárt rendelés régi értékeit
+            # levonjuk, a módosítás után (ha lezárt maradt / lett) újra hozzáadjuk
+            affects_rollup = not ROLLUP_ORDER_FIELDS.isdisjoint(update_dict)
+            was_closed = order.status == OrderStatusEnum.LEZART.value
+            if affects_rollup and was_closed:
+                SalesRollupService.revert_order_closed(db, order)
+            previous_order_type = order.order_type
+
             for field, value in update_dict.items():
                 # Enum értékek kezelése
                 if hasattr(value, 'value'):
@@ -227,6 +286,21 @@ class OrderService:
                 else:
                     setattr(order, field, value)
 
+            if affects_rollup and order.status == OrderStatusEnum.LEZART.value:
+                SalesRollupService.apply_order_closed(db, order)
+
+            # A nap pénztárzárás számai csak a lezárt rendelésekből számolnak:
+            # ha egy lezárt (vagy most lezárt) rendelés számai változnak, elavulnak
+            closed = was_closed or order.status == OrderStatusEnum.LEZART.value
+            if closed and not CLOSURE_ORDER_FIELDS.isdisjoint(update_dict):
+                SalesRollupService.invalidate_closure_figures(db, sale_date_of(order.created_at))
+
+            # A fizetések a rendelés típusával kulcsolva szerepelnek az összesítőben
+            if order.order_type != previous_order_type:
+                for payment in order.payments:
+                    SalesRollupService.revert_payment(db, payment, previous_order_type, order.created_at)
+                    SalesRollupService.apply_payment(db, payment, order.order_type, order.created_at)
+
             db.commit()
             db.refresh(order)
 
@@ -244,6 +318,9 @@ class OrderService:
         """
         Rendelés törlése.
 
+        A lezárt rendelés és a fizetései ugyanabban a tranzakcióban
+        kikerülnek a napi összesítőkből (a nap pénztárzárás számai elavulnak).
+
         Args:
             db: SQLAlchemy session
             order_id: A törlendő rendelés azonosítója
@@ -264,6 +341,13 @@ class OrderService:
         order = OrderService.get_order(db, order_id)
 
         try:
+            # Napi összesítők / pénztárzárás: a rendelés és a vele törlődő
+            # fizetések levonása ugyanabban a tranzakcióban
+            if order.status == OrderStatusEnum.LEZART.value:
+                SalesRollupService.revert_order_closed(db, order)
+            for payment in order.payments:
+                SalesRollupService.revert_payment(db, payment, order.order_type, order.created_at)
+
             db.delete(order)
             db.commit()
 
@@ -402,6 +486,9 @@ class OrderService:
         - NTAK adatszolgáltatás küldése
         - Készlet levonás (inventory deduction)
 
+        Ezek outbox eseményként, a lezárással azonos commit-ban kerülnek
+        rögzítésre, és a háttérben kézbesülnek (at-least-once).
+
         Args:
             db: SQLAlchemy session
             order_id: A lezárandó rendelés azonosítója
@@ -438,42 +525,40 @@ class OrderService:
             )
 
         try:
+            already_closed = order.status == OrderStatusEnum.LEZART.value
+
             # Státusz átállítása LEZART-ra
             order.status = OrderStatusEnum.LEZART.value
 
+            # Napi forgalmi összesítők (riportok) - ugyanabban a tranzakcióban,
+            # ismételt lezárásnál nem számoljuk kétszer
+            if not already_closed:
+                SalesRollupService.apply_order_closed(db, order)
+
+            # NTAK adatszolgáltatás és készletlevonás: outbox sorok ugyanabban
+            # a tranzakcióban; a kézbesítést a háttér dispatcher végzi
+            # (újrapróbálással), így a lezárás nem vár a többi szolgáltatásra
+            OutboxService.enqueue(db, NTAK_REPORT_ORDER, order_id)
+
+            # A tételek a payload-ban utaznak, így az inventory nem hív vissza
+            from backend.service_orders.models.order_item import OrderItem
+            deduction_items = [
+                {"id": row.id, "product_id": row.product_id, "quantity": row.quantity}
+                for row in db.query(
+                    OrderItem.id, OrderItem.product_id, OrderItem.quantity
+                ).filter(OrderItem.order_id == order_id)
+            ]
+            OutboxService.enqueue(
+                db,
+                INVENTORY_DEDUCT_STOCK,
+                order_id,
+                payload={"order_id": order_id, "items": deduction_items}
+            )
+
             db.commit()
             db.refresh(order)
 
-            # Trigger NTAK adatszolgáltatás küldése (graceful failure)
-            try:
-                with httpx.Client() as client:
-                    ntak_url = f"{settings.admin_service_url}/internal/report-order/{order_id}"
-                    client.post(ntak_url, timeout=5.0)
-                    logger.info(f"NTAK trigger sent for order {order_id}")
-            except Exception as e:
-                # Graceful failure: log but don't block order closure
-                # V3.0 Fázis 5: Robusztus hibakezelés (minden Exception típus)
-                logger.warning(f"Failed to trigger NTAK for order {order_id}: {str(e)}")
-
-            # Trigger inventory deduction (graceful failure)
-            # V3.0/F3.A: Real implementation of stock deduction via service_inventory
-            try:
-                with httpx.Client() as client:
-                    inventory_url = f"{settings.inventory_service_url}/api/v1/inventory/internal/deduct-stock"
-                    payload = {"order_id": order_id}
-                    response = client.post(inventory_url, json=payload, timeout=5.0)
-                    logger.info(f"Inventory deduction triggered for order {order_id}: {response.status_code}")
-                    if response.status_code == 200:
-                        result = response.json()
-                        logger.info(
-                            f"Stock deduction result: {result.get('items_processed', 0)} items processed, "
-                            f"{len(result.get('ingredients_deducted', []))} ingredients deducted"
-                        )
-            except Exception as e:
-                # Graceful failure: log but don't block order closure
-                # V3.0 Fázis 5: Robusztus hibakezelés (minden Exception típus)
-                # Catches all possible errors: httpx.HTTPError, DNS, JSON, Timeout, Connection, etc.
-                logger.warning(f"Failed to trigger inventory deduction for order {order_id}: {str(e)}")
+            outbox_dispatcher.notify()
 
             return order
 
@@ -559,47 +644,28 @@ class OrderService:
         # Ellenőrizni kell, hogy a rendelés tartalmaz-e Ital vagy Fagyi kategóriájú terméket
         # V3.0 terv 4.4-es szabály: Ital/Fagyi kategóriájú termékek esetén tilos az átültetés
         try:
-            # Order items lekérdezése
+            # Order items termék ID-i (tételenként egyszer elég ellenőrizni)
             from backend.service_orders.models.order_item import OrderItem
-            order_items = db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
-
-            # Minden termék kategóriájának ellenőrzése
-            for item in order_items:
-                product_id = item.product_id
-
-                # HTTP GET hívás a service_menu felé: termék lekérdezése
-                with httpx.Client() as client:
-                    product_url = f"{settings.menu_service_url}/api/menu/products/{product_id}"
-                    product_response = client.get(product_url, timeout=5.0)
-
-                    if product_response.status_code == 200:
-                        product_data = product_response.json()
-                        category_id = product_data.get("category_id")
-
-                        if category_id:
-                            # HTTP GET hívás a service_menu felé: kategória lekérdezése
-                            category_url = f"{settings.menu_service_url}/api/menu/categories/{category_id}"
-                            category_response = client.get(category_url, timeout=5.0)
-
-                            if category_response.status_code == 200:
-                                category_data = category_response.json()
-                                category_name = category_data.get("name")
-
-                                # V3.0 terv 4.4-es szabály: Ital/Fagyi kategória tiltása
-                                if category_name in ["Ital", "Fagyi"]:
-                                    raise HTTPException(
-                                        status_code=status.HTTP_400_BAD_REQUEST,
-                                        detail=f"A rendelés típusa nem módosítható, mert tartalmaz '{category_name}' kategóriájú terméket. "
-                                               f"Az Ital és Fagyi kategóriájú termékek esetén tilos az átültetés."
-                                    )
-                            else:
-                                logger.warning(
-                                    f"Failed to fetch category {category_id} from service_menu: HTTP {category_response.status_code}"
-                                )
-                    else:
-                        logger.warning(
-                            f"Failed to fetch product {product_id} from service_menu: HTTP {product_response.status_code}"
-                        )
+            product_ids = [
+                row.product_id
+                for row in db.query(OrderItem.product_id).filter(
+                    OrderItem.order_id == order_id
+                ).distinct()
+            ]
+
+            # Kategória nevek: termék katalógus cache, a hiányzókra egyetlen tömeges hívás
+            categories = lookup_product_categories(product_ids)
+
+            for product_id in product_ids:
+                category_name = categories.get(product_id)
+
+                # V3.0 terv 4.4-es szabály: Ital/Fagyi kategória tiltása
+                if category_name in ["Ital", "Fagyi"]:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"A rendelés típusa nem módosítható, mert tartalmaz '{category_name}' kategóriájú terméket. "
+                               f"Az Ital és Fagyi kategóriájú termékek esetén tilos az átültetés."
+                    )
         except HTTPException:
             # HTTPException-öket tovább dobni (pl. Ital/Fagyi tiltás)
             raise
@@ -642,25 +708,25 @@ class OrderService:
                             f"Checking delivery zone for order {order_id} with ZIP code: {customer_zip_code}"
                         )
                         # Valós HTTP POST hívás a service_logistics felé (ZIP kód alapú keresés)
-                        with httpx.Client() as client:
-                            logistics_url = f"{settings.logistics_service_url}/zones/get-by-zip-code"
-                            payload = {"zip_code": customer_zip_code}
-                            response = client.post(logistics_url, json=payload, timeout=5.0)
-
-                            if response.status_code == 200:
-                                zone_data = response.json()
-                                if zone_data.get("zone"):
-                                    logger.info(
-                                        f"Delivery zone found for order {order_id}: {zone_data['zone']['zone_name']}"
-                                    )
-                                else:
-                                    logger.warning(
-                                        f"No delivery zone found for ZIP code {customer_zip_code} for order {order_id}"
-                                    )
+                        client = get_sync_client("logistics")
+                        logistics_url = f"{settings.logistics_service_url}/zones/get-by-zip-code"
+                        payload = {"zip_code": customer_zip_code}
+                        response = client.post(logistics_url, json=payload, timeout=5.0)
+
+                        if response.status_code == 200:
+                            zone_data = response.json()
+                            if zone_data.get("zone"):
+                                logger.info(
+                                    f"Delivery zone found for order {order_id}: {zone_data['zone']['zone_name']}"
+                                )
                             else:
                                 logger.warning(
-                                    f"Failed to check delivery zone for order {order_id}: HTTP {response.status_code}"
+                                    f"No delivery zone found for ZIP code {customer_zip_code} for order {order_id}"
                                 )
+                        else:
+                            logger.warning(
+                                f"Failed to check delivery zone for order {order_id}: HTTP {response.status_code}"
+                            )
                     else:
                         logger.warning(
                             f"Order {order_id} changed to Kiszállítás but no ZIP code provided"
@@ -771,21 +837,21 @@ class OrderService:
                     f"Updating courier status for courier {courier_id} to ON_DELIVERY"
                 )
 
-                with httpx.Client() as client:
-                    # PATCH /api/v1/couriers/{courier_id}/status?new_status=on_delivery
-                    logistics_url = f"{settings.logistics_service_url}/couriers/{courier_id}/status"
-                    params = {"new_status": "on_delivery"}
-                    response = client.patch(logistics_url, params=params, timeout=5.0)
+                client = get_sync_client("logistics")
+                # PATCH /api/v1/couriers/{courier_id}/status?new_status=on_delivery
+                logistics_url = f"{settings.logistics_service_url}/couriers/{courier_id}/status"
+                params = {"new_status": "on_delivery"}
+                response = client.patch(logistics_url, params=params, timeout=5.0)
 
-                    if response.status_code == 200:
-                        logger.info(
-                            f"Courier {courier_id} status updated to ON_DELIVERY successfully"
-                        )
-                    else:
-                        logger.warning(
-                            f"Failed to update courier status: HTTP {response.status_code}. "
-                            f"Proceeding with assignment anyway."
-                        )
+                if response.status_code == 200:
+                    logger.info(
+                        f"Courier {courier_id} status updated to ON_DELIVERY successfully"
+                    )
+                else:
+                    logger.warning(
+                        f"Failed to update courier status: HTTP {response.status_code}. "
+                        f"Proceeding with assignment anyway."
+                    )
             except httpx.HTTPError as e:
                 # Graceful failure: log but don't block courier assignment
                 logger.warning(f"Failed to update courier status for courier {courier_id}: {str(e)}")
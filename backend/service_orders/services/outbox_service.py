@@ -0,0 +1,405 @@
+"""
+Outbox Service - Transactional Outbox & Background Dispatcher
+Module 1: Rendeléskezelés és Asztalok
+
+A rendelés lezárásának mellékhatásai (NTAK jelentés, készletlevonás)
+korábban a kérés szálában, szinkron httpx hívásokkal futottak (5-5 mp
+timeout), így egy lassú inventory szolgáltatás közvetlenül lassította
+a fizetést/lezárást.
+
+Működés:
+1. OutboxService.enqueue() az üzleti változással AZONOS tranzakcióban
+   ír egy outbox_events sort (a commit a hívó feladata)
+2. Az OutboxDispatcher háttér-task a due sorokat lefoglalja
+   (FOR UPDATE SKIP LOCKED + lease), elküldi őket, majd rögzíti az eredményt
+3. Hiba esetén exponenciális backoff, max próbálkozás után FAILED
+4. Minden kérés Idempotency-Key headert visz; a fogadó oldalak
+   ez alapján / saját adataik alapján szűrik a duplikátumokat
+
+Kézbesítési garancia: at-least-once (lease lejárta után újrapróbálás).
+"""
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.core_http import get_async_client
+from backend.service_orders.config import settings
+from backend.service_orders.models.database import SessionLocal
+from backend.service_orders.models.outbox_event import OutboxEvent, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Esemény típusok
+# ============================================================================
+
+NTAK_REPORT_ORDER = "ntak.report_order"
+INVENTORY_DEDUCT_STOCK = "inventory.deduct_stock"
+
+
+def _build_request(
+    event_type: str,
+    aggregate_id: int,
+    payload: Optional[Dict[str, Any]]
+) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    """
+    Esemény típus -> (célszolgáltatás, URL, JSON body) leképezés.
+
+    Args:
+        event_type: Outbox esemény típusa
+        aggregate_id: Érintett entitás azonosítója (order_id)
+        payload: Tárolt payload
+
+    Returns:
+        tuple: (target, url, json body vagy None)
+
+    Raises:
+        ValueError: Ismeretlen esemény típus esetén
+    """
+    if event_type == NTAK_REPORT_ORDER:
+        return "admin", f"{settings.admin_service_url}/internal/report-order/{aggregate_id}", None
+    if event_type == INVENTORY_DEDUCT_STOCK:
+        return (
+            "inventory",
+            f"{settings.inventory_service_url}/api/v1/inventory/internal/deduct-stock",
+            payload or {"order_id": aggregate_id}
+        )
+    raise ValueError(f"Unknown outbox event type: {event_type}")
+
+
+def _utcnow() -> datetime:
+    """Aktuális időpont (UTC, timezone-aware)."""
+    return datetime.now(timezone.utc)
+
+
+class OutboxService:
+    """
+    Outbox sorok kezelése (írás, lefoglalás, eredmény rögzítése).
+    """
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        event_type: str,
+        aggregate_id: int,
+        payload: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Optional[OutboxEvent]:
+        """
+        Outbox esemény felvétele a hívó tranzakciójába (commit NÉLKÜL).
+
+        Ha az idempotencia kulcs már létezik (pl. ismételt lezárás),
+        nem jön létre új sor.
+
+        Args:
+            db: Database session (a hívó tranzakciója)
+            event_type: Esemény típusa (pl. NTAK_REPORT_ORDER)
+            aggregate_id: Érintett entitás azonosítója
+            payload: Kézbesítendő adat
+            idempotency_key: Egyedi kulcs (alapértelmezett: "{event_type}:{aggregate_id}")
+
+        Returns:
+            Optional[OutboxEvent]: Az új sor, vagy None ha már létezett
+        """
+        key = idempotency_key or f"{event_type}:{aggregate_id}"
+
+        existing = db.query(OutboxEvent.id).filter(
+            OutboxEvent.idempotency_key == key
+        ).first()
+        if existing:
+            return None
+
+        event = OutboxEvent(
+            event_type=event_type,
+            aggregate_id=aggregate_id,
+            payload=payload,
+            idempotency_key=key,
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=_utcnow()
+        )
+        db.add(event)
+        return event
+
+    @staticmethod
+    def claim_due(db: Session, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        """
+        Esedékes események lefoglalása kézbesítésre.
+
+        A sorokat FOR UPDATE SKIP LOCKED zárral olvassa (több worker /
+        példány párhuzamosan is futhat), a next_attempt_at-ot a lease
+        idejére előre tolja és commitol. Ha a kézbesítő a lease alatt
+        leáll, a sor a lease lejárta után újra esedékes lesz.
+
+        Args:
+            db: Database session
+            limit: Maximálisan lefoglalt sorok száma
+            lease_seconds: Lefoglalás időtartama másodpercben
+
+        Returns:
+            List[dict]: Lefoglalt események (id, event_type, aggregate_id, payload, idempotency_key, attempts)
+        """
+        now = _utcnow()
+        rows = db.query(OutboxEvent).filter(
+            OutboxEvent.status == OutboxStatus.PENDING,
+            OutboxEvent.next_attempt_at <= now
+        ).order_by(
+            OutboxEvent.next_attempt_at, OutboxEvent.id
+        ).limit(limit).with_for_update(skip_locked=True).all()
+
+        claimed = []
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=lease_seconds)
+            claimed.append({
+                "id": row.id,
+                "event_type": row.event_type,
+                "aggregate_id": row.aggregate_id,
+                "payload": row.payload,
+                "idempotency_key": row.idempotency_key,
+                "attempts": row.attempts,
+            })
+
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def record_results(db: Session, results: List[Dict[str, Any]]) -> None:
+        """
+        Kézbesítési eredmények rögzítése egy tranzakcióban.
+
+        Args:
+            db: Database session
+            results: [{"id", "success", "retryable", "error"}, ...]
+        """
+        if not results:
+            return
+
+        now = _utcnow()
+        events = {
+            event.id: event
+            for event in db.query(OutboxEvent).filter(
+                OutboxEvent.id.in_([result["id"] for result in results])
+            ).all()
+        }
+
+        for result in results:
+            event = events.get(result["id"])
+            if event is None:
+                continue
+
+            if result["success"]:
+                event.status = OutboxStatus.SENT
+                event.sent_at = now
+                event.last_error = None
+            elif not result["retryable"] or event.attempts >= settings.outbox_max_attempts:
+                event.status = OutboxStatus.FAILED
+                event.last_error = result["error"]
+                logger.error(
+                    f"Outbox event {event.id} ({event.event_type}, aggregate {event.aggregate_id}) "
+                    f"failed permanently after {event.attempts} attempts: {result['error']}"
+                )
+            else:
+                event.next_attempt_at = now + timedelta(
+                    seconds=OutboxService.backoff_seconds(event.attempts)
+                )
+                event.last_error = result["error"]
+
+        db.commit()
+
+    @staticmethod
+    def backoff_seconds(attempts: int) -> float:
+        """
+        Exponenciális backoff jitterrel.
+
+        Args:
+            attempts: Eddigi próbálkozások száma (>= 1)
+
+        Returns:
+            float: Várakozás másodpercben
+        """
+        delay = min(
+            settings.outbox_backoff_base_seconds * (2 ** max(attempts - 1, 0)),
+            settings.outbox_backoff_max_seconds
+        )
+        return delay * random.uniform(0.8, 1.2)
+
+
+# ============================================================================
+# Background Dispatcher
+# ============================================================================
+
+
+class OutboxDispatcher:
+    """
+    Háttérben futó outbox kézbesítő (asyncio task az orders szolgáltatásban).
+
+    A DB műveletek threadpool-ban futnak (szinkron SQLAlchemy session),
+    a HTTP hívások a megosztott, poolozott core_http klienseken, párhuzamosan.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._sent = 0
+        self._failed_attempts = 0
+
+    async def start(self) -> None:
+        """Dispatcher indítása (startup eseményből)."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Outbox dispatcher started")
+
+    async def stop(self) -> None:
+        """Dispatcher leállítása (shutdown eseményből)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Outbox dispatcher stopped")
+
+    def notify(self) -> None:
+        """
+        Azonnali kézbesítési kör kérése (bármely szálból hívható, commit után).
+
+        Nélküle is kézbesül az esemény a következő poll körben.
+        """
+        if self._loop is None or self._wakeup is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Az event loop már leállt
+            pass
+
+    async def _run(self) -> None:
+        """Fő ciklus: kézbesítés, majd várakozás (poll intervallum vagy notify)."""
+        while True:
+            try:
+                delivered = await self.dispatch_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox dispatch cycle failed: {e}")
+                delivered = 0
+
+            # Teli batch után azonnal folytatjuk (backlog feldolgozás)
+            if delivered >= settings.outbox_batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=settings.outbox_poll_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_once(self) -> int:
+        """
+        Egy kézbesítési kör: lefoglalás, küldés, eredmény rögzítés.
+
+        Returns:
+            int: A körben feldolgozott események száma
+        """
+        claimed = await asyncio.to_thread(self._claim)
+        if not claimed:
+            return 0
+
+        results = await asyncio.gather(*(self._deliver(event) for event in claimed))
+        await asyncio.to_thread(self._record, list(results))
+        return len(claimed)
+
+    @staticmethod
+    def _claim() -> List[Dict[str, Any]]:
+        """Lefoglalás saját, rövid életű session-nel (threadpool-ban fut)."""
+        db = SessionLocal()
+        try:
+            return OutboxService.claim_due(
+                db,
+                limit=settings.outbox_batch_size,
+                lease_seconds=settings.outbox_lease_seconds
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def _record(results: List[Dict[str, Any]]) -> None:
+        """Eredmények rögzítése saját session-nel (threadpool-ban fut)."""
+        db = SessionLocal()
+        try:
+            OutboxService.record_results(db, results)
+        finally:
+            db.close()
+
+    async def _deliver(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Egy esemény kézbesítése.
+
+        2xx: siker. 4xx (408/429 kivételével): nem újrapróbálható.
+        5xx / hálózati hiba / timeout: újrapróbálható.
+        """
+        result = {"id": event["id"], "success": False, "retryable": True, "error": None}
+        try:
+            target, url, body = _build_request(event["event_type"], event["aggregate_id"], event["payload"])
+            response = await get_async_client(target).post(
+                url,
+                json=body,
+                headers={"Idempotency-Key": event["idempotency_key"]},
+                timeout=settings.outbox_request_timeout_seconds
+            )
+            if response.is_success:
+                result["success"] = True
+                self._sent += 1
+                logger.info(
+                    f"Outbox event {event['id']} delivered ({event['event_type']}, "
+                    f"aggregate {event['aggregate_id']}): {response.status_code}"
+                )
+                return result
+
+            result["retryable"] = response.status_code >= 500 or response.status_code in (408, 429)
+            result["error"] = f"HTTP {response.status_code}: {response.text[:500]}"
+        except ValueError as e:
+            result["retryable"] = False
+            result["error"] = str(e)
+        except Exception as e:
+            # Hálózati hiba, DNS, timeout, stb.
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        self._failed_attempts += 1
+        logger.warning(
+            f"Outbox event {event['id']} delivery failed (attempt {event['attempts']}): {result['error']}"
+        )
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Dispatcher statisztikák (monitoringhoz).
+
+        Returns:
+            dict: running, sent, failed_attempts
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "sent": self._sent,
+            "failed_attempts": self._failed_attempts,
+        }
+
+
+# Singleton instance (folyamatonként egy)
+outbox_dispatcher = OutboxDispatcher()
@@ -13,7 +13,7 @@ Fázis 4.6: PaymentService implementáció
 
 from decimal import Decimal
 from typing import List, Dict, Any, Optional
-from datetime import date, datetime
+from datetime import date
 from sqlalchemy.orm import Session
 from sqlalchemy import func, cast, Date
 from fastapi import HTTPException, status
@@ -21,6 +21,7 @@ from fastapi import HTTPException, status
 from backend.service_orders.models.payment import Payment
 from backend.service_orders.models.order import Order
 from backend.service_orders.models.order_item import OrderItem
+from backend.service_orders.services.sales_rollup_service import SalesRollupService
 from backend.service_orders.schemas.payment import (
     PaymentCreate,
     PaymentResponse,
@@ -82,6 +83,10 @@ class PaymentService:
             )
 
             db.add(db_payment)
+
+            # Napi forgalmi összesítő (pénztárzárás / riportok) - azonos tranzakció
+            SalesRollupService.apply_payment(db, db_payment, order.order_type, order.created_at)
+
             db.commit()
             db.refresh(db_payment)
 
@@ -315,27 +320,6 @@ class PaymentService:
             >>> summary = PaymentService.get_daily_payment_summary(db, date(2024, 1, 15))
             >>> print(f"Készpénz bevétel: {summary.get('KESZPENZ', 0)} HUF")
         """
-        # Kezdő és záró időpontok meghatározása (teljes nap)
-        start_datetime = datetime.combine(target_date, datetime.min.time())
-        end_datetime = datetime.combine(target_date, datetime.max.time())
-
-        # Fizetések lekérdezése az adott napról, fizetési mód szerint csoportosítva
-        # Csak sikeres fizetéseket veszünk figyelembe
-        results = db.query(
-            Payment.payment_method,
-            func.sum(Payment.amount).label('total')
-        ).filter(
-            Payment.created_at >= start_datetime,
-            Payment.created_at <= end_datetime,
-            Payment.status == 'SIKERES'
-        ).group_by(
-            Payment.payment_method
-        ).all()
-
-        # Eredmények átalakítása dictionary formátumba
-        payment_summary = {}
-        for payment_method, total in results:
-            # Decimalt float-ra konvertálunk a JSON szerializálhatóság miatt
-            payment_summary[payment_method] = float(total) if total else 0.0
-
-        return payment_summary
+        # Az előre aggregált napi összesítőből (daily_sales_rollup) olvasunk,
+        # a nyers payments tábla végigolvasása nélkül
+        return SalesRollupService.get_payment_totals(db, target_date)
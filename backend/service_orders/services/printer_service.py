@@ -21,6 +21,7 @@ from fastapi import HTTPException, status
 from backend.service_orders.models.order import Order
 from backend.service_orders.models.order_item import OrderItem
 from backend.service_orders.models.payment import Payment
+from backend.service_orders.services.product_lookup import product_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -223,7 +224,8 @@ class PrinterService:
         Args:
             db: SQLAlchemy session
             order_id: Rendelés azonosítója
-            products_info: Opcionális termék információk (ha nincs megadva, akkor alapértelmezett neveket használ)
+            products_info: Opcionális termék információk (ha nincs megadva, a termék katalógusból
+                egy tömeges hívással töltődik; hiba esetén alapértelmezett nevek)
 
         Returns:
             Dict: Nyomtatás eredménye (file_path, success, message)
@@ -252,9 +254,13 @@ class PrinterService:
                 Payment.status == "SIKERES"
             ).all()
 
-            # Termék információk alapértelmezett értékekkel (ha nincs megadva)
+            # Termék információk a katalógus cache-ből (ha nincs megadva)
             if products_info is None:
-                products_info = {}
+                try:
+                    products_info = await product_catalog.aget_many(item.product_id for item in items)
+                except Exception as e:
+                    logger.warning(f"Could not resolve product names for receipt {order_id}: {e}")
+                    products_info = {}
 
             # Blokk összeállítása
             receipt_lines = []
@@ -0,0 +1,65 @@
+"""
+Product Lookup - Termék metaadatok a service_menu felől
+Module 1: Rendeléskezelés és Asztalok
+
+A change_order_type Ital/Fagyi ellenőrzése, a blokk nyomtatás és a bar
+KDS (ital sor) termék nevei / kategóriái a megosztott core_http
+ProductCatalog gyorsítótárból jönnek:
+- Egy tömeges hívással (POST /api/v1/internal/products/lookup) tölti a hiányzókat
+- A service_menu katalógus verziója (ETag) szerint érvénytelenít;
+  a késés legfeljebb `product_catalog_revalidate_seconds`
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from backend.core_http import ProductCatalog
+from backend.service_orders.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Singleton instance (folyamatonként egy)
+product_catalog = ProductCatalog(
+    base_url=settings.menu_service_url,
+    revalidate_seconds=settings.product_catalog_revalidate_seconds
+)
+
+
+def lookup_product_categories(product_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    """
+    Termékek kategória nevének feloldása (gyorsítótár + legfeljebb egy tömeges hívás).
+
+    A service_menu-ben nem létező termékek kimaradnak az eredményből.
+
+    Args:
+        product_ids: Termék ID-k
+
+    Returns:
+        Dict[int, Optional[str]]: product_id -> kategória név (None, ha nincs kategória)
+
+    Raises:
+        httpx.HTTPError: Ha a service_menu nem elérhető vagy hibával válaszol
+    """
+    return {
+        product_id: info.get("category_name")
+        for product_id, info in product_catalog.get_many(product_ids).items()
+    }
+
+
+def lookup_product_names(product_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Termék nevek feloldása megjelenítéshez (KDS); hiba esetén üres eredmény.
+
+    Args:
+        product_ids: Termék ID-k
+
+    Returns:
+        Dict[int, str]: product_id -> név (a fel nem oldott termékek kimaradnak)
+    """
+    try:
+        products = product_catalog.get_many(product_ids)
+    except Exception as e:
+        logger.warning(f"Could not resolve product names from service_menu: {e}")
+        return {}
+    return {product_id: info["name"] for product_id, info in products.items()}
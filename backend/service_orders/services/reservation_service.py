@@ -10,11 +10,22 @@ from typing import Optional, List
 from datetime import datetime, date, time, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_
 
+from backend.service_orders.config import settings
 from backend.service_orders.models.reservation import Reservation, ReservationStatus, ReservationSource
 from backend.service_orders.models.opening_hours import OpeningHours
 from backend.service_orders.models.table import Table
+from backend.service_orders.services.availability_grid import availability_grid
+from backend.service_orders.services.reservation_availability import (
+    BLOCKING_STATUSES,
+    LOAD_WINDOW_MARGIN,
+    SLOT_INTERVAL,
+    ReservationIntervalIndex,
+    intervals_overlap,
+    local_wall_clock,
+    opening_hours_for
+)
+from backend.service_orders.services.table_combinations import assign_slot_tables, build_adjacency
 from backend.service_orders.schemas.reservation import (
     ReservationCreate,
     ReservationUpdate,
@@ -101,8 +112,20 @@ class ReservationService:
             db.rollback()
             raise ValueError(f"Adatbázis hiba a foglalás létrehozása során: {str(e)}") from e
 
+        ReservationService._sync_availability(db_reservation)
         return db_reservation
 
+    @staticmethod
+    def _sync_availability(reservation: Reservation) -> None:
+        """Commit utáni állapot átvezetése a napi foglaltsági rács cache-be."""
+        availability_grid.apply_reservation(
+            reservation.id,
+            reservation.table_id,
+            reservation.start_time,
+            reservation.duration_minutes,
+            reservation.status
+        )
+
     @staticmethod
     def _check_conflict(
         db: Session,
@@ -124,32 +147,26 @@ class ReservationService:
         Returns:
             Reservation | None: Ütköző foglalás vagy None
         """
+        # Jelölt foglalások kezdési idő alapján (indexelt oszlop); az átfedést a
+        # foglalás hosszából Pythonban számoljuk, ugyanúgy, mint az availability index
         query = db.query(Reservation).filter(
             Reservation.table_id == table_id,
-            Reservation.status.in_([ReservationStatus.PENDING, ReservationStatus.CONFIRMED]),
-            or_(
-                # Új foglalás kezdete egy meglévő foglalás időtartama alatt van
-                and_(
-                    Reservation.start_time <= start_time,
-                    Reservation.start_time + timedelta(minutes=Reservation.duration_minutes) > start_time
-                ),
-                # Új foglalás vége egy meglévő foglalás időtartama alatt van
-                and_(
-                    Reservation.start_time < end_time,
-                    Reservation.start_time + timedelta(minutes=Reservation.duration_minutes) >= end_time
-                ),
-                # Új foglalás teljesen magában foglalja a meglévő foglalást
-                and_(
-                    Reservation.start_time >= start_time,
-                    Reservation.start_time + timedelta(minutes=Reservation.duration_minutes) <= end_time
-                )
-            )
+            Reservation.status.in_(BLOCKING_STATUSES),
+            Reservation.start_time >= start_time - LOAD_WINDOW_MARGIN,
+            Reservation.start_time < end_time + LOAD_WINDOW_MARGIN
         )
 
         if exclude_reservation_id:
             query = query.filter(Reservation.id != exclude_reservation_id)
 
-        return query.first()
+        start_local, end_local = local_wall_clock(start_time), local_wall_clock(end_time)
+        for candidate in query.order_by(Reservation.start_time):
+            candidate_start = local_wall_clock(candidate.start_time)
+            candidate_end = candidate_start + timedelta(minutes=candidate.duration_minutes)
+            if intervals_overlap(candidate_start, candidate_end, start_local, end_local):
+                return candidate
+
+        return None
 
     @staticmethod
     def get_reservation(db: Session, reservation_id: int) -> Optional[Reservation]:
@@ -286,6 +303,7 @@ class ReservationService:
             db.rollback()
             raise ValueError(f"Adatbázis hiba a foglalás frissítése során: {str(e)}") from e
 
+        ReservationService._sync_availability(reservation)
         return reservation
 
     @staticmethod
@@ -306,6 +324,7 @@ class ReservationService:
 
         db.delete(reservation)
         db.commit()
+        availability_grid.discard_reservation(reservation_id)
         return True
 
     @staticmethod
@@ -327,6 +346,7 @@ class ReservationService:
         reservation.status = ReservationStatus.CANCELLED
         db.commit()
         db.refresh(reservation)
+        ReservationService._sync_availability(reservation)
         return reservation
 
     @staticmethod
@@ -337,6 +357,12 @@ class ReservationService:
         """
         Smart availability checking - szabad időpontok keresése.
 
+        Alapértelmezésben a napi foglaltsági rácsból (availability_grid,
+        cache találatnál SQL nélkül); kikapcsolt cache esetén a nap
+        foglalásaiból épített intervallum indexszel. Ha egy időpontban
+        egyetlen asztal sem elég nagy, a szabad szomszédos asztalok
+        kombinációit ajánlja (table_combinations).
+
         Args:
             db: SQLAlchemy session
             query: Availability query paraméterek (date, guests, duration)
@@ -344,68 +370,84 @@ class ReservationService:
         Returns:
             tuple: (szabad időpontok listája, opcionális üzenet)
         """
+        if availability_grid.enabled:
+            free_slots, message = availability_grid.available_slots(
+                db, query.date, query.guests, query.duration_minutes
+            )
+        else:
+            free_slots, message = ReservationService._indexed_slots(db, query)
+
+        available_slots = [
+            TimeSlot(
+                time=slot_start.time(),
+                available_tables=available_table_ids,
+                table_combinations=table_combinations
+            )
+            for slot_start, available_table_ids, table_combinations in free_slots
+        ]
+        if not available_slots and message is None:
+            message = "Nincs szabad időpont a megadott dátumra és vendégszámra"
+
+        return available_slots, message
+
+    @staticmethod
+    def _indexed_slots(
+        db: Session,
+        query: AvailabilityQuery
+    ) -> tuple[List[tuple[datetime, List[int], List[List[int]]]], Optional[str]]:
+        """
+        Szabad időpontok a nap foglalásaiból épített intervallum indexszel (rács cache nélkül).
+
+        Args:
+            db: SQLAlchemy session
+            query: Availability query paraméterek (date, guests, duration)
+
+        Returns:
+            tuple: ([(időpont, [szabad asztalok], [asztal kombinációk]), ...], opcionális üzenet)
+        """
         # 1. Nyitvatartás ellenőrzése
         opening_hours = ReservationService._get_opening_hours(db, query.date)
         if not opening_hours or opening_hours.is_closed:
             return [], "A étterem ezen a napon zárva tart"
 
-        # 2. Megfelelő kapacitású asztalok keresése
-        suitable_tables = db.query(Table).filter(
-            Table.capacity >= query.guests
-        ).all()
+        # 2. Asztalok: egyedül elég nagyok, vagy összevonható (szomszédos) asztalok
+        tables = db.query(
+            Table.id, Table.capacity, Table.room_id,
+            Table.position_x, Table.position_y, Table.width, Table.height
+        ).filter(Table.capacity > 0).order_by(Table.id).all()
 
-        if not suitable_tables:
+        if not any(table.capacity >= query.guests for table in tables) \
+                and settings.table_combination_max_tables <= 1:
             return [], f"Nincs megfelelő asztal {query.guests} fő részére"
 
         # 3. Időpontok generálása (30 perces intervallumokkal)
-        available_slots = []
-        current_time = datetime.combine(query.date, opening_hours.open_time)
-        closing_time = datetime.combine(query.date, opening_hours.close_time)
-
         # Biztosítjuk, hogy a foglalás vége a zárás előtt legyen
-        last_slot_start = closing_time - timedelta(minutes=query.duration_minutes)
+        duration = timedelta(minutes=query.duration_minutes)
+        opening_time = datetime.combine(query.date, opening_hours.open_time)
+        closing_time = datetime.combine(query.date, opening_hours.close_time)
+        last_slot_start = closing_time - duration
 
+        slot_starts = []
+        current_time = opening_time
         while current_time <= last_slot_start:
-            # Minden időpontra ellenőrizzük, mely asztalok szabadok
-            end_time = current_time + timedelta(minutes=query.duration_minutes)
-            available_table_ids = []
-
-            for table in suitable_tables:
-                conflict = ReservationService._check_conflict(
-                    db,
-                    table_id=table.id,
-                    start_time=current_time,
-                    end_time=end_time
-                )
-                if not conflict:
-                    available_table_ids.append(table.id)
-
-            # Ha van szabad asztal, hozzáadjuk az időpontot
-            if available_table_ids:
-                available_slots.append(
-                    TimeSlot(
-                        time=current_time.time(),
-                        available_tables=available_table_ids
-                    )
-                )
+            slot_starts.append(current_time)
+            current_time += SLOT_INTERVAL
 
-            # Következő időpont (30 perc múlva)
-            current_time += timedelta(minutes=30)
+        # 4. A nap foglalásai egy lekérdezéssel, majd asztalonként egy söprés
+        table_ids = [table.id for table in tables]
+        index = ReservationIntervalIndex.load(db, opening_time, closing_time, table_ids)
 
-        message = None
-        if not available_slots:
-            message = "Nincs szabad időpont a megadott dátumra és vendégszámra"
-
-        return available_slots, message
+        return assign_slot_tables(
+            index.free_slots(table_ids, slot_starts, duration),
+            {table.id: table.capacity for table in tables},
+            build_adjacency(tables),
+            query.guests
+        ), None
 
     @staticmethod
     def _get_opening_hours(db: Session, target_date: date) -> Optional[OpeningHours]:
         """
-        Nyitvatartás lekérdezése egy adott dátumra.
-
-        Prioritás:
-        1. Speciális dátum (pl. ünnepek)
-        2. Hétköznapi nyitvatartás
+        Nyitvatartás lekérdezése egy adott dátumra (lásd opening_hours_for).
 
         Args:
             db: SQLAlchemy session
@@ -414,18 +456,4 @@ class ReservationService:
         Returns:
             OpeningHours | None: Nyitvatartás vagy None
         """
-        # 1. Speciális dátum ellenőrzése
-        special = db.query(OpeningHours).filter(
-            OpeningHours.special_date == target_date
-        ).first()
-        if special:
-            return special
-
-        # 2. Hétköznapi nyitvatartás (0=Hétfő, 6=Vasárnap)
-        day_of_week = target_date.weekday()
-        regular = db.query(OpeningHours).filter(
-            OpeningHours.day_of_week == day_of_week,
-            OpeningHours.special_date.is_(None)
-        ).first()
-
-        return regular
+        return opening_hours_for(db, target_date)
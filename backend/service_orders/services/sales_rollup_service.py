@@ -0,0 +1,631 @@
+"""
+Sales Rollup Service - Napi forgalmi összesítők karbantartása
+Module 4: Fizetések - Riport összesítők
+
+A sales / top products riportok és a napi pénztárzárás korábban minden
+kérésnél a nyers orders / payments / order_items táblákat olvasták végig
+(`DATE(o.created_at) BETWEEN ...`), így egy havi riport ideje az
+adatbázis méretével együtt nőtt.
+
+Ez a service a daily_sales_rollup és daily_product_sales táblákat tartja
+karban:
+- apply_order_closed(): rendelés lezárásakor (close_order tranzakciójában)
+- apply_payment(): sikeres fizetés rögzítésekor (record_payment tranzakciójában)
+- revert_order_closed() / revert_payment(): a fenti kettő visszavonása, ha
+  egy lezárt rendelés státusza, összege, típusa vagy tételei változnak,
+  illetve a rendelést törlik (módosítás előtt visszavonás, utána újra
+  hozzáadás, ugyanabban a tranzakcióban)
+- invalidate_closure_figures(): a rendelés napjának materializált
+  pénztárzárás számait elavultnak jelöli (a fentiek mind hívják)
+- rebuild(): egy dátum tartomány újraszámolása a nyers adatokból
+  (visszatöltés / javítás)
+
+A növelések atomikus upsert-tel (INSERT ... ON CONFLICT DO UPDATE SET
+x = x + excluded.x) történnek, így párhuzamos lezárások sem vesznek el.
+A commit a hívó feladata.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from backend.core_domain.business_day import business_date_of, business_day_bounds
+from backend.service_orders.config import settings
+from backend.service_orders.models.order import Order
+from backend.service_orders.models.order_item import OrderItem
+from backend.service_orders.models.payment import Payment
+from backend.service_orders.models.sales_rollup import (
+    DailySalesRollup,
+    DailyProductSales,
+    DailyClosureFigures,
+    ORDER_LEVEL_METHOD
+)
+
+# Riportokban figyelembe vett rendelés / fizetés státuszok
+ROLLUP_ORDER_STATUS = 'LEZART'
+ROLLUP_PAYMENT_STATUS = 'SIKERES'
+
+
+def sale_date_of(timestamp: Optional[datetime]) -> date:
+    """
+    Időbélyeg -> üzleti nap az étterem időzónájában (settings.venue_timezone).
+
+    Args:
+        timestamp: Időbélyeg (None = most)
+
+    Returns:
+        date: Az üzleti nap
+    """
+    return business_date_of(timestamp, settings.venue_timezone)
+
+
+class SalesRollupService:
+    """
+    Napi forgalmi összesítők inkrementális frissítése és újraszámolása.
+    """
+
+    # ========================================================================
+    # Upsert
+    # ========================================================================
+
+    @staticmethod
+    def _increment(db: Session, model, key: Dict[str, Any], increments: Dict[str, Any]) -> None:
+        """
+        Egy összesítő sor számlálóinak atomikus növelése (upsert).
+
+        Args:
+            db: Database session (a hívó tranzakciója)
+            model: DailySalesRollup vagy DailyProductSales
+            key: Egyedi kulcs oszlopai és értékei
+            increments: Növelendő oszlopok és a növelés mértéke
+        """
+        table = model.__table__
+        dialect = db.get_bind().dialect.name
+
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # Upsert nélküli dialektus: zárolt olvasás + módosítás
+            row = db.query(model).filter_by(**key).with_for_update().first()
+            if row is None:
+                db.add(model(**key, **increments))
+                db.flush()
+            else:
+                for column, value in increments.items():
+                    setattr(row, column, getattr(row, column) + value)
+            return
+
+        stmt = insert(table).values(**key, **increments)
+        update_set = {
+            column: table.c[column] + stmt.excluded[column]
+            for column in increments
+        }
+        update_set['updated_at'] = func.now()
+        db.execute(
+            stmt.on_conflict_do_update(index_elements=list(key), set_=update_set)
+        )
+
+    @staticmethod
+    def invalidate_closure_figures(db: Session, business_date: date) -> None:
+        """
+        Egy üzleti nap materializált pénztárzárás számainak elavulttá jelölése
+        (commit NÉLKÜL).
+
+        Upsert: ha a napra még nincs sor, elavult sort szúr be. Így egy
+        párhuzamosan számoló service_admin a sor zárolásánál megvárja ezt a
+        tranzakciót, és a friss adatokból számol (nem marad le a fizetés).
+
+        Args:
+            db: Database session (a hívó tranzakciója)
+            business_date: A rendelés üzleti napja
+        """
+        table = DailyClosureFigures.__table__
+        dialect = db.get_bind().dialect.name
+
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            row = db.query(DailyClosureFigures).filter_by(business_date=business_date).with_for_update().first()
+            if row is None:
+                db.add(DailyClosureFigures(business_date=business_date, is_stale=True))
+                db.flush()
+            else:
+                row.is_stale = True
+                row.invalidated_at = func.now()
+            return
+
+        stmt = insert(table).values(business_date=business_date, is_stale=True, invalidated_at=func.now())
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=['business_date'],
+                set_={"is_stale": True, "invalidated_at": func.now()}
+            )
+        )
+
+    # ========================================================================
+    # Inkrementális frissítés
+    # ========================================================================
+
+    @staticmethod
+    def _apply_order(db: Session, order: Order, sign: int) -> None:
+        """
+        Egy lezárt rendelés hozzáadása (sign=1) vagy levonása (sign=-1).
+
+        A tételeket az adatbázisból olvassa: levonásnál a módosítás előtt,
+        hozzáadásnál a módosítás flush-a után hívandó.
+
+        Args:
+            db: Database session (a hívó tranzakciója)
+            order: A lezárt rendelés
+            sign: 1 = hozzáadás, -1 = levonás
+        """
+        sale_date = sale_date_of(order.created_at)
+
+        SalesRollupService.invalidate_closure_figures(db, sale_date)
+
+        SalesRollupService._increment(
+            db,
+            DailySalesRollup,
+            key={
+                "sale_date": sale_date,
+                "order_type": order.order_type,
+                "payment_method": ORDER_LEVEL_METHOD
+            },
+            increments={
+                "order_count": sign,
+                "revenue": sign * Decimal(str(order.total_amount or 0))
+            }
+        )
+
+        products: Dict[int, Dict[str, Any]] = {}
+        for product_id, quantity, unit_price in db.query(
+            OrderItem.product_id, OrderItem.quantity, OrderItem.unit_price
+        ).filter(OrderItem.order_id == order.id):
+            unit_price = Decimal(str(unit_price))
+            totals = products.setdefault(product_id, {
+                "quantity": 0,
+                "revenue": Decimal("0"),
+                "order_count": sign,
+                "line_count": 0,
+                "unit_price_sum": Decimal("0"),
+            })
+            totals["quantity"] += sign * quantity
+            totals["revenue"] += sign * unit_price * quantity
+            totals["line_count"] += sign
+            totals["unit_price_sum"] += sign * unit_price
+
+        # Rögzített sorrend: párhuzamos lezárások ne zárják egymást körbe
+        for product_id in sorted(products):
+            SalesRollupService._increment(
+                db,
+                DailyProductSales,
+                key={"sale_date": sale_date, "product_id": product_id},
+                increments=products[product_id]
+            )
+
+        if sign < 0:
+            SalesRollupService._prune_empty_rows(db, sale_date)
+
+    @staticmethod
+    def _apply_payment(
+        db: Session,
+        payment: Payment,
+        order_type: str,
+        order_created_at: Optional[datetime],
+        sign: int
+    ) -> None:
+        """
+        Egy sikeres fizetés hozzáadása (sign=1) vagy levonása (sign=-1).
+
+        Args:
+            db: Database session (a hívó tranzakciója)
+            payment: A fizetés
+            order_type: A rendelés típusa (az összesítő kulcsa)
+            order_created_at: A rendelés létrehozása (None = a fizetés napja)
+            sign: 1 = hozzáadás, -1 = levonás
+        """
+        if payment.status != ROLLUP_PAYMENT_STATUS:
+            return
+
+        # A pénztárzárás a rendelés napjához számolja a fizetést (késői fizetés is)
+        SalesRollupService.invalidate_closure_figures(
+            db,
+            sale_date_of(order_created_at or payment.created_at)
+        )
+
+        sale_date = sale_date_of(payment.created_at)
+        SalesRollupService._increment(
+            db,
+            DailySalesRollup,
+            key={
+                "sale_date": sale_date,
+                "order_type": order_type,
+                "payment_method": payment.payment_method
+            },
+            increments={
+                "payment_count": sign,
+                "payment_amount": sign * Decimal(str(payment.amount))
+            }
+        )
+
+        if sign < 0:
+            SalesRollupService._prune_empty_rows(db, sale_date)
+
+    @staticmethod
+    def _prune_empty_rows(db: Session, sale_date: date) -> None:
+        """
+        Levonás után kiürült (csupa nulla) összesítő sorok törlése, hogy a
+        riportok és a rebuild() ugyanazokat a sorokat lássák.
+
+        Args:
+            db: Database session (a hívó tranzakciója)
+            sale_date: Az érintett nap
+        """
+        db.query(DailySalesRollup).filter(
+            DailySalesRollup.sale_date == sale_date,
+            DailySalesRollup.order_count == 0,
+            DailySalesRollup.payment_count == 0
+        ).delete(synchronize_session=False)
+        db.query(DailyProductSales).filter(
+            DailyProductSales.sale_date == sale_date,
+            DailyProductSales.order_count == 0
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def apply_order_closed(db: Session, order: Order) -> None:
+        """
+        Lezárt rendelés hozzáadása az összesítőkhöz (commit NÉLKÜL).
+
+        A rendelés a létrehozása napjához számít (mint a korábbi riportokban).
+        Rendelésenként csak egyszer hívandó (close_order ellenőrzi), illetve
+        egy revert_order_closed() után a módosított rendeléssel újra.
+
+        Args:
+            db: Database session (a lezárás tranzakciója)
+            order: A lezárt rendelés
+        """
+        SalesRollupService._apply_order(db, order, 1)
+
+    @staticmethod
+    def revert_order_closed(db: Session, order: Order) -> None:
+        """
+        Lezárt rendelés levonása az összesítőkből (commit NÉLKÜL).
+
+        Sztornó, törlés, illetve összeg / típus / tétel módosítás ELŐTT
+        hívandó, amíg a rendelés és tételei még a korábban hozzáadott
+        értékeket tartalmazzák.
+
+        Args:
+            db: Database session (a módosítás tranzakciója)
+            order: A (még módosítatlan) lezárt rendelés
+        """
+        SalesRollupService._apply_order(db, order, -1)
+
+    @staticmethod
+    def apply_payment(
+        db: Session,
+        payment: Payment,
+        order_type: str,
+        order_created_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Sikeres fizetés hozzáadása az összesítőkhöz (commit NÉLKÜL).
+
+        A fizetés a rögzítése napjához számít (napi pénztárzárás).
+
+        Args:
+            db: Database session (a fizetés tranzakciója)
+            payment: A rögzített fizetés
+            order_type: A rendelés típusa
+            order_created_at: A rendelés létrehozása (a pénztárzárás napja;
+                None esetén a fizetés napja)
+        """
+        SalesRollupService._apply_payment(db, payment, order_type, order_created_at, 1)
+
+    @staticmethod
+    def revert_payment(
+        db: Session,
+        payment: Payment,
+        order_type: str,
+        order_created_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Sikeres fizetés levonása az összesítőkből (commit NÉLKÜL).
+
+        A rendelés törlésekor (a fizetései vele törlődnek), illetve
+        típusváltáskor (a régi típussal) hívandó.
+
+        Args:
+            db: Database session (a módosítás tranzakciója)
+            payment: A fizetés
+            order_type: A rendelés típusa, amellyel a fizetés hozzá lett adva
+            order_created_at: A rendelés létrehozása (None = a fizetés napja)
+        """
+        SalesRollupService._apply_payment(db, payment, order_type, order_created_at, -1)
+
+    # ========================================================================
+    # Lekérdezés
+    # ========================================================================
+
+    @staticmethod
+    def get_payment_totals(db: Session, target_date: date) -> Dict[str, float]:
+        """
+        Egy nap sikeres fizetései fizetési mód szerint (az összesítőből).
+
+        Args:
+            db: Database session
+            target_date: A nap
+
+        Returns:
+            Dict[str, float]: Fizetési mód -> összeg
+        """
+        results = db.query(
+            DailySalesRollup.payment_method,
+            func.sum(DailySalesRollup.payment_amount)
+        ).filter(
+            DailySalesRollup.sale_date == target_date,
+            DailySalesRollup.payment_method != ORDER_LEVEL_METHOD
+        ).group_by(
+            DailySalesRollup.payment_method
+        ).all()
+
+        return {
+            payment_method: float(total) if total else 0.0
+            for payment_method, total in results
+        }
+
+    @staticmethod
+    def aggregate_sales(db: Session, start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Forgalom napi és fizetési mód szerinti bontásban (GROUP BY sale_date, payment_method).
+
+        Args:
+            db: Database session
+            start_date: Első nap (inkluzív)
+            end_date: Utolsó nap (inkluzív)
+
+        Returns:
+            dict: SalesAggregateResponse szerkezet (start_date, end_date, days)
+        """
+        results = db.query(
+            DailySalesRollup.sale_date,
+            DailySalesRollup.payment_method,
+            func.sum(DailySalesRollup.order_count),
+            func.sum(DailySalesRollup.revenue),
+            func.sum(DailySalesRollup.payment_count),
+            func.sum(DailySalesRollup.payment_amount)
+        ).filter(
+            DailySalesRollup.sale_date.between(start_date, end_date)
+        ).group_by(
+            DailySalesRollup.sale_date, DailySalesRollup.payment_method
+        ).order_by(
+            DailySalesRollup.sale_date, DailySalesRollup.payment_method
+        ).all()
+
+        days: Dict[date, Dict[str, Any]] = {}
+        for sale_date, payment_method, order_count, revenue, payment_count, payment_amount in results:
+            day = days.setdefault(sale_date, {
+                "date": sale_date,
+                "order_count": 0,
+                "revenue": Decimal("0"),
+                "payments": [],
+            })
+            if payment_method == ORDER_LEVEL_METHOD:
+                day["order_count"] += order_count or 0
+                day["revenue"] += Decimal(str(revenue or 0))
+            else:
+                day["payments"].append({
+                    "payment_method": payment_method,
+                    "payment_count": payment_count or 0,
+                    "amount": Decimal(str(payment_amount or 0)),
+                })
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "days": list(days.values()),
+        }
+
+    @staticmethod
+    def aggregate_product_sales(
+        db: Session,
+        start_date: date,
+        end_date: date,
+        limit: int
+    ) -> Dict[str, Any]:
+        """
+        Termék forgalom a tartományban (GROUP BY product_id), eladott mennyiség szerint.
+
+        Args:
+            db: Database session
+            start_date: Első nap (inkluzív)
+            end_date: Utolsó nap (inkluzív)
+            limit: Visszaadott termékek maximális száma
+
+        Returns:
+            dict: ProductSalesAggregateResponse szerkezet
+        """
+        in_range = DailyProductSales.sale_date.between(start_date, end_date)
+        total_quantity = func.sum(DailyProductSales.quantity)
+
+        results = db.query(
+            DailyProductSales.product_id,
+            total_quantity,
+            func.sum(DailyProductSales.revenue),
+            func.sum(DailyProductSales.order_count),
+            func.sum(DailyProductSales.unit_price_sum),
+            func.sum(DailyProductSales.line_count)
+        ).filter(in_range).group_by(
+            DailyProductSales.product_id
+        ).order_by(
+            total_quantity.desc(), DailyProductSales.product_id
+        ).limit(limit).all()
+
+        total_products = db.query(
+            func.count(func.distinct(DailyProductSales.product_id))
+        ).filter(in_range).scalar() or 0
+
+        products = []
+        for product_id, quantity, revenue, order_count, unit_price_sum, line_count in results:
+            unit_price_sum = Decimal(str(unit_price_sum or 0))
+            products.append({
+                "product_id": product_id,
+                "quantity": quantity or 0,
+                "revenue": Decimal(str(revenue or 0)),
+                "order_count": order_count or 0,
+                "average_price": (
+                    (unit_price_sum / line_count).quantize(Decimal("0.01")) if line_count else Decimal("0")
+                ),
+            })
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_products": total_products,
+            "products": products,
+        }
+
+    # ========================================================================
+    # Újraszámolás
+    # ========================================================================
+
+    @staticmethod
+    def _rebuild_day(db: Session, day: date) -> Tuple[List[DailySalesRollup], List[DailyProductSales]]:
+        """
+        Egy üzleti nap összesítő sorainak kiszámítása a nyers adatokból.
+
+        A nap az étterem időzónája szerinti félig nyitott [start, end)
+        intervallum, így a szűrés a (status, created_at) indexeket használja.
+
+        Args:
+            db: Database session
+            day: Az üzleti nap
+
+        Returns:
+            tuple: (daily_sales_rollup sorok, daily_product_sales sorok) - még nem hozzáadva
+        """
+        day_start, day_end = business_day_bounds(day, settings.venue_timezone)
+
+        closed_on_day = and_(
+            Order.status == ROLLUP_ORDER_STATUS,
+            Order.created_at >= day_start,
+            Order.created_at < day_end
+        )
+
+        sales_rows = [
+            DailySalesRollup(
+                sale_date=day,
+                order_type=order_type,
+                payment_method=ORDER_LEVEL_METHOD,
+                order_count=order_count,
+                revenue=revenue or 0,
+                payment_count=0,
+                payment_amount=0
+            )
+            for order_type, order_count, revenue in db.query(
+                Order.order_type, func.count(Order.id), func.sum(Order.total_amount)
+            ).filter(closed_on_day).group_by(Order.order_type)
+        ]
+
+        sales_rows.extend(
+            DailySalesRollup(
+                sale_date=day,
+                order_type=order_type,
+                payment_method=payment_method,
+                order_count=0,
+                revenue=0,
+                payment_count=payment_count,
+                payment_amount=amount or 0
+            )
+            for order_type, payment_method, payment_count, amount in db.query(
+                Order.order_type, Payment.payment_method,
+                func.count(Payment.id), func.sum(Payment.amount)
+            ).join(
+                Order, Payment.order_id == Order.id
+            ).filter(
+                Payment.status == ROLLUP_PAYMENT_STATUS,
+                Payment.created_at >= day_start,
+                Payment.created_at < day_end
+            ).group_by(Order.order_type, Payment.payment_method)
+        )
+
+        product_rows = [
+            DailyProductSales(
+                sale_date=day,
+                product_id=product_id,
+                quantity=quantity,
+                revenue=revenue or 0,
+                order_count=order_count,
+                line_count=line_count,
+                unit_price_sum=unit_price_sum or 0
+            )
+            for product_id, quantity, revenue, order_count, line_count, unit_price_sum in db.query(
+                OrderItem.product_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.quantity * OrderItem.unit_price),
+                func.count(func.distinct(OrderItem.order_id)),
+                func.count(OrderItem.id),
+                func.sum(OrderItem.unit_price)
+            ).join(
+                Order, OrderItem.order_id == Order.id
+            ).filter(closed_on_day).group_by(OrderItem.product_id)
+        ]
+
+        return sales_rows, product_rows
+
+    @staticmethod
+    def rebuild(db: Session, start_date: date, end_date: date) -> Dict[str, Any]:
+        """
+        Összesítők újraszámolása egy dátum tartományra a nyers adatokból.
+
+        Visszatöltésre (a táblák bevezetése előtti napok) és eltérés
+        javítására. Naponként külön tranzakció: a nap sorait törli, újraírja
+        és commitolja, így egy hosszú tartomány sem tart sokáig zárolást,
+        és hiba esetén a már kész napok megmaradnak.
+
+        Args:
+            db: Database session
+            start_date: Kezdő nap (inkluzív)
+            end_date: Záró nap (inkluzív)
+
+        Returns:
+            dict: start_date, end_date, sales_rows, product_rows
+        """
+        sales_count = 0
+        product_count = 0
+
+        day = start_date
+        while day <= end_date:
+            try:
+                db.query(DailySalesRollup).filter(
+                    DailySalesRollup.sale_date == day
+                ).delete(synchronize_session=False)
+                db.query(DailyProductSales).filter(
+                    DailyProductSales.sale_date == day
+                ).delete(synchronize_session=False)
+
+                day_sales, day_products = SalesRollupService._rebuild_day(db, day)
+                db.add_all(day_sales)
+                db.add_all(day_products)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            sales_count += len(day_sales)
+            product_count += len(day_products)
+            day += timedelta(days=1)
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "sales_rows": sales_count,
+            "product_rows": product_count,
+        }
@@ -8,6 +8,7 @@ Támogatja a split-check (számlák személyenkénti felosztását).
 """
 
 from typing import Optional, List
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -291,18 +292,14 @@ class SeatService:
         if seat_count <= 0:
             raise ValueError("A seat_count értékének pozitívnak kell lennie.")
 
-        # Létrehozzuk az ülőhelyeket
-        seats = []
-        for seat_num in range(1, seat_count + 1):
-            seat = Seat(table_id=table_id, seat_number=seat_num)
-            db.add(seat)
-            seats.append(seat)
-
+        # Egyetlen többsoros INSERT ... RETURNING, majd egy lekérdezés a
+        # commit után (soronkénti refresh helyett)
         try:
+            seat_ids = db.scalars(
+                insert(Seat).returning(Seat.id),
+                [{"table_id": table_id, "seat_number": seat_num} for seat_num in range(1, seat_count + 1)]
+            ).all()
             db.commit()
-            # Frissítjük az objektumokat
-            for seat in seats:
-                db.refresh(seat)
         except IntegrityError as e:
             db.rollback()
             raise ValueError(
@@ -310,7 +307,7 @@ class SeatService:
                 f"Lehetséges, hogy néhány székszám már létezik ennél az asztalnál."
             ) from e
 
-        return seats
+        return db.query(Seat).filter(Seat.id.in_(seat_ids)).order_by(Seat.seat_number).all()
 
 
 # Singleton példány exportálása
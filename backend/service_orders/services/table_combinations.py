@@ -0,0 +1,179 @@
+"""
+Table Combinations - Szomszédos asztalok összevonása nagy társaságoknak
+Module 1: Rendeléskezelés és Asztalok (Online foglalás)
+
+A szabad időpont keresés korábban csak egyedi asztalokat vizsgált
+(capacity >= guests), így egy 14 fős társaságra a motor "nincs asztal"
+választ adott, holott a teremben egymás melletti asztalok összetolhatók
+(a kézi merge_tables műveletet a felszolgálók ma telefonon egyeztetik).
+
+Szomszédság (előre számolva, asztal változásig érvényes): két asztal
+összevonható, ha azonos teremben (room_id) vannak, és az alaprajzi
+téglalapjaik (position_x / position_y / width / height) közti rés
+mindkét irányban legfeljebb `table_combination_max_gap` egység.
+A forgatást (rotation) nem vesszük figyelembe.
+
+Keresés: a szabad asztalok szomszédsági gráfjának összefüggő
+részhalmazait soroljuk fel (ESU: minden részhalmaz pontosan egyszer, a
+legkisebb ID-jú asztalból kiindulva), vágásokkal:
+- egy kombináció nem bővül tovább, ha már elég a hely (minimális kombinációk)
+- a legjobb eddigi asztalszámnál nagyobb kombinációt nem építünk
+- korlát: a még hozzáadható asztalok legnagyobb kapacitásaival sem érné
+  el a vendégszámot -> az ág levágható
+
+A kombinációk sorrendje: kevesebb asztal, kevesebb üres hely, asztal ID-k.
+"""
+
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from backend.service_orders.config import settings
+
+# A Table modell alapértelmezett mérete (width / height hiányában)
+DEFAULT_TABLE_SIZE = 80
+
+Adjacency = Dict[int, FrozenSet[int]]
+
+
+def build_adjacency(tables: Iterable, max_gap: Optional[int] = None) -> Adjacency:
+    """
+    Asztalok szomszédsági gráfja az alaprajzi pozíciók alapján.
+
+    Args:
+        tables: Objektumok / sorok id, room_id, position_x, position_y,
+            width, height attribútumokkal
+        max_gap: Megengedett rés (None = settings.table_combination_max_gap)
+
+    Returns:
+        dict: table_id -> szomszédos asztal ID-k (terem nélküli asztalnak nincs szomszédja)
+    """
+    if max_gap is None:
+        max_gap = settings.table_combination_max_gap
+
+    rooms: Dict[int, List[Tuple[int, int, int, int, int]]] = {}
+    adjacency: Dict[int, set] = {}
+    for table in tables:
+        adjacency[table.id] = set()
+        if table.room_id is None:
+            continue
+        left, top = table.position_x or 0, table.position_y or 0
+        rooms.setdefault(table.room_id, []).append((
+            table.id, left, top,
+            left + (table.width or DEFAULT_TABLE_SIZE),
+            top + (table.height or DEFAULT_TABLE_SIZE)
+        ))
+
+    for room_tables in rooms.values():
+        for position, (table_id, left, top, right, bottom) in enumerate(room_tables):
+            for other_id, other_left, other_top, other_right, other_bottom in room_tables[position + 1:]:
+                gap_x = max(left, other_left) - min(right, other_right)
+                gap_y = max(top, other_top) - min(bottom, other_bottom)
+                if gap_x <= max_gap and gap_y <= max_gap:
+                    adjacency[table_id].add(other_id)
+                    adjacency[other_id].add(table_id)
+
+    return {table_id: frozenset(neighbours) for table_id, neighbours in adjacency.items()}
+
+
+def find_combinations(
+    free: Iterable[int],
+    capacities: Dict[int, Optional[int]],
+    adjacency: Adjacency,
+    guests: int,
+    max_tables: int,
+    limit: int
+) -> List[List[int]]:
+    """
+    Szabad, összefüggő (szomszédos) asztal kombinációk, amelyek elférnek a társaságnak.
+
+    Args:
+        free: Szabad asztalok ID-i
+        capacities: table_id -> kapacitás
+        adjacency: build_adjacency eredménye
+        guests: Vendégek száma
+        max_tables: Egy kombináció legfeljebb ennyi asztalból állhat
+        limit: Visszaadott kombinációk maximális száma
+
+    Returns:
+        list: Kombinációk (rendezett asztal ID listák) a legjobb elöl
+    """
+    nodes = sorted(table_id for table_id in free if capacities.get(table_id))
+    node_set = frozenset(nodes)
+    largest = sorted((capacities[table_id] for table_id in nodes), reverse=True)
+    found: List[Tuple[int, int, Tuple[int, ...]]] = []
+    best_size = max_tables
+
+    def extend(subset: Tuple[int, ...], seats: int, extension: List[int], excluded: FrozenSet[int], root: int) -> None:
+        nonlocal best_size
+        if seats >= guests:
+            found.append((len(subset), seats - guests, tuple(sorted(subset))))
+            best_size = min(best_size, len(subset))
+            return
+        room_left = best_size - len(subset)
+        if room_left <= 0 or seats + sum(largest[:room_left]) < guests:
+            return
+
+        extension = list(extension)
+        while extension:
+            table_id = extension.pop()
+            # Új jelöltek: a table_id szomszédai, amelyek még nem részei / szomszédai a részhalmaznak
+            candidates = [
+                neighbour for neighbour in adjacency.get(table_id, ())
+                if neighbour > root and neighbour in node_set and neighbour not in excluded
+            ]
+            extend(
+                subset + (table_id,),
+                seats + capacities[table_id],
+                extension + candidates,
+                excluded | frozenset(candidates) | {table_id},
+                root
+            )
+
+    for root in nodes:
+        neighbours = [
+            neighbour for neighbour in adjacency.get(root, ())
+            if neighbour > root and neighbour in node_set
+        ]
+        extend((root,), capacities[root], neighbours, frozenset(neighbours) | {root}, root)
+
+    found.sort()
+    return [list(table_ids) for size, _, table_ids in found if size <= best_size][:limit]
+
+
+def assign_slot_tables(
+    slot_frees: Sequence[Tuple[datetime, List[int]]],
+    capacities: Dict[int, Optional[int]],
+    adjacency: Adjacency,
+    guests: int
+) -> List[Tuple[datetime, List[int], List[List[int]]]]:
+    """
+    Időpontonként az egyedül is elég asztalok, ezek hiányában az összevonható kombinációk.
+
+    Azonos szabad asztal-halmazú időpontokra a keresés csak egyszer fut.
+
+    Args:
+        slot_frees: [(időpont, [szabad asztal ID-k - bármely kapacitással]), ...]
+        capacities: table_id -> kapacitás
+        adjacency: build_adjacency eredménye
+        guests: Vendégek száma
+
+    Returns:
+        list: [(időpont, [egyedi asztalok], [kombinációk]), ...] csak a
+            foglalható időpontok
+    """
+    max_tables = settings.table_combination_max_tables
+    limit = settings.table_combination_max_results
+    searched: Dict[FrozenSet[int], List[List[int]]] = {}
+
+    slots = []
+    for slot_start, free in slot_frees:
+        singles = [table_id for table_id in free if (capacities.get(table_id) or 0) >= guests]
+        combinations: List[List[int]] = []
+        if not singles and max_tables > 1:
+            key = frozenset(free)
+            if key not in searched:
+                searched[key] = find_combinations(free, capacities, adjacency, guests, max_tables, limit)
+            combinations = searched[key]
+        if singles or combinations:
+            slots.append((slot_start, singles, combinations))
+    return slots
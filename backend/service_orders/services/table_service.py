@@ -11,8 +11,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from backend.service_orders.models.table import Table
+from backend.service_orders.services.availability_grid import availability_grid
 from backend.service_orders.schemas.table import TableCreate, TableUpdate
 
+# Ezek változása érinti a foglalási rácsot (kapacitás, összevonható szomszédok)
+AVAILABILITY_FIELDS = frozenset({'capacity', 'room_id', 'position_x', 'position_y', 'width', 'height'})
+
 
 class TableService:
     """
@@ -65,6 +69,8 @@ class TableService:
                 f"Asztal '{table_data.table_number}' már létezik az adatbázisban."
             ) from e
 
+        # Új asztal: a foglalási rácsok újraépülnek
+        availability_grid.invalidate()
         return db_table
 
     @staticmethod
@@ -161,6 +167,8 @@ class TableService:
                 f"az asztalszám '{table_data.table_number}' már használatban van."
             ) from e
 
+        if AVAILABILITY_FIELDS & update_data.keys():
+            availability_grid.invalidate()
         return db_table
 
     @staticmethod
@@ -186,6 +194,7 @@ class TableService:
 
         db.delete(db_table)
         db.commit()
+        availability_grid.invalidate()
 
         return True
 
@@ -291,9 +300,13 @@ class TableService:
         if primary_table_id in secondary_table_ids:
             raise ValueError("Az elsődleges asztal nem szerepelhet a másodlagos asztalok listájában")
 
-        # Másodlagos asztalok frissítése
+        # Másodlagos asztalok: egy lekérdezés a teljes listára
+        secondary_tables = {
+            table.id: table
+            for table in db.query(Table).filter(Table.id.in_(secondary_table_ids)).all()
+        }
         for secondary_id in secondary_table_ids:
-            secondary_table = db.query(Table).filter(Table.id == secondary_id).first()
+            secondary_table = secondary_tables.get(secondary_id)
             if not secondary_table:
                 raise ValueError(f"Másodlagos asztal (ID: {secondary_id}) nem található")
 
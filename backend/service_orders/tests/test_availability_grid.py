@@ -0,0 +1,251 @@
+"""
+Availability Grid Tests - Napi foglaltsági bitmap cache
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- A rács eredménye megegyezik az intervallum index eredményével
+- Cache találat: SQL lekérdezés nélkül
+- Inkrementális frissítés létrehozás / módosítás / lemondás / törlés után
+- Speciális (zárva) nap
+- Felépítés a lock-on kívül: más nap lekérdezése nem vár, ugyanarra a napra egy építés
+- Építés közbeni foglalás változás és invalidate() kezelése
+"""
+
+import random
+import threading
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.opening_hours import OpeningHours
+from backend.service_orders.models.reservation import Reservation, ReservationStatus
+from backend.service_orders.models.table import Table
+from backend.service_orders.schemas.reservation import AvailabilityQuery, ReservationCreate, ReservationUpdate
+from backend.service_orders.services import reservation_service as reservation_service_module
+from backend.service_orders.services.availability_grid import AvailabilityGrid
+from backend.service_orders.services.reservation_service import ReservationService
+
+DAY = date(2025, 1, 20)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(DAY, time(hour, minute))
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite: 6 asztal (2-6 fő), nyitvatartás 11-22."""
+    engine = create_engine("sqlite://")
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'reservations', 'opening_hours')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    db.add(OpeningHours(day_of_week=DAY.weekday(), open_time=time(11, 0), close_time=time(22, 0)))
+    db.add_all([Table(id=number, table_number=f"T{number}", capacity=2 + number % 3 * 2) for number in range(1, 7)])
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="function")
+def grid(monkeypatch):
+    """Tesztenként friss rács a ReservationService-ben."""
+    grid = AvailabilityGrid(bucket_minutes=15, ttl_seconds=3600, max_days=10)
+    monkeypatch.setattr(reservation_service_module, "availability_grid", grid)
+    return grid
+
+
+def _slots(db, guests, duration):
+    slots, _ = ReservationService.get_available_slots(
+        db, AvailabilityQuery(date=DAY, guests=guests, duration_minutes=duration)
+    )
+    return {slot.time: slot.available_tables for slot in slots}
+
+
+def _create(db, table_id, start, minutes):
+    return ReservationService.create_reservation(db, ReservationCreate(
+        table_id=table_id, customer_name="Vendég", customer_phone="+36301234567",
+        start_time=start, duration_minutes=minutes, guest_count=2
+    ))
+
+
+def test_grid_matches_interval_index(db_session, grid, monkeypatch):
+    """Test: Véletlen foglalásokra a rács és az index minden vendégszám / időtartam esetén egyezik."""
+    rng = random.Random(3)
+    for _ in range(40):
+        db_session.add(Reservation(
+            table_id=rng.randrange(1, 7), customer_name="Vendég", guest_count=2,
+            start_time=at(10) + timedelta(minutes=15 * rng.randrange(0, 48)),
+            duration_minutes=rng.choice([45, 60, 120]),
+            status=rng.choice([ReservationStatus.CONFIRMED, ReservationStatus.PENDING, ReservationStatus.CANCELLED])
+        ))
+    db_session.commit()
+
+    for guests in (1, 4, 6):
+        for duration in (30, 90, 120, 240):
+            from_grid = _slots(db_session, guests, duration)
+            monkeypatch.setattr(grid, "ttl_seconds", 0)
+            from_index = _slots(db_session, guests, duration)
+            monkeypatch.setattr(grid, "ttl_seconds", 3600)
+            assert from_grid == from_index
+
+
+def test_cached_day_needs_no_sql(db_session, grid):
+    """Test: A nap második lekérdezése (más vendégszámmal is) nem fut SQL-t."""
+    _slots(db_session, 2, 120)
+
+    statements = []
+    event.listen(
+        db_session.get_bind(), "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    _slots(db_session, 4, 60)
+    _slots(db_session, 6, 180)
+
+    assert statements == []
+    assert grid.stats()["builds"] == 1
+    assert grid.stats()["hits"] == 2
+
+
+def test_reservation_writes_update_grid(db_session, grid):
+    """Test: Létrehozás / áthelyezés / lemondás / törlés azonnal látszik, újraépítés nélkül."""
+    assert 1 in _slots(db_session, 2, 60)[time(18, 0)]
+
+    reservation = _create(db_session, 1, at(18), 60)
+    assert 1 not in _slots(db_session, 2, 60)[time(18, 0)]
+    assert 1 not in _slots(db_session, 2, 60)[time(17, 30)]
+    assert 1 in _slots(db_session, 2, 60)[time(19, 0)]
+
+    ReservationService.update_reservation(db_session, reservation.id, ReservationUpdate(table_id=2))
+    assert 1 in _slots(db_session, 2, 60)[time(18, 0)]
+    assert 2 not in _slots(db_session, 2, 60)[time(18, 0)]
+
+    ReservationService.cancel_reservation(db_session, reservation.id)
+    assert 2 in _slots(db_session, 2, 60)[time(18, 0)]
+
+    other = _create(db_session, 3, at(12), 120)
+    assert 3 not in _slots(db_session, 2, 60)[time(13, 0)]
+    ReservationService.delete_reservation(db_session, other.id)
+    assert 3 in _slots(db_session, 2, 60)[time(13, 0)]
+
+    assert grid.stats()["builds"] == 1
+
+
+def test_special_closed_day(db_session, grid):
+    """Test: Speciális dátum (zárva) felülírja a hétköznapi nyitvatartást."""
+    db_session.add(OpeningHours(special_date=DAY, is_closed=True, description="Ünnepnap"))
+    db_session.commit()
+
+    slots, message = ReservationService.get_available_slots(
+        db_session, AvailabilityQuery(date=DAY, guests=2, duration_minutes=60)
+    )
+
+    assert slots == []
+    assert message == "A étterem ezen a napon zárva tart"
+
+
+def _blocking_build(db, grid, monkeypatch):
+    """
+    Szálakból hívható _build: az engedélyig vár, majd a főszálon előre
+    felépített rácsot adja (a SQLite session nem osztható meg szálak között).
+
+    Returns:
+        tuple: (építés hívások listája, elindult esemény, engedély esemény)
+    """
+    prebuilt = grid._build(db, DAY)
+    calls, started, release = [], threading.Event(), threading.Event()
+
+    def build(db, day):
+        calls.append(day)
+        started.set()
+        assert release.wait(5)
+        return prebuilt
+
+    monkeypatch.setattr(grid, "_build", build)
+    return calls, started, release
+
+
+def test_build_does_not_block_other_days(db_session, grid, monkeypatch):
+    """Test: Egy nap építése közben egy cache-elt másik nap lekérdezése nem vár."""
+    other_day = DAY + timedelta(days=7)
+    grid.available_slots(db_session, other_day, 2, 60)
+    _, started, release = _blocking_build(db_session, grid, monkeypatch)
+
+    builder = threading.Thread(target=grid.available_slots, args=(None, DAY, 2, 60))
+    builder.start()
+    assert started.wait(5)
+    try:
+        results = []
+        reader = threading.Thread(target=lambda: results.append(grid.available_slots(None, other_day, 2, 60)))
+        reader.start()
+        reader.join(2)
+        assert not reader.is_alive(), "a másik nap lekérdezése az építésre várt"
+        slots, message = results[0]
+        assert message is None and slots
+        assert grid.stats()["hits"] == 1
+    finally:
+        release.set()
+        builder.join(5)
+
+
+def test_same_day_is_built_once(db_session, grid, monkeypatch):
+    """Test: Ugyanarra a napra párhuzamos kérések egy építést várnak meg."""
+    calls, started, release = _blocking_build(db_session, grid, monkeypatch)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(grid.available_slots(None, DAY, 2, 60)))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [DAY]
+    assert len(results) == 3 and all(result == results[0] for result in results)
+    assert grid.stats()["builds"] == 1
+
+
+def test_reservation_change_during_build_is_applied(db_session, grid, monkeypatch):
+    """Test: Az építés lekérdezései után (még a cache-be írás előtt) rögzített foglalás is látszik."""
+    real_build = grid._build
+
+    def build(db, day):
+        built = real_build(db, day)
+        # Másik kérés foglalása a lekérdezések után commitolódott
+        grid.apply_reservation(99, 1, at(18), 60, ReservationStatus.CONFIRMED)
+        return built
+
+    monkeypatch.setattr(grid, "_build", build)
+
+    assert 1 not in _slots(db_session, 2, 60)[time(18, 0)]
+    monkeypatch.setattr(grid, "_build", real_build)
+    assert 1 not in _slots(db_session, 2, 60)[time(18, 0)]
+    assert grid.stats()["builds"] == 1
+
+
+def test_invalidate_during_build_discards_result(db_session, grid, monkeypatch):
+    """Test: Az építés közbeni invalidate() után az eredmény nem kerül a cache-be."""
+    real_build = grid._build
+
+    def build(db, day):
+        built = real_build(db, day)
+        grid.invalidate()
+        return built
+
+    monkeypatch.setattr(grid, "_build", build)
+    _slots(db_session, 2, 60)
+    monkeypatch.setattr(grid, "_build", real_build)
+
+    assert grid.stats()["days"] == 0
+    _slots(db_session, 2, 60)
+    assert grid.stats()["builds"] == 2
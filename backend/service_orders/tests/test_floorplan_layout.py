@@ -0,0 +1,135 @@
+"""
+Floorplan Layout Tests - Alaprajz mentés egy tranzakcióban
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- 120 asztalos új terem mentése konstans számú SQL utasítással (room_ref, székek)
+- Diff: csak a ténylegesen változott sorok, székek pontos halmaza, törlések
+- Hiba esetén semmi nem kerül mentésre
+- bulk_create_seats egy INSERT utasítással
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.reservation import Reservation
+from backend.service_orders.models.room import Room
+from backend.service_orders.models.seat import Seat
+from backend.service_orders.models.table import Table
+from backend.service_orders.schemas.floorplan import FloorplanLayoutSaveRequest
+from backend.service_orders.services.floorplan_service import FloorplanService
+from backend.service_orders.services.seat_service import SeatService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Belső terem két asztallal (T1: 4 szék), T2-höz foglalás tartozik."""
+    engine = create_engine("sqlite://")
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'orders', 'order_items', 'reservations')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    db.add(Room(id=1, name="Belső terem"))
+    db.add_all([
+        Table(id=1, table_number="T1", capacity=4, room_id=1),
+        Table(id=2, table_number="T2", capacity=2, room_id=1),
+    ])
+    db.add_all([Seat(table_id=1, seat_number=number) for number in range(1, 5)])
+    db.add(Reservation(table_id=2, customer_name="Vendég", start_time=datetime(2025, 1, 20, 18, 0),
+                       duration_minutes=60, guest_count=2))
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _statements(db):
+    statements = []
+    event.listen(
+        db.get_bind(), "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    return statements
+
+
+def test_large_layout_saved_with_set_based_statements(db_session):
+    """Test: Új terem 120 asztallal és 480 székkel, az utasítások száma nem függ az asztalszámtól."""
+    layout = FloorplanLayoutSaveRequest(
+        rooms=[{"name": "Terasz", "ref": "terasz"}],
+        tables=[
+            {"table_number": f"K{number}", "room_ref": "terasz", "position_x": 100 * number,
+             "seat_numbers": [1, 2, 3, 4]}
+            for number in range(120)
+        ]
+    )
+    statements = _statements(db_session)
+
+    diff = FloorplanService.save_layout(db_session, layout)
+
+    room_id = diff.room_refs["terasz"]
+    assert diff.rooms.created == [room_id]
+    assert len(diff.tables.created) == 120
+    assert len(diff.seats.created) == 480
+    assert db_session.query(Table).filter(Table.room_id == room_id).count() == 120
+    assert db_session.query(Table).filter(Table.table_number == "K7").one().position_x == 700
+    # terem, asztalok, székek: egy-egy többsoros INSERT
+    assert len([s for s in statements if s.startswith("INSERT")]) == 3
+
+
+def test_diff_updates_only_changed_rows(db_session):
+    """Test: Változatlan asztal nem kerül UPDATE-be; székek szűkítése; üres terem törlése."""
+    diff = FloorplanService.save_layout(db_session, FloorplanLayoutSaveRequest(
+        rooms=[{"id": 1, "name": "Belső terem"}, {"name": "Galéria", "ref": "galeria"}],
+        tables=[
+            {"id": 1, "table_number": "T1", "capacity": 4, "seat_numbers": [1, 2, 5]},
+            {"id": 2, "table_number": "T2", "room_ref": "galeria"},
+        ]
+    ))
+
+    assert diff.rooms.updated == []
+    assert diff.tables.updated == [2]
+    assert len(diff.seats.deleted) == 2
+    assert len(diff.seats.created) == 1
+    assert sorted(seat.seat_number for seat in db_session.query(Seat).filter(Seat.table_id == 1)) == [1, 2, 5]
+
+    diff = FloorplanService.save_layout(db_session, FloorplanLayoutSaveRequest(
+        tables=[{"id": 1, "table_number": "T1", "room_id": diff.room_refs["galeria"]}],
+        delete_room_ids=[1]
+    ))
+    assert diff.rooms.deleted == [1]
+    assert db_session.query(Room).count() == 1
+
+
+def test_failed_save_changes_nothing(db_session):
+    """Test: Foglalással rendelkező asztal törlése hibát ad, és az új terem sem jön létre."""
+    with pytest.raises(ValueError, match="foglalás"):
+        FloorplanService.save_layout(db_session, FloorplanLayoutSaveRequest(
+            rooms=[{"name": "Terasz", "ref": "terasz"}],
+            tables=[{"table_number": "K1", "room_ref": "terasz", "seat_numbers": [1]}],
+            delete_table_ids=[2]
+        ))
+
+    assert db_session.query(Room).count() == 1
+    assert db_session.query(Table).count() == 2
+
+    with pytest.raises(ValueError, match="Ismétlődő asztalszám"):
+        FloorplanService.save_layout(db_session, FloorplanLayoutSaveRequest(
+            tables=[{"table_number": "K1"}, {"table_number": "K1"}]
+        ))
+
+
+def test_bulk_create_seats_single_insert(db_session):
+    """Test: 6 szék egy INSERT utasítással, székszám szerint rendezve."""
+    statements = _statements(db_session)
+
+    seats = SeatService.bulk_create_seats(db_session, table_id=2, seat_count=6)
+
+    assert [seat.seat_number for seat in seats] == [1, 2, 3, 4, 5, 6]
+    assert len([s for s in statements if s.startswith("INSERT")]) == 1
@@ -0,0 +1,110 @@
+"""
+Floorplan Snapshot Tests - Élő alaprajz egy lekérdezéssel
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- Termek, asztalok, székek és nyitott rendelés (eltelt idő, összeg) egy SQL lekérdezésből
+- Verzió (ETag): változatlan állapotra azonos, új tételre / eltelt percre változik
+- If-None-Match egyezés
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.core_domain.enums import OrderStatus
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.order import Order
+from backend.service_orders.models.order_item import OrderItem
+from backend.service_orders.models.room import Room
+from backend.service_orders.models.seat import Seat
+from backend.service_orders.models.table import Table
+from backend.service_orders.routers.floorplan_router import _etag_matches
+from backend.service_orders.services.floorplan_service import FloorplanService
+
+NOW = datetime(2025, 1, 20, 19, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Terem két asztallal (T1: 2 szék, 2 nyitott + 1 lezárt rendelés), üres terasz, terem nélküli bárasztal."""
+    engine = create_engine("sqlite://")
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'orders', 'order_items')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    db.add_all([Room(id=1, name="Belső terem"), Room(id=2, name="Terasz")])
+    db.add_all([
+        Table(id=1, table_number="T1", capacity=4, room_id=1, position_x=10, position_y=20),
+        Table(id=2, table_number="T2", capacity=2, room_id=1),
+        Table(id=3, table_number="B1", capacity=2),
+    ])
+    db.add_all([Seat(table_id=1, seat_number=1), Seat(table_id=1, seat_number=2)])
+    opened = NOW.replace(tzinfo=None)
+    db.add_all([
+        Order(id=1, order_type="Helyben", table_id=1, created_at=opened - timedelta(minutes=45)),
+        Order(id=2, order_type="Helyben", table_id=1, status=OrderStatus.IN_PROGRESS.value,
+              created_at=opened - timedelta(minutes=10), total_amount=Decimal("990.00")),
+        Order(id=3, order_type="Helyben", table_id=1, status=OrderStatus.CLOSED.value,
+              created_at=opened - timedelta(hours=3)),
+    ])
+    db.add_all([
+        OrderItem(order_id=1, product_id=1, quantity=2, unit_price=Decimal("1500.00")),
+        OrderItem(order_id=1, product_id=2, quantity=1, unit_price=Decimal("450.50")),
+        OrderItem(order_id=3, product_id=1, quantity=9, unit_price=Decimal("1500.00")),
+    ])
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_snapshot_single_query(db_session):
+    """Test: Egy SELECT; T1 a legrégebbi nyitott rendeléssel, a két nyitott rendelés összegével."""
+    statements = []
+    event.listen(
+        db_session.get_bind(), "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+
+    snapshot = FloorplanService.get_snapshot(db_session, now=NOW)
+
+    assert len(statements) == 1
+    assert [room.name for room in snapshot.rooms] == ["Belső terem", "Terasz"]
+    tables = {table.number: table for table in snapshot.tables}
+    assert set(tables) == {"T1", "T2", "B1"}
+    assert tables["B1"].room_id is None
+
+    t1 = tables["T1"]
+    assert (t1.x, t1.y, t1.width) == (10, 20, 80)
+    assert [seat.seat_number for seat in t1.seats] == [1, 2]
+    assert t1.open_order.id == 1
+    assert t1.open_order.elapsed_minutes == 45
+    assert t1.open_order.order_count == 2
+    assert t1.open_order.amount == Decimal("4440.50")
+    assert tables["T2"].open_order is None
+    assert tables["T2"].seats == []
+
+
+def test_snapshot_version(db_session):
+    """Test: Változatlan állapot -> azonos verzió; új tétel vagy eltelt perc -> új verzió."""
+    version = FloorplanService.get_snapshot(db_session, now=NOW).version
+    assert FloorplanService.get_snapshot(db_session, now=NOW + timedelta(seconds=30)).version == version
+    assert FloorplanService.get_snapshot(db_session, now=NOW + timedelta(minutes=1)).version != version
+
+    db_session.add(OrderItem(order_id=1, product_id=3, quantity=1, unit_price=Decimal("800.00")))
+    db_session.commit()
+    assert FloorplanService.get_snapshot(db_session, now=NOW).version != version
+
+    etag = f'"{version}"'
+    assert _etag_matches(etag, etag)
+    assert _etag_matches(f'"other", W/{etag}', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"other"', etag)
+    assert not _etag_matches(None, etag)
@@ -0,0 +1,146 @@
+"""
+KDS Board Tests - Incremental in-memory Kitchen Display state
+Module 1: Rendeléskezelés és Asztalok / Epic B: Konyha/KDS
+
+Teszteli a következő funkciókat:
+- Betöltés és snapshot (get_active_items struktúra)
+- since_version: változatlan állapot (None -> 304), csak a változott jegyek
+- Eltűnt jegy tombstone (removed)
+- Összes állomás nézet: a változott rendelés minden állomás tételével megy
+- Betöltés előtti események figyelmen kívül hagyása
+"""
+
+from backend.service_orders.services.kds_board import KDSBoard
+
+
+def _item(item_id: int, order_id: int, station: str = "KONYHA", status: str = "WAITING") -> dict:
+    """OrderItemResponse JSON-szerű tétel."""
+    return {
+        "id": item_id,
+        "order_id": order_id,
+        "product_id": 1,
+        "quantity": 1,
+        "kds_station": station,
+        "kds_status": status,
+        "is_urgent": False,
+    }
+
+
+def _header(order_id: int) -> dict:
+    """get_active_items rendelés-fejléc."""
+    return {
+        "order_id": order_id,
+        "table_id": None,
+        "table_number": None,
+        "order_type": "Helyben",
+        "order_status": "NYITOTT",
+        "created_at": f"2024-01-15T14:{order_id:02d}:00",
+    }
+
+
+def _event(event_type: str, item: dict) -> dict:
+    """kds_event_bus esemény."""
+    return {
+        "type": event_type,
+        "station": item["kds_station"],
+        "order_id": item["order_id"],
+        "order": _header(item["order_id"]),
+        "item": item,
+    }
+
+
+def _board() -> KDSBoard:
+    """Betöltött tábla két rendeléssel (KONYHA + PULT)."""
+    groups = [
+        {**_header(1), "items": [_item(10, 1), _item(11, 1, station="PULT")]},
+        {**_header(2), "items": [_item(20, 2)]},
+    ]
+    board = KDSBoard(loader=lambda db: groups, resync_seconds=0)
+    board.ensure_loaded(db=None)
+    return board
+
+
+def test_snapshot_groups_by_order_and_station():
+    """Test: A snapshot állomásonként, rendelés szerint csoportosít."""
+    board = _board()
+
+    kitchen = board.snapshot("KONYHA")
+    bar = board.snapshot("PULT")
+
+    assert [ticket["order_id"] for ticket in kitchen] == [1, 2]
+    assert [item["id"] for item in kitchen[0]["items"]] == [10]
+    assert [item["id"] for item in bar[0]["items"]] == [11]
+
+
+def test_since_current_version_returns_none():
+    """Test: Változás nélkül a lekérdezés None (a végpont 304-et ad)."""
+    board = _board()
+    version = board.changes_since("KONYHA", None)["version"]
+
+    assert board.changes_since("KONYHA", version) is None
+
+
+def test_changes_since_returns_only_changed_tickets():
+    """Test: Csak a változott jegy kerül a válaszba, a többi állomás nem érintett."""
+    board = _board()
+    kitchen_version = board.changes_since("KONYHA", None)["version"]
+    bar_version = board.changes_since("PULT", None)["version"]
+
+    board.apply_event(_event("item_upserted", _item(21, 2)))
+
+    changes = board.changes_since("KONYHA", kitchen_version)
+    assert changes["full"] is False
+    assert [ticket["order_id"] for ticket in changes["tickets"]] == [2]
+    assert [item["id"] for item in changes["tickets"][0]["items"]] == [20, 21]
+    assert board.changes_since("PULT", bar_version) is None
+
+
+def test_removed_ticket_is_reported():
+    """Test: Utolsó tétel eltűnésekor a jegy a removed listába kerül."""
+    board = _board()
+    version = board.changes_since("KONYHA", None)["version"]
+
+    board.apply_event(_event("item_removed", _item(20, 2, status="SERVED")))
+
+    changes = board.changes_since("KONYHA", version)
+    assert changes["tickets"] == []
+    assert changes["removed"] == [2]
+    assert [ticket["order_id"] for ticket in board.snapshot("KONYHA")] == [1]
+
+
+def test_all_stations_delta_carries_items_of_every_station():
+    """Test: Egy állomás változásakor az összesített jegy a másik állomás tételeit is tartalmazza."""
+    board = _board()
+    version = board.changes_since(None, None)["version"]
+
+    board.apply_event(_event("item_upserted", _item(12, 1, station="PULT")))
+
+    changes = board.changes_since(None, version)
+    assert changes["full"] is False
+    assert [ticket["order_id"] for ticket in changes["tickets"]] == [1]
+    assert [item["id"] for item in changes["tickets"][0]["items"]] == [10, 11, 12]
+    assert changes["removed"] == []
+
+
+def test_all_stations_delta_after_one_station_emptied():
+    """Test: Ha egy rendelés csak az egyik állomásról tűnik el, jegyként megy (nem removed)."""
+    board = _board()
+    version = board.changes_since(None, None)["version"]
+
+    board.apply_event(_event("item_removed", _item(11, 1, station="PULT", status="SERVED")))
+
+    changes = board.changes_since(None, version)
+    assert [ticket["order_id"] for ticket in changes["tickets"]] == [1]
+    assert [item["id"] for item in changes["tickets"][0]["items"]] == [10]
+    assert changes["removed"] == []
+    assert board.changes_since("PULT", version)["removed"] == [1]
+
+
+def test_events_before_load_are_ignored():
+    """Test: Betöltés előtti eseményeket a tábla figyelmen kívül hagy."""
+    board = KDSBoard(loader=lambda db: [], resync_seconds=0)
+
+    board.apply_event(_event("item_upserted", _item(10, 1)))
+    board.ensure_loaded(db=None)
+
+    assert board.snapshot() == []
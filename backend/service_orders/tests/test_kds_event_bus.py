@@ -0,0 +1,72 @@
+"""
+KDS Event Bus Tests - Push-based Kitchen Display feed
+Module 1: Rendeléskezelés és Asztalok / Epic B: Konyha/KDS
+
+Teszteli a következő funkciókat:
+- Állomás szerinti eseményszűrés
+- Minden állomást figyelő feliratkozás
+- Leiratkozás után nincs kézbesítés
+- Sor túlcsordulás jelzése (resync)
+"""
+
+import asyncio
+
+from backend.service_orders.services.kds_event_bus import KDSEventBus
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    """Sorban várakozó események kiolvasása."""
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_publish_is_filtered_by_station():
+    """Test: Csak az érintett állomás feliratkozói kapják meg az eseményt."""
+    async def scenario():
+        bus = KDSEventBus()
+        kitchen = bus.subscribe("KONYHA")
+        bar = bus.subscribe("PULT")
+        everything = bus.subscribe(None)
+
+        bus.publish({"type": "item_upserted", "station": "KONYHA"}, ["KONYHA"])
+        await asyncio.sleep(0)
+
+        assert len(_drain(kitchen.queue)) == 1
+        assert _drain(bar.queue) == []
+        assert len(_drain(everything.queue)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribed_client_receives_nothing():
+    """Test: Leiratkozás után nincs kézbesítés."""
+    async def scenario():
+        bus = KDSEventBus()
+        subscription = bus.subscribe("KONYHA")
+        bus.unsubscribe(subscription)
+
+        bus.publish({"type": "item_upserted", "station": "KONYHA"}, ["KONYHA"])
+        await asyncio.sleep(0)
+
+        assert _drain(subscription.queue) == []
+        assert bus.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_marks_subscription_for_resync():
+    """Test: Megtelt sor esetén a feliratkozás overflowed jelzést kap."""
+    async def scenario():
+        bus = KDSEventBus(queue_size=2)
+        subscription = bus.subscribe("PIZZA")
+
+        for _ in range(3):
+            bus.publish({"type": "item_upserted", "station": "PIZZA"}, ["PIZZA"])
+        await asyncio.sleep(0)
+
+        assert subscription.overflowed is True
+        assert subscription.queue.qsize() == 2
+
+    asyncio.run(scenario())
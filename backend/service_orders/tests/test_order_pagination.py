@@ -0,0 +1,86 @@
+"""
+Order Pagination Tests - Keyset (kurzor) lapozás
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- Kurzor kódolás / dekódolás (átlátszatlan, URL-biztos)
+- Kurzoros lapozás: minden rendelés pontosan egyszer, azonos created_at esetén is
+- Hibás kurzor: HTTP 400
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core_domain.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    next_page_cursor
+)
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.order import Order
+from backend.service_orders.services.order_service import OrderService
+
+BASE_TIME = datetime(2024, 1, 15, 12, 0)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis a rendelés táblákkal."""
+    engine = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ('rooms', 'tables', 'seats', 'orders')]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_cursor_round_trip():
+    """Test: A kurzor URL-biztos és visszaadja a (created_at, id) kulcsot."""
+    created_at = datetime(2024, 1, 15, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert cursor.replace("-", "").replace("_", "").isalnum()
+    assert decode_cursor(cursor) == (created_at, 42)
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_pages_cover_every_order_once(db_session):
+    """Test: 7 rendelés (közte azonos időbélyegűek) 3-asával, hiány és ismétlés nélkül."""
+    offsets = [0, 1, 1, 1, 2, 3, 3]
+    for minutes in offsets:
+        db_session.add(Order(order_type='Helyben', status='LEZART', created_at=BASE_TIME + timedelta(minutes=minutes)))
+    db_session.commit()
+
+    expected = [
+        order.id
+        for order in db_session.query(Order).order_by(Order.created_at.desc(), Order.id.desc())
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        page = OrderService.get_orders(db_session, limit=3, cursor=cursor)
+        seen.extend(order.id for order in page)
+        cursor = next_page_cursor(page, 3)
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_invalid_cursor_is_bad_request(db_session):
+    """Test: Hibás kurzor esetén 400-as hiba."""
+    with pytest.raises(HTTPException) as exc_info:
+        OrderService.get_orders(db_session, cursor="%%%")
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,76 @@
+"""
+Outbox Service Tests - Transactional Outbox
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- Idempotens sorba állítás (ugyanaz a kulcs csak egyszer)
+- Lefoglalás (claim) lease-szel: a lefoglalt sor nem esedékes újra
+- Eredmény rögzítés: siker, újrapróbálás backoff-fal, végleges hiba
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_orders.models.outbox_event import OutboxEvent, OutboxStatus
+from backend.service_orders.services.outbox_service import (
+    OutboxService,
+    NTAK_REPORT_ORDER,
+    INVENTORY_DEDUCT_STOCK
+)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis csak az outbox táblával."""
+    engine = create_engine("sqlite://")
+    OutboxEvent.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_enqueue_is_idempotent_per_key(db_session):
+    """Test: Ismételt lezárás nem hoz létre új outbox sort."""
+    assert OutboxService.enqueue(db_session, NTAK_REPORT_ORDER, 42) is not None
+    db_session.commit()
+
+    assert OutboxService.enqueue(db_session, NTAK_REPORT_ORDER, 42) is None
+    assert OutboxService.enqueue(db_session, INVENTORY_DEDUCT_STOCK, 42) is not None
+    db_session.commit()
+
+    assert db_session.query(OutboxEvent).count() == 2
+
+
+def test_claimed_event_is_leased(db_session):
+    """Test: A lefoglalt esemény a lease alatt nem foglalható le újra."""
+    OutboxService.enqueue(db_session, NTAK_REPORT_ORDER, 1)
+    db_session.commit()
+
+    claimed = OutboxService.claim_due(db_session, limit=10, lease_seconds=60)
+
+    assert [event["idempotency_key"] for event in claimed] == ["ntak.report_order:1"]
+    assert claimed[0]["attempts"] == 1
+    assert OutboxService.claim_due(db_session, limit=10, lease_seconds=60) == []
+
+
+def test_record_results_marks_sent_retry_and_failed(db_session):
+    """Test: Siker -> SENT, újrapróbálható hiba -> PENDING, nem újrapróbálható -> FAILED."""
+    for order_id in (1, 2, 3):
+        OutboxService.enqueue(db_session, NTAK_REPORT_ORDER, order_id)
+    db_session.commit()
+    claimed = OutboxService.claim_due(db_session, limit=10, lease_seconds=60)
+    ids = [event["id"] for event in claimed]
+
+    OutboxService.record_results(db_session, [
+        {"id": ids[0], "success": True, "retryable": True, "error": None},
+        {"id": ids[1], "success": False, "retryable": True, "error": "HTTP 503"},
+        {"id": ids[2], "success": False, "retryable": False, "error": "HTTP 404"},
+    ])
+
+    statuses = {event.id: event.status for event in db_session.query(OutboxEvent).all()}
+    assert statuses[ids[0]] == OutboxStatus.SENT
+    assert statuses[ids[1]] == OutboxStatus.PENDING
+    assert statuses[ids[2]] == OutboxStatus.FAILED
@@ -0,0 +1,77 @@
+"""
+Product Lookup Tests - Termék katalógus gyorsítótár
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- Egy tömeges hívás a hiányzókra (duplikált ID-k egyszer), utána cache találat
+- Nem létező termék is cache-elődik (nincs ismételt hívás)
+- Katalógus verzió (ETag) változásakor a gyorsítótár ürül
+"""
+
+import time
+
+import httpx
+import pytest
+
+from backend.core_http import ProductCatalog
+from backend.core_http import product_catalog as product_catalog_module
+
+MENU_URL = "http://menu.test"
+
+PRODUCTS = {
+    1: {"id": 1, "name": "Limonádé", "category_id": 10, "category_name": "Ital", "is_active": True},
+    2: {"id": 2, "name": "Gulyásleves", "category_id": 20, "category_name": "Levesek", "is_active": True},
+}
+
+
+@pytest.fixture
+def menu(monkeypatch):
+    """Hamis service_menu lookup végpont; a kéréseket és a verziót a teszt állítja."""
+    state = {"version": "v1", "requests": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        product_ids = httpx.Response(200, content=request.content).json()["product_ids"]
+        state["requests"].append(product_ids)
+        items = [PRODUCTS[product_id] for product_id in product_ids if product_id in PRODUCTS]
+        missing_ids = [product_id for product_id in product_ids if product_id not in PRODUCTS]
+        return httpx.Response(
+            200,
+            headers={"ETag": f'"{state["version"]}"'},
+            json={"items": items, "missing_ids": missing_ids, "catalog_version": state["version"]}
+        )
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(product_catalog_module, "get_sync_client", lambda target: client)
+    yield state
+    client.close()
+
+
+def test_misses_are_fetched_once_then_served_from_cache(menu):
+    """Test: Első kérés egy hívás, a második (nem létező ID-vel együtt) nulla."""
+    catalog = ProductCatalog(base_url=MENU_URL, revalidate_seconds=60)
+
+    first = catalog.get_many([1, 2, 2, 99])
+    second = catalog.get_many([2, 99, 1])
+
+    assert menu["requests"] == [[1, 2, 99]]
+    assert set(first) == {1, 2}
+    assert second[1]["category_name"] == "Ital"
+    assert 99 not in second
+    assert catalog.stats()["hits"] == 3
+
+
+def test_catalog_version_change_invalidates_cache(menu, monkeypatch):
+    """Test: Esedékes ellenőrzéskor új ETag esetén a régi bejegyzések törlődnek."""
+    catalog = ProductCatalog(base_url=MENU_URL, revalidate_seconds=10)
+    catalog.get_many([1, 2])
+
+    menu["version"] = "v2"
+    later = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+
+    catalog.get_many([1])
+
+    assert menu["requests"] == [[1, 2], [1]]
+    assert catalog.stats()["version"] == "v2"
+    assert catalog.stats()["entries"] == 1
+    assert catalog.stats()["invalidations"] == 1
@@ -0,0 +1,143 @@
+"""
+Reports Router Tests - Forgalmi aggregátum végpontok
+Module 4: Fizetések - Riport összesítők
+
+A teszt a service_orders alkalmazást a main.py szerinti routerekkel hívja;
+csak az adatbázis van in-memory SQLite-ra cserélve.
+
+Teszteli a következő funkciókat:
+- A forgalmi és termék aggregátum a belső (/api/v1/internal) routeren érhető el
+- A régi, hitelesítés nélküli /api/v1/reports aggregátum útvonalak megszűntek
+- Az összesítő újraszámolás (rebuild) threadpool-ban fut, a tartománya korlátozott
+"""
+
+import inspect
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.service_admin.dependencies import get_current_principal
+from backend.service_admin.permission_cache import CachedPrincipal
+from backend.service_orders.config import settings
+from backend.service_orders.main import app
+from backend.service_orders.models.database import Base, get_db
+from backend.service_orders.models.sales_rollup import DailySalesRollup, DailyProductSales, ORDER_LEVEL_METHOD
+from backend.service_orders.routers.internal_router import get_product_sales, get_sales_aggregate
+from backend.service_orders.routers.reports import rebuild_sales_rollup
+
+SALE_DAY = date(2024, 1, 15)
+PARAMS = {"start_date": "2024-01-15", "end_date": "2024-01-15"}
+
+
+@pytest.fixture
+def db_session():
+    """In-memory SQLite összesítő táblákkal, a threadpool szálai között megosztva."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'orders', 'order_items', 'payments',
+                     'daily_sales_rollup', 'daily_product_sales')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        DailySalesRollup(
+            sale_date=SALE_DAY, order_type="Helyben", payment_method=ORDER_LEVEL_METHOD,
+            order_count=2, revenue=Decimal("3000.00")
+        ),
+        DailySalesRollup(
+            sale_date=SALE_DAY, order_type="Helyben", payment_method="KESZPENZ",
+            order_count=0, revenue=Decimal("3000.00")
+        ),
+        DailyProductSales(
+            sale_date=SALE_DAY, product_id=7, quantity=3, revenue=Decimal("3000.00"), order_count=2
+        ),
+    ])
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(db_session):
+    """A mountolt orders app; az adatbázis és a bejelentkezett (orders:manage) felhasználó felülírva."""
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_principal] = lambda: CachedPrincipal.from_token_claims(
+        1, {"username": "manager", "roles": ["Manager"], "permissions": ["orders:manage"]}
+    )
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_internal_sales_aggregate(client):
+    """Test: A belső forgalmi aggregátum token nélkül, napi sorokkal."""
+    response = client.get("/api/v1/internal/reports/sales-aggregate", params=PARAMS)
+
+    assert response.status_code == 200
+    assert [day["date"] for day in response.json()["days"]] == ["2024-01-15"]
+
+
+def test_internal_product_sales(client):
+    """Test: A belső termék aggregátum a top termékeket adja."""
+    response = client.get("/api/v1/internal/reports/product-sales", params={**PARAMS, "limit": 5})
+
+    assert response.status_code == 200
+    assert [product["product_id"] for product in response.json()["products"]] == [7]
+
+
+def test_internal_aggregate_rejects_inverted_range(client):
+    """Test: Kezdő dátum a záró után: 400."""
+    response = client.get(
+        "/api/v1/internal/reports/sales-aggregate",
+        params={"start_date": "2024-01-16", "end_date": "2024-01-15"}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/api/v1/reports/sales-aggregate", "/api/v1/reports/product-sales"])
+def test_public_aggregate_routes_removed(client, path):
+    """Test: A forgalmi adatok nem érhetők el a nyilvános /reports útvonalon."""
+    assert client.get(path, params=PARAMS).status_code == 404
+
+
+def test_report_handlers_run_in_threadpool():
+    """Test: A szinkron adatbázis munkát végző handlerek nem blokkolják az event loop-ot."""
+    for handler in (get_sales_aggregate, get_product_sales, rebuild_sales_rollup):
+        assert not inspect.iscoroutinefunction(handler)
+
+
+def test_rebuild_within_limit(client, db_session):
+    """Test: A megengedett tartomány újraszámolása; üres nyers adatnál a nap sorai törlődnek."""
+    response = client.post(
+        "/api/v1/reports/sales-rollup/rebuild",
+        params={"start_date": "2024-01-14", "end_date": "2024-01-15"}
+    )
+
+    assert response.status_code == 200
+    assert (response.json()["sales_rows"], response.json()["product_rows"]) == (0, 0)
+    assert db_session.query(DailySalesRollup).count() == 0
+
+
+def test_rebuild_range_is_capped(client, monkeypatch):
+    """Test: A SALES_ROLLUP_REBUILD_MAX_DAYS-nál hosszabb tartomány 400."""
+    monkeypatch.setattr(settings, "sales_rollup_rebuild_max_days", 31)
+
+    response = client.post(
+        "/api/v1/reports/sales-rollup/rebuild",
+        params={"start_date": "2024-01-01", "end_date": "2024-02-01"}
+    )
+
+    assert response.status_code == 400
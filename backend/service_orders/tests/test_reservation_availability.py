@@ -0,0 +1,131 @@
+"""
+Reservation Availability Tests - Intervallum index
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- Intervallum index: félig nyitott átfedés, egymást átfedő foglalások
+- get_available_slots: egy lekérdezés a foglalásokra, helyes szabad asztalok
+- Ütközés ellenőrzés foglalás létrehozásakor
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.opening_hours import OpeningHours
+from backend.service_orders.models.reservation import Reservation, ReservationStatus
+from backend.service_orders.models.table import Table
+from backend.service_orders.schemas.reservation import AvailabilityQuery, ReservationCreate
+from backend.service_orders.services.availability_grid import availability_grid
+from backend.service_orders.services.reservation_availability import ReservationIntervalIndex
+from backend.service_orders.services.reservation_service import ReservationService
+
+DAY = date(2025, 1, 20)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(DAY, time(hour, minute))
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis asztalokkal, nyitvatartással (12-16) és foglalásokkal."""
+    engine = create_engine("sqlite://")
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'reservations', 'opening_hours')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    db.add(OpeningHours(day_of_week=DAY.weekday(), open_time=time(12, 0), close_time=time(16, 0)))
+    db.add_all([
+        Table(id=1, table_number="T1", capacity=4),
+        Table(id=2, table_number="T2", capacity=4),
+        Table(id=3, table_number="T3", capacity=2),
+    ])
+    db.commit()
+    availability_grid.invalidate()
+    try:
+        yield db
+    finally:
+        db.close()
+        availability_grid.invalidate()
+
+
+def _reserve(db, table_id, start, minutes, status=ReservationStatus.CONFIRMED):
+    db.add(Reservation(
+        table_id=table_id, customer_name="Vendég", start_time=start,
+        duration_minutes=minutes, guest_count=2, status=status
+    ))
+    db.commit()
+
+
+def test_index_matches_brute_force():
+    """Test: Véletlen (egymást is átfedő) foglalásokon az index egyezik a páronkénti ellenőrzéssel."""
+    rng = random.Random(7)
+    intervals = []
+    for _ in range(200):
+        start = at(10) + timedelta(minutes=15 * rng.randrange(0, 48))
+        intervals.append((rng.randrange(1, 6), start, start + timedelta(minutes=rng.choice([30, 60, 150]))))
+    index = ReservationIntervalIndex(intervals)
+
+    slots = [at(10) + timedelta(minutes=30 * step) for step in range(24)]
+    duration = timedelta(minutes=90)
+    for slot_start, free in index.free_slots(range(1, 7), slots, duration):
+        expected = [
+            table_id for table_id in range(1, 7)
+            if not any(
+                table == table_id and start < slot_start + duration and end > slot_start
+                for table, start, end in intervals
+            )
+        ]
+        assert free == expected
+        assert all(index.is_free(table_id, slot_start, slot_start + duration) for table_id in free)
+
+
+def test_available_slots_use_single_reservation_query(db_session):
+    """Test: T1 13:00-14:00 foglalt, T2 lemondott foglalás; T3 kevés a 4 főnek."""
+    _reserve(db_session, 1, at(13), 60)
+    _reserve(db_session, 2, at(12), 240, status=ReservationStatus.CANCELLED)
+
+    statements = []
+    event.listen(
+        db_session.get_bind(), "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+
+    slots, message = ReservationService.get_available_slots(
+        db_session, AvailabilityQuery(date=DAY, guests=4, duration_minutes=60)
+    )
+
+    assert message is None
+    assert {slot.time: slot.available_tables for slot in slots} == {
+        time(12, 0): [1, 2],
+        time(12, 30): [2],
+        time(13, 0): [2],
+        time(13, 30): [2],
+        time(14, 0): [1, 2],
+        time(14, 30): [1, 2],
+        time(15, 0): [1, 2],
+    }
+    assert len([s for s in statements if "FROM reservations" in s]) == 1
+
+
+def test_create_reservation_detects_conflict(db_session):
+    """Test: Átfedő foglalás hibát ad, a közvetlenül utána kezdődő nem."""
+    _reserve(db_session, 1, at(13), 60)
+
+    def create(start):
+        return ReservationService.create_reservation(db_session, ReservationCreate(
+            table_id=1, customer_name="Új Vendég", customer_phone="+36301234567",
+            start_time=start, duration_minutes=60, guest_count=2
+        ))
+
+    with pytest.raises(ValueError, match="foglalt"):
+        create(at(12, 30))
+
+    assert create(at(14)).id is not None
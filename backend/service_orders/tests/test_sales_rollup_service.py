@@ -0,0 +1,337 @@
+"""
+Sales Rollup Service Tests - Napi forgalmi összesítők
+Module 4: Fizetések - Riport összesítők
+
+Teszteli a következő funkciókat:
+- Lezárt rendelés inkrementális hozzáadása (rendelés és termék összesítő)
+- Sikeres fizetés hozzáadása fizetési mód szerint, napi pénztárzárás összeg
+- Újraszámolás (rebuild) egyezik az inkrementális eredménnyel, naponként commitol
+- Üzleti nap az étterem időzónájában (UTC éjfél előtti rendelés is)
+- Késői fizetés a rendelés napjának pénztárzárás számait elavulttá teszi
+- Lezárt rendelés sztornó / összeg módosítás / törlés / tétel módosítás
+  után az összesítő egyezik az újraszámolással, a zárás számai elavulnak
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.order import Order
+from backend.service_orders.models.order_item import OrderItem
+from backend.service_orders.models.payment import Payment
+from backend.service_orders.models.sales_rollup import (
+    DailySalesRollup,
+    DailyProductSales,
+    DailyClosureFigures,
+    ORDER_LEVEL_METHOD
+)
+from backend.service_orders.schemas.order import OrderUpdate, OrderStatusEnum
+from backend.service_orders.schemas.order_item import OrderItemCreate, OrderItemUpdate
+from backend.service_orders.services.order_item_service import OrderItemService
+from backend.service_orders.services.order_service import OrderService
+from backend.service_orders.services.sales_rollup_service import SalesRollupService
+
+SALE_DAY = date(2024, 1, 15)
+SALE_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """In-memory SQLite adatbázis a rendelés, fizetés és összesítő táblákkal."""
+    engine = create_engine("sqlite://")
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'orders', 'order_items', 'payments',
+                     'daily_sales_rollup', 'daily_product_sales', 'daily_closure_figures')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _closed_order(db, order_type, items, payments, created_at=SALE_TIME):
+    """Lezárt rendelés tételekkel és fizetésekkel, az összesítők frissítésével."""
+    total = sum(Decimal(price) * quantity for _, quantity, price in items)
+    order = Order(order_type=order_type, status='LEZART', total_amount=total, created_at=created_at)
+    db.add(order)
+    db.flush()
+
+    for product_id, quantity, price in items:
+        db.add(OrderItem(order_id=order.id, product_id=product_id, quantity=quantity, unit_price=Decimal(price)))
+    db.flush()
+
+    for method, amount in payments:
+        payment = Payment(
+            order_id=order.id, payment_method=method, amount=Decimal(amount),
+            status='SIKERES', created_at=created_at
+        )
+        db.add(payment)
+        SalesRollupService.apply_payment(db, payment, order_type)
+
+    SalesRollupService.apply_order_closed(db, order)
+    db.commit()
+    return order
+
+
+def _snapshot(db):
+    """Összesítő táblák tartalma összehasonlítható formában."""
+    sales = sorted(
+        (row.sale_date, row.order_type, row.payment_method, row.order_count,
+         Decimal(row.revenue), row.payment_count, Decimal(row.payment_amount))
+        for row in db.query(DailySalesRollup)
+    )
+    products = sorted(
+        (row.sale_date, row.product_id, row.quantity, Decimal(row.revenue),
+         row.order_count, row.line_count, Decimal(row.unit_price_sum))
+        for row in db.query(DailyProductSales)
+    )
+    return sales, products
+
+
+def test_closed_orders_and_payments_are_accumulated(db_session):
+    """Test: Két lezárás ugyanarra a napra egy-egy sorba összegződik."""
+    _closed_order(db_session, 'Helyben', [(1, 2, "1000.00"), (2, 1, "500.00")], [('KESZPENZ', "2500.00")])
+    _closed_order(db_session, 'Helyben', [(1, 1, "1200.00")], [('KARTYA', "1000.00"), ('KESZPENZ', "200.00")])
+
+    order_row = db_session.query(DailySalesRollup).filter_by(
+        sale_date=SALE_DAY, order_type='Helyben', payment_method=ORDER_LEVEL_METHOD
+    ).one()
+    assert order_row.order_count == 2
+    assert Decimal(order_row.revenue) == Decimal("3700.00")
+
+    product_row = db_session.query(DailyProductSales).filter_by(sale_date=SALE_DAY, product_id=1).one()
+    assert product_row.quantity == 3
+    assert Decimal(product_row.revenue) == Decimal("3200.00")
+    assert product_row.order_count == 2
+    assert product_row.line_count == 2
+
+    assert SalesRollupService.get_payment_totals(db_session, SALE_DAY) == {
+        'KESZPENZ': 2700.0,
+        'KARTYA': 1000.0,
+    }
+
+
+def test_rebuild_matches_incremental_totals(db_session):
+    """Test: A nyers adatokból újraszámolt összesítő megegyezik az inkrementálissal."""
+    _closed_order(db_session, 'Helyben', [(1, 2, "1000.00"), (1, 1, "900.00")], [('KESZPENZ', "2900.00")])
+    _closed_order(db_session, 'Elvitel', [(3, 4, "250.00")], [('KARTYA', "1000.00")])
+    incremental = _snapshot(db_session)
+
+    result = SalesRollupService.rebuild(db_session, SALE_DAY, SALE_DAY)
+
+    assert result["sales_rows"] == len(incremental[0])
+    assert _snapshot(db_session) == incremental
+
+
+def test_business_day_follows_venue_timezone(db_session, monkeypatch):
+    """Test: 23:30 UTC (00:30 Budapest) a következő üzleti naphoz számít, rebuild-del is."""
+    from backend.service_orders.services import sales_rollup_service
+    monkeypatch.setattr(sales_rollup_service.settings, "venue_timezone", "Europe/Budapest")
+
+    late_evening_utc = datetime(2024, 1, 14, 23, 30, tzinfo=timezone.utc)
+    _closed_order(db_session, 'Elvitel', [(5, 1, "800.00")], [('KARTYA', "800.00")], created_at=late_evening_utc)
+    incremental = _snapshot(db_session)
+
+    assert {row[0] for row in incremental[0]} == {SALE_DAY}
+
+    SalesRollupService.rebuild(db_session, date(2024, 1, 14), SALE_DAY)
+
+    assert _snapshot(db_session) == incremental
+
+
+def test_aggregates_group_by_day_method_and_product(db_session):
+    """Test: A riport aggregátumok napi / fizetési mód / termék szerinti sorokat adnak."""
+    _closed_order(db_session, 'Helyben', [(1, 2, "1000.00"), (2, 5, "300.00")], [('KESZPENZ', "3500.00")])
+    _closed_order(db_session, 'Elvitel', [(1, 1, "1100.00")], [('KARTYA', "1100.00")])
+
+    sales = SalesRollupService.aggregate_sales(db_session, SALE_DAY, SALE_DAY)
+
+    assert len(sales["days"]) == 1
+    day = sales["days"][0]
+    assert (day["date"], day["order_count"], day["revenue"]) == (SALE_DAY, 2, Decimal("4600.00"))
+    assert {p["payment_method"]: p["amount"] for p in day["payments"]} == {
+        'KARTYA': Decimal("1100.00"),
+        'KESZPENZ': Decimal("3500.00"),
+    }
+
+    top = SalesRollupService.aggregate_product_sales(db_session, SALE_DAY, SALE_DAY, limit=1)
+
+    assert top["total_products"] == 2
+    assert [(p["product_id"], p["quantity"], p["order_count"], p["average_price"]) for p in top["products"]] == [
+        (2, 5, 1, Decimal("300.00"))
+    ]
+
+
+def test_late_payment_marks_order_day_figures_stale(db_session):
+    """Test: Másnapi fizetés a rendelés napjának zárás számait jelöli elavultnak."""
+    order = _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KESZPENZ', "600.00")])
+
+    figures = db_session.get(DailyClosureFigures, SALE_DAY)
+    assert figures.is_stale is True
+    figures.is_stale = False
+    db_session.commit()
+
+    late_payment = Payment(
+        order_id=order.id, payment_method='KARTYA', amount=Decimal("400.00"),
+        status='SIKERES', created_at=datetime(2024, 1, 16, 10, 0, tzinfo=timezone.utc)
+    )
+    db_session.add(late_payment)
+    SalesRollupService.apply_payment(db_session, late_payment, 'Helyben', order.created_at)
+    db_session.commit()
+
+    db_session.refresh(figures)
+    assert figures.is_stale is True
+    assert db_session.get(DailyClosureFigures, date(2024, 1, 16)) is None
+
+
+def _mark_figures_fresh(db):
+    """A nap pénztárzárás számai frissként (ahogy a service_admin számolás után hagyja)."""
+    figures = db.get(DailyClosureFigures, SALE_DAY)
+    figures.is_stale = False
+    db.commit()
+    return figures
+
+
+def _assert_matches_rebuild(db):
+    """Az inkrementális összesítő megegyezik a nyers adatokból újraszámolttal."""
+    incremental = _snapshot(db)
+    SalesRollupService.rebuild(db, SALE_DAY, SALE_DAY)
+    assert _snapshot(db) == incremental
+    return incremental
+
+
+def test_storno_of_closed_order_is_removed_from_rollup(db_session):
+    """Test: LEZART -> SZTORNÓ módosítás kiveszi a rendelést az összesítőkből, a zárás elavul."""
+    _closed_order(db_session, 'Helyben', [(1, 2, "1000.00")], [('KESZPENZ', "2000.00")])
+    voided = _closed_order(db_session, 'Helyben', [(1, 1, "1000.00"), (2, 1, "500.00")], [('KARTYA', "1500.00")])
+    figures = _mark_figures_fresh(db_session)
+
+    OrderService.update_order(db_session, voided.id, OrderUpdate(status=OrderStatusEnum.SZTORNO))
+
+    db_session.refresh(figures)
+    assert figures.is_stale is True
+
+    sales, products = _assert_matches_rebuild(db_session)
+    order_rows = [row for row in sales if row[2] == ORDER_LEVEL_METHOD]
+    assert order_rows == [(SALE_DAY, 'Helyben', ORDER_LEVEL_METHOD, 1, Decimal("2000.00"), 0, Decimal("0"))]
+    assert [(row[1], row[2], row[4]) for row in products] == [(1, 2, 1)]
+
+
+def test_total_change_and_reclose_update_rollup(db_session):
+    """Test: Lezárt rendelés összeg módosítása és PUT status=LEZART is frissíti az összesítőt."""
+    edited = _closed_order(db_session, 'Elvitel', [(3, 2, "500.00")], [('KESZPENZ', "1000.00")])
+    figures = _mark_figures_fresh(db_session)
+
+    OrderService.update_order(db_session, edited.id, OrderUpdate(total_amount=Decimal("900.00")))
+
+    db_session.refresh(figures)
+    assert figures.is_stale is True
+    day = SalesRollupService.aggregate_sales(db_session, SALE_DAY, SALE_DAY)["days"][0]
+    assert (day["order_count"], day["revenue"]) == (1, Decimal("900.00"))
+
+    OrderService.update_order(db_session, edited.id, OrderUpdate(status=OrderStatusEnum.NYITOTT))
+    OrderService.update_order(db_session, edited.id, OrderUpdate(status=OrderStatusEnum.LEZART))
+
+    sales, products = _assert_matches_rebuild(db_session)
+    assert [row[3:5] for row in sales if row[2] == ORDER_LEVEL_METHOD] == [(1, Decimal("900.00"))]
+    assert [(row[1], row[2]) for row in products] == [(3, 2)]
+
+
+def test_order_type_change_rekeys_payments(db_session):
+    """Test: Lezárt rendelés típusváltása a fizetéseit is az új típushoz könyveli."""
+    order = _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KARTYA', "1000.00")])
+
+    OrderService.update_order(db_session, order.id, OrderUpdate(order_type='Elvitel'))
+
+    sales, _ = _assert_matches_rebuild(db_session)
+    assert {(row[1], row[2]) for row in sales} == {('Elvitel', ORDER_LEVEL_METHOD), ('Elvitel', 'KARTYA')}
+
+
+def test_delete_closed_order_removes_order_and_payments(db_session):
+    """Test: Lezárt rendelés törlése a rendelést és a fizetéseit is levonja, a zárás elavul."""
+    kept = _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KESZPENZ', "1000.00")])
+    deleted = _closed_order(db_session, 'Helyben', [(2, 3, "400.00")], [('KARTYA', "1200.00")])
+    figures = _mark_figures_fresh(db_session)
+
+    OrderService.delete_order(db_session, deleted.id)
+
+    db_session.refresh(figures)
+    assert figures.is_stale is True
+    assert SalesRollupService.get_payment_totals(db_session, SALE_DAY) == {'KESZPENZ': 1000.0}
+
+    sales, products = _assert_matches_rebuild(db_session)
+    assert {row[2] for row in sales} == {ORDER_LEVEL_METHOD, 'KESZPENZ'}
+    assert [row[1] for row in products] == [1]
+    assert db_session.get(Order, kept.id) is not None
+
+
+def test_item_changes_on_closed_order_update_product_rollup(db_session):
+    """Test: Lezárt rendelés tételének hozzáadása / módosítása / törlése a termék összesítőt követi."""
+    order = _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KESZPENZ', "1000.00")])
+
+    added = OrderItemService.add_item_to_order(db_session, OrderItemCreate(
+        order_id=order.id, product_id=2, quantity=2, unit_price=Decimal("300.00")
+    ))
+    OrderItemService.update_order_item(db_session, added.id, OrderItemUpdate(quantity=3))
+    _assert_matches_rebuild(db_session)
+
+    first_item = db_session.query(OrderItem).filter_by(order_id=order.id, product_id=1).one()
+    OrderItemService.delete_order_item(db_session, first_item.id)
+
+    _, products = _assert_matches_rebuild(db_session)
+    assert [(row[1], row[2], row[4]) for row in products] == [(2, 3, 1)]
+
+
+def test_vat_rate_change_on_closed_order_marks_figures_stale(db_session):
+    """Test: Lezárt rendelés ÁFA kulcsának módosítása a zárás számait elavulttá teszi (az összesítő változatlan)."""
+    order = _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KESZPENZ', "1000.00")])
+    figures = _mark_figures_fresh(db_session)
+    before = _snapshot(db_session)
+
+    OrderService.update_order(db_session, order.id, OrderUpdate(final_vat_rate=Decimal("5.00")))
+
+    db_session.refresh(figures)
+    assert figures.is_stale is True
+    assert _snapshot(db_session) == before
+
+
+def test_open_order_edit_keeps_figures_fresh(db_session):
+    """Test: Nyitott rendelés módosítása nem érinti a pénztárzárás számait."""
+    _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KESZPENZ', "1000.00")])
+    figures = _mark_figures_fresh(db_session)
+    open_order = Order(order_type='Helyben', status='NYITOTT', total_amount=Decimal("500.00"), created_at=SALE_TIME)
+    db_session.add(open_order)
+    db_session.commit()
+
+    OrderService.update_order(db_session, open_order.id, OrderUpdate(total_amount=Decimal("700.00")))
+
+    db_session.refresh(figures)
+    assert figures.is_stale is False
+
+
+def test_rebuild_commits_day_by_day(db_session, monkeypatch):
+    """Test: Rebuild naponként commitol; egy későbbi nap hibája a kész napokat nem vonja vissza."""
+    _closed_order(db_session, 'Helyben', [(1, 1, "1000.00")], [('KESZPENZ', "1000.00")])
+    rebuild_day = SalesRollupService._rebuild_day
+
+    def failing_second_day(db, day):
+        if day > SALE_DAY:
+            raise RuntimeError("connection dropped")
+        return rebuild_day(db, day)
+
+    monkeypatch.setattr(SalesRollupService, "_rebuild_day", staticmethod(failing_second_day))
+    db_session.query(DailySalesRollup).delete()
+    db_session.commit()
+
+    with pytest.raises(RuntimeError):
+        SalesRollupService.rebuild(db_session, SALE_DAY, date(2024, 1, 16))
+
+    days = SalesRollupService.aggregate_sales(db_session, SALE_DAY, SALE_DAY)["days"]
+    assert [day["order_count"] for day in days] == [1]
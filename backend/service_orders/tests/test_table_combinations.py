@@ -0,0 +1,136 @@
+"""
+Table Combination Tests - Szomszédos asztalok összevonása
+Module 1: Rendeléskezelés és Asztalok
+
+Teszteli a következő funkciókat:
+- Szomszédság: azonos terem, alaprajzi rés
+- Kombináció keresés: a vágások nem hagynak ki jobb megoldást (brute force összevetés)
+- get_available_slots: 14 fős társaság összevont asztalokat kap
+"""
+
+import itertools
+import random
+from datetime import date, datetime, time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.service_orders.models.database import Base
+from backend.service_orders.models.opening_hours import OpeningHours
+from backend.service_orders.models.reservation import Reservation, ReservationStatus
+from backend.service_orders.models.room import Room
+from backend.service_orders.models.table import Table
+from backend.service_orders.schemas.reservation import AvailabilityQuery
+from backend.service_orders.services.availability_grid import availability_grid
+from backend.service_orders.services.reservation_service import ReservationService
+from backend.service_orders.services.table_combinations import build_adjacency, find_combinations
+
+DAY = date(2025, 1, 20)
+
+
+def _table(table_id, x, y, room_id=1, capacity=4):
+    return SimpleNamespace(id=table_id, room_id=room_id, position_x=x, position_y=y,
+                           width=80, height=80, capacity=capacity)
+
+
+def _connected(table_ids, adjacency):
+    seen, stack = {table_ids[0]}, [table_ids[0]]
+    while stack:
+        for neighbour in adjacency[stack.pop()]:
+            if neighbour in table_ids and neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return len(seen) == len(table_ids)
+
+
+def test_adjacency_uses_room_and_gap():
+    """Test: 20 egységnyi rés szomszéd, 200 nem; más terem vagy terem nélküli asztal sosem."""
+    adjacency = build_adjacency([
+        _table(1, 0, 0),
+        _table(2, 100, 0),
+        _table(3, 300, 0),
+        _table(4, 100, 100, room_id=2),
+        _table(5, 0, 100, room_id=None),
+    ], max_gap=30)
+
+    assert adjacency[1] == {2}
+    assert adjacency[2] == {1}
+    assert adjacency[3] == frozenset()
+    assert adjacency[4] == frozenset()
+    assert adjacency[5] == frozenset()
+
+
+def test_search_matches_brute_force():
+    """Test: Véletlen 10 asztalos termekben a legjobb kombinációk egyeznek a teljes felsorolással."""
+    rng = random.Random(11)
+    for _ in range(30):
+        tables = [_table(table_id, 100 * (table_id % 4), 100 * (table_id // 4), capacity=rng.choice([2, 4, 6]))
+                  for table_id in range(10)]
+        adjacency = build_adjacency(tables, max_gap=30)
+        capacities = {table.id: table.capacity for table in tables}
+        free = [table.id for table in tables if rng.random() < 0.8]
+        guests = rng.randrange(7, 16)
+
+        # A legkisebb asztalszámú összes összefüggő, elég nagy kombináció
+        expected = []
+        for size in range(1, 4):
+            for subset in itertools.combinations(free, size):
+                seats = sum(capacities[table_id] for table_id in subset)
+                if seats >= guests and _connected(subset, adjacency):
+                    expected.append((size, seats - guests, list(subset)))
+            if expected:
+                break
+        expected.sort()
+
+        found = find_combinations(free, capacities, adjacency, guests, max_tables=3, limit=50)
+        assert found == [table_ids for _, _, table_ids in expected]
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Terasz: 4 x 6 fős asztal egy sorban (összetolhatók), egy külön 8 fős asztal."""
+    engine = create_engine("sqlite://")
+    tables = [
+        Base.metadata.tables[name]
+        for name in ('rooms', 'tables', 'seats', 'reservations', 'opening_hours')
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    db.add(Room(id=1, name="Terasz"))
+    db.add(OpeningHours(day_of_week=DAY.weekday(), open_time=time(18, 0), close_time=time(22, 0)))
+    db.add_all([Table(id=number, table_number=f"T{number}", capacity=6, room_id=1,
+                      position_x=100 * (number - 1), position_y=0) for number in range(1, 5)])
+    db.add(Table(id=5, table_number="T5", capacity=8, room_id=1, position_x=0, position_y=400))
+    db.commit()
+    availability_grid.invalidate()
+    try:
+        yield db
+    finally:
+        db.close()
+        availability_grid.invalidate()
+
+
+def test_large_party_gets_table_combinations(db_session):
+    """Test: 14 fő: 3 szomszédos asztal; amíg T2 foglalt, nincs összefüggő kombináció."""
+    db_session.add(Reservation(
+        table_id=2, customer_name="Vendég", start_time=datetime.combine(DAY, time(18, 0)),
+        duration_minutes=60, guest_count=2, status=ReservationStatus.CONFIRMED
+    ))
+    db_session.commit()
+
+    slots, message = ReservationService.get_available_slots(
+        db_session, AvailabilityQuery(date=DAY, guests=14, duration_minutes=120)
+    )
+
+    assert message is None
+    by_time = {slot.time: slot for slot in slots}
+    assert time(18, 0) not in by_time
+    assert by_time[time(19, 0)].available_tables == []
+    assert by_time[time(19, 0)].table_combinations == [[1, 2, 3], [2, 3, 4]]
+
+    slots, _ = ReservationService.get_available_slots(
+        db_session, AvailabilityQuery(date=DAY, guests=6, duration_minutes=120)
+    )
+    assert {slot.time: slot.available_tables for slot in slots}[time(18, 0)] == [1, 3, 4, 5]
@@ -7,11 +7,10 @@ import { useState, useEffect } from 'react';
 import { ErrorBoundary } from '@/components/ui/ErrorBoundary';
 import { Skeleton } from '@/components/ui/Skeleton';
 import { KdsCard } from '@/components/kds/KdsCard';
-import { getItemsByStation } from '@/services/kdsService';
+import { getItemsByStation, subscribeToKdsStream } from '@/services/kdsService';
 import type { KdsItem } from '@/types/kds';
 import './BarCounterOrders.css';
 
-const REFRESH_INTERVAL = 12000; // 12 seconds
 
 export const BarCounterOrders = () => {
   const [items, setItems] = useState<KdsItem[]>([]);
@@ -35,9 +34,13 @@ export const BarCounterOrders = () => {
     fetchBarOrders();
   }, []);
 
+  // Valós idejű frissítés: PULT állomás SSE push feed (polling helyett)
   useEffect(() => {
-    const interval = setInterval(fetchBarOrders, REFRESH_INTERVAL);
-    return () => clearInterval(interval);
+    return subscribeToKdsStream('PULT', (barItems) => {
+      setItems(barItems);
+      setError(null);
+      setIsLoading(false);
+    });
   }, []);
 
   if (isLoading) {
@@ -7,13 +7,16 @@ import { useState, useEffect } from 'react';
 import { ErrorBoundary } from '@/components/ui/ErrorBoundary';
 import { Skeleton } from '@/components/ui/Skeleton';
 import { KdsCard } from '@/components/kds/KdsCard';
-import { getItemsByStation } from '@/services/kdsService';
+import { getItemsByStation, subscribeToKdsStream } from '@/services/kdsService';
 import type { KdsItem, KdsStation } from '@/types/kds';
 import './DrinkKdsQueue.css';
 
-const REFRESH_INTERVAL = 10000; // 10 seconds - faster for drinks
 const DRINK_STATIONS: KdsStation[] = ['PULT', 'KONYHA', 'PIZZA'];
 
+// Sort by created_at (oldest first for FIFO)
+const sortByCreatedAt = (items: KdsItem[]): KdsItem[] =>
+  [...items].sort((a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime());
+
 export const DrinkKdsQueue = () => {
   const [drinkItems, setDrinkItems] = useState<KdsItem[]>([]);
   const [isLoading, setIsLoading] = useState(true);
@@ -34,12 +37,7 @@ export const DrinkKdsQueue = () => {
       // This is a simplified version - you might want to filter by product category
       const allItems = allStationsResults.flat();
 
-      // Sort by created_at (oldest first for FIFO)
-      const sortedItems = allItems.sort((a, b) => {
-        return new Date(a.created_at).getTime() - new Date(b.created_at).getTime();
-      });
-
-      setDrinkItems(sortedItems);
+      setDrinkItems(sortByCreatedAt(allItems));
     } catch (err) {
       console.error('Error fetching drink queue:', err);
       setError(err instanceof Error ? err.message : 'Hiba történt');
@@ -52,9 +50,20 @@ export const DrinkKdsQueue = () => {
     fetchDrinkItems();
   }, []);
 
+  // Valós idejű frissítés: SSE push feed minden állomásra (polling helyett)
   useEffect(() => {
-    const interval = setInterval(fetchDrinkItems, REFRESH_INTERVAL);
-    return () => clearInterval(interval);
+    const stationItems: Partial<Record<KdsStation, KdsItem[]>> = {};
+
+    const unsubscribers = DRINK_STATIONS.map((station) =>
+      subscribeToKdsStream(station, (items) => {
+        stationItems[station] = items;
+        setDrinkItems(sortByCreatedAt(Object.values(stationItems).flat()));
+        setError(null);
+        setIsLoading(false);
+      })
+    );
+
+    return () => unsubscribers.forEach((unsubscribe) => unsubscribe());
   }, []);
 
   // Group items by status for better organization
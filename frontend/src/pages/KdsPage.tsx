@@ -1,20 +1,19 @@
 /**
  * KdsPage - Konyhai Kijelző Oldal
- * Valós idejű frissítéssel (12 másodpercenként - throttled)
+ * Valós idejű frissítés push feed-del (SSE, állomásonként) - polling helyett
  * V3.0 Fázis 5: GlobalHeader integrálva
  * Sprint 0: Performance optimizations with throttling & error handling
  */
 
 import { useState, useEffect, useMemo } from 'react';
 import { GlobalHeader } from '@/components/layout/GlobalHeader';
-import { getItemsByStation } from '@/services/kdsService';
+import { getItemsByStation, subscribeToKdsStream } from '@/services/kdsService';
 import { KdsLane } from '@/components/kds/KdsLane';
 import type { KdsItem, KdsStation } from '@/types/kds';
 import { useUrgentAudio } from '@/hooks/useUrgentAudio';
 import './KdsPage.css';
 
 const STATIONS: KdsStation[] = ['PULT', 'KONYHA', 'PIZZA'];
-const REFRESH_INTERVAL = 12000; // 12 seconds - throttled for performance (Sprint 0)
 
 export const KdsPage = () => {
   const [items, setItems] = useState<Record<KdsStation, KdsItem[]>>({
@@ -82,13 +81,17 @@ export const KdsPage = () => {
     fetchAllStations();
   }, []);
 
-  // Automatikus frissítés (12 másodpercenként - throttled)
+  // Valós idejű frissítés: állomásonként egy SSE push feed (tétel-szintű delták)
   useEffect(() => {
-    const interval = setInterval(() => {
-      fetchAllStations(true); // Mark as background poll
-    }, REFRESH_INTERVAL);
-
-    return () => clearInterval(interval);
+    const unsubscribers = STATIONS.map((station) =>
+      subscribeToKdsStream(station, (stationItems) => {
+        setItems((prev) => ({ ...prev, [station]: stationItems }));
+        setLastUpdate(new Date());
+        setIsLoading(false);
+      })
+    );
+
+    return () => unsubscribers.forEach((unsubscribe) => unsubscribe());
   }, []);
 
   // Kézi frissítés
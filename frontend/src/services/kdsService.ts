@@ -10,9 +10,11 @@
  *   - GET /api/orders/kds/stations/{station}/items → http://localhost:8002/api/v1/kds/stations/{station}/items
  *   - PATCH /api/orders/items/{item_id}/kds-status → http://localhost:8002/api/v1/kds/items/{item_id}/status
  *   - PATCH /api/orders/kds/items/{item_id}/urgent → http://localhost:8002/api/v1/kds/items/{item_id}/urgent
+ *   - GET /api/orders/kds/stream?station={station} → http://localhost:8002/api/v1/orders/kds/stream (SSE push feed)
  */
 
 import apiClient from './api';
+import { storage } from '@/utils/storage';
 import type { KdsItem, KdsStation, KdsStatus } from '@/types/kds';
 import { KDS_STATUS_TO_BACKEND, KDS_STATUS_FROM_BACKEND } from '@/types/kds';
 
@@ -130,3 +132,161 @@ export const getDrinkItems = async (): Promise<DrinkItem[]> => {
     throw error;
   }
 };
+
+/**
+ * KDS push feed (SSE) esemény a backendről
+ */
+interface KdsStreamOrderHeader {
+  order_id: number;
+  table_number: string | null;
+  created_at: string | null;
+}
+
+interface KdsStreamDelta {
+  type: 'item_upserted' | 'item_removed';
+  station: string;
+  order_id: number;
+  order: KdsStreamOrderHeader | null;
+  item: any;
+}
+
+const KDS_STREAM_RECONNECT_MIN_MS = 1000;
+const KDS_STREAM_RECONNECT_MAX_MS = 30000;
+
+/**
+ * Backend tétel -> KdsItem (státusz mapping + rendelés-fejléc adatok)
+ */
+const toKdsItem = (item: any, order: KdsStreamOrderHeader | null): KdsItem => ({
+  ...item,
+  table_number: item.table_number ?? order?.table_number ?? undefined,
+  created_at: item.created_at ?? order?.created_at ?? '',
+  kds_status: KDS_STATUS_FROM_BACKEND[item.kds_status] || item.kds_status,
+});
+
+/**
+ * Feliratkozás egy állomás KDS push feed-jére (Server-Sent Events)
+ *
+ * Polling helyett: GET /api/orders/kds/stream?station={station}
+ * Az első `snapshot` esemény a teljes aktív listát adja, utána tétel-szintű
+ * `delta` események érkeznek. Kapcsolat megszakadásakor exponenciális
+ * visszalépéssel újracsatlakozik (és új snapshot-ot kap).
+ *
+ * Az EventSource nem tud Authorization headert küldeni, ezért fetch + ReadableStream.
+ *
+ * @param station - Állomás neve ('KONYHA', 'PIZZA', 'PULT')
+ * @param onItems - Callback az aktuális (aktív) tétellistával minden változás után
+ * @param onError - Opcionális callback kapcsolat hiba esetén
+ * @returns Leiratkozó függvény (useEffect cleanup-hoz)
+ */
+export const subscribeToKdsStream = (
+  station: KdsStation,
+  onItems: (items: KdsItem[]) => void,
+  onError?: (error: unknown) => void
+): (() => void) => {
+  const controller = new AbortController();
+  const items = new Map<number, KdsItem>();
+  let reconnectDelay = KDS_STREAM_RECONNECT_MIN_MS;
+
+  const emit = () => {
+    onItems(Array.from(items.values()));
+  };
+
+  const handleMessage = (event: string, data: string) => {
+    const payload = JSON.parse(data);
+
+    if (event === 'snapshot') {
+      items.clear();
+      for (const order of payload as Array<KdsStreamOrderHeader & { items: any[] }>) {
+        for (const item of order.items) {
+          items.set(item.id, toKdsItem(item, order));
+        }
+      }
+      emit();
+      return;
+    }
+
+    if (event === 'delta') {
+      const delta = payload as KdsStreamDelta;
+      if (delta.type === 'item_removed') {
+        items.delete(delta.item.id);
+      } else {
+        items.set(delta.item.id, toKdsItem(delta.item, delta.order));
+      }
+      emit();
+    }
+  };
+
+  const connect = async (): Promise<void> => {
+    const token = storage.getToken();
+    const response = await fetch(
+      `/api/orders/kds/stream?station=${encodeURIComponent(station)}`,
+      {
+        headers: {
+          Accept: 'text/event-stream',
+          ...(token ? { Authorization: `Bearer ${token}` } : {}),
+        },
+        signal: controller.signal,
+      }
+    );
+
+    if (!response.ok || !response.body) {
+      throw new Error(`KDS stream HTTP ${response.status}`);
+    }
+
+    reconnectDelay = KDS_STREAM_RECONNECT_MIN_MS;
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+
+      // Üzenetek elválasztója: üres sor
+      let separatorIndex = buffer.indexOf('\n\n');
+      while (separatorIndex !== -1) {
+        const rawMessage = buffer.slice(0, separatorIndex);
+        buffer = buffer.slice(separatorIndex + 2);
+
+        let event = 'message';
+        const dataLines: string[] = [];
+        for (const line of rawMessage.split('\n')) {
+          if (line.startsWith('event:')) {
+            event = line.slice(6).trim();
+          } else if (line.startsWith('data:')) {
+            dataLines.push(line.slice(5).trim());
+          }
+          // ':' kezdetű sorok keepalive kommentek
+        }
+
+        if (dataLines.length > 0) {
+          handleMessage(event, dataLines.join('\n'));
+        }
+
+        separatorIndex = buffer.indexOf('\n\n');
+      }
+    }
+  };
+
+  const run = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        await connect();
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error(`KDS stream error for station ${station}:`, error);
+        onError?.(error);
+      }
+
+      if (controller.signal.aborted) return;
+      await new Promise((resolve) => setTimeout(resolve, reconnectDelay));
+      reconnectDelay = Math.min(reconnectDelay * 2, KDS_STREAM_RECONNECT_MAX_MS);
+    }
+  };
+
+  run();
+
+  return () => controller.abort();
+};